@@ -0,0 +1,4 @@
+// ใส่ class form-control ให้ input ของ Django อัตโนมัติ
+document.querySelectorAll('input').forEach(input => {
+    input.classList.add('form-control');
+});
@@ -5,8 +5,12 @@ set -o errexit
 # 1. ลง Library ตามใบสั่ง
 pip install -r requirements.txt
 
-# 2. รวบรวมไฟล์ Static (CSS/JS)
+# 2. ดาวน์โหลด CSS/JS/ฟอนต์จาก CDN มาไว้ในเครื่อง (pages/assets.py)
+#    ดาวน์โหลดไม่ได้ก็ build ต่อ: template จะใช้ URL ของ CDN แทน
+python manage.py vendor_assets || echo "vendor_assets failed: pages will load assets from CDN"
+
+# 3. รวบรวมไฟล์ Static (CSS/JS) ใส่ hash ในชื่อ + ทำ .gz/.br
 python manage.py collectstatic --no-input
 
-# 3. สร้างตารางใน Database
+# 4. สร้างตารางใน Database
 python manage.py migrate
\ No newline at end of file
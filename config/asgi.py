@@ -14,3 +14,14 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_asgi_application()
+
+
+async def events_application(scope, receive, send):
+    """ASGI app ของ gunicorn.events.conf.py: ส่งต่อเฉพาะ live board (SSE) path อื่นตอบ 404"""
+    from django.urls import reverse
+
+    if scope['type'] == 'http' and scope['path'] != reverse('tasks:task_events'):
+        await send({'type': 'http.response.start', 'status': 404, 'headers': [(b'content-type', b'text/plain')]})
+        await send({'type': 'http.response.body', 'body': b'Not Found'})
+        return
+    await application(scope, receive, send)
@@ -0,0 +1,106 @@
+"""
+Cache ของหน้าร้าน (storefront) ที่ใช้ร่วมกันหลายแอป
+
+- ผู้ใช้ที่ไม่ได้ login และตะกร้าว่าง: cache ทั้งหน้า (ดู cache_anonymous_page)
+- ผู้ใช้ที่ login: cache เฉพาะการ์ดสินค้าใน template ({% cache %}) ส่วน cart_count อ่านจำนวนชิ้นจาก cart store
+- Product / Category ถูก save/delete -> เพิ่ม storefront version ทำให้ key เก่าทั้งหมดใช้ไม่ได้ (store/signals.py)
+- version อยู่ใน cache: ทุก worker ต้องเห็น cache ชุดเดียวกัน (Redis / ไฟล์) ไม่งั้น worker ที่ไม่ได้แก้สินค้า
+  ยังส่งหน้าเก่าจนหมดอายุ -> ใช้ LocMem (ค่าเริ่มต้นตอนไม่ตั้ง REDIS_URL / CACHE_DIR) จะปิด cache หน้าร้านทั้งหมด
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+VERSION_KEY = 'storefront:version'
+
+# backend ที่เก็บข้อมูลใน memory ของ process ตัวเอง (แต่ละ worker เห็นคนละชุด) / ไม่เก็บอะไรเลย
+PROCESS_LOCAL_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+# ตัวนับ hit/miss ของ process นี้ (ดูผ่าน header X-Cache หรือ cache_stats())
+_stats = {'hits': 0, 'misses': 0}
+
+
+def cache_stats():
+    return dict(_stats)
+
+
+def is_shared_cache(alias='default'):
+    """ทุก process (worker ของ gunicorn, คำสั่ง manage.py) อ่าน/เขียน cache นี้ชุดเดียวกันไหม"""
+    return settings.CACHES[alias]['BACKEND'] not in PROCESS_LOCAL_BACKENDS
+
+
+def storefront_cache_timeout():
+    """อายุ cache หน้าร้าน (วินาที) 0 = ปิด (ใช้ทั้ง cache_anonymous_page และ {% cache %} ของการ์ดสินค้า)"""
+    if not is_shared_cache():
+        return 0
+    return settings.STOREFRONT_CACHE_TIMEOUT
+
+
+def storefront_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, 1, None)
+        version = cache.get(VERSION_KEY, 1)
+    return version
+
+
+def bump_storefront_version():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        # ยังไม่มี key (เช่น cache เพิ่งถูกล้าง) เริ่มนับใหม่ที่เลขที่ไม่ซ้ำกับของเดิม
+        cache.set(VERSION_KEY, storefront_version() + 1, None)
+
+
+def _page_key(request):
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f'storefront:page:{storefront_version()}:{path}'
+
+
+def _is_cacheable_request(request):
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    if request.user.is_authenticated:
+        return False
+    # มีของในตะกร้า -> badge cart_count ไม่ใช่ 0 ใช้หน้า cache กลางไม่ได้
+    from store.cart_store import get_cart_store
+    return not get_cart_store(request).count()
+
+
+def cache_anonymous_page(view_func):
+    """cache ทั้งหน้าเฉพาะผู้ใช้ที่ไม่ได้ login และไม่มีของในตะกร้า"""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        timeout = storefront_cache_timeout()
+        if not timeout or not _is_cacheable_request(request):
+            return view_func(request, *args, **kwargs)
+
+        key = _page_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            _stats['hits'] += 1
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        _stats['misses'] += 1
+        response = view_func(request, *args, **kwargs)
+        if (
+            response.status_code == 200
+            and not response.streaming
+            and not response.cookies
+            # หน้าที่มี {% csrf_token %} ต้องได้ token ของแต่ละคน ห้าม cache
+            and not request.META.get('CSRF_COOKIE_NEEDS_UPDATE')
+        ):
+            cache.set(key, (response.content, response['Content-Type']), timeout)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    return wrapper
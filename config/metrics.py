@@ -0,0 +1,444 @@
+"""
+วัดประสิทธิภาพราย request แล้วเปิดให้ Prometheus อ่านที่ /metrics/
+
+- MetricsMiddleware จับเวลาแต่ละ request แยกตาม view (ชื่อ URL เช่น tasks:board)
+  + จำนวน query / เวลาใน DB (connection.execute_wrapper) + เวลา render template
+- เวลาเรียก HTTP ออกไปข้างนอก (Discord) ผ่าน hook ของ requests.Session ดู observe_outbound()
+- request ที่ช้ากว่า SLOW_REQUEST_MS: log พร้อม SQL ที่ช้าที่สุดของ request นั้น และเก็บรายการล่าสุดไว้ที่ /metrics/slow/
+- ตัวเลขเก็บใน memory ของแต่ละ process (เหมือน cache_stats()) ตั้ง METRICS_DIR (gunicorn.conf.py ตั้งให้เอง)
+  แต่ละ worker เขียนสถานะของตัวเองลง <METRICS_DIR>/<pid>.json ทุก METRICS_FLUSH_SECONDS แล้ว /metrics/
+  รวมทุกไฟล์ให้ (ไฟล์ของ worker ที่ตายไปแล้วยังนับอยู่ counter จะได้ไม่ลดลง) ไม่ตั้ง = เห็นแค่ worker ที่ตอบ
+  process ที่ไม่ใช่ web (send_notifications) เขียนออกเป็นไฟล์ .prom ให้ node_exporter อ่านแทน
+- /metrics/ เปิดให้ staff ที่ login หรือส่ง Authorization: Bearer <METRICS_TOKEN>
+"""
+import contextvars
+import glob
+import heapq
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from operator import itemgetter
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse
+from django.utils.crypto import constant_time_compare
+
+from .caching import cache_stats
+
+logger = logging.getLogger(__name__)
+
+# ขอบของ histogram (วินาที) ตามค่าเริ่มต้นของ client Prometheus
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+# SQL ที่เก็บไว้ต่อ request ที่ช้า / จำนวน request ช้าล่าสุดที่เก็บไว้ดู
+SLOW_SQL_PER_REQUEST = 5
+SLOW_REQUEST_HISTORY = 50
+# worker เขียนไฟล์สถานะลง METRICS_DIR ห่างกันอย่างน้อยเท่านี้ (วินาที) เฉพาะเมื่อมี request ใหม่
+FLUSH_SECONDS = 1.0
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _label_key(names):
+    """ฟังก์ชันดึง tuple ของค่า label จาก **labels (itemgetter เร็วกว่า genexpr ใน hot path ของทุก request)"""
+    if not names:
+        return lambda labels: ()
+    if len(names) == 1:
+        name = names[0]
+        return lambda labels: (labels[name],)
+    return itemgetter(*names)
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{value}"' for name, value in extra)
+    return '{%s}' % ','.join(pairs) if pairs else ''
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = labels
+        self._key = _label_key(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def state(self):
+        """สำเนาค่าปัจจุบัน {label values: ค่า}"""
+        with self._lock:
+            return dict(self._values)
+
+    @staticmethod
+    def merge(values, other):
+        """บวกค่าของอีก process (state() ที่อ่านกลับจากไฟล์) เข้าไปใน values"""
+        for key, value in other.items():
+            values[key] = values.get(key, 0) + value
+
+    def render(self, values=None):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        for key, value in sorted((self.state() if values is None else values).items()):
+            lines.append(f'{self.name}{_labels(self.label_names, key)} {value}')
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.label_names = labels
+        self.buckets = buckets
+        self._key = _label_key(labels)
+        # label values -> [จำนวนต่อช่อง (ไม่สะสม) ..., ช่องสุดท้าย = เกินทุกขอบ], ผลรวม
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def state(self):
+        """สำเนาค่าปัจจุบัน {label values: [จำนวนต่อช่อง, ผลรวม]}"""
+        with self._lock:
+            return {key: [list(counts), total] for key, (counts, total) in self._values.items()}
+
+    @staticmethod
+    def merge(values, other):
+        for key, (counts, total) in other.items():
+            entry = values.get(key)
+            if entry is None:
+                values[key] = [list(counts), total]
+            else:
+                entry[0] = [mine + theirs for mine, theirs in zip(entry[0], counts)]
+                entry[1] += total
+
+    def render(self, values=None):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        values = self.state() if values is None else values
+        items = sorted((key, counts, total) for key, (counts, total) in values.items())
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{_labels(self.label_names, key, [("le", bound)])} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{self.name}_bucket{_labels(self.label_names, key, [("le", "+Inf")])} {cumulative}')
+            lines.append(f'{self.name}_sum{_labels(self.label_names, key)} {total}')
+            lines.append(f'{self.name}_count{_labels(self.label_names, key)} {cumulative}')
+        return lines
+
+
+REQUEST_SECONDS = Histogram(
+    'django_request_duration_seconds', 'Time spent in the view and middleware.', ('view', 'method', 'status'),
+)
+REQUEST_QUERIES = Histogram(
+    'django_request_db_queries', 'Database queries per request.', ('view',), buckets=QUERY_BUCKETS,
+)
+REQUEST_DB_SECONDS = Histogram('django_request_db_seconds', 'Time spent in database queries per request.', ('view',))
+REQUEST_TEMPLATE_SECONDS = Histogram(
+    'django_request_template_seconds', 'Time spent rendering templates per request.', ('view',),
+)
+SLOW_REQUESTS = Counter('django_slow_requests_total', 'Requests slower than SLOW_REQUEST_MS.', ('view',))
+OUTBOUND_SECONDS = Histogram(
+    'outbound_http_duration_seconds', 'Outbound HTTP calls (e.g. Discord webhooks).', ('host', 'status'),
+)
+OUTBOUND_ERRORS = Counter('outbound_http_errors_total', 'Outbound HTTP calls that raised.', ('host',))
+
+METRICS = [
+    REQUEST_SECONDS, REQUEST_QUERIES, REQUEST_DB_SECONDS, REQUEST_TEMPLATE_SECONDS, SLOW_REQUESTS,
+    OUTBOUND_SECONDS, OUTBOUND_ERRORS,
+]
+
+_slow_requests = deque(maxlen=SLOW_REQUEST_HISTORY)
+
+
+def _process_state():
+    return {
+        'metrics': {metric.name: [[list(key), value] for key, value in metric.state().items()] for metric in METRICS},
+        'cache': cache_stats(),
+        'slow': list(_slow_requests),
+    }
+
+
+def _metrics_dir():
+    return getattr(settings, 'METRICS_DIR', None)
+
+
+def write_worker_file():
+    """เขียนสถานะของ process นี้ลง <METRICS_DIR>/<pid>.json (เขียนไฟล์ชั่วคราวก่อนแล้วค่อยแทนที่)"""
+    directory = _metrics_dir()
+    if not directory:
+        return
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f'{os.getpid()}.json')
+    temp = f'{path}.tmp'
+    with open(temp, 'w') as f:
+        json.dump(_process_state(), f)
+    os.replace(temp, path)
+
+
+def _worker_states():
+    """สถานะของทุก worker ใน METRICS_DIR (process นี้อ่านจาก memory ไม่ใช้ไฟล์ที่อาจเก่ากว่า)"""
+    states = [_process_state()]
+    own = os.path.join(_metrics_dir(), f'{os.getpid()}.json')
+    for path in glob.glob(os.path.join(_metrics_dir(), '*.json')):
+        if path == own:
+            continue
+        try:
+            with open(path) as f:
+                states.append(json.load(f))
+        except (OSError, ValueError):
+            # worker กำลังเขียน / ไฟล์เสีย: ข้ามรอบนี้
+            logger.warning("skipped unreadable metrics file %s", path)
+    return states
+
+
+def render_metrics(aggregate=True):
+    """ข้อความรูปแบบ Prometheus text exposition
+
+    aggregate=True และตั้ง METRICS_DIR: รวมทุก worker / ไม่งั้นเฉพาะ process นี้
+    """
+    if aggregate and _metrics_dir():
+        states = _worker_states()
+    else:
+        states = None
+    lines = []
+    for metric in METRICS:
+        if states is None:
+            lines.extend(metric.render())
+            continue
+        values = {}
+        for state in states:
+            metric.merge(values, {tuple(key): value for key, value in state['metrics'].get(metric.name, [])})
+        lines.extend(metric.render(values))
+    if states is None:
+        stats = cache_stats()
+    else:
+        stats = {name: sum(state['cache'][name] for state in states) for name in ('hits', 'misses')}
+    lines += [
+        '# HELP storefront_page_cache_total Storefront full-page cache lookups.',
+        '# TYPE storefront_page_cache_total counter',
+        f'storefront_page_cache_total{{result="hit"}} {stats["hits"]}',
+        f'storefront_page_cache_total{{result="miss"}} {stats["misses"]}',
+    ]
+    return '\n'.join(lines) + '\n'
+
+
+def write_metrics_file(path):
+    """เขียน metrics ลงไฟล์ (textfile collector ของ node_exporter) เขียนไฟล์ชั่วคราวก่อนแล้วค่อยแทนที่
+
+    เฉพาะ process นี้ (ไม่รวม worker ของ web ไม่งั้นนับซ้ำกับ /metrics/)
+    """
+    temp = f'{path}.{os.getpid()}.tmp'
+    with open(temp, 'w') as f:
+        f.write(render_metrics(aggregate=False))
+    os.replace(temp, path)
+
+
+_dirty = threading.Event()
+_flusher_pid = None
+
+
+def _flush_loop():
+    while True:
+        _dirty.wait()
+        time.sleep(FLUSH_SECONDS)
+        _dirty.clear()
+        try:
+            write_worker_file()
+        except OSError:
+            logger.exception("could not write metrics file")
+
+
+def _mark_dirty():
+    """มีตัวเลขใหม่: ให้ thread ของ process นี้เขียนไฟล์ใน FLUSH_SECONDS (เริ่ม thread ครั้งแรกหลัง fork)"""
+    global _flusher_pid
+    if not _metrics_dir():
+        return
+    if _flusher_pid != os.getpid():
+        # thread ไม่ตามไปหลัง fork: worker แต่ละตัวเริ่มของตัวเองตอน request แรก
+        _flusher_pid = os.getpid()
+        threading.Thread(target=_flush_loop, name='metrics-flush', daemon=True).start()
+    _dirty.set()
+
+
+# ==========================================
+# 1. Outbound HTTP
+# ==========================================
+def observe_outbound(response, *args, **kwargs):
+    """hook 'response' ของ requests.Session: session.hooks['response'].append(observe_outbound)"""
+    host = urlsplit(response.url).hostname or ''
+    OUTBOUND_SECONDS.observe(response.elapsed.total_seconds(), host=host, status=response.status_code)
+    _mark_dirty()
+    return response
+
+
+def observe_outbound_error(url):
+    """เรียก HTTP ไม่สำเร็จเลย (timeout / ต่อไม่ได้) hook ของ requests ไม่ถูกเรียกในกรณีนี้"""
+    OUTBOUND_ERRORS.inc(host=urlsplit(url).hostname or '')
+    _mark_dirty()
+
+
+# ==========================================
+# 2. Per-request collection
+# ==========================================
+_current = contextvars.ContextVar('request_metrics', default=None)
+
+
+class RequestStats:
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.template_seconds = 0.0
+        self.template_depth = 0
+        # heap ของ (เวลา, ลำดับ, sql) เก็บแค่ตัวที่ช้าที่สุดไม่กี่ตัว
+        self.slowest_sql = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.queries += 1
+            self.db_seconds += elapsed
+            entry = (elapsed, self.queries, sql)
+            if len(self.slowest_sql) < SLOW_SQL_PER_REQUEST:
+                heapq.heappush(self.slowest_sql, entry)
+            elif elapsed > self.slowest_sql[0][0]:
+                heapq.heapreplace(self.slowest_sql, entry)
+
+
+_template_timer_installed = False
+
+
+def install_template_timer():
+    """จับเวลา Template.render ของ Django (นับเฉพาะชั้นนอกสุด include ข้างในไม่นับซ้ำ)"""
+    global _template_timer_installed
+    if _template_timer_installed:
+        return
+    from django.template.base import Template
+
+    original = Template.render
+
+    def render(self, context):
+        stats = _current.get()
+        if stats is None or stats.template_depth:
+            return original(self, context)
+        stats.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return original(self, context)
+        finally:
+            stats.template_seconds += time.perf_counter() - started
+            stats.template_depth -= 1
+
+    Template.render = render
+    _template_timer_installed = True
+
+
+def slow_requests(aggregate=True):
+    """request ที่ช้าล่าสุด เก่าสุดก่อน (ตั้ง METRICS_DIR: รวมทุก worker)"""
+    if not (aggregate and _metrics_dir()):
+        return list(_slow_requests)
+    entries = [entry for state in _worker_states() for entry in state['slow']]
+    return sorted(entries, key=itemgetter('at'))[-SLOW_REQUEST_HISTORY:]
+
+
+class MetricsMiddleware:
+    """เก็บเวลา / query / template ของทุก request (วางต่อจาก WhiteNoise ไฟล์ static จะไม่ถูกนับ)"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.slow_seconds = getattr(settings, 'SLOW_REQUEST_MS', 500) / 1000
+        install_template_timer()
+
+    def __call__(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(stats):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        elapsed = time.perf_counter() - started
+
+        match = request.resolver_match
+        # ใช้ชื่อ URL ไม่ใช่ path ไม่งั้น label แตกเป็นหนึ่งค่าต่อ id
+        view = match.view_name if match else '<unmatched>'
+        REQUEST_SECONDS.observe(elapsed, view=view, method=request.method, status=response.status_code)
+        REQUEST_QUERIES.observe(stats.queries, view=view)
+        REQUEST_DB_SECONDS.observe(stats.db_seconds, view=view)
+        REQUEST_TEMPLATE_SECONDS.observe(stats.template_seconds, view=view)
+        if elapsed >= self.slow_seconds:
+            self.record_slow(request, view, elapsed, stats)
+        _mark_dirty()
+        return response
+
+    def record_slow(self, request, view, elapsed, stats):
+        SLOW_REQUESTS.inc(view=view)
+        slowest = [
+            {'ms': round(seconds * 1000, 2), 'sql': sql}
+            for seconds, _, sql in sorted(stats.slowest_sql, reverse=True)
+        ]
+        entry = {
+            'at': time.time(),
+            'path': request.path,
+            'view': view,
+            'method': request.method,
+            'ms': round(elapsed * 1000, 1),
+            'queries': stats.queries,
+            'db_ms': round(stats.db_seconds * 1000, 1),
+            'template_ms': round(stats.template_seconds * 1000, 1),
+            'slowest_sql': slowest,
+        }
+        _slow_requests.append(entry)
+        logger.warning(
+            "Slow request %s %s (%s): %.0f ms, %d queries, %.0f ms DB, %.0f ms templates\n%s",
+            request.method, request.path, view, entry['ms'], stats.queries, entry['db_ms'], entry['template_ms'],
+            '\n'.join(f"  {item['ms']:8.2f} ms  {item['sql']}" for item in slowest),
+        )
+
+
+# ==========================================
+# 3. Views
+# ==========================================
+def _allowed(request):
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    header = request.headers.get('Authorization', '')
+    if token and header.startswith('Bearer ') and constant_time_compare(header[7:], token):
+        return True
+    return request.user.is_authenticated and request.user.is_staff
+
+
+def metrics_view(request):
+    if not _allowed(request):
+        return HttpResponseForbidden()
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+def slow_requests_view(request):
+    """request ที่ช้าล่าสุด (ทุก worker ถ้าตั้ง METRICS_DIR) พร้อม SQL ที่ช้าที่สุด (ใหม่สุดก่อน)"""
+    if not _allowed(request):
+        return HttpResponseForbidden()
+    return JsonResponse({'threshold_ms': getattr(settings, 'SLOW_REQUEST_MS', 500), 'requests': slow_requests()[::-1]})
@@ -0,0 +1,209 @@
+"""
+จับ N+1 query: query รูปเดียวกันถูกยิงซ้ำหลายครั้งจากบรรทัดเดียวกัน (เช่น {{ item.product.name }} ใน {% for %})
+
+- รูปของ query (shape): ตัดค่าคงที่ / รายการใน IN (...) ออก ต่างกันแค่ id ถือว่าเป็นรูปเดียวกัน
+- ตำแหน่ง: บรรทัดใน template ที่กำลัง render อยู่ (ถ้ามี) ไม่งั้นเป็นบรรทัดแรกในโค้ดของโปรเจกต์ที่เรียก django.db
+- ไม่นับคำสั่งควบคุม transaction (BEGIN / SAVEPOINT / RELEASE ...): atomic() ในลูปไม่ใช่ N+1
+- ใช้ได้ 3 แบบ
+  * NPlusOneMiddleware: ตอน DEBUG log คำเตือนทุก request ที่เจอ + header X-N-Plus-One
+  * QueryBudgetMixin (TestCase): assertMaxQueries / assertQueryBudget ตกเมื่อเกินงบหรือเจอ N+1
+  * manage.py nplusone_report: รันทุก scenario ของ manage.py bench แล้วสรุป pattern ที่แย่ที่สุด
+"""
+import logging
+import os
+import re
+import sys
+from contextlib import contextmanager
+
+import django.db
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.template.base import Node
+
+logger = logging.getLogger(__name__)
+
+# ซ้ำตั้งแต่กี่ครั้งใน request เดียวถึงนับเป็น N+1
+DEFAULT_THRESHOLD = 3
+# จำนวนบรรทัดของโค้ดโปรเจกต์ที่เก็บไว้เป็น stack ตัวอย่างของแต่ละ pattern
+STACK_DEPTH = 6
+
+_IN_LIST_RE = re.compile(r'\bIN \((?:%s, )*%s\)')
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+_TRANSACTION_RE = re.compile(r'(BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE)\b', re.IGNORECASE)
+
+_THIS_FILE = os.path.abspath(__file__)
+_DB_DIR = os.path.dirname(django.db.__file__) + os.sep
+_PROJECT_DIR = str(settings.BASE_DIR)
+_RENDER_CODE = Node.render_annotated.__code__
+
+
+def query_shape(sql):
+    """SQL ที่ตัดค่าเฉพาะของแต่ละครั้งออก (id ใน IN (...), ตัวเลข, string)"""
+    sql = _IN_LIST_RE.sub('IN (...)', sql)
+    return _LITERAL_RE.sub('?', sql)
+
+
+def _is_project_file(filename):
+    return filename.startswith(_PROJECT_DIR) and filename != _THIS_FILE and 'site-packages' not in filename
+
+
+def _short(filename):
+    return os.path.relpath(filename, _PROJECT_DIR)
+
+
+def _caller_of_db(frame):
+    """frame แรกเหนือ django.db
+
+    execute_wrapper ตัวอื่น (config/metrics.py, manage.py bench) ซ้อนอยู่ใต้ django.db เหมือนตัวนี้
+    ถ้าไม่ข้ามจะได้ตำแหน่งเป็น wrapper นั้นแทนบรรทัดที่เรียก query จริง
+    """
+    caller = frame
+    while caller is not None and not caller.f_code.co_filename.startswith(_DB_DIR):
+        caller = caller.f_back
+    while caller is not None and caller.f_code.co_filename.startswith(_DB_DIR):
+        caller = caller.f_back
+    return caller or frame
+
+
+def query_location(frame):
+    """(ตำแหน่งที่ใช้จัดกลุ่ม, stack สั้นๆ ของโค้ดโปรเจกต์) ของ query ที่กำลังถูกยิงจาก frame นี้"""
+    frame = _caller_of_db(frame)
+    template = None
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        if template is None and code is _RENDER_CODE:
+            # Node ที่อยู่ในสุดที่กำลัง render = บรรทัดใน template ที่ทำให้เกิด query
+            node = frame.f_locals.get('self')
+            origin = getattr(node, 'origin', None)
+            token = getattr(node, 'token', None)
+            if origin is not None and token is not None:
+                template = f'{origin.template_name or origin.name}:{token.lineno}'
+        elif len(stack) < STACK_DEPTH and _is_project_file(code.co_filename):
+            stack.append(f'{_short(code.co_filename)}:{frame.f_lineno} in {code.co_name}')
+        frame = frame.f_back
+    location = template or (stack[0] if stack else '<unknown>')
+    return location, stack
+
+
+class QueryRecorder:
+    """execute_wrapper ที่นับ query ทั้งหมด และจัดกลุ่มตาม (shape, ตำแหน่ง, stack ของโค้ดโปรเจกต์)
+
+    จัดกลุ่มด้วย stack ทั้งชุด: helper ตัวเดียวกันที่ถูกเรียกจาก 2 บรรทัดไม่นับเป็น N+1 มีแค่ที่วนเรียกจากที่เดียว
+    """
+
+    def __init__(self):
+        self.count = 0
+        # (shape, location, stack) -> {'count', 'sql'}
+        self.groups = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        if _TRANSACTION_RE.match(sql):
+            return execute(sql, params, many, context)
+        location, stack = query_location(sys._getframe(1))
+        key = (query_shape(sql), location, tuple(stack))
+        group = self.groups.get(key)
+        if group is None:
+            self.groups[key] = {'count': 1, 'sql': sql}
+        else:
+            group['count'] += 1
+        return execute(sql, params, many, context)
+
+    def repeated(self, threshold=None):
+        """pattern ที่ซ้ำตั้งแต่ threshold ครั้ง เรียงจากซ้ำมากสุด"""
+        threshold = threshold or getattr(settings, 'NPLUSONE_THRESHOLD', DEFAULT_THRESHOLD)
+        patterns = [
+            {'shape': shape, 'location': location, 'stack': list(stack), **group}
+            for (shape, location, stack), group in self.groups.items()
+            if group['count'] >= threshold
+        ]
+        return sorted(patterns, key=lambda pattern: -pattern['count'])
+
+
+@contextmanager
+def capture_queries(using=DEFAULT_DB_ALIAS):
+    """with capture_queries() as recorder: ... -> recorder.count / recorder.repeated()"""
+    recorder = QueryRecorder()
+    with connections[using].execute_wrapper(recorder):
+        yield recorder
+
+
+def format_patterns(patterns):
+    lines = []
+    for pattern in patterns:
+        lines.append(f"{pattern['count']:>4}x {pattern['location']}  {pattern['shape'][:160]}")
+        lines.extend(f"        {entry}" for entry in pattern['stack'][:3])
+    return '\n'.join(lines)
+
+
+# ==========================================
+# 1. Dev middleware
+# ==========================================
+class NPlusOneMiddleware:
+    """ตอนพัฒนา (NPLUSONE_CHECK ค่าเริ่มต้น = DEBUG): log คำเตือนเมื่อ request มี query ซ้ำจากบรรทัดเดียวกัน"""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'NPLUSONE_CHECK', settings.DEBUG):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with capture_queries() as recorder:
+            response = self.get_response(request)
+        patterns = recorder.repeated()
+        if patterns:
+            response['X-N-Plus-One'] = str(len(patterns))
+            logger.warning(
+                "Possible N+1 in %s %s (%d queries):\n%s",
+                request.method, request.path, recorder.count, format_patterns(patterns),
+            )
+        return response
+
+
+# ==========================================
+# 2. Tests
+# ==========================================
+class QueryBudgetMixin:
+    """ใช้คู่กับ django.test.TestCase
+
+        class BoardTests(QueryBudgetMixin, TestCase):
+            query_budgets = {'tasks:board': 6}
+
+            def test_board(self):
+                self.assertQueryBudget(reverse('tasks:board'))
+                with self.assertMaxQueries(3):
+                    load_board(self.user)
+    """
+    # ชื่อ URL (view_name) -> จำนวน query สูงสุดที่ยอมได้
+    query_budgets = {}
+    nplusone_threshold = DEFAULT_THRESHOLD
+
+    @contextmanager
+    def assertMaxQueries(self, budget, using=DEFAULT_DB_ALIAS, allow_repeats=False):
+        with capture_queries(using) as recorder:
+            yield recorder
+        if recorder.count > budget:
+            self.fail(
+                f"{recorder.count} queries executed, budget is {budget}\n"
+                + format_patterns(recorder.repeated(threshold=1))
+            )
+        patterns = recorder.repeated(self.nplusone_threshold)
+        if patterns and not allow_repeats:
+            self.fail("repeated queries (N+1):\n" + format_patterns(patterns))
+
+    def assertQueryBudget(self, path, method='get', **kwargs):
+        """ยิง request ด้วย self.client แล้วเทียบกับ query_budgets ของ view ที่ตอบ คืน response"""
+        with capture_queries() as recorder:
+            response = getattr(self.client, method)(path, **kwargs)
+        view = response.resolver_match.view_name if response.resolver_match else path
+        if view not in self.query_budgets:
+            self.fail(f"no query budget for {view}; add it to query_budgets")
+        budget = self.query_budgets[view]
+        if recorder.count > budget:
+            self.fail(f"{view}: {recorder.count} queries, budget is {budget}\n" + format_patterns(recorder.repeated(threshold=1)))
+        patterns = recorder.repeated(self.nplusone_threshold)
+        if patterns:
+            self.fail(f"{view}: repeated queries (N+1):\n" + format_patterns(patterns))
+        return response
@@ -38,8 +38,8 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
-    'cloudinary_storage', 
-    'cloudinary',
+    # 'cloudinary' / 'cloudinary_storage' ไม่ต้องเป็นแอป: storage ของ Cloudinary import เองตอนใช้ครั้งแรก
+    # (ใส่เป็นแอปแล้ว template tag ของมันจะ import cloudinary + urllib3 ทุกครั้งที่ boot ~40ms ทั้งที่ไม่มี template ไหนใช้)
     'store',
     'accounts',
     'pages',
@@ -50,10 +50,13 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'config.metrics.MetricsMiddleware',
+    'config.querycheck.NPlusOneMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'store.middleware.CartMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -85,9 +88,61 @@ WSGI_APPLICATION = 'config.wsgi.application'
 DATABASES = {
     'default': dj_database_url.config(
         default='sqlite:///' + os.path.join(BASE_DIR, 'db.sqlite3'),
-        conn_max_age=600
+        # gunicorn.events.conf.py (process ASGI ของ SSE) ตั้งเป็น 0
+        conn_max_age=int(os.environ.get('CONN_MAX_AGE', '600'))
     )
 }
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    # test ใช้ไฟล์แทน in-memory (in-memory ล็อกทั้งตารางไม่รอ) test ที่ยิงหลาย thread พร้อมกันจะได้รันได้
+    DATABASES['default']['TEST'] = {'NAME': os.path.join(BASE_DIR, 'test_db.sqlite3')}
+
+
+# Cache
+# ค่าเริ่มต้นใช้ local memory / ตั้ง CACHE_DIR เพื่อใช้ไฟล์ / ตั้ง REDIS_URL เพื่อใช้ Redis (ต้อง pip install redis)
+# local memory แยกกันคนละ process: อะไรที่ต้องเห็นตรงกันทุก worker (หน้าร้าน, ตะกร้า, สิทธิ์ในทีม) จะไม่ใช้ cache ตัวนี้
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+elif os.environ.get('CACHE_DIR'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ['CACHE_DIR'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# broker ของ event กระดานงานแบบ real-time (SSE) มีหลาย worker ต้องใช้ Redis
+REDIS_URL = os.environ.get('REDIS_URL', '')
+TASK_EVENTS_BROKER = 'tasks.events.RedisBroker' if REDIS_URL else 'tasks.events.InProcessBroker'
+# ส่ง comment ping ทุกกี่วินาทีระหว่างไม่มี event
+TASK_EVENTS_HEARTBEAT = 15
+# เก็บ change log ของกระดาน (delta sync) กี่วัน ดู manage.py compact_board_changes
+TASK_CHANGES_RETENTION_DAYS = 30
+
+# Metrics ราย request (config/metrics.py) อ่านได้ที่ /metrics/ โดย staff หรือส่ง Authorization: Bearer <METRICS_TOKEN>
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+# โฟลเดอร์ที่แต่ละ worker เขียนตัวเลขของตัวเองไว้ให้ /metrics/ รวม (gunicorn.conf.py ตั้งให้) ไม่ตั้ง = นับแยกราย process
+METRICS_DIR = os.environ.get('METRICS_DIR') or None
+# request ที่ช้ากว่านี้ (ms) ถูก log พร้อม SQL ที่ช้าที่สุด ดูล่าสุดได้ที่ /metrics/slow/
+SLOW_REQUEST_MS = int(os.environ.get('SLOW_REQUEST_MS', 500))
+# ตัวจับ N+1 (config/querycheck.py) เปิดเฉพาะตอน DEBUG: query รูปเดียวกันซ้ำตั้งแต่ NPLUSONE_THRESHOLD ครั้งจากบรรทัดเดียวกัน -> log คำเตือน
+NPLUSONE_CHECK = DEBUG
+NPLUSONE_THRESHOLD = 3
+
+# อายุ cache ของหน้าร้าน (วินาที) - ถูกล้างทันทีเมื่อ Product/Category เปลี่ยน
+# ใช้ได้เฉพาะเมื่อตั้ง REDIS_URL หรือ CACHE_DIR: LocMem แยกกันคนละ worker ล้างได้แค่ worker ที่แก้สินค้า
+# -> ตอนใช้ LocMem cache หน้าร้านถูกปิดเอง (ดู config/caching.py storefront_cache_timeout)
+STOREFRONT_CACHE_TIMEOUT = 60 * 10
 
 
 # Password validation
@@ -126,7 +181,21 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+
+# Django 5.1+ อ่านแค่ STORAGES (STATICFILES_STORAGE / DEFAULT_FILE_STORAGE แบบเดิมถูกข้ามไปเงียบๆ)
+# - staticfiles: collectstatic ใส่ hash ในชื่อไฟล์ + ทำ .gz/.br (ต้องมี Brotli) -> WhiteNoise ส่งพร้อม Cache-Control immutable
+# - default (media): ไฟล์อัปโหลดอยู่บนดิสก์มาตลอดเพราะ DEFAULT_FILE_STORAGE ไม่มีผล
+#   เปิด Cloudinary ด้วย MEDIA_STORAGE=cloudinary_storage.storage.MediaCloudinaryStorage
+STORAGES = {
+    'default': {
+        'BACKEND': os.environ.get('MEDIA_STORAGE', 'django.core.files.storage.FileSystemStorage'),
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+# manage.py test ไม่ได้ collectstatic: config/test_runner.py สลับ staticfiles เป็นแบบไม่มี manifest ระหว่างเทส
+TEST_RUNNER = 'config.test_runner.TestRunner'
 
 
 CLOUDINARY_STORAGE = {
@@ -135,8 +204,21 @@ CLOUDINARY_STORAGE = {
     'API_SECRET': os.environ.get('CLOUDINARY_API_SECRET', '5wyBzKrHccxgW2ShMozid4MBcAQ'),
 }
 
-# บอก Django ว่าถ้าเป็นไฟล์ Media (รูปอัปโหลด) ให้ไปฝากไว้ที่ Cloudinary
-DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
+# Discord Webhook สำหรับแจ้งเตือนออเดอร์ใหม่ / แจ้งสลิป (ส่งผ่าน outbox: python manage.py send_notifications)
+DISCORD_ORDER_WEBHOOK_URL = os.environ.get('DISCORD_ORDER_WEBHOOK_URL', 'https://discord.com/api/webhooks/1458009167381139509/1gSu6Hhe-EQcwKE90Jd8Pko4yTm9S1kFjU2IDxB67arMUeBR2fTHUgyBjuMuwpQJcYsy')
+DISCORD_SLIP_WEBHOOK_URL = os.environ.get('DISCORD_SLIP_WEBHOOK_URL', 'https://discord.com/api/webhooks/1460176250902544394/kanTURG_tRgy_vg2panKhr2RevWdJhYZ6RmtAQLPEqY2uzpkiuWr5BEXb9MGkNeemVwc')
+
+# ส่งไฟล์สคริปต์ผ่าน web server แทน Django (ใช้ได้เฉพาะ storage บนเครื่อง)
+# 'x-accel-redirect' = nginx (internal location ที่ DOWNLOAD_ACCEL_PREFIX), 'x-sendfile' = Apache/lighttpd
+DOWNLOAD_OFFLOAD = os.environ.get('DOWNLOAD_OFFLOAD') or None
+DOWNLOAD_ACCEL_PREFIX = os.environ.get('DOWNLOAD_ACCEL_PREFIX', '/protected/')
+
+# ที่เก็บตะกร้าของผู้ใช้ที่ไม่ได้ login (ผู้ใช้ที่ login เก็บในตาราง SavedCart เสมอ)
+# store.cart_store.SignedCookieCartStore / SessionCartStore / CacheCartStore (ต้องมี REDIS_URL หรือ CACHE_DIR)
+CART_STORE = os.environ.get('CART_STORE', 'store.cart_store.SignedCookieCartStore')
+
+# จำนวนสินค้าต่อหน้าในร้านค้า (?page_size= ปรับได้ สูงสุด 100)
+STORE_PAGE_SIZE = 24
 
 LOGIN_REDIRECT_URL = '/' 
 LOGOUT_REDIRECT_URL = '/'     
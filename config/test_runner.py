@@ -0,0 +1,23 @@
+"""
+Test runner ของโปรเจกต์ (settings.TEST_RUNNER)
+
+manage.py test บังคับ DEBUG=False แต่ไม่ได้ collectstatic: storage แบบ manifest ของ production
+หาไฟล์ใน {% static %} ไม่เจอแล้ว raise -> ระหว่างเทสใช้ StaticFilesStorage ธรรมดา (ชื่อไฟล์ตรงๆ)
+เทสที่ต้องการ manifest จริง override STORAGES เองได้ (ดู pages/tests/test_assets.py)
+"""
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+TEST_STATICFILES = {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'}
+
+
+class TestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._storages = override_settings(STORAGES={**settings.STORAGES, 'staticfiles': TEST_STATICFILES})
+        self._storages.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._storages.disable()
+        super().teardown_test_environment(**kwargs)
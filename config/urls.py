@@ -19,6 +19,8 @@ from django.urls import path, include
 from django.conf import settings  # ต้องมีอันนี้
 from django.conf.urls.static import static # ต้องมีอันนี้
 
+from config.metrics import metrics_view, slow_requests_view
+
 
 admin.site.site_header = "Roblox Store Manager"       # ข้อความตรงแถบสีฟ้าด้านบน
 admin.site.site_title = "Roblox Store Admin Portal"   # ชื่อตรง Tab ของ Browser
@@ -26,6 +28,8 @@ admin.site.index_title = "ยินดีต้อนรับสู่ระบ
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics/', metrics_view, name='metrics'),
+    path('metrics/slow/', slow_requests_view, name='slow_requests'),
     path('store/', include('store.urls')),
     path('accounts/', include('accounts.urls')),
     path('tasks/', include('tasks.urls')),
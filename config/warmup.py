@@ -0,0 +1,177 @@
+"""
+อุ่นเครื่องก่อนรับ request แรก (เรียกจาก gunicorn.conf.py หลังโหลดแอป)
+
+request แรกของ process ใหม่ต้องจ่ายค่าเริ่มต้นที่ Django ทำแบบ lazy ทั้งหมด:
+- URL resolver: compile regex ของทุก path + สร้าง reverse dict ของแต่ละ namespace (ครั้งแรกที่ resolve / {% url %})
+- template: อ่านไฟล์ + parse เข้า cached loader ทีละไฟล์ที่ถูกใช้ + import context processor
+- ORM: cache ของ Model._meta, import SQL compiler ของ backend
+- backend ที่ตั้งใน settings: cache, storage ของ media/static (เช่น Cloudinary), messages, session serializer
+- เปิด connection ไป DB (รันแบบ WSGI conn_max_age=600 -> worker ใช้ต่อได้เลย / ASGI ปิด persistent connection)
+
+ดูตัวเลขก่อน/หลังได้ที่ python manage.py profile_startup
+"""
+import asyncio
+import logging
+import os
+import time
+from wsgiref.util import setup_testing_defaults
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.core.files.storage import storages
+from django.db import connections
+from django.template import engines
+from django.urls import NoReverseMatch, get_resolver, reverse
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+def _url_names(resolver, namespace=''):
+    for pattern in resolver.url_patterns:
+        if hasattr(pattern, 'url_patterns'):
+            yield from _url_names(pattern, f'{namespace}{pattern.namespace}:' if pattern.namespace else namespace)
+        elif pattern.name:
+            yield namespace + pattern.name
+
+
+def warm_urls():
+    """populate resolver หลัก + resolver แยกของแต่ละ namespace ที่ reverse('store:...') สร้างตอนใช้ครั้งแรก คืนจำนวนชื่อ URL"""
+    get_resolver().reverse_dict
+    names = list(_url_names(get_resolver()))
+    for name in names:
+        try:
+            reverse(name)
+        except NoReverseMatch:
+            # URL ที่ต้องมี args: resolver ถูก populate ไปแล้วก่อนจะหาไม่เจอ
+            pass
+    return len(names)
+
+
+def _template_names(directory):
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [name for name in dirs if not name.startswith('.')]
+        for filename in files:
+            if not filename.startswith('.'):
+                yield os.path.relpath(os.path.join(root, filename), directory).replace(os.sep, '/')
+
+
+def warm_templates():
+    """parse ทุก template ของทุก engine เข้า cached loader คืน (จำนวนที่ compile ได้, จำนวนที่ข้าม)"""
+    compiled = skipped = 0
+    for backend in engines.all():
+        engine = getattr(backend, 'engine', None)
+        if engine is not None:
+            # import context processor ไว้ก่อน (ปกติ import ตอน render ครั้งแรก)
+            engine.template_context_processors
+        seen = set()
+        for directory in backend.template_dirs:
+            for name in _template_names(directory):
+                if name in seen:
+                    continue
+                seen.add(name)
+                try:
+                    backend.get_template(name)
+                    compiled += 1
+                except Exception as exc:  # ไฟล์ที่ไม่ใช่ template / ต้องใช้ library ที่ไม่ได้ติดตั้ง
+                    logger.debug("warm-up skipped template %s: %s", name, exc)
+                    skipped += 1
+    return compiled, skipped
+
+
+def warm_orm():
+    """เติม cache ของ _meta และ compile SELECT ของทุก model (ไม่ยิง query) คืนจำนวน model"""
+    models = apps.get_models()
+    for model in models:
+        model._meta.get_fields()
+        str(model._default_manager.all().query)
+    return len(models)
+
+
+def warm_backends():
+    """สร้าง cache / storage ทุกตัว + import class ที่ Django โหลดจาก settings ตอนใช้ครั้งแรก คืนจำนวนที่โหลด"""
+    for alias in settings.CACHES:
+        caches[alias]
+    for alias in settings.STORAGES:
+        storages[alias]
+    paths = [settings.MESSAGE_STORAGE, settings.SESSION_SERIALIZER, *settings.AUTHENTICATION_BACKENDS]
+    for path in paths:
+        import_string(path)
+    return len(settings.CACHES) + len(settings.STORAGES) + len(paths)
+
+
+def open_connections():
+    for alias in connections:
+        connections[alias].ensure_connection()
+
+
+def warm_request(application, path='/'):
+    """ยิง GET path เข้า WSGI app ใน process นี้เลย (ไม่ผ่าน network) คืน status เช่น '200 OK'"""
+    environ = {'PATH_INFO': path, 'HTTP_USER_AGENT': 'warm-up'}
+    setup_testing_defaults(environ)
+    status = []
+    response = application(environ, lambda code, headers, exc_info=None: status.append(code))
+    try:
+        for _ in response:
+            pass
+    finally:
+        if hasattr(response, 'close'):
+            response.close()
+    return status[0]
+
+
+def warm_asgi_request(application, path='/'):
+    """เหมือน warm_request แต่ยิงเข้า ASGI app (worker ของ uvicorn) คืน status เช่น 200"""
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': b'',
+        'root_path': '', 'headers': [(b'host', b'127.0.0.1'), (b'user-agent', b'warm-up')],
+        'client': ('127.0.0.1', 0), 'server': ('127.0.0.1', 80),
+    }
+    status = []
+
+    async def run():
+        done = asyncio.Event()
+        sent_body = False
+
+        async def receive():
+            nonlocal sent_body
+            if not sent_body:
+                sent_body = True
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+            # Django รอฟัง disconnect ระหว่างตอบ: ค้างไว้จนส่ง response ครบ
+            await done.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                status.append(message['status'])
+            elif message['type'] == 'http.response.body' and not message.get('more_body'):
+                done.set()
+
+        await application(scope, receive, send)
+
+    # เรียกก่อน worker เริ่ม event loop ของตัวเอง (post_worker_init) ใช้ loop ชั่วคราว
+    asyncio.run(run())
+    return status[0]
+
+
+def warm_up(connect=True):
+    """อุ่นทุกส่วน คืน {ส่วน: ms} (connect=False ไม่เปิด connection ค้างไว้ เช่นใน master ก่อน fork)"""
+    timings = {}
+    for name, step in (
+        ('urls', warm_urls), ('templates', warm_templates), ('orm', warm_orm), ('backends', warm_backends),
+    ):
+        started = time.perf_counter()
+        step()
+        timings[name] = (time.perf_counter() - started) * 1000
+    if connect:
+        started = time.perf_counter()
+        open_connections()
+        timings['connections'] = (time.perf_counter() - started) * 1000
+    else:
+        # warm_orm อาจต้องเปิด connection เพื่อเช็ค version ของ DB
+        connections.close_all()
+    logger.info("warm-up done: %s", ', '.join(f'{name} {ms:.0f}ms' for name, ms in timings.items()))
+    return timings
@@ -0,0 +1,64 @@
+# ตั้งค่า gunicorn (gunicorn อ่านไฟล์นี้เองเมื่อรันจากโฟลเดอร์โปรเจกต์: gunicorn)
+# รันทั้งเว็บแบบ WSGI (config.wsgi) ด้วย worker แบบ sync: response แบบ stream (export / import / ดาวน์โหลดไฟล์)
+# ส่งออกทีละก้อนจริง ใต้ ASGI Django จะอ่าน iterator แบบ sync ทั้งก้อนเข้า memory ก่อนส่ง
+# live board (SSE /tasks/api/events/) ตอบ 501 ที่นี่ ให้ reverse proxy ส่ง path นั้นไป process ASGI แยก
+# (gunicorn -c gunicorn.events.conf.py)
+# เน้นลด cold start บน platform ที่ scale to zero:
+# 1. preload_app: import Django + ทุกแอปครั้งเดียวใน master แล้ว fork ให้ worker (ไม่ต้อง import ซ้ำทุก worker)
+# 2. when_ready: master อุ่น URL resolver / template / ORM ก่อน fork -> worker ได้ของที่ compile แล้วไปด้วย
+# 3. post_worker_init: แต่ละ worker เปิด connection ไป DB ของตัวเอง แล้วยิง WARMUP_PATHS ใส่ตัวเองก่อนรับ request จริง
+#    (หลัง fork ครั้งแรกที่แตะ object ของ master ยังช้าอยู่ ~8ms ให้ request อุ่นเครื่องจ่ายแทนผู้ใช้)
+# วัดผลก่อน/หลัง: python manage.py profile_startup
+import glob
+import os
+import tempfile
+
+wsgi_app = 'config.wsgi:application'
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', '2'))
+preload_app = True
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '30'))
+accesslog = '-'
+# แต่ละ worker เขียนตัวเลข metrics ลงโฟลเดอร์นี้ /metrics/ รวมให้ทุก worker (config/metrics.py)
+metrics_dir = os.environ.get('METRICS_DIR') or os.path.join(tempfile.gettempdir(), f"gunicorn-metrics-{bind.rsplit(':', 1)[-1]}")
+raw_env = [f"METRICS_DIR={metrics_dir}"]
+
+
+def on_starting(server):
+    # ไฟล์ของ worker จากรอบก่อน (pid เก่า) ไม่ใช่ของ server นี้: เริ่มนับใหม่ทุกครั้งที่ boot
+    os.makedirs(metrics_dir, exist_ok=True)
+    for path in glob.glob(os.path.join(metrics_dir, '*.json')):
+        os.remove(path)
+
+
+def when_ready(server):
+    from config.warmup import warm_up
+
+    # ห้ามมี connection เปิดค้างตอน fork (socket เดียวกันจะถูกใช้ร่วมหลาย process)
+    # อุ่นไม่สำเร็จ (เช่น DB ยังไม่พร้อม) ไม่ใช่เหตุให้ server ไม่ขึ้น: request แรกจ่ายเองตามปกติ
+    try:
+        warm_up(connect=False)
+    except Exception:
+        server.log.exception("warm-up failed")
+
+
+def post_worker_init(worker):
+    from config.warmup import open_connections, warm_request
+
+    # worker แบบ sync ตอบทุก request ใน thread หลัก = thread เดียวกับที่เปิด connection ไว้ตรงนี้
+    try:
+        open_connections()
+        for path in filter(None, os.environ.get('WARMUP_PATHS', '/').split(',')):
+            worker.log.info("warm-up %s: %s", path, warm_request(worker.wsgi, path))
+    except Exception:
+        worker.log.exception("warm-up failed")
+
+
+def worker_exit(server, worker):
+    from config.metrics import write_worker_file
+
+    # ตัวเลขที่ยังไม่ได้เขียน (ภายใน FLUSH_SECONDS ล่าสุด) ไม่หายไปกับ worker
+    try:
+        write_worker_file()
+    except Exception:
+        server.log.exception("could not write metrics file")
@@ -0,0 +1,30 @@
+# ตั้งค่า gunicorn ของ process ที่ส่ง live board (SSE /tasks/api/events/) เท่านั้น: gunicorn -c gunicorn.events.conf.py
+# ทั้งเว็บรันแบบ WSGI ตาม gunicorn.conf.py ส่วน SSE ต้องค้าง connection ไว้นานๆ จึงต้องใช้ ASGI (worker ของ uvicorn)
+# reverse proxy ส่งเฉพาะ path นี้มาที่นี่ เช่น nginx:
+#     location /tasks/api/events/ { proxy_pass http://127.0.0.1:8001; proxy_buffering off; proxy_read_timeout 1h; }
+# config.asgi.events_application ตอบ 404 ทุก path อื่น (view แบบ stream ของเว็บจะไม่ถูกเสิร์ฟใต้ ASGI โดยไม่ตั้งใจ)
+import os
+
+wsgi_app = 'config.asgi:events_application'
+worker_class = 'uvicorn_worker.UvicornWorker'
+bind = f"0.0.0.0:{os.environ.get('EVENTS_PORT', '8001')}"
+# ไม่มี REDIS_URL = InProcessBroker ส่ง event ได้แค่ใน process เดียว
+# (worker ของ web ที่ publish ต้องอยู่ process เดียวกันด้วย) -> ตั้ง REDIS_URL เมื่อแยก process
+workers = int(os.environ.get('EVENTS_CONCURRENCY', '1'))
+preload_app = True
+accesslog = '-'
+# view แบบ sync ใต้ ASGI รันใน thread ใหม่ต่อ request: connection แบบ persistent ของ thread ที่จบไปจะค้างอยู่
+# ตั้งเฉพาะ process นี้ (SSE ใช้ DB แค่ตอนเปิด connection) ส่วน WSGI ใช้ conn_max_age ตาม settings
+raw_env = ['CONN_MAX_AGE=0']
+
+
+def post_worker_init(worker):
+    from django.urls import reverse
+
+    from config.warmup import warm_asgi_request
+
+    try:
+        path = reverse('tasks:task_events')
+        worker.log.info("warm-up %s: %s", path, warm_asgi_request(worker.wsgi, path))
+    except Exception:
+        worker.log.exception("warm-up failed")
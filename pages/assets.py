@@ -0,0 +1,43 @@
+"""
+CSS/JS/ฟอนต์จาก CDN ที่หน้าเว็บใช้ร่วมกัน เก็บสำเนาไว้ใน pages/static/vendor/ จะได้ไม่ต้องต่อโดเมนอื่นทุกหน้า
+
+- python manage.py vendor_assets ดาวน์โหลดตาม VENDOR_ASSETS (build.sh เรียกก่อน collectstatic)
+  ไฟล์ที่ CSS อ้างถึง (ฟอนต์) ดาวน์โหลดตามมาด้วยแล้วแก้ url() ให้ชี้ไฟล์ในเครื่อง
+- collectstatic (CompressedManifestStaticFilesStorage) ใส่ hash ในชื่อไฟล์ + ทำ .gz/.br ไว้ให้ WhiteNoise ส่งแบบ immutable
+- template ใช้ {% vendor 'bootstrap.css' %} (load assets): มีสำเนาแล้วได้ URL ใน /static/ ยังไม่มี (เครื่อง dev) ได้ URL ของ CDN
+"""
+from functools import lru_cache
+from pathlib import Path
+
+from django.templatetags.static import static
+
+VENDOR_DIR = Path(__file__).resolve().parent / 'static' / 'vendor'
+
+# ชื่อไฟล์ใน static/vendor/ -> URL ต้นฉบับ (ระบุ version เสมอ เปลี่ยน version = เปลี่ยนที่นี่ที่เดียว)
+VENDOR_ASSETS = {
+    'bootstrap.css': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css',
+    'bootstrap.js': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js',
+    'bootstrap-icons.css': 'https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.3/font/bootstrap-icons.min.css',
+    'sortable.js': 'https://cdnjs.cloudflare.com/ajax/libs/Sortable/1.15.0/Sortable.min.js',
+    'sweetalert2.js': 'https://cdn.jsdelivr.net/npm/sweetalert2@11.10.5/dist/sweetalert2.all.min.js',
+    'chart.js': 'https://cdn.jsdelivr.net/npm/chart.js@4.4.1/dist/chart.umd.min.js',
+    'font-inter.css': (
+        'https://fonts.googleapis.com/css2?family=Inter:wght@300;400;600;700;800'
+        '&family=JetBrains+Mono:wght@500&display=swap'
+    ),
+    'font-kanit.css': 'https://fonts.googleapis.com/css2?family=Kanit:wght@300;400;600;800&display=swap',
+}
+
+
+@lru_cache(maxsize=None)
+def is_vendored(name):
+    return (VENDOR_DIR / name).is_file()
+
+
+def vendor_url(name):
+    """URL ของ asset ใน VENDOR_ASSETS: สำเนาใน static ถ้าดาวน์โหลดไว้แล้ว ไม่งั้น URL ของ CDN"""
+    if name not in VENDOR_ASSETS:
+        raise ValueError(f"unknown vendor asset {name!r}; add it to pages.assets.VENDOR_ASSETS")
+    if is_vendored(name):
+        return static(f'vendor/{name}')
+    return VENDOR_ASSETS[name]
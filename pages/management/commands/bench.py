@@ -0,0 +1,664 @@
+import io
+import itertools
+import json
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from django.utils import timezone
+
+from store.images import build_derivatives
+from store.models import Category, Entitlement, Order, OrderItem, Product, ProductSearchToken
+from store.orders import build_summary
+from store.search import build_tokens
+from tasks.models import Sprint, SprintSnapshot, Task, Team, TeamMember
+from tasks.ranks import spread
+
+# urlconf ที่ต้องมี scenario ครบทุก URL (เพิ่ม URL ใหม่แล้วไม่เพิ่ม scenario -> bench ไม่ผ่าน)
+URLCONFS = ('store.urls', 'tasks.urls', 'accounts.urls', 'pages.urls')
+# URL ที่วัดแบบนี้ไม่ได้ (ชื่อ -> เหตุผล)
+SKIPPED = {
+    'tasks:task_events': 'SSE ค้าง connection ไว้ใต้ ASGI วัดด้วย manage.py loadtest_events แทน',
+}
+PASSWORD = 'Bench-Passw0rd-2024'
+WORDS = [
+    'auto', 'farm', 'admin', 'gui', 'esp', 'teleport', 'speed', 'fly', 'pet', 'sim', 'tycoon', 'obby',
+    'script', 'hub', 'menu', 'loader', 'สคริปต์', 'ฟาร์ม', 'ออโต้', 'เกม',
+]
+
+
+class Rollback(Exception):
+    pass
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Scenario:
+    """request 1 แบบของ URL หนึ่ง (label = ชื่อ URL + method + ชื่อย่อยถ้ามีหลายแบบ ใช้เป็น key ใน baseline)
+
+    data เป็น callable ได้ (ไฟล์อัปโหลด / key ที่ต้องไม่ซ้ำในแต่ละรอบ)
+    setup(client) ทำก่อนทุก request โดยไม่จับเวลา (อยู่ใน savepoint เดียวกัน)
+    """
+
+    def __init__(self, name, path, method='GET', user=None, data=None, status=200, variant='', setup=None, **kwargs):
+        self.name = name
+        self.path = path
+        self.method = method
+        self.user = user
+        self.data = data
+        self.status = status
+        self.setup = setup
+        self.kwargs = kwargs
+        self.label = ' '.join(filter(None, [name, method, variant]))
+
+    def request(self, client):
+        data = self.data() if callable(self.data) else self.data
+        return getattr(client, self.method.lower())(self.path, data, **self.kwargs)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))]
+
+
+def consume(response):
+    """อ่าน body ให้หมด (streaming ด้วย) แล้วคืนขนาดเป็น byte
+
+    ไม่เรียก response.close() เอง: test client ปิดให้แล้วโดยไม่ส่ง request_finished
+    (ถ้าส่ง close_old_connections จะปิด connection ทั้งที่อยู่ใน transaction ของ bench)
+    """
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+def url_names():
+    """ชื่อ URL ทั้งหมดใน URLCONFS (รวม namespace เช่น store:product_list)"""
+    names = set()
+    for entry in get_resolver().url_patterns:
+        if not isinstance(entry, URLResolver):
+            continue
+        module = getattr(entry.urlconf_name, '__name__', entry.urlconf_name)
+        if module not in URLCONFS:
+            continue
+        prefix = f'{entry.namespace}:' if entry.namespace else ''
+        names.update(prefix + pattern.name for pattern in entry.url_patterns if isinstance(pattern, URLPattern) and pattern.name)
+    return names
+
+
+def png_bytes(width, height, color):
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), color).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+class Command(BaseCommand):
+    help = (
+        "สร้างข้อมูลจำลองชุดใหญ่ (ทีม / Sprint / งานหลายหมื่น / สินค้า / Order) แบบ deterministic แล้วยิงทุก URL "
+        "ของ store, tasks, accounts, pages ผ่าน test client วัด p50/p95 และจำนวน query ต่อ view "
+        "เขียนผลเป็น JSON และเทียบกับ baseline ช้าลงเกิน threshold -> exit code 1 (rollback ข้อมูลทั้งหมดตอนจบ)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1.0, help='คูณจำนวนข้อมูลที่สร้าง (1.0 = งาน 30,000 / สินค้า 3,000 / Order 6,000)')
+        parser.add_argument('--iterations', type=int, default=20, help='จำนวน request ที่จับเวลาต่อ scenario')
+        parser.add_argument('--warmup', type=int, default=2, help='request ที่ไม่จับเวลาก่อนเริ่มวัด (cache / template loader)')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--only', default=None, help='วัดเฉพาะ scenario ที่ label มีข้อความนี้ (ข้ามการเช็คว่าครบทุก URL)')
+        parser.add_argument('--output', default='bench-results.json')
+        parser.add_argument('--baseline', default='bench-baseline.json')
+        parser.add_argument('--save-baseline', action='store_true', help='เขียนผลรอบนี้ทับ baseline แทนการเทียบ')
+        parser.add_argument('--threshold', type=float, default=0.25, help='p50 ช้าลงเกินสัดส่วนนี้ = regression (0.25 = 25%%)')
+        parser.add_argument('--min-ms', type=float, default=2.0, help='และต้องช้าลงอย่างน้อยกี่ ms (กัน view เร็วๆ แกว่งเป็น %% สูง)')
+
+    @contextmanager
+    def isolated(self):
+        """สภาพแวดล้อมของการวัด (ใช้ร่วมกับ nplusone_report) ข้อมูลทั้งหมดถูก rollback ตอนออก
+
+        - DEBUG=False: ไม่เก็บ SQL ทุกตัวไว้ใน connection.queries
+        - cache แยกของ bench: ทุกรอบเริ่มจาก cache ว่างเท่ากัน
+        - ไฟล์อัปโหลดลงโฟลเดอร์ชั่วคราว ไม่ส่งขึ้น Cloudinary
+        - static ไม่ใช้ manifest: วัดได้โดยไม่ต้อง collectstatic ก่อน
+        """
+        media = tempfile.mkdtemp(prefix='bench-media-')
+        storages = {
+            **settings.STORAGES,
+            'default': {
+                'BACKEND': 'django.core.files.storage.FileSystemStorage',
+                'OPTIONS': {'location': media, 'base_url': '/bench-media/'},
+            },
+            'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+        }
+        try:
+            with override_settings(
+                DEBUG=False,
+                STORAGES=storages,
+                CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'bench'}},
+                SLOW_REQUEST_MS=10 ** 6,
+            ), transaction.atomic():
+                yield media
+                raise Rollback
+        except Rollback:
+            pass
+        finally:
+            shutil.rmtree(media, ignore_errors=True)
+
+    def handle(self, *args, **options):
+        with self.isolated() as media:
+            results, errors = self.run(options, media)
+
+        report = {
+            'meta': {
+                'created': timezone.now().isoformat(timespec='seconds'),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'scale': options['scale'],
+                'iterations': options['iterations'],
+                'seed': options['seed'],
+            },
+            'results': results,
+        }
+        with open(options['output'], 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        self.stdout.write(f"\nresults written to {options['output']}")
+
+        if errors:
+            raise CommandError("unexpected responses:\n  " + '\n  '.join(errors))
+        if options['save_baseline']:
+            with open(options['baseline'], 'w') as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+            self.stdout.write(self.style.SUCCESS(f"baseline saved to {options['baseline']}"))
+            return
+        self.gate(results, options)
+
+    # ==========================================
+    # 1. Synthetic data
+    # ==========================================
+    def seed(self, scale, rng, media):
+        def count(n):
+            return max(1, int(n * scale))
+
+        today = timezone.localdate()
+        ctx = type('BenchData', (), {})()
+
+        # --- ไฟล์ media ที่ view ต้องอ่านจริง (รูปสินค้า + รูปย่อ, ไฟล์สคริปต์) ---
+        os.makedirs(os.path.join(media, 'products'))
+        os.makedirs(os.path.join(media, 'script_files'))
+        with open(os.path.join(media, 'products', 'bench.png'), 'wb') as f:
+            f.write(png_bytes(1200, 800, (40, 120, 200)))
+        with open(os.path.join(media, 'script_files', 'bench.lua'), 'wb') as f:
+            f.write(b'-- bench script\n' * 4096)
+        image_variants = build_derivatives('products/bench.png')
+        ctx.png = png_bytes(400, 600, (240, 240, 240))
+
+        # --- Users ---
+        ctx.owner = User.objects.create_user('bench_owner', is_staff=True, is_superuser=True)
+        ctx.member = User.objects.create_user('bench_member')
+        ctx.customer = User.objects.create_user('bench_customer', password=PASSWORD)
+        unusable = make_password(None)
+        # อย่างน้อยต้องเกินสมาชิกทีมหลัก 12 คน (ต้องเหลือ outsider) แม้ --scale จะเล็ก
+        pool = User.objects.bulk_create(
+            [User(username=f'bench_user_{i:05d}', password=unusable) for i in range(max(count(300), 20))],
+            batch_size=1000,
+        )
+
+        # --- Teams + roles ---
+        teams = Team.objects.bulk_create([Team(name=f'Bench Team {i}') for i in range(count(40))])
+        ctx.team = teams[0]
+        memberships = [
+            TeamMember(user=ctx.owner, team=ctx.team, role='OWNER'),
+            TeamMember(user=ctx.member, team=ctx.team, role='MEMBER'),
+        ]
+        team_users = {ctx.team.id: [ctx.owner, ctx.member]}
+        for team in teams:
+            users = rng.sample(pool, min(len(pool), 12 if team is ctx.team else 8))
+            for i, user in enumerate(users):
+                role = 'OWNER' if i == 0 and team is not ctx.team else rng.choice(['ADMIN', 'MEMBER', 'MEMBER'])
+                memberships.append(TeamMember(user=user, team=team, role=role))
+            team_users.setdefault(team.id, []).extend(users)
+        TeamMember.objects.bulk_create(memberships)
+        ctx.outsider = next(user for user in pool if user not in team_users[ctx.team.id])
+        ctx.removable = team_users[ctx.team.id][-1]
+
+        # --- Sprints: 6 ต่อทีม อันล่าสุด active / กระดานส่วนตัวของ member 3 อัน ---
+        sprints = []
+        for team in teams:
+            for i in range(6):
+                start = today - timedelta(days=14 * (5 - i) + 7)
+                sprints.append(Sprint(
+                    name=f'{team.name} Sprint {i + 1}', team=team, created_by=ctx.owner,
+                    start_date=start, end_date=start + timedelta(days=14), is_active=i == 5,
+                ))
+        for i in range(3):
+            start = today - timedelta(days=14 * (2 - i) + 7)
+            sprints.append(Sprint(
+                name=f'Personal Sprint {i + 1}', created_by=ctx.member,
+                start_date=start, end_date=start + timedelta(days=14), is_active=i == 2,
+            ))
+        sprints = Sprint.objects.bulk_create(sprints)
+        team_sprints = {}
+        for sprint in sprints:
+            team_sprints.setdefault(sprint.team_id, []).append(sprint)
+        ctx.active_sprint = team_sprints[ctx.team.id][-1]
+        ctx.old_sprint = team_sprints[ctx.team.id][-2]
+        ctx.future_sprint = Sprint.objects.create(
+            name='Bench Next Sprint', team=ctx.team, created_by=ctx.owner,
+            start_date=today + timedelta(days=7), end_date=today + timedelta(days=21),
+        )
+
+        # --- Tasks: ทีม bench ได้ 2,000 (sprint ล่าสุด / backlog / sprint เก่า) ที่เหลือกระจายทุกทีม ---
+        total = count(30000)
+        per_team = {ctx.team.id: count(2000)}
+        rest = max(0, total - per_team[ctx.team.id] - count(300))
+        for team in teams[1:]:
+            per_team[team.id] = rest // max(1, len(teams) - 1)
+        boards = [(team.id, per_team[team.id], team_users[team.id], team_sprints[team.id]) for team in teams]
+        boards.append((None, count(300), [ctx.member], team_sprints[None]))
+
+        tasks = []
+        for team_id, amount, users, board_sprints in boards:
+            for i, rank in enumerate(spread(amount)):
+                roll = rng.random()
+                sprint = board_sprints[-1] if roll < 0.4 else None if roll < 0.7 else rng.choice(board_sprints[:-1])
+                tasks.append(Task(
+                    title=f'{rng.choice(WORDS).title()} {rng.choice(WORDS)} #{i}',
+                    description=f'รายละเอียดงาน {i} ' * rng.randint(0, 6) or None,
+                    status=rng.choice(['TODO', 'TODO', 'IN_PROGRESS', 'DONE']),
+                    priority=rng.choice('HML'), story_points=rng.choice([1, 2, 3, 5, 8]), rank=rank,
+                    assignee=rng.choice(users + [None]), sprint=sprint, team_id=team_id,
+                    created_by=ctx.member if team_id is None else ctx.owner,
+                ))
+        tasks = Task.objects.bulk_create(tasks, batch_size=2000)
+        bench_tasks = [task for task in tasks if task.team_id == ctx.team.id]
+        ctx.sprint_tasks = [task for task in bench_tasks if task.sprint_id == ctx.active_sprint.id]
+        ctx.backlog_task = next(task for task in bench_tasks if task.sprint_id is None)
+
+        # --- ประวัติรายวันของทุก Sprint (burndown / velocity) ---
+        snapshots = []
+        for sprint in sprints:
+            planned = rng.randint(20, 60)
+            days = (min(sprint.end_date, today) - sprint.start_date).days + 1
+            for day in range(days):
+                done = planned * day // max(1, days)
+                snapshots.append(SprintSnapshot(
+                    sprint=sprint, date=sprint.start_date + timedelta(days=day),
+                    total_tasks=planned, done_tasks=done, total_points=planned * 3, done_points=done * 3,
+                ))
+        SprintSnapshot.objects.bulk_create(snapshots, batch_size=2000)
+
+        # --- สินค้า + ดัชนีค้นหา ---
+        categories = Category.objects.bulk_create([Category(name=f'Category {word}') for word in WORDS[:12]])
+        products = Product.objects.bulk_create([
+            Product(
+                name=f'{rng.choice(WORDS).title()} {rng.choice(WORDS)} {i}',
+                description=' '.join(rng.choice(WORDS) for _ in range(rng.randint(5, 30))),
+                price=rng.randint(19, 999), image='products/bench.png', image_variants=image_variants,
+                script_file='script_files/bench.lua' if i % 3 == 0 else None,
+                category=rng.choice(categories + [None]),
+            )
+            for i in range(count(3000))
+        ], batch_size=1000)
+        ProductSearchToken.objects.bulk_create([
+            ProductSearchToken(product=product, token=token, weight=weight)
+            for product in products
+            for token, weight in build_tokens(product).items()
+        ], batch_size=2000)
+        ctx.product = products[0]
+        ctx.cart_products = [product.id for product in products[1:4]]
+
+        # --- Orders: ทุก 20 ออเดอร์เป็นของ bench_customer ---
+        orders, order_lines = [], []
+        for i in range(count(6000)):
+            user = ctx.customer if i % 20 == 0 else rng.choice(pool + [None])
+            lines = [{'product': rng.choice(products), 'quantity': rng.randint(1, 3)} for _ in range(rng.randint(1, 4))]
+            orders.append(Order(
+                customer_name=user.username if user else f'guest{i}', user=user,
+                total_price=sum(line['product'].price * line['quantity'] for line in lines),
+                paid=rng.random() < 0.7, summary=build_summary(lines),
+            ))
+            order_lines.append(lines)
+        orders = Order.objects.bulk_create(orders, batch_size=1000)
+        OrderItem.objects.bulk_create([
+            OrderItem(order=order, product=line['product'], quantity=line['quantity'], price=line['product'].price)
+            for order, lines in zip(orders, order_lines)
+            for line in lines
+        ], batch_size=2000)
+        entitlements = {
+            (order.user_id, line['product'].id): Entitlement(user_id=order.user_id, product=line['product'], order=order)
+            for order, lines in zip(orders, order_lines)
+            if order.paid and order.user_id
+            for line in lines
+            if line['product'].script_file
+        }
+        entitlements[(ctx.customer.id, ctx.product.id)] = Entitlement(user=ctx.customer, product=ctx.product)
+        Entitlement.objects.bulk_create(entitlements.values(), batch_size=2000)
+        ctx.unpaid_order = next(order for order in orders if order.user_id == ctx.customer.id and not order.paid)
+
+        # --- ไฟล์สำหรับ import_tasks ---
+        rows = ['title,status,priority,story_points,assignee']
+        rows += [f'Imported {i},To Do,M,2,{ctx.member.username}' for i in range(200)]
+        ctx.import_csv = ('\n'.join(rows) + '\n').encode()
+
+        ctx.counts = {
+            'users': len(pool) + 3, 'teams': len(teams), 'sprints': len(sprints) + 1, 'tasks': len(tasks),
+            'products': len(products), 'orders': len(orders), 'order_items': sum(len(lines) for lines in order_lines),
+        }
+        return ctx
+
+    # ==========================================
+    # 2. Scenarios (อย่างน้อย 1 ต่อ URL)
+    # ==========================================
+    def scenarios(self, ctx):
+        today = timezone.localdate()
+        team_id = ctx.team.id
+        team = f'?team_id={team_id}'
+        task = ctx.sprint_tasks[0]
+        signups = itertools.count()
+
+        def login(user):
+            return lambda client: client.force_login(user)
+
+        def fill_cart(client):
+            for product_id in ctx.cart_products:
+                client.get(reverse('store:add_to_cart', args=[product_id]))
+
+        def upload(field):
+            return lambda: {field: SimpleUploadedFile('bench.png', ctx.png, content_type='image/png')}
+
+        def product_form(**extra):
+            return dict({'name': 'Bench product', 'description': 'รายละเอียด', 'price': 99}, **extra)
+
+        def stop_active_sprint(client):
+            Sprint.objects.filter(team_id=team_id, is_active=True).update(is_active=False)
+
+        moves = []
+        previous = None
+        for moved in ctx.sprint_tasks[1:21]:
+            moves.append({'task_id': moved.id, 'status': 'IN_PROGRESS', 'sprint_id': ctx.active_sprint.id,
+                          'after_id': previous, 'before_id': None})
+            previous = moved.id
+        sprint_form = {
+            'name': 'Bench sprint', 'goal': '', 'is_active': 'on',
+            'start_date': today.isoformat(), 'end_date': (today + timedelta(days=14)).isoformat(),
+        }
+        task_form = {'title': 'Bench task', 'description': '', 'status': 'IN_PROGRESS', 'priority': 'H',
+                     'story_points': 3, 'assignee': ctx.member.id}
+        owner, member, customer = ctx.owner, ctx.member, ctx.customer
+        xhr = {'headers': {'x-requested-with': 'XMLHttpRequest'}}
+
+        return [
+            # --- pages ---
+            Scenario('home', reverse('home'), variant='anonymous'),
+            Scenario('home', reverse('home'), user=customer),
+
+            # --- store (หน้าร้าน) ---
+            Scenario('store:store', reverse('store:store'), variant='anonymous'),
+            Scenario('store:product_list', reverse('store:product_list'), variant='anonymous'),
+            Scenario('store:product_list', reverse('store:product_list'), user=customer),
+            Scenario('store:product_list', reverse('store:product_list'), user=customer, variant='search',
+                     data={'search': 'auto farm'}),
+            Scenario('store:product_list_api', reverse('store:product_list_api'), variant='anonymous'),
+            Scenario('store:product_list_api', reverse('store:product_list_api'), variant='search',
+                     data={'search': 'script'}),
+            Scenario('store:product_detail', reverse('store:product_detail', args=[ctx.product.id]), variant='anonymous'),
+            Scenario('store:product_detail', reverse('store:product_detail', args=[ctx.product.id]), user=customer),
+
+            # --- store (ตะกร้า / Order) ---
+            Scenario('store:add_to_cart', reverse('store:add_to_cart', args=[ctx.product.id]), user=customer, status=302),
+            Scenario('store:cart_detail', reverse('store:cart_detail'), user=customer, setup=fill_cart),
+            Scenario('store:clear_cart', reverse('store:clear_cart'), user=customer, status=302, setup=fill_cart),
+            Scenario('store:checkout', reverse('store:checkout'), 'POST', user=customer, setup=fill_cart,
+                     data=lambda: {'idempotency_key': uuid.uuid4().hex}),
+            Scenario('store:my_orders', reverse('store:my_orders'), user=customer),
+            Scenario('store:download_script', reverse('store:download_script', args=[ctx.product.id]), user=customer),
+            Scenario('store:upload_slip', reverse('store:upload_slip', args=[ctx.unpaid_order.id]), user=customer),
+            Scenario('store:upload_slip', reverse('store:upload_slip', args=[ctx.unpaid_order.id]), 'POST',
+                     user=customer, status=302, data=upload('slip_image')),
+            Scenario('store:manual_logout', reverse('store:manual_logout'), user=customer, status=302,
+                     setup=login(customer)),
+
+            # --- store (Admin) ---
+            Scenario('store:add_product', reverse('store:add_product'), user=owner),
+            Scenario('store:add_product', reverse('store:add_product'), 'POST', user=owner, status=302,
+                     data=lambda: product_form(**upload('image')())),
+            Scenario('store:edit_product', reverse('store:edit_product', args=[ctx.product.id]), user=owner),
+            Scenario('store:edit_product', reverse('store:edit_product', args=[ctx.product.id]), 'POST',
+                     user=owner, status=302, data=product_form(name=f'{ctx.product.name} v2')),
+            Scenario('store:delete_product', reverse('store:delete_product', args=[ctx.product.id]), user=owner),
+            Scenario('store:delete_product', reverse('store:delete_product', args=[ctx.product.id]), 'POST',
+                     user=owner, status=302),
+
+            # --- tasks (กระดาน) ---
+            Scenario('tasks:board', reverse('tasks:board') + team, user=owner, variant='team'),
+            Scenario('tasks:board', reverse('tasks:board'), user=member, variant='personal'),
+            Scenario('tasks:task_api', reverse('tasks:task_api', args=[task.id]), user=member),
+            Scenario('tasks:task_changes', reverse('tasks:task_changes') + team + '&since=0', user=member),
+            Scenario('tasks:update_status', reverse('tasks:update_status', args=[task.id, 'DONE']), user=member, **xhr),
+            Scenario('tasks:move_task_api', reverse('tasks:move_task_api'), 'POST', user=member,
+                     data=json.dumps({'task_id': task.id, 'status': 'DONE', 'sprint_id': ctx.active_sprint.id}),
+                     content_type='application/json'),
+            Scenario('tasks:move_tasks_api', reverse('tasks:move_tasks_api'), 'POST', user=member, variant='20 cards',
+                     data=json.dumps({'team_id': team_id, 'moves': moves}), content_type='application/json'),
+
+            # --- tasks (ฟอร์มงาน) ---
+            Scenario('tasks:add_task', reverse('tasks:add_task') + team, user=member),
+            Scenario('tasks:add_task', reverse('tasks:add_task'), 'POST', user=member, status=302,
+                     data=dict(task_form, team_id=team_id)),
+            Scenario('tasks:edit_task', reverse('tasks:edit_task', args=[task.id]), user=member),
+            Scenario('tasks:edit_task', reverse('tasks:edit_task', args=[task.id]), 'POST', user=member, status=302,
+                     data=task_form),
+            Scenario('tasks:delete_task', reverse('tasks:delete_task', args=[ctx.backlog_task.id]), user=owner, status=302),
+
+            # --- tasks (Sprint) ---
+            Scenario('tasks:add_sprint', reverse('tasks:add_sprint') + team, user=owner),
+            Scenario('tasks:add_sprint', reverse('tasks:add_sprint'), 'POST', user=owner, status=302,
+                     variant='replace active', data=dict(sprint_form, team_id=team_id)),
+            Scenario('tasks:edit_sprint', reverse('tasks:edit_sprint', args=[ctx.active_sprint.id]), user=owner),
+            Scenario('tasks:edit_sprint', reverse('tasks:edit_sprint', args=[ctx.active_sprint.id]), 'POST',
+                     user=owner, status=302, data=sprint_form),
+            Scenario('tasks:start_sprint', reverse('tasks:start_sprint', args=[ctx.future_sprint.id]), user=owner,
+                     status=302, setup=stop_active_sprint),
+            Scenario('tasks:complete_sprint', reverse('tasks:complete_sprint', args=[ctx.active_sprint.id]), user=owner,
+                     status=302),
+            Scenario('tasks:delete_sprint', reverse('tasks:delete_sprint', args=[ctx.old_sprint.id]), user=owner,
+                     status=302),
+            Scenario('tasks:dashboard', reverse('tasks:dashboard') + team, user=member),
+            Scenario('tasks:dashboard_data', reverse('tasks:dashboard_data') + team, user=member),
+
+            # --- tasks (ทีม) ---
+            Scenario('tasks:create_team', reverse('tasks:create_team'), user=member),
+            Scenario('tasks:create_team', reverse('tasks:create_team'), 'POST', user=member, status=302,
+                     data={'name': 'Bench new team'}),
+            Scenario('tasks:manage_team', reverse('tasks:manage_team', args=[team_id]), user=owner),
+            Scenario('tasks:manage_team', reverse('tasks:manage_team', args=[team_id]), 'POST', user=owner,
+                     status=302, data={'username': ctx.outsider.username}),
+            Scenario('tasks:remove_team_member', reverse('tasks:remove_team_member', args=[team_id, ctx.removable.id]),
+                     user=owner, status=302),
+
+            # --- tasks (Import / Export) ---
+            Scenario('tasks:export_tasks', reverse('tasks:export_tasks') + team, user=member),
+            Scenario('tasks:import_tasks', reverse('tasks:import_tasks') + team, user=owner),
+            Scenario('tasks:import_tasks', reverse('tasks:import_tasks'), 'POST', user=owner, variant='200 rows',
+                     data=lambda: {'team_id': team_id, 'kind': 'tasks',
+                                   'file': SimpleUploadedFile('tasks.csv', ctx.import_csv, content_type='text/csv')}),
+
+            # --- accounts ---
+            Scenario('signup', reverse('signup')),
+            Scenario('signup', reverse('signup'), 'POST', status=302, data=lambda: {
+                'username': f'bench_signup_{next(signups)}', 'password1': PASSWORD, 'password2': PASSWORD,
+            }),
+            Scenario('login', reverse('login')),
+            Scenario('login', reverse('login'), 'POST', status=302,
+                     data={'username': customer.username, 'password': PASSWORD}),
+            Scenario('logout', reverse('logout'), 'POST', user=customer, status=302, setup=login(customer)),
+        ]
+
+    def check_coverage(self, scenarios):
+        expected = url_names()
+        covered = {scenario.name for scenario in scenarios}
+        missing = sorted(expected - covered - set(SKIPPED))
+        unknown = sorted(covered - expected)
+        if missing or unknown:
+            raise CommandError(
+                f"bench scenarios are out of date. missing: {', '.join(missing) or '-'}; "
+                f"unknown URL names: {', '.join(unknown) or '-'}"
+            )
+
+    # ==========================================
+    # 3. Measure
+    # ==========================================
+    def client_for(self, scenario):
+        client = Client(HTTP_HOST='localhost')
+        if scenario.user:
+            client.force_login(scenario.user)
+        return client
+
+    def perform(self, scenario, client, wrapper):
+        """ยิง scenario 1 ครั้ง (wrapper = connection.execute_wrapper ระหว่าง request) แล้ว rollback ด้วย savepoint
+
+        คืน (response, ขนาด body, เวลาเป็นวินาที) ข้อมูลเท่าเดิมทุกรอบ
+        """
+        savepoint = transaction.savepoint()
+        try:
+            if scenario.setup:
+                scenario.setup(client)
+            started = time.perf_counter()
+            with connection.execute_wrapper(wrapper):
+                response = scenario.request(client)
+                size = consume(response)
+            return response, size, time.perf_counter() - started
+        except Exception as exc:
+            raise CommandError(f"{scenario.label}: {exc!r}") from exc
+        finally:
+            transaction.savepoint_rollback(savepoint)
+
+    def measure(self, scenario, iterations, warmup):
+        """คืน (ผลของ scenario, ข้อความ error ถ้า status ไม่ตรง)"""
+        client = self.client_for(scenario)
+        timings, queries = [], []
+        size = status = None
+        for i in range(warmup + iterations):
+            counter = QueryCounter()
+            response, size, elapsed = self.perform(scenario, client, counter)
+            status = response.status_code
+            if status != scenario.status:
+                return None, f"{scenario.label}: expected {scenario.status}, got {status}"
+            if i >= warmup:
+                timings.append(elapsed * 1000)
+                queries.append(counter.count)
+        return {
+            'view': scenario.name,
+            'method': scenario.method,
+            'path': scenario.path,
+            'status': status,
+            'bytes': size,
+            'p50_ms': round(statistics.median(timings), 3),
+            'p95_ms': round(percentile(timings, 0.95), 3),
+            'mean_ms': round(statistics.fmean(timings), 3),
+            'queries': int(statistics.median(queries)),
+            'max_queries': max(queries),
+        }, None
+
+    def run(self, options, media):
+        rng = random.Random(options['seed'])
+        started = time.perf_counter()
+        ctx = self.seed(options['scale'], rng, media)
+        self.stdout.write(
+            f"seeded in {time.perf_counter() - started:.1f} s: "
+            + ', '.join(f'{amount:,} {name}' for name, amount in ctx.counts.items())
+        )
+
+        scenarios = self.scenarios(ctx)
+        if options['only']:
+            scenarios = [scenario for scenario in scenarios if options['only'] in scenario.label]
+        else:
+            self.check_coverage(scenarios)
+        for name, reason in SKIPPED.items():
+            self.stdout.write(f"skip {name}: {reason}")
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"\n{'scenario':<44} {'status':>6} {'p50 ms':>9} {'p95 ms':>9} {'queries':>8} {'KiB':>8}"
+        ))
+        results, errors = {}, []
+        for scenario in scenarios:
+            result, error = self.measure(scenario, options['iterations'], options['warmup'])
+            if error:
+                errors.append(error)
+                self.stdout.write(self.style.ERROR(error))
+                continue
+            results[scenario.label] = result
+            self.stdout.write(
+                f"{scenario.label[:44]:<44} {result['status']:>6} {result['p50_ms']:9.2f} {result['p95_ms']:9.2f} "
+                f"{result['queries']:>8} {result['bytes'] / 1024:8.1f}"
+            )
+        return results, errors
+
+    # ==========================================
+    # 4. Regression gate
+    # ==========================================
+    def gate(self, results, options):
+        path = options['baseline']
+        if not os.path.exists(path):
+            self.stdout.write(self.style.WARNING(
+                f"no baseline at {path}; run again with --save-baseline to record one"
+            ))
+            return
+        with open(path) as f:
+            baseline = json.load(f)['results']
+
+        threshold, min_ms = options['threshold'], options['min_ms']
+        regressions = []
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\ncompared with {path}"))
+        for label, result in results.items():
+            base = baseline.get(label)
+            if base is None:
+                self.stdout.write(f"{label[:44]:<44} new (not in baseline)")
+                continue
+            problems = []
+            if result['queries'] > base['queries']:
+                problems.append(f"queries {base['queries']} -> {result['queries']}")
+            slower = result['p50_ms'] - base['p50_ms']
+            if result['p50_ms'] > base['p50_ms'] * (1 + threshold) and slower >= min_ms:
+                problems.append(f"p50 {base['p50_ms']:.2f} -> {result['p50_ms']:.2f} ms")
+            change = (result['p50_ms'] / base['p50_ms'] - 1) * 100 if base['p50_ms'] else 0
+            line = f"{label[:44]:<44} p50 {change:+7.1f}%  queries {result['queries'] - base['queries']:+d}"
+            if problems:
+                regressions.append(f"{label}: {', '.join(problems)}")
+                self.stdout.write(self.style.ERROR(f"{line}  REGRESSION"))
+            else:
+                self.stdout.write(line)
+        for label in sorted(set(baseline) - set(results)):
+            if not options['only']:
+                self.stdout.write(self.style.WARNING(f"{label[:44]:<44} missing (in baseline only)"))
+
+        if regressions:
+            raise CommandError(
+                f"{len(regressions)} scenario(s) regressed (threshold {threshold:.0%} and {min_ms} ms, "
+                f"any extra query):\n  " + '\n  '.join(regressions)
+            )
+        self.stdout.write(self.style.SUCCESS(f"no regressions against {path}"))
@@ -0,0 +1,78 @@
+import random
+
+from django.core.management.base import CommandError
+
+from config.querycheck import DEFAULT_THRESHOLD, QueryRecorder
+
+from .bench import Command as BenchCommand
+
+
+class Command(BenchCommand):
+    help = (
+        "รันทุก scenario ของ manage.py bench (ข้อมูลจำลองชุดเดียวกัน) พร้อมตัวจับ N+1 ใน config/querycheck.py "
+        "แล้วสรุป query รูปเดียวกันที่ถูกยิงซ้ำจากบรรทัดเดียวกันมากที่สุด (rollback ข้อมูลทั้งหมดตอนจบ)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=0.2, help='ขนาดข้อมูลเทียบกับ manage.py bench (N+1 ไม่ต้องใช้ข้อมูลเต็ม)')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--threshold', type=int, default=DEFAULT_THRESHOLD, help='ซ้ำตั้งแต่กี่ครั้งต่อ request ถึงนับ')
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument('--only', default=None, help='เฉพาะ scenario ที่ label มีข้อความนี้')
+        parser.add_argument('--fail', action='store_true', help='exit 1 ถ้าเจอ pattern ใดๆ (ใช้ใน CI)')
+
+    def handle(self, *args, **options):
+        with self.isolated() as media:
+            ctx = self.seed(options['scale'], random.Random(options['seed']), media)
+            scenarios = self.scenarios(ctx)
+            if options['only']:
+                scenarios = [scenario for scenario in scenarios if options['only'] in scenario.label]
+            found, totals = self.collect(scenarios, options['threshold'])
+
+        self.stdout.write(self.style.MIGRATE_HEADING("\nmost queries per request"))
+        for count, label in sorted(totals, reverse=True)[:10]:
+            self.stdout.write(f"{count:>6}  {label}")
+
+        patterns = sorted(found.values(), key=lambda pattern: (-pattern['count'], pattern['location']))
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"\nrepeated queries (>= {options['threshold']}x from one location) across {len(scenarios)} scenarios"
+        ))
+        if not patterns:
+            self.stdout.write(self.style.SUCCESS("none found"))
+            return
+        for pattern in patterns[:options['limit']]:
+            self.stdout.write(self.style.WARNING(f"{pattern['count']:>5}x  {pattern['location']}"))
+            self.stdout.write(f"        {pattern['shape'][:200]}")
+            for entry in pattern['stack'][:3]:
+                self.stdout.write(f"        at {entry}")
+            self.stdout.write(f"        in {', '.join(pattern['scenarios'])}")
+        if len(patterns) > options['limit']:
+            self.stdout.write(f"... and {len(patterns) - options['limit']} more")
+        if options['fail']:
+            raise CommandError(f"{len(patterns)} repeated-query pattern(s) found")
+
+    def collect(self, scenarios, threshold):
+        """คืน ({(shape, location, stack): pattern}, [(จำนวน query, label)])
+
+        ยิงแต่ละ scenario 2 ครั้ง: ครั้งแรก cache ยังว่าง (N+1 ที่ซ่อนอยู่หลัง cache จะโผล่) ครั้งที่สองตอน cache อุ่นแล้ว
+        """
+        found = {}
+        totals = []
+        for scenario in scenarios:
+            client = self.client_for(scenario)
+            worst = {}
+            most = 0
+            for _ in range(2):
+                recorder = QueryRecorder()
+                self.perform(scenario, client, recorder)
+                most = max(most, recorder.count)
+                for pattern in recorder.repeated(threshold):
+                    key = (pattern['shape'], pattern['location'], tuple(pattern['stack']))
+                    if key not in worst or pattern['count'] > worst[key]['count']:
+                        worst[key] = pattern
+            totals.append((most, scenario.label))
+            for key, pattern in worst.items():
+                entry = found.setdefault(key, dict(pattern, count=0, scenarios=[]))
+                entry['count'] = max(entry['count'], pattern['count'])
+                entry['scenarios'].append(f"{scenario.label} ({pattern['count']}x)")
+        return found, totals
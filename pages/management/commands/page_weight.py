@@ -0,0 +1,94 @@
+import gzip
+import json
+import random
+import re
+
+from django.core.management.base import CommandError
+
+from .bench import Command as BenchCommand
+
+_STYLE_RE = re.compile(r'<style[^>]*>(.*?)</style>', re.S | re.I)
+_INLINE_SCRIPT_RE = re.compile(r'<script(?![^>]*\bsrc=)[^>]*>(.*?)</script>', re.S | re.I)
+_ASSET_RE = re.compile(r'<(?:link[^>]+href|script[^>]+src)="([^"]+)"', re.I)
+
+
+def weigh(html):
+    """ขนาดของหน้า HTML หนึ่งหน้า: byte ดิบ / gzip / CSS+JS ที่ฝังในหน้า / asset ที่โหลดจากโดเมนอื่น"""
+    body = html.encode()
+    assets = _ASSET_RE.findall(html)
+    return {
+        'bytes': len(body),
+        'gzip': len(gzip.compress(body, 6)),
+        'inline_css': sum(len(block.encode()) for block in _STYLE_RE.findall(html)),
+        'inline_js': sum(len(block.encode()) for block in _INLINE_SCRIPT_RE.findall(html) if block.strip()),
+        'third_party': sorted({url for url in assets if url.startswith(('http://', 'https://', '//'))}),
+    }
+
+
+class Command(BenchCommand):
+    help = (
+        "ขนาด HTML ของทุกหน้าใน scenario ของ manage.py bench (GET ที่ตอบ text/html): byte ดิบ, gzip, "
+        "CSS/JS ที่ฝังในหน้า และ asset ที่ต้องโหลดจากโดเมนอื่น เทียบกับผลครั้งก่อนได้ด้วย --baseline"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=0.2, help='ขนาดข้อมูลเทียบกับ manage.py bench')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--only', default=None, help='เฉพาะ scenario ที่ label มีข้อความนี้')
+        parser.add_argument('--output', default=None, help='บันทึกผลเป็น JSON')
+        parser.add_argument('--baseline', default=None, help='JSON จาก --output ครั้งก่อน ใช้แสดงผลต่าง')
+
+    def handle(self, *args, **options):
+        with self.isolated() as media:
+            ctx = self.seed(options['scale'], random.Random(options['seed']), media)
+            pages = {}
+            for scenario in self.scenarios(ctx):
+                if scenario.method != 'GET' or scenario.status != 200:
+                    continue
+                if options['only'] and options['only'] not in scenario.label:
+                    continue
+                response, _, _ = self.perform(scenario, self.client_for(scenario), lambda execute, *args: execute(*args))
+                if response.streaming or not response.get('Content-Type', '').startswith('text/html'):
+                    continue
+                pages[scenario.label] = weigh(response.content.decode())
+
+        baseline = {}
+        if options['baseline']:
+            try:
+                with open(options['baseline'], encoding='utf-8') as fh:
+                    baseline = json.load(fh)
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"cannot read baseline {options['baseline']}: {exc}") from exc
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"HTML payload of {len(pages)} pages (bytes)"))
+        self.stdout.write(f"{'html':>9} {'gzip':>8} {'css':>7} {'js':>7} {'3rd':>4}  page")
+        for label, page in sorted(pages.items(), key=lambda item: -item[1]['bytes']):
+            self.stdout.write(
+                f"{page['bytes']:>9} {page['gzip']:>8} {page['inline_css']:>7} {page['inline_js']:>7} "
+                f"{len(page['third_party']):>4}  {label}{self.change(page, baseline.get(label))}"
+            )
+        totals = {key: sum(page[key] for page in pages.values()) for key in ('bytes', 'gzip', 'inline_css', 'inline_js')}
+        self.stdout.write(
+            f"{totals['bytes']:>9} {totals['gzip']:>8} {totals['inline_css']:>7} {totals['inline_js']:>7}       total"
+        )
+        if baseline:
+            before = {key: sum(page[key] for label, page in baseline.items() if label in pages) for key in totals}
+            self.stdout.write(
+                f"\nvs baseline: html {before['bytes']} -> {totals['bytes']}, "
+                f"gzip {before['gzip']} -> {totals['gzip']}, "
+                f"inline css+js {before['inline_css'] + before['inline_js']} -> {totals['inline_css'] + totals['inline_js']}"
+            )
+        hosts = sorted({re.sub(r'^(?:https?:)?//([^/]+).*$', r'\1', url) for page in pages.values() for url in page['third_party']})
+        self.stdout.write(f"third-party hosts: {', '.join(hosts) or 'none'}")
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as fh:
+                json.dump(pages, fh, indent=2, sort_keys=True)
+            self.stdout.write(f"wrote {options['output']}")
+
+    @staticmethod
+    def change(page, before):
+        if not before:
+            return ''
+        delta = page['bytes'] - before['bytes']
+        return f"  ({delta:+d} B vs {before['bytes']})" if delta else ''
@@ -0,0 +1,185 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# process ใหม่: โหลดแอปแบบเดียวกับ gunicorn (config.wsgi) + import urls/views ทั้งหมด
+BOOT = """
+from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
+get_wsgi_application()
+get_resolver().url_patterns
+"""
+
+# process ใหม่: จับเวลาแต่ละช่วงตั้งแต่ boot จนได้ byte แรกของ request แรก แล้วพิมพ์เป็น JSON
+TTFB = """
+import io, json, sys, time
+started = time.perf_counter()
+from wsgiref.util import setup_testing_defaults
+from django.core.wsgi import get_wsgi_application
+
+paths, warm = json.loads(sys.argv[1])
+timings = {}
+mark = started
+
+def lap(name):
+    global mark
+    now = time.perf_counter()
+    timings[name] = (now - mark) * 1000
+    mark = now
+
+application = get_wsgi_application()
+lap('boot')
+if warm:
+    from config.warmup import warm_up
+    warm_up()
+    lap('warm-up')
+
+def first_byte(path):
+    environ = {'PATH_INFO': path, 'wsgi.errors': io.StringIO()}
+    setup_testing_defaults(environ)
+    status = []
+    body = iter(application(environ, lambda code, headers, exc_info=None: status.append(code)))
+    next(body, b'')
+    return status[0].split()[0]
+
+for number, path in enumerate(paths):
+    status = first_byte(path)
+    lap(f'{path} #1 ({status})' if number == 0 else f'{path} ({status})')
+status = first_byte(paths[0])
+lap(f'{paths[0]} #2 ({status})')
+print(json.dumps(timings))
+"""
+
+
+def parse_importtime(stderr):
+    """แถวของ -X importtime -> [(module, ผู้ import, self us, cumulative us)]"""
+    rows = []
+    for line in stderr.splitlines():
+        if line.startswith('import time:') and 'self [us]' not in line:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            rows.append((name.strip(), len(name) - len(name.lstrip()), int(self_us), int(cumulative_us)))
+    # -X importtime พิมพ์ลูกก่อนแม่ (เยื้องลึกกว่า): ไล่จากท้ายขึ้นมา แม่จะอยู่บน stack เสมอ
+    parsed = []
+    stack = []
+    for module, depth, self_us, cumulative_us in reversed(rows):
+        while stack and stack[-1][0] >= depth:
+            stack.pop()
+        parsed.append((module, stack[-1][1] if stack else None, self_us, cumulative_us))
+        stack.append((depth, module))
+    parsed.reverse()
+    return parsed
+
+
+def owner(module):
+    """ชื่อที่ใช้รวมเวลา: package บนสุด (= ชื่อแอปของโปรเจกต์) ยกเว้น django.contrib.* แยกตามแอป"""
+    if module.startswith('django.contrib.'):
+        return '.'.join(module.split('.')[:3])
+    return module.split('.')[0]
+
+
+class Command(BaseCommand):
+    help = (
+        "วัด cold start: เวลา import แยกตามแอป/package (แบบ python -X importtime) "
+        "และเวลาจาก boot จนได้ byte แรกของ request แรก เทียบแบบมี/ไม่มี config.warmup"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=15, help='จำนวนแถวในแต่ละตาราง')
+        parser.add_argument('--runs', type=int, default=5, help='จำนวน process ที่รันต่อแบบ (ใช้ค่ากลาง)')
+        parser.add_argument(
+            '--path', action='append', dest='paths', default=None,
+            help='path ที่ยิงหลัง boot (ใส่ซ้ำได้ ค่าเริ่มต้น / และ /store/shop/)',
+        )
+        parser.add_argument('--skip-imports', action='store_true')
+        parser.add_argument('--skip-ttfb', action='store_true')
+
+    def handle(self, *args, **options):
+        if not options['skip_imports']:
+            self.report_imports(options['limit'])
+        if not options['skip_ttfb']:
+            self.report_ttfb(options['paths'] or ['/', '/store/shop/'], options['runs'])
+
+    def child(self, *args, python_options=()):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings'))
+        result = subprocess.run(
+            [sys.executable, *python_options, '-c', *args],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if result.returncode:
+            raise CommandError(f"child process failed:\n{result.stderr[-2000:]}")
+        return result
+
+    # ==========================================
+    # 1. Import time
+    # ==========================================
+    def report_imports(self, limit):
+        rows = parse_importtime(self.child(BOOT, python_options=('-X', 'importtime')).stderr)
+        if not rows:
+            raise CommandError("no -X importtime output")
+        total = sum(self_us for _, _, self_us, _ in rows)
+
+        per_owner = defaultdict(lambda: [0, 0])
+        for module, _, self_us, _ in rows:
+            entry = per_owner[owner(module)]
+            entry[0] += self_us
+            entry[1] += 1
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"import time by app/package ({len(rows)} modules, {total / 1000:.0f} ms total)"
+        ))
+        self.stdout.write(f"{'self ms':>9} {'share':>6} {'modules':>8}  name")
+        for name, (self_us, count) in sorted(per_owner.items(), key=lambda item: -item[1][0])[:limit]:
+            self.stdout.write(f"{self_us / 1000:>9.1f} {self_us / total:>6.1%} {count:>8}  {name}")
+
+        # package ที่ถูก import มาเป็นก้อนใหญ่ + ใครดึงมา (module แรกนอก package ที่ import มันเข้ามา)
+        self.stdout.write(self.style.MIGRATE_HEADING("\nslowest imports (cumulative, incl. what they pull in)"))
+        self.stdout.write(f"{'cum ms':>9}  module  <-  imported by")
+        for cumulative_us, module, importer in self.heaviest(rows, limit):
+            self.stdout.write(f"{cumulative_us / 1000:>9.1f}  {module}  <-  {importer or '-'}")
+
+    def heaviest(self, rows, limit):
+        """ก้อนใหญ่สุดของแต่ละ app/package ที่ถูกดึงเข้ามาจากข้างนอก -> [(เวลารวม, module, ผู้ import)]"""
+        largest = {}
+        for module, importer, _, cumulative_us in rows:
+            name = owner(module)
+            if importer is not None and owner(importer) == name:
+                continue
+            if name not in largest or cumulative_us > largest[name][0]:
+                largest[name] = (cumulative_us, module, importer)
+        return sorted(largest.values(), key=lambda entry: -entry[0])[:limit]
+
+    # ==========================================
+    # 2. Time to first byte
+    # ==========================================
+    def report_ttfb(self, paths, runs):
+        results = {}
+        for warm in (False, True):
+            samples = [json.loads(self.child(TTFB, json.dumps([paths, warm])).stdout) for _ in range(runs)]
+            results[warm] = {name: statistics.median(sample[name] for sample in samples) for name in samples[0]}
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"\nnew process -> first byte, median of {runs} runs (ms)"
+        ))
+        self.stdout.write(f"{'':<32} {'cold':>9} {'warm-up':>9}")
+        phases = list(dict.fromkeys([*results[True], *results[False]]))
+        for name in phases:
+            cold, warmed = (results[warm].get(name) for warm in (False, True))
+            self.stdout.write(f"{name:<32} {self.ms(cold):>9} {self.ms(warmed):>9}")
+
+        # warm-up ทำตอน boot (ใน gunicorn: ใน master ก่อน fork) ผู้ใช้คนแรกรอแค่ request แรก
+        cold, warmed = (
+            next(ms for name, ms in results[warm].items() if ' #1 ' in name) for warm in (False, True)
+        )
+        self.stdout.write(
+            f"\nfirst request after boot: {cold:.1f} ms -> {warmed:.1f} ms "
+            f"({(cold - warmed) / cold:.0%} less); warm-up itself {results[True]['warm-up']:.0f} ms at boot"
+        )
+
+    @staticmethod
+    def ms(value):
+        return '-' if value is None else f'{value:.1f}'
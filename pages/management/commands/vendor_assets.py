@@ -0,0 +1,81 @@
+import posixpath
+import re
+from urllib.parse import urljoin, urlsplit
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+from pages.assets import VENDOR_ASSETS, VENDOR_DIR
+
+# Google Fonts ส่ง CSS ตาม browser: ขอแบบ browser ปัจจุบันจะได้ woff2 แยก subset (thai / latin / ...)
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36'
+
+_CSS_URL_RE = re.compile(r'''url\(\s*(['"]?)([^'")]+)\1\s*\)''')
+# collectstatic (ManifestStaticFilesStorage) หาไฟล์ .map ที่อ้างถึงแล้วล้มถ้าไม่มี: ไม่ได้ดาวน์โหลด .map มาก็ตัดทิ้ง
+_SOURCE_MAP_RE = re.compile(r'(?m)^\s*(?://[#@] sourceMappingURL=.*|/\*[#@] sourceMappingURL=.*?\*/)\s*$')
+
+
+class Command(BaseCommand):
+    help = (
+        "ดาวน์โหลด CSS/JS/ฟอนต์จาก CDN ตาม pages.assets.VENDOR_ASSETS มาไว้ที่ pages/static/vendor/ "
+        "(รันก่อน collectstatic ใน build.sh) ไฟล์ที่มีอยู่แล้วข้าม เว้นแต่ --force"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help='เฉพาะไฟล์เหล่านี้ (ค่าเริ่มต้น: ทั้งหมด)')
+        parser.add_argument('--force', action='store_true', help='ดาวน์โหลดใหม่แม้มีไฟล์อยู่แล้ว')
+
+    def handle(self, *args, **options):
+        unknown = set(options['names']) - set(VENDOR_ASSETS)
+        if unknown:
+            raise CommandError(f"unknown asset(s): {', '.join(sorted(unknown))}")
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = USER_AGENT
+
+        for name in options['names'] or VENDOR_ASSETS:
+            target = VENDOR_DIR / name
+            if target.exists() and not options['force']:
+                self.stdout.write(f"skip  {name} (exists)")
+                continue
+            url = VENDOR_ASSETS[name]
+            text = self.fetch(url).decode()
+            if name.endswith('.css'):
+                text = self.localize_css(name, url, text)
+            body = _SOURCE_MAP_RE.sub('', text).encode()
+            self.write(target, body)
+            self.stdout.write(self.style.SUCCESS(f"saved {name} ({len(body)} B) <- {url}"))
+
+    def fetch(self, url):
+        try:
+            response = self.session.get(url, timeout=30)
+            response.raise_for_status()
+        except requests.RequestException as exc:
+            raise CommandError(f"cannot download {url}: {exc}") from exc
+        return response.content
+
+    def localize_css(self, name, url, css):
+        """ดาวน์โหลดไฟล์ที่ url(...) ใน CSS อ้างถึงไปไว้ที่ vendor/<ชื่อ css>/ แล้วแก้ให้ชี้ไฟล์นั้น"""
+        folder = posixpath.splitext(name)[0]
+        saved = {}
+
+        def replace(match):
+            ref = match.group(2).strip()
+            if ref.startswith(('data:', '#')):
+                return match.group(0)
+            source = urljoin(url, ref)
+            if source not in saved:
+                filename = posixpath.basename(urlsplit(source).path)
+                self.write(VENDOR_DIR / folder / filename, self.fetch(source))
+                saved[source] = f'{folder}/{filename}'
+            return f'url("{saved[source]}")'
+
+        css = _CSS_URL_RE.sub(replace, css)
+        if saved:
+            self.stdout.write(f"      {name}: {len(saved)} file(s) in vendor/{folder}/")
+        return css
+
+    def write(self, target, body):
+        target.parent.mkdir(parents=True, exist_ok=True)
+        partial = target.with_name(target.name + '.part')
+        partial.write_bytes(body)
+        partial.replace(target)
@@ -0,0 +1,15 @@
+from django import template
+
+from pages.assets import vendor_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def vendor(name):
+    """URL ของไฟล์ CSS/JS จาก CDN ที่เก็บสำเนาไว้ (ดู pages/assets.py)
+
+    ตัวอย่าง: <link href="{% vendor 'bootstrap.css' %}" rel="stylesheet">
+    """
+    # ค่าคงที่ใน template มาเป็น SafeString: แปลงเป็น str ธรรมดาก่อนใช้เป็น path
+    return vendor_url(str.__str__(name))
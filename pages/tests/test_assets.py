@@ -0,0 +1,133 @@
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import CommandError, call_command
+from django.template import Context, Template
+from django.test import SimpleTestCase, override_settings
+
+from config import settings as project_settings
+from config.test_runner import TEST_STATICFILES
+from pages import assets
+from pages.management.commands.vendor_assets import Command as VendorAssetsCommand
+
+
+class TempVendorDir:
+    """VENDOR_DIR ชั่วคราว (ไม่แตะ pages/static/vendor/ ของเครื่องที่รันเทส)"""
+
+    def setUp(self):
+        super().setUp()
+        self.vendor_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.vendor_dir, ignore_errors=True)
+        for target in ('pages.assets.VENDOR_DIR', 'pages.management.commands.vendor_assets.VENDOR_DIR'):
+            patcher = mock.patch(target, self.vendor_dir)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        assets.is_vendored.cache_clear()
+        self.addCleanup(assets.is_vendored.cache_clear)
+
+
+class VendorTagTests(TempVendorDir, SimpleTestCase):
+    def render(self, name):
+        return Template("{% load assets %}{% vendor '" + name + "' %}").render(Context())
+
+    def test_cdn_until_downloaded(self):
+        self.assertEqual(self.render('chart.js'), assets.VENDOR_ASSETS['chart.js'])
+
+    def test_local_copy(self):
+        (self.vendor_dir / 'chart.js').write_text('/* chart */')
+        self.assertEqual(self.render('chart.js'), '/static/vendor/chart.js')
+
+    def test_unknown_asset(self):
+        with self.assertRaisesMessage(ValueError, 'add it to pages.assets.VENDOR_ASSETS'):
+            self.render('jquery.js')
+
+
+class VendorAssetsCommandTests(TempVendorDir, SimpleTestCase):
+    CSS = (
+        "@font-face{src:url(https://fonts.gstatic.com/s/kanit/v15/thai.woff2) format('woff2')}\n"
+        "@font-face{src:url('https://fonts.gstatic.com/s/kanit/v15/thai.woff2')}\n"
+        ".icon{background:url(data:image/svg+xml;base64,AAAA)}\n"
+        "/*# sourceMappingURL=font.css.map */\n"
+    )
+
+    def fetch(self, url):
+        self.fetched.append(url)
+        return self.CSS.encode() if url == assets.VENDOR_ASSETS['font-kanit.css'] else b'wOF2'
+
+    def vendor_assets(self, *args, **options):
+        self.fetched = []
+        out = StringIO()
+        with mock.patch.object(VendorAssetsCommand, 'fetch', lambda command, url: self.fetch(url)):
+            call_command('vendor_assets', *args, stdout=out, **options)
+        return out.getvalue()
+
+    def test_localizes_fonts(self):
+        self.vendor_assets('font-kanit.css')
+        css = (self.vendor_dir / 'font-kanit.css').read_text()
+        self.assertEqual(css.count('url("font-kanit/thai.woff2")'), 2)
+        self.assertIn('url(data:image/svg+xml;base64,AAAA)', css)
+        # collectstatic จะหาไฟล์ .map ที่อ้างถึงไม่เจอ
+        self.assertNotIn('sourceMappingURL', css)
+        self.assertEqual((self.vendor_dir / 'font-kanit' / 'thai.woff2').read_bytes(), b'wOF2')
+        # ไฟล์เดียวกันถูกอ้างสองที่: ดาวน์โหลดครั้งเดียว
+        self.assertEqual(len(self.fetched), 2)
+
+    def test_skips_existing_unless_forced(self):
+        self.vendor_assets('chart.js')
+        self.assertIn('skip  chart.js', self.vendor_assets('chart.js'))
+        self.assertEqual(self.fetched, [])
+        self.vendor_assets('chart.js', force=True)
+        self.assertEqual(self.fetched, [assets.VENDOR_ASSETS['chart.js']])
+
+    def test_unknown_name(self):
+        with self.assertRaisesMessage(CommandError, 'unknown asset(s): jquery.js'):
+            self.vendor_assets('jquery.js')
+
+
+class TestStaticStorageTests(SimpleTestCase):
+    def test_only_the_test_runner_swaps_storage(self):
+        # settings ของ production ไม่เปลี่ยนตามคำสั่งที่รัน (manifest + บีบอัด)
+        self.assertEqual(
+            project_settings.STORAGES['staticfiles']['BACKEND'], 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+        )
+        self.assertEqual(settings.STORAGES['staticfiles'], TEST_STATICFILES)
+        self.assertEqual(staticfiles_storage.url('tasks/css/tasks.css'), '/static/tasks/css/tasks.css')
+
+
+class CompressedStaticTests(SimpleTestCase):
+    """collectstatic แบบ production (manifest + .gz/.br) แล้วให้ WhiteNoise ส่งไฟล์ที่มี hash"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.static_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.static_root, ignore_errors=True)
+        cls.enterClassContext(override_settings(
+            DEBUG=False,
+            STATIC_ROOT=cls.static_root,
+            STORAGES={
+                'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+                'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'},
+            },
+        ))
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+    def test_hashed_bundle_served_compressed_and_immutable(self):
+        url = staticfiles_storage.url('tasks/css/tasks.css')
+        self.assertRegex(url, r'^/static/tasks/css/tasks\.[0-9a-f]{12}\.css$')
+
+        response = self.client.get(url, headers={'Accept-Encoding': 'gzip, br'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertIn('immutable', response['Cache-Control'])
+        response.close()
+
+    def test_unhashed_name_is_not_immutable(self):
+        response = self.client.get('/static/tasks/css/tasks.css')
+        self.assertNotIn('immutable', response.get('Cache-Control', ''))
+        response.close()
@@ -0,0 +1,64 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from pages.management.commands.bench import SKIPPED, url_names
+
+
+class BenchGateTests(TestCase):
+    """manage.py bench: ข้อมูลชุดเล็ก 1 รอบต่อ scenario (วัดเวลาจริงไม่ได้ แต่ตรวจ gate กับความครบของ scenario ได้)"""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.output = os.path.join(directory, 'bench-results.json')
+        self.baseline = os.path.join(directory, 'bench-baseline.json')
+
+    def bench(self, **options):
+        out = StringIO()
+        call_command(
+            'bench', scale=0.02, iterations=1, warmup=0, output=self.output, baseline=self.baseline,
+            stdout=out, **options,
+        )
+        return out.getvalue()
+
+    def edit_baseline(self, label, **values):
+        with open(self.baseline) as f:
+            report = json.load(f)
+        report['results'][label].update(values)
+        with open(self.baseline, 'w') as f:
+            json.dump(report, f)
+
+    def test_every_url_has_a_scenario(self):
+        self.assertIn('baseline saved', self.bench(save_baseline=True))
+        with open(self.baseline) as f:
+            results = json.load(f)['results']
+        self.assertEqual({result['view'] for result in results.values()}, url_names() - set(SKIPPED))
+
+    def test_extra_query_fails(self):
+        self.bench(only='store:product_list', save_baseline=True)
+        # เวลาของรอบเดียวแกว่ง: ปิด gate ของ p50 ไว้ ดูเฉพาะจำนวน query
+        self.assertIn('no regressions', self.bench(only='store:product_list', threshold=100))
+
+        with open(self.output) as f:
+            label, result = next(iter(json.load(f)['results'].items()))
+        self.edit_baseline(label, queries=result['queries'] - 1)
+        message = f"queries {result['queries'] - 1} -> {result['queries']}"
+        with self.assertRaisesMessage(CommandError, message):
+            self.bench(only='store:product_list', threshold=100)
+
+    def test_slower_p50_fails(self):
+        self.bench(only='store:product_list', save_baseline=True)
+        with open(self.baseline) as f:
+            label = next(iter(json.load(f)['results']))
+        self.edit_baseline(label, p50_ms=0.001)
+        with self.assertRaisesMessage(CommandError, 'p50 0.00 ->'):
+            self.bench(only='store:product_list', min_ms=0)
+
+    def test_missing_baseline_only_warns(self):
+        self.assertIn('no baseline at', self.bench(only='store:product_list'))
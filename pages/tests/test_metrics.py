@@ -0,0 +1,82 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from config.metrics import REQUEST_SECONDS, render_metrics, slow_requests, write_worker_file
+
+# view ที่มีแค่ worker อื่นเคยตอบ (เทสอื่นใน process นี้ยิง tasks:board ไปแล้ว ตัวนับเป็นของทั้ง process)
+OTHER_VIEW = 'reports:weekly'
+COUNT_LINE = 'django_request_duration_seconds_count{view="%s",method="GET",status="200"} '
+
+
+def count(body, view):
+    match = re.search(re.escape(COUNT_LINE % view) + r'(\d+)', body)
+    return int(match.group(1)) if match else 0
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        self.metrics_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.metrics_dir, ignore_errors=True)
+        self.staff = User.objects.create_user('ops', is_staff=True)
+
+    def other_worker(self, pid, view, requests, slow=()):
+        # ไฟล์ที่ worker อีกตัวเขียนไว้ (รูปแบบเดียวกับ write_worker_file)
+        histogram = [[[view, 'GET', 200], [[requests] + [0] * len(REQUEST_SECONDS.buckets), 0.001 * requests]]]
+        state = {
+            'metrics': {REQUEST_SECONDS.name: histogram},
+            'cache': {'hits': 7, 'misses': 1},
+            'slow': list(slow),
+        }
+        with open(os.path.join(self.metrics_dir, f'{pid}.json'), 'w') as f:
+            json.dump(state, f)
+
+    def test_staff_only(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        self.client.force_login(User.objects.create_user('buyer'))
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_bearer_token(self):
+        self.assertEqual(self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer secret').status_code, 200)
+        self.assertEqual(self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer nope').status_code, 403)
+
+    def test_sums_every_worker(self):
+        self.client.get(reverse('store:product_list'))
+        local = count(render_metrics(aggregate=False), 'store:product_list')
+        self.assertGreater(local, 0)
+
+        with override_settings(METRICS_DIR=self.metrics_dir):
+            self.other_worker(1001, 'store:product_list', 3)
+            self.other_worker(1002, OTHER_VIEW, 5)
+            self.client.force_login(self.staff)
+            body = self.client.get(reverse('metrics')).content.decode()
+        self.assertEqual(count(body, 'store:product_list'), local + 3)
+        self.assertEqual(count(body, OTHER_VIEW), 5)
+        self.assertRegex(body, r'storefront_page_cache_total\{result="hit"\} \d+')
+
+    def test_process_local_without_metrics_dir(self):
+        self.other_worker(1001, OTHER_VIEW, 5)
+        self.assertEqual(count(render_metrics(), OTHER_VIEW), 0)
+
+    def test_worker_file_round_trip(self):
+        self.client.get(reverse('store:product_list'))
+        with override_settings(METRICS_DIR=self.metrics_dir):
+            write_worker_file()
+            with open(os.path.join(self.metrics_dir, f'{os.getpid()}.json')) as f:
+                state = json.load(f)
+            # process นี้อ่านจาก memory: ไฟล์ของตัวเองไม่ถูกนับซ้ำ
+            local = count(render_metrics(aggregate=False), 'store:product_list')
+            self.assertEqual(count(render_metrics(), 'store:product_list'), local)
+        self.assertIn(REQUEST_SECONDS.name, state['metrics'])
+
+    def test_slow_requests_from_every_worker(self):
+        with override_settings(METRICS_DIR=self.metrics_dir):
+            self.other_worker(1001, OTHER_VIEW, 1, slow=[{'at': 1.0, 'path': '/tasks/', 'ms': 900}])
+            self.assertIn('/tasks/', [entry['path'] for entry in slow_requests()])
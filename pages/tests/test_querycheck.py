@@ -0,0 +1,148 @@
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.template import Context, Template
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from config.metrics import RequestStats
+from config.querycheck import NPlusOneMiddleware, QueryBudgetMixin, capture_queries, query_shape
+from store.models import Order, Product
+from store.orders import build_summary
+from tasks.board import load_board
+from tasks.models import Sprint, Task, Team, TeamMember
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    """งบ query ของหน้าที่ข้อมูลโตตามผู้ใช้ (ข้อมูลเยอะ ต้องไม่เกินงบและไม่มี query ซ้ำจากบรรทัดเดียว)"""
+
+    query_budgets = {
+        # session + user + order 1 หน้า + จำนวนชิ้นในตะกร้า
+        'store:my_orders': 4,
+        # session + user + membership + เลข sequence ของกระดาน + sprint + งาน (join assignee) + จำนวนชิ้นในตะกร้า
+        'tasks:board': 7,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('dev')
+        products = [Product.objects.create(name=f'Script {i}', description='-', price=10, image='') for i in range(3)]
+        summary = build_summary([{'product': product, 'quantity': 1} for product in products])
+        Order.objects.bulk_create([
+            Order(customer_name='dev', user=cls.user, total_price=30, summary=summary) for _ in range(200)
+        ])
+
+        cls.team = Team.objects.create(name='Dev')
+        for i in range(10):
+            member = User.objects.create_user(f'member{i}')
+            TeamMember.objects.create(user=member, team=cls.team, role='MEMBER')
+        TeamMember.objects.create(user=cls.user, team=cls.team, role='OWNER')
+        sprint = Sprint.objects.create(
+            name='Sprint 1', team=cls.team, created_by=cls.user,
+            start_date='2026-10-01', end_date='2026-10-14', is_active=True,
+        )
+        assignees = list(User.objects.all())
+        Task.objects.bulk_create([
+            Task(
+                title=f'Task {i}', team=cls.team, created_by=cls.user, sprint=sprint, rank=f'{i:05d}',
+                status=['TODO', 'IN_PROGRESS', 'DONE'][i % 3], assignee=assignees[i % len(assignees)],
+            )
+            for i in range(300)
+        ])
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_my_orders(self):
+        response = self.assertQueryBudget(reverse('store:my_orders'))
+        self.assertEqual(len(response.context['orders']), 24)
+
+    def test_board(self):
+        response = self.assertQueryBudget(reverse('tasks:board') + f'?team_id={self.team.id}')
+        self.assertContains(response, 'Task 299')
+
+    def test_load_board(self):
+        with self.assertMaxQueries(4):
+            load_board(self.user, team_id=self.team.id)
+
+    def test_catches_n_plus_one(self):
+        # มิกซ์อินต้องจับ query ซ้ำจากบรรทัดเดียวกันได้จริง แม้จำนวนรวมยังไม่เกินงบ
+        with self.assertRaisesMessage(AssertionError, 'repeated queries (N+1)'):
+            with self.assertMaxQueries(100):
+                for task in Task.objects.all()[:5]:
+                    task.assignee.username
+
+
+class NPlusOneDetectionTests(TestCase):
+    CARDS = Template(
+        '{% for task in tasks %}\n'
+        '{{ task.title }} {{ task.assignee.username }}\n'
+        '{% endfor %}'
+    )
+
+    @classmethod
+    def setUpTestData(cls):
+        owner = User.objects.create_user('owner')
+        Task.objects.bulk_create([
+            Task(title=f'Task {i}', created_by=owner, assignee=User.objects.create_user(f'dev{i}'))
+            for i in range(8)
+        ])
+
+    def render_cards(self, tasks):
+        with capture_queries() as recorder:
+            self.CARDS.render(Context({'tasks': tasks}))
+        return recorder
+
+    def test_reports_template_line(self):
+        recorder = self.render_cards(Task.objects.all())
+        self.assertEqual(recorder.count, 9)
+        [pattern] = recorder.repeated()
+        self.assertEqual(pattern['count'], 8)
+        # บรรทัดใน template ที่อ่าน task.assignee ไม่ใช่บรรทัดใน Django
+        self.assertEqual(pattern['location'], '<unknown source>:2')
+        self.assertIn('FROM "auth_user"', pattern['shape'])
+
+    def test_select_related_is_clean(self):
+        recorder = self.render_cards(Task.objects.select_related('assignee'))
+        self.assertEqual((recorder.count, recorder.repeated()), (1, []))
+
+    def test_location_skips_other_execute_wrappers(self):
+        # wrapper ที่ติดตั้งก่อน (metrics ของ request) เรียก recorder: ตำแหน่งต้องเป็นบรรทัดที่เรียก query ไม่ใช่ config/metrics.py
+        with connection.execute_wrapper(RequestStats()), capture_queries() as recorder:
+            for task in Task.objects.all():
+                task.assignee.username
+        [pattern] = recorder.repeated()
+        self.assertRegex(pattern['location'], r'^pages/tests/test_querycheck\.py:\d+ in test_location_skips')
+        self.assertFalse(any('config/metrics.py' in entry for entry in pattern['stack']))
+
+    def test_transaction_control_not_grouped(self):
+        with capture_queries() as recorder:
+            for _ in range(5):
+                with transaction.atomic():
+                    pass
+        # SAVEPOINT + RELEASE SAVEPOINT ต่อรอบ: นับรวมในจำนวน query แต่ไม่ใช่ N+1
+        self.assertEqual((recorder.count, recorder.repeated()), (10, []))
+
+    def test_query_shape(self):
+        self.assertEqual(
+            query_shape('''SELECT * FROM "t" WHERE "id" IN (%s, %s, %s) AND "name" = 'it''s' LIMIT 21'''),
+            '''SELECT * FROM "t" WHERE "id" IN (...) AND "name" = ? LIMIT ?''',
+        )
+
+    @override_settings(NPLUSONE_CHECK=True)
+    def test_middleware_flags_response(self):
+        def view(request):
+            for task in Task.objects.all():
+                task.assignee.username
+            return HttpResponse()
+
+        with self.assertLogs('config.querycheck', 'WARNING') as logs:
+            response = NPlusOneMiddleware(view)(RequestFactory().get('/tasks/'))
+        self.assertEqual(response['X-N-Plus-One'], '1')
+        self.assertIn('8x pages/tests/test_querycheck.py', logs.output[0])
+
+    @override_settings(NPLUSONE_CHECK=True)
+    def test_middleware_quiet_without_repeats(self):
+        response = NPlusOneMiddleware(lambda request: HttpResponse())(RequestFactory().get('/'))
+        self.assertNotIn('X-N-Plus-One', response)
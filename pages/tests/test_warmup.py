@@ -0,0 +1,43 @@
+import runpy
+
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.core.wsgi import get_wsgi_application
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.module_loading import import_string
+
+from config.warmup import warm_asgi_request, warm_request, warm_up
+
+
+class WarmUpTests(TestCase):
+    def test_warm_up_steps(self):
+        timings = warm_up(connect=False)
+        self.assertEqual(list(timings), ['urls', 'templates', 'orm', 'backends'])
+
+    def test_warm_requests(self):
+        self.assertEqual(warm_request(get_wsgi_application(), '/'), '200 OK')
+        self.assertEqual(warm_asgi_request(get_asgi_application(), '/'), 200)
+        self.assertEqual(warm_asgi_request(get_asgi_application(), '/no-such-page/'), 404)
+
+
+class GunicornConfigTests(TestCase):
+    def load(self, name):
+        return runpy.run_path(str(settings.BASE_DIR / name))
+
+    def test_site_runs_on_sync_wsgi_workers(self):
+        # response แบบ stream (export / ดาวน์โหลด) ต้องไม่ถูก ASGI อ่านรวดเดียวเข้า memory
+        config = self.load('gunicorn.conf.py')
+        self.assertEqual(config['wsgi_app'], 'config.wsgi:application')
+        self.assertNotIn('worker_class', config)
+        self.assertTrue(callable(import_string(config['wsgi_app'].replace(':', '.'))))
+        self.assertFalse([env for env in config['raw_env'] if env.startswith('CONN_MAX_AGE=')])
+
+    def test_events_process_serves_only_sse(self):
+        config = self.load('gunicorn.events.conf.py')
+        self.assertEqual(config['worker_class'], 'uvicorn_worker.UvicornWorker')
+        app = import_string(config['wsgi_app'].replace(':', '.'))
+        self.assertEqual(warm_asgi_request(app, '/'), 404)
+        self.assertEqual(warm_asgi_request(app, '/store/'), 404)
+        # ยังไม่ login -> ไปหน้า login (ผ่าน Django จริง)
+        self.assertEqual(warm_asgi_request(app, reverse('tasks:task_events')), 302)
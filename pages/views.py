@@ -1,4 +1,7 @@
 from django.shortcuts import render
 
+from config.caching import cache_anonymous_page
+
+@cache_anonymous_page
 def home(request):
     return render(request, 'home.html')
@@ -1,4 +1,7 @@
 from django.shortcuts import render
 
+from config.caching import cache_anonymous_page
+
+@cache_anonymous_page
 def index(request):
     return render(request, 'roblox_showcase/index.html')
\ No newline at end of file
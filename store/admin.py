@@ -1,20 +1,40 @@
 from django.contrib import admin
-from .models import Product, Order, OrderItem
+from .models import Product, Order, OrderItem, Notification, Entitlement
 from django.utils.html import format_html
+from .templatetags.store_images import thumbnail_url
 
 # 1. ปรับแต่งหน้า Admin ของ Order
 class OrderAdmin(admin.ModelAdmin):
     list_display = ('id', 'customer_name', 'total_price', 'paid', 'show_slip', 'created_at')
     list_editable = ('paid',) # ติ๊ก Paid ได้เลยจากหน้าแรก
+    raw_id_fields = ('user',)
 
     def show_slip(self, obj):
         if obj.slip_image:
-            # สร้างลิงก์ให้กดดูรูปได้
-            return format_html('<a href="{}" target="_blank">View Slip</a>', obj.slip_image.url)
+            # สร้างลิงก์ให้กดดูรูปได้ (แสดงรูปย่อ ไม่โหลดสลิปขนาดเต็มทุกแถว)
+            return format_html(
+                '<a href="{}" target="_blank"><img src="{}" style="height: 40px;" alt="View Slip"></a>',
+                obj.slip_image.url,
+                thumbnail_url(obj.slip_image, obj.slip_image_variants),
+            )
         return "No Slip"
     show_slip.short_description = "Payment Slip"
 
-# 2. ลงทะเบียน Model (เช็คว่ามีอย่างละ 1 บรรทัดเท่านั้น!)
+# 2. Outbox แจ้งเตือน Discord (ดูข้อความที่ส่งไม่ผ่าน)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ('id', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at')
+    list_filter = ('status',)
+    readonly_fields = ('last_error',)
+
+# 3. สิทธิ์ดาวน์โหลด (สร้างเองตอนติ๊ก Paid ที่ Order)
+class EntitlementAdmin(admin.ModelAdmin):
+    list_display = ('user', 'product', 'order', 'created_at')
+    raw_id_fields = ('user', 'product', 'order')
+    search_fields = ('user__username', 'product__name')
+
+# 4. ลงทะเบียน Model (เช็คว่ามีอย่างละ 1 บรรทัดเท่านั้น!)
 admin.site.register(Product)
 admin.site.register(Order, OrderAdmin) # อันนี้ใช้คู่กับ Class ข้างบน
-admin.site.register(OrderItem)
\ No newline at end of file
+admin.site.register(OrderItem)
+admin.site.register(Notification, NotificationAdmin)
+admin.site.register(Entitlement, EntitlementAdmin)
\ No newline at end of file
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class StoreConfig(AppConfig):
     name = 'store'
+
+    def ready(self):
+        # ผูก signal อัปเดตดัชนีค้นหาสินค้า
+        from . import signals  # noqa: F401
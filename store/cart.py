@@ -0,0 +1,78 @@
+from .cart_store import get_cart_store
+from .models import Product
+
+
+class Cart:
+    """ตะกร้าสินค้าที่อ่านจาก cart store (ดู store/cart_store.py) แล้วคิดราคาทั้งตะกร้าในครั้งเดียว
+
+    โหลดสินค้าทุกชิ้นด้วย query เดียว (in_bulk) แทนการ get() ทีละบรรทัด
+    และแชร์ผลลัพธ์ต่อ request ผ่าน Cart.for_request() เพื่อให้ cart_detail,
+    checkout และ context processor cart_count ใช้ snapshot เดียวกัน
+    """
+
+    def __init__(self, request):
+        self.request = request
+        self.store = get_cart_store(request)
+        self._data = None
+        self._snapshot = None
+
+    @property
+    def data(self):
+        # โหลดตะกร้าทั้งก้อนเฉพาะตอนต้องใช้จริง (badge ใช้ count() ของ store)
+        if self._data is None:
+            self._data = self.store.load()
+        return self._data
+
+    @classmethod
+    def for_request(cls, request):
+        # เก็บ Cart ไว้บน request กันคิดราคาซ้ำใน request เดียวกัน
+        cart = getattr(request, '_cart', None)
+        if cart is None:
+            cart = cls(request)
+            request._cart = cart
+        return cart
+
+    def __bool__(self):
+        return self.count > 0
+
+    def price(self):
+        """คืนค่า snapshot {'items': [...], 'total_price': int, 'count': int}"""
+        if self._snapshot is not None:
+            return self._snapshot
+
+        products = Product.objects.select_related('category').in_bulk(
+            [int(product_id) for product_id in self.data]
+        )
+
+        items = []
+        total_price = 0
+        count = 0
+        for product_id, quantity in self.data.items():
+            product = products.get(int(product_id))
+            if product is None:
+                # สินค้าถูกลบไปแล้ว ข้ามไปเหมือนเดิม
+                continue
+            subtotal = product.price * quantity
+            total_price += subtotal
+            count += quantity
+            items.append({'product': product, 'quantity': quantity, 'subtotal': subtotal})
+
+        self._snapshot = {'items': items, 'total_price': total_price, 'count': count}
+        return self._snapshot
+
+    @property
+    def count(self):
+        # ถ้าคิดราคาไปแล้วใช้ยอดจาก snapshot, ถ้ายังไม่ได้คิดก็ใช้จำนวนที่ store cache ไว้ (ไม่ต้องโหลดตะกร้า)
+        if self._snapshot is not None:
+            return self._snapshot['count']
+        return self.store.count()
+
+    def add(self, product_id, quantity=1):
+        self.store.add(product_id, quantity)
+        self._data = None
+        self._snapshot = None
+
+    def clear(self):
+        self.store.clear()
+        self._data = {}
+        self._snapshot = None
@@ -0,0 +1,263 @@
+"""
+ที่เก็บข้อมูลตะกร้า (แยกออกจาก Session)
+
+- ผู้ใช้ที่ไม่ได้ login: ใช้ settings.CART_STORE (ค่าเริ่มต้น SignedCookieCartStore = ตะกร้าอยู่ใน cookie)
+  CacheCartStore ใช้ได้เฉพาะ cache ที่ทุก worker เห็นร่วมกัน (Redis / ไฟล์) กับ LocMem จะ error ทันที
+- ผู้ใช้ที่ login: UserCartStore อ่าน/เขียนตาราง SavedCart ตรงๆ (cache แค่จำนวนชิ้น และเฉพาะ cache ที่ใช้ร่วมกัน)
+- ตอน login ตะกร้าของผู้ใช้ที่ไม่ได้ login จะถูกรวมเข้าตะกร้าของบัญชี (ดู merge_anonymous_cart)
+- badge ใน navbar อ่านแค่จำนวนชิ้นที่ cache แยกไว้ ไม่ต้องโหลดตะกร้าทั้งก้อน
+
+ข้อมูลตะกร้าทุกแบบเป็น dict {product_id (str): quantity}
+cookie ที่ต้องตั้ง/ลบ จะถูกเขียนลง response โดย store.middleware.CartMiddleware
+"""
+import secrets
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+from config.caching import is_shared_cache
+
+from .models import SavedCart
+
+CART_TIMEOUT = 60 * 60 * 24 * 30
+
+
+class CartStore:
+    """interface กลาง: load / save / count (+ add / clear ที่สร้างจากสองตัวแรก)"""
+
+    def __init__(self, request):
+        self.request = request
+
+    def load(self):
+        raise NotImplementedError
+
+    def save(self, data):
+        raise NotImplementedError
+
+    def count(self):
+        return sum(self.load().values())
+
+    def add(self, product_id, quantity=1):
+        data = self.load()
+        key = str(product_id)
+        data[key] = data.get(key, 0) + quantity
+        self.save(data)
+
+    def merge(self, other):
+        """รวมจำนวนสินค้าจากตะกร้าอื่นเข้ามา (ใช้ตอน login)"""
+        incoming = other.load()
+        if not incoming:
+            return
+        data = self.load()
+        for key, quantity in incoming.items():
+            data[key] = data.get(key, 0) + quantity
+        self.save(data)
+
+    def clear(self):
+        self.save({})
+
+    def process_response(self, response):
+        return response
+
+
+class SessionCartStore(CartStore):
+    """แบบเดิม (request.session['cart']) เผื่ออยากกลับไปใช้ Session"""
+
+    SESSION_KEY = 'cart'
+
+    def load(self):
+        return dict(self.request.session.get(self.SESSION_KEY, {}))
+
+    def save(self, data):
+        if data:
+            self.request.session[self.SESSION_KEY] = data
+        else:
+            self.request.session.pop(self.SESSION_KEY, None)
+
+
+class CacheCartStore(CartStore):
+    """เก็บตะกร้าใน cache โดยมี cookie cart_id เป็นตัวระบุ (ไม่แตะ Session/DB เลย)
+
+    ต้องใช้คู่กับ cache ที่ทุก worker เห็นร่วมกัน: กับ LocMem ตะกร้าอยู่แค่ใน worker ที่รับ request แรก
+    request ถัดไปที่ไปตก worker อื่นจะเห็นตะกร้าว่าง (anonymous_store_class ไม่ยอมให้ใช้)
+    """
+
+    COOKIE_NAME = 'cart_id'
+
+    def __init__(self, request):
+        super().__init__(request)
+        self.cart_id = request.COOKIES.get(self.COOKIE_NAME)
+        self._cookie_changed = False
+
+    def _key(self, part):
+        return f'cart:anon:{self.cart_id}:{part}'
+
+    def load(self):
+        if not self.cart_id:
+            return {}
+        return dict(cache.get(self._key('items')) or {})
+
+    def save(self, data):
+        if not data:
+            if self.cart_id:
+                cache.delete_many([self._key('items'), self._key('count')])
+                self.cart_id = None
+                self._cookie_changed = True
+            return
+        if not self.cart_id:
+            self.cart_id = secrets.token_urlsafe(16)
+            self._cookie_changed = True
+        cache.set_many({self._key('items'): data, self._key('count'): sum(data.values())}, CART_TIMEOUT)
+
+    def count(self):
+        if not self.cart_id:
+            return 0
+        count = cache.get(self._key('count'))
+        if count is None:
+            count = super().count()
+        return count
+
+    def process_response(self, response):
+        if self._cookie_changed:
+            if self.cart_id:
+                response.set_cookie(
+                    self.COOKIE_NAME, self.cart_id, max_age=CART_TIMEOUT,
+                    httponly=True, samesite='Lax', secure=self.request.is_secure(),
+                )
+            else:
+                response.delete_cookie(self.COOKIE_NAME, samesite='Lax')
+        return response
+
+
+class SignedCookieCartStore(CartStore):
+    """เก็บตะกร้าทั้งก้อนใน cookie ที่ลงลายเซ็นไว้ (ไม่ใช้ storage ฝั่ง server เลย)
+
+    จำนวนชิ้นเก็บแยกใน cookie cart_count จะได้ไม่ต้องถอดตะกร้าทั้งก้อนตอนแสดง badge
+    """
+
+    COOKIE_NAME = 'cart'
+    COUNT_COOKIE_NAME = 'cart_count'
+    SALT = 'store.cart'
+
+    def __init__(self, request):
+        super().__init__(request)
+        self._pending = None
+
+    def load(self):
+        if self._pending is not None:
+            return dict(self._pending)
+        value = self.request.COOKIES.get(self.COOKIE_NAME)
+        if not value:
+            return {}
+        try:
+            data = signing.loads(value, salt=self.SALT)
+        except signing.BadSignature:
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def save(self, data):
+        self._pending = dict(data)
+
+    def count(self):
+        if self._pending is not None:
+            return sum(self._pending.values())
+        value = self.request.get_signed_cookie(self.COUNT_COOKIE_NAME, default=None, salt=self.SALT)
+        if value is None or not value.isdigit():
+            # ไม่มี cookie จำนวนชิ้น (หรือถูกแก้) นับจากตะกร้าตรงๆ
+            return super().count()
+        return int(value)
+
+    def process_response(self, response):
+        if self._pending is None:
+            return response
+        if not self._pending:
+            response.delete_cookie(self.COOKIE_NAME, samesite='Lax')
+            response.delete_cookie(self.COUNT_COOKIE_NAME, samesite='Lax')
+            return response
+        options = {
+            'max_age': CART_TIMEOUT, 'httponly': True, 'samesite': 'Lax', 'secure': self.request.is_secure(),
+        }
+        response.set_cookie(self.COOKIE_NAME, signing.dumps(self._pending, salt=self.SALT, compress=True), **options)
+        response.set_signed_cookie(self.COUNT_COOKIE_NAME, sum(self._pending.values()), salt=self.SALT, **options)
+        return response
+
+
+class UserCartStore(CartStore):
+    """ตะกร้าของผู้ใช้ที่ login: ตาราง SavedCart คือข้อมูลจริงเสมอ (load อ่าน DB ทุกครั้ง)
+
+    จำนวนชิ้นสำหรับ badge cache ไว้เฉพาะเมื่อ cache ใช้ร่วมกันทุก worker และลบทิ้งทุกครั้งที่ save
+    (ถ้าเป็น LocMem worker อื่นจะยังถือเลขเก่า -> นับจาก DB แทน)
+    """
+
+    def __init__(self, request, user=None):
+        super().__init__(request)
+        self.user = user or request.user
+
+    def _key(self, part):
+        return f'cart:user:{self.user.pk}:{part}'
+
+    def load(self):
+        saved = SavedCart.objects.filter(user=self.user).values_list('items', flat=True).first()
+        return dict(saved or {})
+
+    def save(self, data):
+        # ส่วนใหญ่มีแถวอยู่แล้ว -> UPDATE query เดียว (ไม่ต้อง SELECT ก่อนแบบ update_or_create)
+        if not SavedCart.objects.filter(user=self.user).update(items=data):
+            SavedCart.objects.get_or_create(user=self.user, defaults={'items': data})
+        # ลบแทน set: save สองอันที่ชนกันจะไม่ทิ้งเลขของอันที่แพ้ไว้ใน cache
+        cache.delete(self._key('count'))
+
+    def count(self):
+        if not is_shared_cache():
+            return super().count()
+        count = cache.get(self._key('count'))
+        if count is None:
+            count = super().count()
+            cache.set(self._key('count'), count, CART_TIMEOUT)
+        return count
+
+
+def anonymous_store_class():
+    store_class = import_string(getattr(settings, 'CART_STORE', 'store.cart_store.SignedCookieCartStore'))
+    if issubclass(store_class, CacheCartStore) and not is_shared_cache():
+        raise ImproperlyConfigured(
+            "CART_STORE=CacheCartStore needs a cache shared by every worker (set REDIS_URL or CACHE_DIR); "
+            "with the local-memory cache use SignedCookieCartStore or SessionCartStore"
+        )
+    return store_class
+
+
+def _track(request, store):
+    # middleware จะเรียก process_response ของทุก store ที่ถูกใช้ใน request นี้
+    if not hasattr(request, '_cart_stores'):
+        request._cart_stores = []
+    request._cart_stores.append(store)
+    return store
+
+
+def get_cart_store(request):
+    """store ของ request นี้ (สร้างครั้งเดียวต่อ request)"""
+    store = getattr(request, '_cart_store', None)
+    if store is None:
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            store = UserCartStore(request)
+        else:
+            store = anonymous_store_class()(request)
+        request._cart_store = _track(request, store)
+    return store
+
+
+def merge_anonymous_cart(request, user):
+    """เรียกตอน login: ย้ายของในตะกร้าของผู้ใช้ที่ไม่ได้ login เข้าตะกร้าของบัญชี แล้วล้างตะกร้าเดิม"""
+    anonymous = _track(request, anonymous_store_class()(request))
+    user_store = UserCartStore(request, user)
+    if anonymous.count():
+        user_store.merge(anonymous)
+        anonymous.clear()
+    request._cart_store = _track(request, user_store)
+    # Cart ที่เคยสร้างไว้ใน request นี้ยังอ้างถึงตะกร้าเดิม
+    request.__dict__.pop('_cart', None)
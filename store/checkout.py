@@ -0,0 +1,99 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+
+from . import notifications
+from .models import Order, OrderItem
+from .orders import build_summary
+
+MAX_KEY_LENGTH = 200
+# แขกที่เปิดหน้าตะกร้าแล้ว: ใส่ไว้ใน session ให้ cookie session ถูกส่งไปตั้งแต่ตอน render ฟอร์ม
+CHECKOUT_SESSION_KEY = 'checkout_started'
+
+
+def new_idempotency_key(request):
+    """key ใหม่สำหรับฟอร์ม checkout (เรียกตอน render หน้าตะกร้า)
+
+    แขกต้องมี session ก่อนกดสั่ง: ถ้าไปสร้างตอน POST การกดซ้ำที่ส่งมาพร้อมกันยังไม่มี cookie
+    ทั้งคู่ -> ได้ session คนละอัน owner คนละคน key ไม่ชนกัน -> order ซ้ำ
+    """
+    if not request.user.is_authenticated:
+        # session ว่างจะไม่ถูกบันทึกและไม่ได้ cookie
+        request.session[CHECKOUT_SESSION_KEY] = True
+    return uuid.uuid4().hex
+
+
+def idempotency_key(request):
+    """key กันสั่งซื้อซ้ำจากฟอร์ม (hidden input) หรือ header Idempotency-Key
+
+    ผูก key กับผู้ใช้/session ก่อนเก็บ คนอื่นใช้ key เดียวกันจะไม่ได้ order ของเรากลับไป
+    แขกที่ไม่มี session จากหน้าตะกร้า (new_idempotency_key) -> None (สั่งได้แต่ไม่กันซ้ำ)
+    """
+    key = request.POST.get('idempotency_key') or request.headers.get('Idempotency-Key')
+    if not key or len(key) > MAX_KEY_LENGTH:
+        return None
+    if request.user.is_authenticated:
+        owner = f'user:{request.user.pk}'
+    elif request.session.get(CHECKOUT_SESSION_KEY):
+        owner = f'session:{request.session.session_key}'
+    else:
+        return None
+    return hashlib.sha256(f'{owner}:{key}'.encode()).hexdigest()
+
+
+def _order_message(order, snapshot):
+    lines = [
+        f"🔔 **ออเดอร์ใหม่มาแล้ว! (#{order.id})**",
+        f"👤 ลูกค้า: **{order.customer_name}**",
+        "---------------------------------",
+    ]
+    for item in snapshot['items']:
+        product = item['product']
+        lines.append(f"📦 {product.name} x {item['quantity']} = {product.price * item['quantity']} บ.")
+    lines.append("---------------------------------")
+    lines.append(f"💰 **ยอดรวม: {snapshot['total_price']} บาท**")
+    return '\n'.join(lines)
+
+
+def place_order(snapshot, customer_name, user=None, key=None):
+    """สร้าง Order + OrderItem ทั้งหมด + แจ้งเตือน ใน transaction เดียว
+
+    คืนค่า (order, created) ถ้า key นี้เคยสั่งไปแล้ว (กดซ้ำ/retry) คืน order เดิม created=False
+    """
+    if key:
+        existing = Order.objects.filter(idempotency_key=key).first()
+        if existing is not None:
+            return existing, False
+
+    try:
+        # คำสั่งแรกใน transaction เป็น INSERT: บน SQLite ได้ lock เขียนทันที request ที่มาพร้อมกันรอตาม
+        # timeout ของ connection แทนที่จะอ่านก่อนแล้วไปชน "database is locked" ตอนจะเขียน
+        with transaction.atomic():
+            order = Order.objects.create(
+                customer_name=customer_name,
+                user=user,
+                total_price=snapshot['total_price'],
+                paid=False,
+                summary=build_summary(snapshot['items']),
+                idempotency_key=key,
+            )
+            OrderItem.objects.bulk_create([
+                OrderItem(
+                    order=order,
+                    product=item['product'],
+                    quantity=item['quantity'],
+                    price=item['product'].price,
+                )
+                for item in snapshot['items']
+            ])
+            # แถว outbox commit พร้อม order (order ไม่สำเร็จ = ไม่มีข้อความหลุดไป Discord)
+            notifications.enqueue(settings.DISCORD_ORDER_WEBHOOK_URL, _order_message(order, snapshot))
+    except IntegrityError:
+        # อีก request ที่ใช้ key เดียวกันสร้าง order ไปก่อนแล้ว (unique index กันไว้)
+        if not key:
+            raise
+        return Order.objects.get(idempotency_key=key), False
+
+    return order, True
@@ -1,7 +1,6 @@
-from .models import Product
+from .cart import Cart
 
 def cart_count(request):
-    cart = request.session.get('cart', {})
-    # เอายอดจำนวนของสินค้าทุกชิ้นมารวมกัน
-    count = sum(cart.values())
-    return {'cart_count': count}
\ No newline at end of file
+    # ใช้ Cart ตัวเดียวกับ view (ถ้า view คิดราคาไปแล้วจะได้ยอดจาก snapshot เดียวกัน)
+    count = Cart.for_request(request).count
+    return {'cart_count': count}
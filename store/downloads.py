@@ -0,0 +1,188 @@
+import hashlib
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import content_disposition_header
+
+from .models import Entitlement, Order, OrderItem
+
+CHUNK_SIZE = 64 * 1024
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+# ---------- สิทธิ์ดาวน์โหลด ----------
+
+def has_entitlement(user, product_id):
+    """เช็คสิทธิ์ดาวน์โหลด: query เดียวบน unique index (user, product)"""
+    if user.is_superuser:
+        return True
+    return Entitlement.objects.filter(user=user, product_id=product_id).exists()
+
+
+def grant_for_order(order):
+    """ให้สิทธิ์ดาวน์โหลดทุกสินค้าใน order ที่จ่ายแล้ว (เรียกซ้ำได้ แถวที่มีอยู่แล้วจะถูกข้าม)"""
+    if order.user_id is None:
+        return 0
+    product_ids = set(OrderItem.objects.filter(order=order).values_list('product_id', flat=True))
+    Entitlement.objects.bulk_create(
+        [Entitlement(user_id=order.user_id, product_id=product_id, order=order) for product_id in product_ids],
+        ignore_conflicts=True,
+    )
+    return len(product_ids)
+
+
+def revoke_for_order(order):
+    """order ถูกยกเลิก paid -> ถอนสิทธิ์ที่ได้มาจาก order นี้
+
+    ถ้าผู้ใช้ยังมี order อื่นที่จ่ายแล้วและมีสินค้าเดียวกัน ให้สิทธิ์กลับมาจาก order นั้นแทน
+    """
+    revoked = Entitlement.objects.filter(order=order)
+    user_ids = set(revoked.values_list('user_id', flat=True))
+    if not user_ids:
+        return
+    revoked.delete()
+    for other in Order.objects.filter(user_id__in=user_ids, paid=True).exclude(pk=order.pk):
+        grant_for_order(other)
+
+
+# ---------- ส่งไฟล์ ----------
+
+def _local_path(field_file):
+    # storage บนเครื่อง (FileSystemStorage) มี path() ส่วน storage ระยะไกล (Cloudinary) ไม่มี
+    try:
+        return field_file.storage.path(field_file.name)
+    except NotImplementedError:
+        return None
+
+
+def _content_type(filename):
+    return mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+
+def _etag(field_file, size, path):
+    parts = [field_file.name, str(size)]
+    if path:
+        parts.append(str(int(os.path.getmtime(path))))
+    return '"%s"' % hashlib.md5(':'.join(parts).encode()).hexdigest()
+
+
+def parse_range(header, size):
+    """แปลง header Range (รองรับช่วงเดียว) เป็น (start, end) แบบรวมปลาย
+
+    คืนค่า None ถ้าไม่มี/ไม่รองรับ (ส่งทั้งไฟล์), คืน False ถ้าช่วงอยู่นอกไฟล์ (416)
+    """
+    if not header:
+        return None
+    match = _RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # bytes=-500 = 500 ไบต์สุดท้าย
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _stream(f, start, length):
+    """อ่านไฟล์ทีละ chunk (ไม่โหลดทั้งไฟล์ขึ้น memory)"""
+    try:
+        if start:
+            try:
+                f.seek(start)
+            except (AttributeError, OSError, ValueError):
+                # ไฟล์ที่ seek ไม่ได้: อ่านทิ้งจนถึงจุดเริ่ม
+                remaining = start
+                while remaining > 0:
+                    skipped = f.read(min(CHUNK_SIZE, remaining))
+                    if not skipped:
+                        break
+                    remaining -= len(skipped)
+        remaining = length
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        f.close()
+
+
+def serve_file(request, field_file, filename=None):
+    """ส่งไฟล์ให้ดาวน์โหลด รองรับ ETag/If-None-Match, Range และ X-Sendfile/X-Accel-Redirect
+
+    settings.DOWNLOAD_OFFLOAD:
+      None              -> Django ส่งไฟล์เอง (ค่าเริ่มต้น)
+      'x-sendfile'      -> Apache/lighttpd ส่งไฟล์จาก path จริง
+      'x-accel-redirect'-> nginx ส่งไฟล์จาก DOWNLOAD_ACCEL_PREFIX + ชื่อไฟล์
+    """
+    filename = filename or os.path.basename(field_file.name)
+    path = _local_path(field_file)
+    try:
+        size = os.path.getsize(path) if path else field_file.storage.size(field_file.name)
+        etag = _etag(field_file, size, path)
+    except OSError:
+        # แถวใน DB ยังอ้างถึงไฟล์ที่ถูกลบ/ย้ายไปแล้ว
+        raise Http404("ไม่พบไฟล์สคริปต์")
+
+    if etag in [tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')]:
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    offload = getattr(settings, 'DOWNLOAD_OFFLOAD', None)
+    if path and offload:
+        # ให้ web server ส่งไฟล์เอง (จัดการ Range ให้ด้วย) worker ของ Django ว่างทันที
+        response = HttpResponse(content_type=_content_type(filename))
+        if offload == 'x-sendfile':
+            response['X-Sendfile'] = path
+        else:
+            prefix = getattr(settings, 'DOWNLOAD_ACCEL_PREFIX', '/protected/')
+            response['X-Accel-Redirect'] = prefix + field_file.name
+        response['Content-Disposition'] = content_disposition_header(True, filename)
+        response['ETag'] = etag
+        return response
+
+    byte_range = parse_range(request.headers.get('Range'), size)
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    try:
+        f = open(path, 'rb') if path else field_file.storage.open(field_file.name, 'rb')
+    except OSError:
+        raise Http404("ไม่พบไฟล์สคริปต์")
+
+    if byte_range is None:
+        if path:
+            response = FileResponse(f, as_attachment=True, filename=filename)
+            # ค่าเริ่มต้นของ FileResponse อ่านทีละ 4KB ช้าเกินไปสำหรับไฟล์ใหญ่
+            response.block_size = CHUNK_SIZE
+        else:
+            response = StreamingHttpResponse(_stream(f, 0, size), content_type=_content_type(filename))
+            response['Content-Length'] = str(size)
+            response['Content-Disposition'] = content_disposition_header(True, filename)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(_stream(f, start, length), status=206, content_type=_content_type(filename))
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(length)
+        response['Content-Disposition'] = content_disposition_header(True, filename)
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    return response
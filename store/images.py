@@ -0,0 +1,92 @@
+import io
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+# รูปย่อที่สร้างให้ทุกรูป: ความกว้าง (px) x รูปแบบไฟล์
+DEFAULT_WIDTHS = (320, 640, 1024)
+FORMATS = (
+    # (นามสกุล, ชื่อ format ของ Pillow, options)
+    ('webp', 'WEBP', {'quality': 80, 'method': 4}),
+    ('jpg', 'JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+)
+
+
+def derivative_name(source_name, width, ext):
+    """products/foo.png -> products/derivatives/foo_w320.webp (เก็บข้างๆ ไฟล์ต้นฉบับ)"""
+    folder, filename = os.path.split(source_name)
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(folder, 'derivatives', f'{stem}_w{width}.{ext}')
+
+
+def _flatten(image):
+    from PIL import Image
+
+    # JPEG ไม่มี alpha: วาง PNG โปร่งใสลงพื้นขาวก่อน
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.split()[-1])
+        return background
+    return image.convert('RGB')
+
+
+def build_derivatives(source_name, storage=None, widths=None):
+    """สร้างรูปย่อทุกขนาด/ทุก format ของไฟล์ใน storage แล้วคืนค่าข้อมูลที่จะเก็บลง *_variants
+
+    ไม่แตะ database เลย เลยเรียกจาก process pool ได้ (ดู management command generate_image_derivatives)
+    """
+    from PIL import Image, ImageOps
+
+    storage = storage or default_storage
+    widths = widths or getattr(settings, 'IMAGE_DERIVATIVE_WIDTHS', DEFAULT_WIDTHS)
+
+    with storage.open(source_name, 'rb') as f:
+        data = f.read()
+
+    image = Image.open(io.BytesIO(data))
+    image = ImageOps.exif_transpose(image)
+    rgb = _flatten(image)
+
+    variants = []
+    # ขนาดที่ใหญ่กว่าต้นฉบับไม่ต้องทำ (แต่อย่างน้อยต้องมี 1 ขนาด)
+    targets = [w for w in sorted(widths) if w < image.width] or [image.width]
+    for width in targets:
+        height = round(image.height * width / image.width)
+        resized = rgb.resize((width, height), Image.LANCZOS)
+        for ext, pil_format, options in FORMATS:
+            buffer = io.BytesIO()
+            resized.save(buffer, pil_format, **options)
+            name = derivative_name(source_name, width, ext)
+            if storage.exists(name):
+                storage.delete(name)
+            saved_name = storage.save(name, ContentFile(buffer.getvalue()))
+            variants.append({
+                'width': width,
+                'format': ext,
+                'name': saved_name,
+                'bytes': buffer.tell(),
+            })
+
+    return {
+        'source': source_name,
+        'original_bytes': len(data),
+        'original_width': image.width,
+        'variants': variants,
+    }
+
+
+def bytes_saved(info):
+    """ไบต์ที่ประหยัดได้ถ้า browser โหลดรูป WebP ขนาดใหญ่สุดแทนต้นฉบับ"""
+    if not info:
+        return 0
+    webp = [v['bytes'] for v in info.get('variants', []) if v['format'] == 'webp']
+    if not webp:
+        return 0
+    return info['original_bytes'] - max(webp)
+
+
+def needs_derivatives(field_file, info):
+    return bool(field_file) and (info or {}).get('source') != field_file.name
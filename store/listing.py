@@ -0,0 +1,124 @@
+import base64
+import json
+
+from django.conf import settings
+from django.db.models import Count, Q
+from django.utils.dateparse import parse_datetime
+
+from .models import Product
+from .search import search_products
+
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values):
+    raw = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+    if not isinstance(values, list) or len(values) != 2:
+        raise InvalidCursor(cursor)
+    return values
+
+
+def get_page_size(value):
+    default = getattr(settings, 'STORE_PAGE_SIZE', 24)
+    try:
+        page_size = int(value) if value else default
+    except ValueError:
+        page_size = default
+    return max(1, min(page_size, MAX_PAGE_SIZE))
+
+
+# ค่าใน cursor มาจาก client (แก้เองได้) ต้องเป็นตัวเลขที่ DB เก็บได้จริง ไม่งั้น query ล้มเป็น 500
+_MAX_INT = 2 ** 63
+
+
+def _cursor_int(value, cursor):
+    if isinstance(value, bool) or not isinstance(value, int) or not -_MAX_INT <= value < _MAX_INT:
+        raise InvalidCursor(cursor)
+    return value
+
+
+def _keyset(queryset, key, cursor):
+    """ตัดแถวที่อยู่ก่อน cursor ออก (เรียง key จากมากไปน้อย, id เป็นตัวตัดสินเสมอ)"""
+    if not cursor:
+        return queryset
+    value, last_id = decode_cursor(cursor)
+    if key == 'created_at':
+        try:
+            value = parse_datetime(value) if isinstance(value, str) else None
+        except ValueError:
+            # รูปแบบถูกแต่วันที่ไม่มีจริง เช่น เดือน 13
+            value = None
+        if value is None:
+            raise InvalidCursor(cursor)
+    else:
+        value = _cursor_int(value, cursor)
+    last_id = _cursor_int(last_id, cursor)
+    return queryset.filter(Q(**{f'{key}__lt': value}) | Q(**{key: value, 'id__lt': last_id}))
+
+
+def category_facets(queryset):
+    """จำนวนสินค้าในแต่ละหมวดหมู่ (GROUP BY query เดียว)"""
+    rows = (
+        queryset.order_by()
+        .values('category_id', 'category__name')
+        .annotate(count=Count('id'))
+        .order_by('category__name')
+    )
+    return [
+        {'id': row['category_id'], 'name': row['category__name'] or 'Uncategorized', 'count': row['count']}
+        for row in rows
+    ]
+
+
+def product_page(query=None, category_id=None, cursor=None, page_size=None):
+    """โหลดสินค้า 1 หน้าแบบ keyset (cursor) + facet หมวดหมู่
+
+    - ไม่ค้นหา: เรียงตาม (created_at, id) ใหม่สุดก่อน
+    - ค้นหา: เรียงตาม (search_score, id) ตามความเกี่ยวข้อง
+    ทุกหน้ามีต้นทุนเท่ากันเพราะไม่มี OFFSET
+    """
+    page_size = get_page_size(page_size)
+
+    if query:
+        base = search_products(query)
+        key = 'search_score'
+    else:
+        base = Product.objects.all()
+        key = 'created_at'
+
+    # facet คิดจากผลก่อนกรองหมวดหมู่ จะได้เห็นจำนวนของทุกหมวด
+    facets = category_facets(base)
+
+    products = base
+    if category_id:
+        products = products.filter(category_id=category_id)
+
+    products = _keyset(products, key, cursor).select_related('category').order_by(f'-{key}', '-id')
+    items = list(products[:page_size + 1])
+
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        last = items[-1]
+        value = getattr(last, key)
+        next_cursor = encode_cursor([value.isoformat() if key == 'created_at' else value, last.id])
+
+    return {
+        'products': items,
+        'facets': facets,
+        'next_cursor': next_cursor,
+        'page_size': page_size,
+    }
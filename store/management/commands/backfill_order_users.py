@@ -0,0 +1,45 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from store.models import Order
+
+
+class Command(BaseCommand):
+    help = "เติม Order.user ให้ order เก่า โดยจับคู่ customer_name กับ username (ทำทีละ batch)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        batch_size = options['batch_size']
+
+        orders = Order.objects.filter(user__isnull=True).order_by('id')
+        last_id = 0
+        scanned = linked = 0
+
+        # เดินตาม id (order ที่ไม่มี username ตรงจะยัง user ว่างอยู่ ต้องไม่วนกลับมาเจออีก)
+        while True:
+            batch = list(orders.filter(id__gt=last_id).only('id', 'customer_name')[:batch_size])
+            if not batch:
+                break
+            last_id = batch[-1].id
+            scanned += len(batch)
+
+            names = {order.customer_name for order in batch}
+            users = dict(User.objects.filter(username__in=names).values_list('username', 'id'))
+
+            matched = []
+            for order in batch:
+                user_id = users.get(order.customer_name)
+                if user_id is not None:
+                    order.user_id = user_id
+                    matched.append(order)
+            # bulk_update ไม่ยิง signal -> ไม่ไปสร้าง Entitlement/รูปย่อซ้ำ
+            Order.objects.bulk_update(matched, ['user'])
+            linked += len(matched)
+            self.stdout.write(f"{scanned} order(s) scanned, {linked} linked...")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. {linked} of {scanned} order(s) linked to a user."
+        ))
@@ -0,0 +1,79 @@
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from store.cart_store import UserCartStore
+from store.models import Category, Product
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "วัดจำนวน query / เวลาของหน้าตะกร้า (cart_detail) ตามจำนวนรายการในตะกร้า "
+        "จำนวน query ต้องเท่ากันทุกขนาด ไม่งั้นจบด้วย error (rollback ทุกอย่างตอนจบ)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1,10,50,200', help='จำนวนรายการในตะกร้าที่จะวัด คั่นด้วย ,')
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        try:
+            sizes = sorted({int(size) for size in options['sizes'].split(',')})
+        except ValueError:
+            raise CommandError("--sizes ต้องเป็นตัวเลขคั่นด้วย , เช่น 1,10,50")
+        try:
+            with transaction.atomic():
+                counts = self.run(sizes, options['repeat'])
+                raise Rollback
+        except Rollback:
+            self.stdout.write("(rolled back seeded data)")
+        if len(set(counts)) > 1:
+            raise CommandError(f"query count grows with cart size: {counts}")
+
+    def run(self, sizes, repeat):
+        category = Category.objects.create(name='Bench Cart Category')
+        products = Product.objects.bulk_create([
+            Product(name=f'Bench product {i}', description='-', price=10 + i, image='products/bench.jpg', category=category)
+            for i in range(max(sizes))
+        ])
+        user = User.objects.create_user(username='bench_cart_user')
+        # เขียนผ่าน store (SavedCart + cache) เหมือนตอนผู้ใช้กด add-to-cart
+        cart = UserCartStore(None, user)
+        client = Client()
+        client.force_login(user)
+        url = reverse('store:cart_detail')
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"cart_detail, {repeat} requests per size"))
+        self.stdout.write(f"{'lines':>6} {'queries':>8} {'p50 ms':>8} {'min ms':>8}")
+        counts = []
+        for size in sizes:
+            cart.save({str(product.id): 1 + i % 3 for i, product in enumerate(products[:size])})
+            client.get(url, HTTP_HOST='localhost')  # warm-up (template / cache ของตะกร้า)
+
+            # request_started ล้าง queries_log: เริ่มนับจาก log ว่าง
+            reset_queries()
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(url, HTTP_HOST='localhost')
+            if response.status_code != 200:
+                raise CommandError(f"cart_detail returned {response.status_code}")
+            counts.append(len(queries.captured_queries))
+
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                client.get(url, HTTP_HOST='localhost')
+                timings.append((time.perf_counter() - started) * 1000)
+            self.stdout.write(
+                f"{size:>6} {counts[-1]:>8} {statistics.median(timings):>8.2f} {min(timings):>8.2f}"
+            )
+        return counts
@@ -0,0 +1,128 @@
+import statistics
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import Client, RequestFactory
+from django.test.utils import override_settings
+from django.urls import resolve, reverse
+from django.utils import timezone
+
+from config.metrics import MetricsMiddleware, render_metrics
+from tasks.models import Sprint, Task, Team, TeamMember
+
+METRICS_MIDDLEWARE = 'config.metrics.MetricsMiddleware'
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "วัด overhead ของ MetricsMiddleware: ยิง request ชุดเดียวกันสลับกันระหว่างเปิด/ปิด middleware "
+        "แล้วเทียบเวลาเฉลี่ยต่อ request (rollback ข้อมูลที่สร้างตอนจบ)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=300, help='จำนวน request ต่อ path ต่อรอบ')
+        parser.add_argument('--rounds', type=int, default=9)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            self.stdout.write("(rolled back seeded data)")
+
+    def seed(self):
+        today = timezone.localdate()
+        user = User.objects.create_user(username='bench_metrics_user')
+        team = Team.objects.create(name='Bench Metrics Team')
+        TeamMember.objects.create(user=user, team=team, role='OWNER')
+        sprint = Sprint.objects.create(
+            name='Bench Sprint', team=team, created_by=user,
+            start_date=today, end_date=today + timedelta(days=14), is_active=True,
+        )
+        Task.objects.bulk_create([
+            Task(title=f'Task {i}', status=['TODO', 'IN_PROGRESS', 'DONE'][i % 3], rank=f'{i:04d}i',
+                 team=team, created_by=user, sprint=sprint if i % 2 else None)
+            for i in range(200)
+        ])
+        return user, team
+
+    def client(self, user, middleware):
+        # Client ใหม่ = โหลด middleware ตาม settings ตอนนั้น
+        with override_settings(MIDDLEWARE=middleware):
+            client = Client()
+            client.force_login(user)
+            client.get('/', HTTP_HOST='localhost')
+        return client
+
+    def run(self, options):
+        user, team = self.seed()
+        paths = [
+            f"{reverse('tasks:board')}?team_id={team.id}",
+            f"{reverse('tasks:task_changes')}?team_id={team.id}&since=0",
+            reverse('store:product_list'),
+        ]
+        with_metrics = list(settings.MIDDLEWARE)
+        without_metrics = [name for name in with_metrics if name != METRICS_MIDDLEWARE]
+        setups = {'with metrics': with_metrics, 'without': without_metrics}
+        count = options['requests']
+
+        timings = {label: {path: [] for path in paths} for label in setups}
+        for round_ in range(options['rounds']):
+            # สลับกันทีละรอบ (และสลับว่าใครได้ไปก่อน) ลดผลของเครื่องที่เร็ว/ช้าลงระหว่างวัด
+            order = list(setups.items())
+            if round_ % 2:
+                order.reverse()
+            for label, middleware in order:
+                with override_settings(MIDDLEWARE=middleware):
+                    client = self.client(user, middleware)
+                    for path in paths:
+                        started = time.perf_counter()
+                        for _ in range(count):
+                            client.get(path, HTTP_HOST='localhost')
+                        timings[label][path].append((time.perf_counter() - started) / count * 1000)
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"\nmedian ms per request ({options['rounds']} rounds x {count} requests)"
+        ))
+        self.stdout.write(f"{'path':<40} {'without':>9} {'with':>9} {'overhead':>9}")
+        totals = {label: 0 for label in setups}
+        for path in paths:
+            without = statistics.median(timings['without'][path])
+            with_ = statistics.median(timings['with metrics'][path])
+            totals['without'] += without
+            totals['with metrics'] += with_
+            self.stdout.write(f"{path[:40]:<40} {without:9.3f} {with_:9.3f} {(with_ / without - 1) * 100:8.1f}%")
+        self.stdout.write(
+            f"{'all paths':<40} {totals['without']:9.3f} {totals['with metrics']:9.3f} "
+            f"{(totals['with metrics'] / totals['without'] - 1) * 100:8.1f}%"
+        )
+
+        # ต้นทุนของ middleware เองล้วนๆ (view ว่างที่ไม่ทำอะไร ไม่มี noise ของ view จริง)
+        request = RequestFactory().get(paths[-1])
+        request.resolver_match = resolve(paths[-1])
+        response = HttpResponse()
+        middleware = MetricsMiddleware(lambda request: response)
+        calls = 50000
+        started = time.perf_counter()
+        for _ in range(calls):
+            middleware(request)
+        self.stdout.write(
+            f"\nMetricsMiddleware alone: {(time.perf_counter() - started) / calls * 1e6:.1f} µs per request"
+        )
+
+        started = time.perf_counter()
+        body = render_metrics()
+        self.stdout.write(
+            f"render /metrics/: {(time.perf_counter() - started) * 1000:.2f} ms, "
+            f"{len(body.splitlines())} lines"
+        )
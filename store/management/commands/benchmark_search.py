@@ -0,0 +1,99 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from store.models import Category, Product, ProductSearchToken
+from store.search import build_tokens, search_products
+
+# คำที่ใช้สร้างชื่อ/รายละเอียดสินค้าปลอม (มีทั้งอังกฤษ ตัวเลข และไทย)
+WORDS = [
+    'script', 'admin', 'gui', 'auto', 'farm', 'tycoon', 'obby', 'simulator', 'combat', 'pet', 'fly', 'teleport',
+    'inventory', 'shop', 'quest', 'npc', 'ui', 'animation', 'camera', 'vehicle', 'sword', 'gun', 'tool', 'map',
+    'สคริปต์', 'ระบบ', 'ร้านค้า', 'ต่อสู้', 'ฟาร์ม', 'สัตว์เลี้ยง', 'แอนิเมชัน', 'กล้อง', 'ยานพาหนะ', 'ภารกิจ',
+]
+CATEGORIES = ['Scripts', 'Maps', 'UI Kits', 'Models', 'ระบบเกม', 'แอนิเมชัน']
+QUERIES = ['4242', 'tele', 'pet sim', 'script', 'สคริปต์', 'ร้าน', 'combat sword', 'nothing-matches']
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "seed แคตตาล็อกสินค้าปลอม (ค่าเริ่มต้น 100k ชิ้น) แล้วเทียบเวลาค้นหาผ่านตาราง token (store/search.py) "
+        "กับ name/description/category icontains แบบเดิม (rollback ทุกอย่างตอนจบ)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=100000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--query', action='append', dest='queries', help='คำค้น (ใส่ซ้ำได้ ค่าเริ่มต้นชุด QUERIES)')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            self.stdout.write("(rolled back seeded data)")
+
+    def seed(self, options):
+        rng = random.Random(options['seed'])
+        categories = Category.objects.bulk_create([Category(name=name) for name in CATEGORIES])
+        started = time.perf_counter()
+        total = options['products']
+        tokens = 0
+        for offset in range(0, total, 5000):
+            products = Product.objects.bulk_create([
+                Product(
+                    name=' '.join(rng.sample(WORDS, 3)) + f' {i}',
+                    description=' '.join(rng.choices(WORDS, k=12)),
+                    price=rng.randint(10, 500), image='products/bench.jpg', category=rng.choice(categories),
+                )
+                for i in range(offset, min(offset + 5000, total))
+            ])
+            # bulk_create ไม่ยิง signal: สร้าง token เองด้วย build_tokens ตัวเดียวกับ index_product
+            rows = [
+                ProductSearchToken(product=product, token=token, weight=weight)
+                for product in products
+                for token, weight in build_tokens(product).items()
+            ]
+            ProductSearchToken.objects.bulk_create(rows, batch_size=5000)
+            tokens += len(rows)
+        self.stdout.write(f"seeded {total} products, {tokens} tokens in {time.perf_counter() - started:.1f}s")
+
+    def timed(self, repeat, run):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = run()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings), result
+
+    def run(self, options):
+        self.seed(options)
+        repeat = options['repeat']
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\nfirst page of 24, median of {repeat}"))
+        self.stdout.write(f"{'query':<16} {'token ms':>9} {'hits':>6} {'icontains ms':>13} {'hits':>6}")
+        for query in options['queries'] or QUERIES:
+            def indexed():
+                results = search_products(query)
+                return len(results[:24]), results.count()
+
+            def icontains():
+                results = Product.objects.filter(
+                    Q(name__icontains=query) | Q(description__icontains=query) | Q(category__name__icontains=query)
+                ).order_by('-created_at', '-id')
+                return len(results[:24]), results.count()
+
+            indexed_ms, (_, indexed_hits) = self.timed(repeat, indexed)
+            icontains_ms, (_, icontains_hits) = self.timed(repeat, icontains)
+            self.stdout.write(
+                f"{query:<16} {indexed_ms:>9.1f} {indexed_hits:>6} {icontains_ms:>13.1f} {icontains_hits:>6}"
+            )
@@ -0,0 +1,65 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from store.images import build_derivatives, bytes_saved
+from store.models import Product, Order
+
+# (model, ชื่อฟิลด์รูป)
+TARGETS = [
+    (Product, 'image'),
+    (Order, 'slip_image'),
+]
+
+
+def _build(source_name):
+    # รันใน process ลูก: ทำแค่อ่าน/เขียนไฟล์ใน storage ไม่แตะ database
+    return build_derivatives(source_name)
+
+
+class Command(BaseCommand):
+    help = "สร้างรูปย่อ (WebP/JPEG หลายขนาด) ให้รูปสินค้าและสลิปที่ยังไม่มี ด้วย process pool"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None, help='จำนวน process (ค่าเริ่มต้น = จำนวน CPU)')
+        parser.add_argument('--force', action='store_true', help='สร้างใหม่ทั้งหมดแม้มีรูปย่ออยู่แล้ว')
+
+    def handle(self, *args, **options):
+        jobs = []
+        for model, field_name in TARGETS:
+            variants_field = f'{field_name}_variants'
+            rows = model.objects.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+            for pk, name, info in rows.values_list('pk', field_name, variants_field).iterator():
+                if options['force'] or (info or {}).get('source') != name:
+                    jobs.append((model, pk, variants_field, name))
+
+        if not jobs:
+            self.stdout.write("Nothing to do.")
+            return
+
+        # ปิด connection ก่อน fork กัน process ลูกใช้ socket ของ DB ร่วมกัน
+        connections.close_all()
+
+        total_saved = 0
+        failed = 0
+        with ProcessPoolExecutor(max_workers=options['workers']) as pool:
+            futures = {pool.submit(_build, name): (model, pk, field, name) for model, pk, field, name in jobs}
+            for future in as_completed(futures):
+                model, pk, variants_field, name = futures[future]
+                try:
+                    info = future.result()
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(f"{name}: {e}")
+                    continue
+                model.objects.filter(pk=pk).update(**{variants_field: info})
+                saved = bytes_saved(info)
+                total_saved += saved
+                self.stdout.write(
+                    f"{name}: {info['original_bytes']:,} -> {len(info['variants'])} variants, saved {saved:,} bytes"
+                )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. {len(jobs) - failed} image(s), {failed} failed, {total_saved:,} bytes saved."
+        ))
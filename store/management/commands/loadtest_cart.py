@@ -0,0 +1,82 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from config.caching import is_shared_cache
+from store.models import Product, SavedCart
+
+BACKENDS = {
+    'session': 'store.cart_store.SessionCartStore',
+    'cache': 'store.cart_store.CacheCartStore',
+    'signed_cookie': 'store.cart_store.SignedCookieCartStore',
+}
+
+
+class Command(BaseCommand):
+    help = "วัด throughput ของ add-to-cart หลาย session พร้อมกัน เทียบ cart store แต่ละแบบ (+ ผู้ใช้ที่ login)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sessions', type=int, default=16)
+        parser.add_argument('--adds', type=int, default=25, help="จำนวนครั้งที่กด add-to-cart ต่อ session")
+        parser.add_argument('--concurrency', type=int, default=8)
+
+    def handle(self, *args, **options):
+        product_ids = list(Product.objects.values_list('id', flat=True)[:10])
+        if not product_ids:
+            raise CommandError("ต้องมีสินค้าอย่างน้อย 1 ชิ้น")
+        sessions, adds = options['sessions'], options['adds']
+
+        def add_many(client):
+            for i in range(adds):
+                url = reverse('store:add_to_cart', args=[product_ids[i % len(product_ids)]])
+                client.get(url, HTTP_HOST='localhost')
+            return client
+
+        def run(label, clients):
+            # นับ query ของ request เดียวแยกไว้ก่อน (CaptureQueriesContext ใช้กับหลาย thread ไม่ได้)
+            probe = clients[0]
+            url = reverse('store:add_to_cart', args=[product_ids[0]])
+            probe.get(url, HTTP_HOST='localhost')  # ครั้งแรกอาจต้องสร้างแถว/ cookie ไม่นับ
+            # request_started ล้าง queries_log ต้องเริ่มจาก log ว่าง ไม่งั้นนับผิด
+            reset_queries()
+            with CaptureQueriesContext(connection) as queries:
+                probe.get(url, HTTP_HOST='localhost')
+            per_request = len(queries.captured_queries)
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+                list(pool.map(add_many, clients))
+            elapsed = time.perf_counter() - started
+            total = sessions * adds
+            self.stdout.write(f"{label:<14} {total / elapsed:8.1f} adds/s  {per_request} queries/add")
+
+        cache.clear()
+        for label, path in BACKENDS.items():
+            if label == 'cache' and not is_shared_cache():
+                self.stdout.write(f"{label:<14} ข้าม (LocMem แยกกันคนละ worker ตั้ง REDIS_URL หรือ CACHE_DIR ก่อน)")
+                continue
+            with override_settings(CART_STORE=path):
+                run(label, [Client() for _ in range(sessions)])
+
+        User = get_user_model()
+        users = [
+            User.objects.get_or_create(username=f'loadtest_cart_{i}')[0]
+            for i in range(sessions)
+        ]
+        clients = []
+        for user in users:
+            client = Client()
+            client.force_login(user)
+            clients.append(client)
+        try:
+            run('logged in', clients)
+        finally:
+            SavedCart.objects.filter(user__in=users).delete()
+            User.objects.filter(id__in=[user.id for user in users]).delete()
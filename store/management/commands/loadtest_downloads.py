@@ -0,0 +1,86 @@
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+
+from store.downloads import serve_file
+
+
+class RemoteLikeStorage(FileSystemStorage):
+    """storage ที่ไม่มี path() เหมือน Cloudinary -> บังคับให้ serve_file อ่านแบบ stream"""
+
+    def path(self, name):
+        raise NotImplementedError("This backend doesn't support absolute paths.")
+
+    def _real_path(self, name):
+        return super().path(name)
+
+    def size(self, name):
+        return os.path.getsize(self._real_path(name))
+
+    def _open(self, name, mode='rb'):
+        return File(open(self._real_path(name), mode))
+
+
+class Command(BaseCommand):
+    help = "วัดความเร็วการดาวน์โหลดสคริปต์พร้อมกันหลายคน (ทั้งไฟล์ / Range / 304 / storage ระยะไกล)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size-kb', type=int, default=2048)
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--range-kb', type=int, default=256, help="ขนาดแต่ละช่วงตอนทดสอบ Range")
+
+    def handle(self, *args, **options):
+        size = options['size_kb'] * 1024
+        total = options['requests']
+        range_size = options['range_kb'] * 1024
+        factory = RequestFactory()
+
+        tmpdir = tempfile.mkdtemp()
+        try:
+            name = 'script_files/bench.lua'
+            os.makedirs(os.path.join(tmpdir, 'script_files'))
+            with open(os.path.join(tmpdir, name), 'wb') as f:
+                f.write(os.urandom(size))
+
+            local = SimpleNamespace(name=name, storage=FileSystemStorage(location=tmpdir))
+            remote = SimpleNamespace(name=name, storage=RemoteLikeStorage(location=tmpdir))
+            etag = serve_file(factory.get('/'), local)['ETag']
+
+            def download(field_file, headers):
+                response = serve_file(factory.get('/', headers=headers), field_file)
+                body = b''.join(response.streaming_content) if response.streaming else response.content
+                response.close()
+                return response.status_code, len(body)
+
+            def run(label, field_file, headers_for):
+                started = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+                    results = list(pool.map(lambda i: download(field_file, headers_for(i)), range(total)))
+                elapsed = time.perf_counter() - started
+                sent = sum(length for _, length in results)
+                statuses = sorted({status for status, _ in results})
+                self.stdout.write(
+                    f"{label:<14} {total / elapsed:8.1f} req/s  {sent / elapsed / 1024 / 1024:8.1f} MB/s  status={statuses}"
+                )
+
+            def byte_range(i):
+                start = (i * range_size) % size
+                return {'Range': f'bytes={start}-{start + range_size - 1}'}
+
+            self.stdout.write(f"file {options['size_kb']} KB, {total} requests, concurrency {options['concurrency']}")
+            run('local full', local, lambda i: {})
+            run('local range', local, byte_range)
+            run('remote full', remote, lambda i: {})
+            run('remote range', remote, byte_range)
+            run('not modified', local, lambda i: {'If-None-Match': etag})
+        finally:
+            shutil.rmtree(tmpdir)
@@ -0,0 +1,131 @@
+import json
+import threading
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from store.models import Notification
+from store.notifications import DISCORD_MAX_CONTENT, Dispatcher
+
+
+class Rollback(Exception):
+    pass
+
+
+class StubWebhook(BaseHTTPRequestHandler):
+    """Discord webhook ปลอม: /ok ตอบ 204, /limited ตอบ 429 ครั้งแรกแล้ว 204, /error ตอบ 500 เสมอ"""
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        server = self.server
+        with server.lock:
+            server.posts.append((self.path, body))
+            limited = self.path == '/limited' and not server.limited_once
+            if limited:
+                server.limited_once = True
+        if self.path == '/error':
+            self.send_response(500)
+        elif limited:
+            self.send_response(429)
+            self.send_header('Retry-After', str(server.retry_after))
+        else:
+            self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = (
+        "ยิง outbox (store.Notification) ใส่ webhook ปลอมบนเครื่อง วัด throughput และเช็คการรวมข้อความ, "
+        "429 Retry-After และ backoff ของ 500 (rollback ทุกอย่างตอนจบ)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=300)
+        parser.add_argument('--retry-after', type=float, default=0.2, help='Retry-After (วินาที) ที่ /limited ตอบกลับ')
+
+    def handle(self, *args, **options):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), StubWebhook)
+        server.lock = threading.Lock()
+        server.posts = []
+        server.limited_once = False
+        server.retry_after = options['retry_after']
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        base = f'http://127.0.0.1:{server.server_address[1]}'
+        try:
+            with transaction.atomic():
+                problems = self.run(base, server, options)
+                raise Rollback
+        except Rollback:
+            self.stdout.write("(rolled back outbox rows)")
+        finally:
+            server.shutdown()
+            server.server_close()
+        if problems:
+            raise CommandError('; '.join(problems))
+
+    def run(self, base, server, options):
+        # ข้อความจริงที่ค้างอยู่ห้ามถูกส่งออกไประหว่างทดสอบ: เลื่อนออกไปก่อน (rollback ตอนจบ)
+        Notification.objects.filter(status='PENDING').update(next_attempt_at=timezone.now() + timedelta(days=365))
+        problems = []
+        dispatcher = Dispatcher()
+
+        total = options['messages']
+        Notification.objects.bulk_create([
+            Notification(webhook_url=f'{base}/ok', content=f'🔔 ออเดอร์ทดสอบ #{i} ' + 'x' * 100)
+            for i in range(total)
+        ])
+        started = time.perf_counter()
+        sent = self.drain(dispatcher)
+        elapsed = time.perf_counter() - started
+        posts = [body for path, body in server.posts if path == '/ok']
+        longest = max(len(json.loads(body)['content']) for body in posts)
+        self.stdout.write(self.style.MIGRATE_HEADING("throughput"))
+        self.stdout.write(
+            f"{sent}/{total} messages in {len(posts)} POSTs, {elapsed * 1000:.0f} ms "
+            f"({sent / elapsed:.0f} msg/s), longest body {longest} chars"
+        )
+        if sent != total:
+            problems.append(f"sent {sent} of {total}")
+        if longest > DISCORD_MAX_CONTENT:
+            problems.append(f"batched content {longest} > {DISCORD_MAX_CONTENT} chars")
+
+        limited = Notification.objects.create(webhook_url=f'{base}/limited', content='rate limited')
+        dispatcher.run_once()
+        limited.refresh_from_db()
+        delay = (limited.next_attempt_at - timezone.now()).total_seconds()
+        self.stdout.write(self.style.MIGRATE_HEADING("429 Retry-After"))
+        self.stdout.write(f"status {limited.status}, attempts {limited.attempts}, retry in {delay:.2f}s")
+        if limited.status != 'PENDING' or limited.attempts:
+            problems.append("429 must reschedule without counting an attempt")
+        time.sleep(max(delay, 0))
+        dispatcher.run_once()
+        limited.refresh_from_db()
+        self.stdout.write(f"after Retry-After: status {limited.status}")
+        if limited.status != 'SENT':
+            problems.append("message was not sent after Retry-After")
+
+        failing = Notification.objects.create(webhook_url=f'{base}/error', content='server error')
+        dispatcher.run_once()
+        failing.refresh_from_db()
+        delay = (failing.next_attempt_at - timezone.now()).total_seconds()
+        self.stdout.write(self.style.MIGRATE_HEADING("500 backoff"))
+        self.stdout.write(f"status {failing.status}, attempts {failing.attempts}, retry in {delay:.0f}s ({failing.last_error})")
+        if failing.status != 'PENDING' or failing.attempts != 1 or delay <= 0:
+            problems.append("500 must count an attempt and back off")
+        return problems
+
+    def drain(self, dispatcher):
+        sent = 0
+        while True:
+            processed, delivered = dispatcher.run_once()
+            sent += delivered
+            if not processed:
+                return sent
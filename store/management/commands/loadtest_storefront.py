@@ -0,0 +1,49 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+
+from config.caching import cache_stats, storefront_cache_timeout
+
+
+class Command(BaseCommand):
+    help = "ยิง request ใส่หน้าร้าน (ผู้ใช้ไม่ login) แล้ววัด throughput ตอนไม่มี cache เทียบกับมี cache"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--concurrency', type=int, default=8)
+
+    def handle(self, *args, **options):
+        if not storefront_cache_timeout():
+            raise CommandError("cache หน้าร้านปิดอยู่ (ใช้ LocMem) ตั้ง CACHE_DIR หรือ REDIS_URL ก่อนรัน")
+        paths = [
+            reverse('store:product_list'),
+            reverse('home'),
+            reverse('roblox_home'),
+        ]
+        total = options['requests']
+
+        def hit(i, unique):
+            # ใช้ Client ใหม่ทุกครั้ง = ผู้ใช้ไม่ login และตะกร้าว่าง
+            # unique=True ใส่ query string ไม่ซ้ำกัน -> ไม่มีทางโดน cache (ใช้เป็นตัวเทียบ)
+            path = paths[i % len(paths)] + (f'?_={i}' if unique else '')
+            response = Client().get(path, HTTP_HOST='localhost')
+            return response.get('X-Cache')
+
+        def run(label, unique):
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+                results = list(pool.map(lambda i: hit(i, unique), range(total)))
+            elapsed = time.perf_counter() - started
+            hits = sum(1 for result in results if result == 'HIT')
+            self.stdout.write(
+                f"{label:<8} {total / elapsed:8.1f} req/s  ({hits}/{total} cache hits)"
+            )
+
+        cache.clear()
+        run('no cache', unique=True)
+        run('cached', unique=False)
+        self.stdout.write(f"process counters: {cache_stats()}")
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from store.models import Product, ProductSearchToken
+from store.search import build_tokens
+
+
+class Command(BaseCommand):
+    help = "สร้างดัชนีค้นหาสินค้า (ProductSearchToken) ใหม่ทั้งหมด"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        products = Product.objects.select_related('category').order_by('id')
+
+        ProductSearchToken.objects.all().delete()
+
+        done = 0
+        last_id = 0
+        while True:
+            batch = list(products.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+
+            tokens = [
+                ProductSearchToken(product=product, token=token, weight=weight)
+                for product in batch
+                for token, weight in build_tokens(product).items()
+            ]
+            with transaction.atomic():
+                ProductSearchToken.objects.bulk_create(tokens, batch_size=5000)
+
+            last_id = batch[-1].id
+            done += len(batch)
+            self.stdout.write(f"indexed {done} product(s)...")
+
+        self.stdout.write(self.style.SUCCESS(f"Done. {done} product(s) indexed."))
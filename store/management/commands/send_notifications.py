@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from config.metrics import write_metrics_file
+from store.notifications import Dispatcher
+
+
+class Command(BaseCommand):
+    help = "ส่งข้อความใน outbox (store.Notification) ไป Discord Webhook แบบ background"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='ส่งที่ค้างอยู่ให้หมดแล้วจบ')
+        parser.add_argument('--interval', type=float, default=2.0, help='เวลารอระหว่างรอบ (วินาที)')
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument(
+            '--metrics-file', default=None,
+            help='เขียนเวลาเรียก Discord (Prometheus text) ลงไฟล์นี้ทุกรอบ ให้ textfile collector ของ node_exporter อ่าน',
+        )
+
+    def handle(self, *args, **options):
+        dispatcher = Dispatcher(batch_size=options['batch_size'])
+
+        while True:
+            processed, sent = dispatcher.run_once()
+            if options['metrics_file'] and processed:
+                write_metrics_file(options['metrics_file'])
+            if sent:
+                self.stdout.write(f"sent {sent}/{processed} notification(s)")
+            if processed:
+                # ยังมีของค้าง -> วนต่อทันทีไม่ต้องรอ
+                continue
+            if options['once']:
+                break
+            time.sleep(options['interval'])
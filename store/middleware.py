@@ -0,0 +1,11 @@
+class CartMiddleware:
+    """เขียน cookie ของตะกร้า (cart_id / signed cookie) ลง response หลัง view ทำงานเสร็จ"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        for store in getattr(request, '_cart_stores', ()):
+            store.process_response(response)
+        return response
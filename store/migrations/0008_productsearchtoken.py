@@ -0,0 +1,56 @@
+# Generated by Django 6.0 on 2026-10-18 20:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def index_existing_products(apps, schema_editor):
+    # สร้างดัชนีให้สินค้าที่มีอยู่แล้ว (สินค้าใหม่จะถูก index ผ่าน signal)
+    from store.search import tokenize, FIELD_WEIGHTS
+
+    Product = apps.get_model('store', 'Product')
+    ProductSearchToken = apps.get_model('store', 'ProductSearchToken')
+
+    tokens = []
+    for product in Product.objects.select_related('category').iterator(chunk_size=1000):
+        weights = {}
+        fields = {
+            'name': product.name,
+            'description': product.description,
+            'category': product.category.name if product.category_id else '',
+        }
+        for field, text in fields.items():
+            for token in tokenize(text):
+                weights[token] = weights.get(token, 0) + FIELD_WEIGHTS[field]
+        tokens.extend(
+            ProductSearchToken(product_id=product.id, token=token, weight=weight)
+            for token, weight in weights.items()
+        )
+        if len(tokens) >= 5000:
+            ProductSearchToken.objects.bulk_create(tokens)
+            tokens = []
+    ProductSearchToken.objects.bulk_create(tokens)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0007_notification'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=64)),
+                ('weight', models.IntegerField(default=1)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='store.product')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['token', 'product', 'weight'], name='store_produ_token_8634d5_idx')],
+                'unique_together': {('product', 'token')},
+            },
+        ),
+        migrations.RunPython(index_existing_products, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 6.0 on 2026-10-18 20:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def grant_paid_orders(apps, schema_editor):
+    # ให้สิทธิ์ดาวน์โหลดจาก order ที่จ่ายแล้วก่อนหน้านี้ (จับคู่ customer_name กับ username)
+    Order = apps.get_model('store', 'Order')
+    OrderItem = apps.get_model('store', 'OrderItem')
+    Entitlement = apps.get_model('store', 'Entitlement')
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+
+    users = dict(User.objects.values_list('username', 'id'))
+    rows = (
+        OrderItem.objects.filter(order__paid=True)
+        .order_by('order_id')
+        .values_list('order_id', 'order__customer_name', 'product_id')
+    )
+    entitlements = {}
+    for order_id, customer_name, product_id in rows.iterator():
+        user_id = users.get(customer_name)
+        if user_id is not None:
+            entitlements.setdefault((user_id, product_id), order_id)
+    Entitlement.objects.bulk_create(
+        [Entitlement(user_id=u, product_id=p, order_id=o) for (u, p), o in entitlements.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0010_image_variants'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Entitlement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('order', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='entitlements', to='store.order')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entitlements', to='store.product')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entitlements', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'product')},
+            },
+        ),
+        migrations.RunPython(grant_paid_orders, migrations.RunPython.noop),
+    ]
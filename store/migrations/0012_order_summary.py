@@ -0,0 +1,49 @@
+# Generated by Django 6.0 on 2026-10-18 20:19
+
+from django.db import migrations, models
+
+
+def summarize_existing_orders(apps, schema_editor):
+    # เติม summary ให้ order เก่า (order ใหม่เขียนตอน checkout)
+    Order = apps.get_model('store', 'Order')
+    OrderItem = apps.get_model('store', 'OrderItem')
+
+    summaries = {}
+    rows = OrderItem.objects.order_by('order_id', 'id').values_list(
+        'order_id', 'product_id', 'product__name', 'product__script_file', 'quantity',
+    )
+    for order_id, product_id, name, script_file, quantity in rows.iterator():
+        summary = summaries.setdefault(order_id, {'count': 0, 'items': []})
+        summary['count'] += quantity
+        summary['items'].append({
+            'id': product_id,
+            'name': name,
+            'quantity': quantity,
+            'downloadable': bool(script_file),
+        })
+
+    orders = []
+    for order in Order.objects.only('id').iterator():
+        order.summary = summaries.get(order.id, {'count': 0, 'items': []})
+        orders.append(order)
+    Order.objects.bulk_update(orders, ['summary'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0011_entitlement'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='summary',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['customer_name', '-created_at', '-id'], name='order_customer_created_idx'),
+        ),
+        migrations.RunPython(summarize_existing_orders, migrations.RunPython.noop),
+    ]
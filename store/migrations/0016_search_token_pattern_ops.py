@@ -0,0 +1,21 @@
+# Generated by Django 6.0 on 2026-10-18 21:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0015_savedcart'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='productsearchtoken',
+            name='store_produ_token_8634d5_idx',
+        ),
+        migrations.AddIndex(
+            model_name='productsearchtoken',
+            index=models.Index(fields=['token', 'product', 'weight'], name='search_token_prefix_idx', opclasses=['varchar_pattern_ops', 'int8_ops', 'int4_ops']),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 6.0 on 2026-10-18 22:10
+
+from django.conf import settings
+from django.db import migrations
+
+
+def backfill_order_user(apps, schema_editor):
+    """order ที่สั่งก่อนมี Order.user: จับคู่ customer_name กับ username (แบบเดียวกับ manage.py backfill_order_users)"""
+    Order = apps.get_model('store', 'Order')
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    db = schema_editor.connection.alias
+
+    orders = Order.objects.using(db).filter(user__isnull=True).order_by('id')
+    last_id = 0
+    while True:
+        batch = list(orders.filter(id__gt=last_id).only('id', 'customer_name')[:1000])
+        if not batch:
+            break
+        last_id = batch[-1].id
+        names = {order.customer_name for order in batch}
+        users = dict(User.objects.using(db).filter(username__in=names).values_list('username', 'id'))
+        matched = []
+        for order in batch:
+            user_id = users.get(order.customer_name)
+            if user_id is not None:
+                order.user_id = user_id
+                matched.append(order)
+        Order.objects.using(db).bulk_update(matched, ['user'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0016_search_token_pattern_ops'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_order_user, migrations.RunPython.noop),
+    ]
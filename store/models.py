@@ -1,4 +1,6 @@
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 class Category(models.Model):
     name = models.CharField(max_length=100)
@@ -14,17 +16,60 @@ class Product(models.Model):
     script_file = models.FileField(upload_to='script_files/', blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True)
+    # รูปย่อ WebP/JPEG หลายขนาดของ image (สร้างอัตโนมัติ ดู store/images.py)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
 
+    class Meta:
+        indexes = [
+            # หน้าร้านแบ่งหน้าแบบ keyset บน (created_at, id) ทั้งแบบรวมและแยกหมวดหมู่
+            models.Index(fields=['-created_at', '-id'], name='product_created_idx'),
+            models.Index(fields=['category', '-created_at', '-id'], name='product_category_created_idx'),
+        ]
 
     def __str__(self):
         return self.name
     
+class ProductSearchToken(models.Model):
+    # ดัชนีค้นหาสินค้า: 1 แถวต่อ (สินค้า, token) เขียนใหม่ทุกครั้งที่ Product ถูก save (ดู store/search.py)
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='search_tokens')
+    token = models.CharField(max_length=64)
+    weight = models.IntegerField(default=1)
+
+    class Meta:
+        unique_together = ('product', 'token')
+        indexes = [
+            # ค้นหาแบบ prefix บน token แล้วได้ product_id + weight จาก index ตรงๆ
+            # Postgres: LIKE 'term%' ใช้ index ได้เฉพาะ *_pattern_ops (เทียบตาม byte ไม่ขึ้นกับ collation ของ DB)
+            # backend อื่นไม่สน opclasses ได้ index (token, product, weight) ธรรมดา
+            models.Index(
+                fields=['token', 'product', 'weight'],
+                opclasses=['varchar_pattern_ops', 'int8_ops', 'int4_ops'],
+                name='search_token_prefix_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.token} -> {self.product_id}"
+    
 class Order(models.Model):
     customer_name = models.CharField(max_length=200, verbose_name="ชื่อลูกค้า/Discord")
+    # ผู้ใช้ที่สั่งซื้อ (ว่างได้สำหรับแขกที่ไม่ได้ login) order เก่าเติมให้ใน migration 0017 (รันซ้ำได้ด้วย manage.py backfill_order_users)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL, related_name='orders')
     total_price = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="ยอดรวม")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="เวลาสั่งซื้อ")
     paid = models.BooleanField(default=False)
     slip_image = models.ImageField(upload_to='payment_slips/', blank=True, null=True, verbose_name="สลิปการชำระเงิน")
+    slip_image_variants = models.JSONField(default=dict, blank=True, editable=False)
+    # สรุปรายการสินค้า (จำนวน, ชื่อ, มีไฟล์ให้โหลดไหม) เขียนตอน checkout ดู store/orders.py
+    summary = models.JSONField(default=dict, blank=True, editable=False)
+    # กันกดสั่งซื้อซ้ำ/retry: request ที่ key ซ้ำได้ order เดิมกลับไป (ดู store/checkout.py)
+    idempotency_key = models.CharField(max_length=64, unique=True, null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # หน้าประวัติการสั่งซื้อ: order ของผู้ใช้คนเดียว เรียงใหม่สุดก่อน (keyset)
+            models.Index(fields=['user', '-created_at', '-id'], name='order_user_created_idx'),
+        ]
 
     def __str__(self):
         return f"Order #{self.id} - {self.customer_name}"
@@ -36,4 +81,67 @@ class OrderItem(models.Model):
     price = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="ราคาต่อชิ้น")
 
     def __str__(self):
-        return f"{self.product.name} ({self.quantity})"
\ No newline at end of file
+        return f"{self.product.name} ({self.quantity})"
+
+
+class SavedCart(models.Model):
+    """ตะกร้าของผู้ใช้ที่ login (เก็บถาวร ข้ามอุปกรณ์ได้) ดู store/cart_store.py"""
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, related_name='saved_cart', on_delete=models.CASCADE)
+    # {product_id (str): quantity}
+    items = models.JSONField(default=dict, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Cart of {self.user_id}"
+
+
+class Entitlement(models.Model):
+    """สิทธิ์ดาวน์โหลดสคริปต์ของผู้ใช้ (1 แถวต่อผู้ใช้ต่อสินค้า)
+
+    เขียนตอน Order ถูกติ๊กว่าจ่ายเงินแล้ว (store/signals.py) ตอนดาวน์โหลดเลยเช็คสิทธิ์
+    ด้วย unique index (user, product) ครั้งเดียว ไม่ต้อง join Order/OrderItem
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='entitlements', on_delete=models.CASCADE)
+    product = models.ForeignKey(Product, related_name='entitlements', on_delete=models.CASCADE)
+    # order ที่ให้สิทธิ์นี้มา (ยกเลิก paid แล้วจะถอนสิทธิ์ได้ถูกแถว)
+    order = models.ForeignKey(Order, related_name='entitlements', null=True, blank=True, on_delete=models.SET_NULL)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('user', 'product')
+
+    def __str__(self):
+        return f"{self.user_id} -> {self.product_id}"
+
+
+class Notification(models.Model):
+    """Outbox ของข้อความที่จะส่งไป Discord Webhook
+
+    View แค่เขียนแถวลงตารางนี้แล้วตอบกลับทันที ส่วนการส่งจริงเป็นหน้าที่ของ
+    worker (python manage.py send_notifications)
+    """
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),  # รอส่ง (หรือรอ retry)
+        ('SENT', 'Sent'),        # ส่งสำเร็จ
+        ('FAILED', 'Failed'),    # retry ครบแล้วยังไม่ผ่าน / Discord ตอบ 4xx (ส่งซ้ำไม่ช่วย)
+    ]
+
+    webhook_url = models.URLField(max_length=500)
+    content = models.TextField()
+    # ชื่อไฟล์ใน storage (เช่น สลิป) ที่ต้องแนบไปด้วย
+    attachment = models.CharField(max_length=500, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # worker ดึงเฉพาะแถวที่ PENDING และถึงเวลาส่งแล้ว
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"Notification #{self.id} ({self.status})"
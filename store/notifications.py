@@ -0,0 +1,197 @@
+import logging
+import time
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from config.metrics import observe_outbound, observe_outbound_error
+
+from .models import Notification
+
+logger = logging.getLogger(__name__)
+
+# Discord จำกัดข้อความละไม่เกิน 2000 ตัวอักษร
+DISCORD_MAX_CONTENT = 2000
+# (connect, read) timeout กัน Discord ค้างแล้วลาก worker ไปด้วย
+REQUEST_TIMEOUT = (3.05, 10)
+MAX_ATTEMPTS = 8
+BACKOFF_BASE = 5       # วินาที
+BACKOFF_MAX = 60 * 60  # retry ห่างสุด 1 ชั่วโมง
+# เวลาที่ worker "จอง" แถวไว้ระหว่างส่ง ถ้า worker ตายกลางทางแถวจะกลับมาให้ส่งใหม่หลังหมดเวลานี้
+CLAIM_SECONDS = 120
+
+
+def enqueue(webhook_url, content, attachment=''):
+    """เขียนข้อความลง outbox แล้วคืนค่าทันที (ไม่ยิง HTTP ใน request)"""
+    return Notification.objects.create(
+        webhook_url=webhook_url,
+        content=content,
+        attachment=attachment or '',
+    )
+
+
+def backoff_delay(attempts):
+    return min(BACKOFF_BASE * (2 ** (attempts - 1)), BACKOFF_MAX)
+
+
+def make_session(pool_size=10):
+    """requests.Session ที่ใช้ connection pool ร่วมกันทุกข้อความ"""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    # เวลาที่ใช้เรียก Discord แต่ละครั้ง -> metrics (ดู config/metrics.py)
+    session.hooks['response'].append(observe_outbound)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def build_batches(notifications):
+    """รวมข้อความที่ไป webhook เดียวกันให้เป็นก้อนละไม่เกิน DISCORD_MAX_CONTENT
+
+    ข้อความที่มีไฟล์แนบส่งแยกทีละอัน ส่วนข้อความล้วนรวมต่อกันได้
+    """
+    batches = {}
+    for notification in notifications:
+        url_batches = batches.setdefault(notification.webhook_url, [])
+        if notification.attachment:
+            url_batches.append([notification])
+            continue
+
+        last = url_batches[-1] if url_batches else None
+        if (
+            last
+            and not last[0].attachment
+            and len(_join_content(last + [notification])) <= DISCORD_MAX_CONTENT
+        ):
+            last.append(notification)
+        else:
+            url_batches.append([notification])
+    return batches
+
+
+def _join_content(batch):
+    return '\n\n'.join(notification.content for notification in batch)
+
+
+def _retry_after(response):
+    """อ่านเวลาที่ต้องรอจาก header rate limit ของ Discord (วินาที)"""
+    if response.status_code == 429:
+        value = response.headers.get('Retry-After')
+        if value is None:
+            try:
+                value = response.json().get('retry_after')
+            except ValueError:
+                value = None
+        try:
+            return float(value) if value is not None else 1.0
+        except ValueError:
+            return 1.0
+
+    # ยังไม่โดน 429 แต่ bucket หมดแล้ว -> รอให้ reset ก่อนส่งก้อนต่อไป
+    if response.headers.get('X-RateLimit-Remaining') == '0':
+        try:
+            return float(response.headers.get('X-RateLimit-Reset-After', 0))
+        except ValueError:
+            return 0
+    return 0
+
+
+class Dispatcher:
+    """ดึงข้อความจาก outbox แล้วส่งไป Discord (ใช้ใน management command)"""
+
+    def __init__(self, session=None, batch_size=100, sleep=time.sleep):
+        self.session = session or make_session()
+        self.batch_size = batch_size
+        self.sleep = sleep
+        # webhook_url -> time.monotonic() ที่ส่งต่อได้
+        self.blocked_until = {}
+
+    def claim(self):
+        """จองแถวที่ถึงเวลาส่ง (select_for_update + skip_locked รองรับหลาย worker)"""
+        now = timezone.now()
+        with transaction.atomic():
+            notifications = list(
+                Notification.objects.select_for_update(skip_locked=True)
+                .filter(status='PENDING', next_attempt_at__lte=now)
+                .order_by('next_attempt_at', 'id')[:self.batch_size]
+            )
+            if notifications:
+                Notification.objects.filter(id__in=[n.id for n in notifications]).update(
+                    next_attempt_at=now + timedelta(seconds=CLAIM_SECONDS)
+                )
+        return notifications
+
+    def run_once(self):
+        """ส่งทุกอย่างที่ถึงเวลา 1 รอบ คืนค่า (จำนวนที่หยิบมา, จำนวนที่ส่งสำเร็จ)"""
+        notifications = self.claim()
+        sent = 0
+        for webhook_url, batches in build_batches(notifications).items():
+            for batch in batches:
+                wait = self.blocked_until.get(webhook_url, 0) - time.monotonic()
+                if wait > 0:
+                    self.sleep(wait)
+                sent += self.send_batch(webhook_url, batch)
+        return len(notifications), sent
+
+    def send_batch(self, webhook_url, batch):
+        content = _join_content(batch)
+        try:
+            if batch[0].attachment:
+                with default_storage.open(batch[0].attachment, 'rb') as f:
+                    files = {'file': (batch[0].attachment.rsplit('/', 1)[-1], f)}
+                    response = self.session.post(
+                        webhook_url, data={'content': content}, files=files, timeout=REQUEST_TIMEOUT
+                    )
+            else:
+                response = self.session.post(
+                    webhook_url, json={'content': content}, timeout=REQUEST_TIMEOUT
+                )
+        except Exception as e:
+            observe_outbound_error(webhook_url)
+            self.mark_failed(batch, repr(e))
+            return 0
+
+        retry_after = _retry_after(response)
+        if retry_after:
+            self.blocked_until[webhook_url] = time.monotonic() + retry_after
+
+        if response.status_code == 429:
+            # โดน rate limit ไม่นับเป็นความผิดพลาด แค่เลื่อนเวลาส่ง
+            Notification.objects.filter(id__in=[n.id for n in batch]).update(
+                next_attempt_at=timezone.now() + timedelta(seconds=retry_after),
+            )
+            return 0
+
+        if response.status_code >= 400:
+            # 4xx อื่น (webhook ถูกลบ 404, ข้อความผิดรูปแบบ 400, ...) ส่งซ้ำก็ได้ผลเดิม -> FAILED เลย
+            # retry เฉพาะ 5xx ที่ Discord มีปัญหาชั่วคราว
+            self.mark_failed(
+                batch, f"HTTP {response.status_code}: {response.text[:500]}", permanent=response.status_code < 500,
+            )
+            return 0
+
+        Notification.objects.filter(id__in=[n.id for n in batch]).update(
+            status='SENT', sent_at=timezone.now(), last_error='',
+        )
+        return len(batch)
+
+    def mark_failed(self, batch, error, permanent=False):
+        logger.warning("Discord webhook failed: %s", error)
+        now = timezone.now()
+        for notification in batch:
+            notification.attempts += 1
+            notification.last_error = error
+            if permanent or notification.attempts >= MAX_ATTEMPTS:
+                notification.status = 'FAILED'
+            else:
+                notification.next_attempt_at = now + timedelta(
+                    seconds=backoff_delay(notification.attempts)
+                )
+        Notification.objects.bulk_update(
+            batch, ['attempts', 'last_error', 'status', 'next_attempt_at']
+        )
@@ -0,0 +1,75 @@
+from django.db.models import Prefetch, prefetch_related_objects
+
+from .listing import _keyset, encode_cursor, get_page_size
+from .models import Order, OrderItem
+
+
+def build_summary(items):
+    """สรุป order แบบย่อเก็บลง Order.summary (หน้าประวัติการสั่งซื้อจะได้ไม่ต้อง join)
+
+    items: [{'product': Product, 'quantity': int}, ...] (รูปแบบเดียวกับ Cart.price()['items'])
+    """
+    return {
+        'count': sum(item['quantity'] for item in items),
+        'items': [
+            {
+                'id': item['product'].id,
+                'name': item['product'].name,
+                'quantity': item['quantity'],
+                'downloadable': bool(item['product'].script_file),
+            }
+            for item in items
+        ],
+    }
+
+
+def summary_from_order_items(order_items):
+    return build_summary([{'product': item.product, 'quantity': item.quantity} for item in order_items])
+
+
+def refresh_product_in_summaries(product):
+    """สินค้าเปลี่ยนชื่อ/เพิ่มไฟล์สคริปต์ -> แก้ข้อมูลสินค้านี้ใน summary ของทุก order ที่มีมัน"""
+    order_ids = OrderItem.objects.filter(product=product).values('order_id')
+    changed = []
+    for order in Order.objects.filter(id__in=order_ids).only('id', 'summary').iterator():
+        dirty = False
+        for entry in order.summary.get('items', []):
+            if entry['id'] != product.id:
+                continue
+            fresh = {'name': product.name, 'downloadable': bool(product.script_file)}
+            if any(entry.get(key) != value for key, value in fresh.items()):
+                entry.update(fresh)
+                dirty = True
+        if dirty:
+            changed.append(order)
+    Order.objects.bulk_update(changed, ['summary'], batch_size=500)
+    return len(changed)
+
+
+def order_history(user, cursor=None, page_size=None):
+    """ประวัติการสั่งซื้อ 1 หน้า เรียงใหม่สุดก่อน แบ่งหน้าด้วย cursor (created_at, id)
+
+    ปกติใช้ query เดียว (ข้อมูลสินค้าอยู่ใน summary แล้ว) ถ้ามี order เก่าที่ยังไม่มี summary
+    จะ prefetch items + product ให้อีก 1 query แล้วเติม summary ให้
+    """
+    page_size = get_page_size(page_size)
+    orders = Order.objects.filter(user=user).defer('slip_image_variants')
+    orders = _keyset(orders, 'created_at', cursor).order_by('-created_at', '-id')
+    orders = list(orders[:page_size + 1])
+
+    next_cursor = None
+    if len(orders) > page_size:
+        orders = orders[:page_size]
+        last = orders[-1]
+        next_cursor = encode_cursor([last.created_at.isoformat(), last.id])
+
+    missing = [order for order in orders if not order.summary]
+    if missing:
+        items = OrderItem.objects.select_related('product').only(
+            'order', 'quantity', 'product__name', 'product__script_file',
+        )
+        prefetch_related_objects(missing, Prefetch('items', queryset=items))
+        for order in missing:
+            order.summary = summary_from_order_items(order.items.all())
+
+    return {'orders': orders, 'next_cursor': next_cursor, 'page_size': page_size}
@@ -0,0 +1,137 @@
+import re
+import unicodedata
+
+from django.db import connections, router
+from django.db.models import Case, When, Value, Count, Sum, Q, IntegerField
+
+from .models import Product, ProductSearchToken
+
+# น้ำหนักคะแนนของแต่ละช่อง (เจอในชื่อสำคัญกว่าเจอในรายละเอียด)
+FIELD_WEIGHTS = {
+    'name': 3,
+    'category': 2,
+    'description': 1,
+}
+MAX_TOKEN_LENGTH = 64
+MAX_QUERY_TERMS = 10
+# ผลค้นหาเก็บแค่อันดับต้นๆ (เกินนี้ผู้ใช้ควรพิมพ์คำค้นให้ชัดขึ้น)
+MAX_RESULTS = 500
+
+# ภาษาไทยไม่มีเว้นวรรคระหว่างคำ เลยแยกช่วงตัวอักษรไทยออกมาก่อน แล้วตัดเป็น trigram
+# (คำค้นไทยสั้นๆ 1-2 ตัวอักษรยังหาเจอเพราะค้นแบบ prefix)
+_THAI_RUN = r'[\u0E00-\u0E7F]+'
+_WORD_RE = re.compile(_THAI_RUN + r'|[^\W_\u0E00-\u0E7F]+')
+_THAI_RE = re.compile(_THAI_RUN)
+
+
+def _trigrams(text):
+    if len(text) <= 3:
+        return [text]
+    return [text[i:i + 3] for i in range(len(text) - 2)]
+
+
+def tokenize(text):
+    """แปลงข้อความเป็น token ตัวพิมพ์เล็ก (คำภาษาอังกฤษ/ตัวเลข ทั้งคำ, ภาษาไทยเป็น trigram)"""
+    if not text:
+        return []
+    text = unicodedata.normalize('NFC', text).lower()
+
+    tokens = []
+    for word in _WORD_RE.findall(text):
+        if _THAI_RE.fullmatch(word):
+            tokens.extend(_trigrams(word))
+        else:
+            tokens.append(word[:MAX_TOKEN_LENGTH])
+    return tokens
+
+
+def build_tokens(product):
+    """token ทั้งหมดของสินค้า 1 ชิ้น -> {token: weight}"""
+    weights = {}
+    fields = {
+        'name': product.name,
+        'description': product.description,
+        'category': product.category.name if product.category_id else '',
+    }
+    for field, text in fields.items():
+        for token in tokenize(text):
+            weights[token] = weights.get(token, 0) + FIELD_WEIGHTS[field]
+    return weights
+
+
+def index_product(product):
+    """เขียน token ของสินค้าใหม่ทั้งหมด (เรียกจาก signal ตอน Product ถูก save)"""
+    ProductSearchToken.objects.filter(product=product).delete()
+    ProductSearchToken.objects.bulk_create([
+        ProductSearchToken(product=product, token=token, weight=weight)
+        for token, weight in build_tokens(product).items()
+    ])
+
+
+# ตัวอักษรที่มากที่สุดใน Unicode: ทุก token ที่ขึ้นต้นด้วย term เรียงอยู่ก่อน term + ตัวนี้ (เมื่อเทียบตาม codepoint)
+_MAX_CHAR = '\U0010ffff'
+
+
+def _prefix_q(term):
+    if connections[router.db_for_read(ProductSearchToken)].vendor == 'sqlite':
+        # SQLite เทียบ text แบบ BINARY (ตาม codepoint) เสมอ -> ใช้ช่วงบน index ได้
+        # (LIKE ของ SQLite ไม่สนตัวพิมพ์เล็ก/ใหญ่ เลยใช้ index ของคอลัมน์ BINARY ไม่ได้)
+        return Q(token__gte=term, token__lt=term + _MAX_CHAR)
+    # Postgres: < / >= เรียงตาม collation ของ DB (th_TH, en_US ไม่ตรงกับ codepoint) ใช้ช่วงแล้วผลหายเงียบๆ
+    # LIKE 'term%' ถูกต้องทุก collation และใช้ index varchar_pattern_ops (ดู ProductSearchToken.Meta)
+    return Q(token__startswith=term)
+
+
+def rank_products(query, limit=None):
+    """คืนค่า [(product_id, score), ...] เรียงจากเกี่ยวข้องมากไปน้อย
+
+    ทุกคำในคำค้นต้องเจอ (แบบ prefix) อย่างน้อยหนึ่งที่ ทำงานบนตาราง token อย่างเดียว
+    (GROUP BY product_id จาก index) ไม่ต้อง join ตารางสินค้า
+    """
+    terms = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+    if not terms:
+        return []
+
+    any_term = Q()
+    for term in terms:
+        any_term |= _prefix_q(term)
+
+    ranked = (
+        ProductSearchToken.objects.filter(any_term)
+        .values('product_id')
+        .annotate(score=Sum('weight'))
+    )
+    if len(terms) > 1:
+        # นับแยกทีละคำ แล้วเอาเฉพาะสินค้าที่เจอทุกคำ
+        # (token เดียวตรงกับหลายคำได้ เช่น 'py' กับ 'python' -> รวมเป็น Case เดียวไม่ได้ เพราะ Case นับแค่ When แรกที่ตรง)
+        hits = {
+            f'hits_{i}': Count(Case(When(_prefix_q(term), then=Value(1)), output_field=IntegerField()))
+            for i, term in enumerate(terms)
+        }
+        ranked = ranked.annotate(**hits).filter(**{f'{name}__gt': 0 for name in hits})
+    ranked = ranked.order_by('-score', '-product_id').values_list('product_id', 'score')
+    limit = limit or MAX_RESULTS
+    return list(ranked[:limit])
+
+
+def search_products(query, queryset=None):
+    """ค้นหาสินค้าจากชื่อ รายละเอียด และหมวดหมู่ เรียงตามคะแนนความเกี่ยวข้อง
+
+    คืนค่าเป็น QuerySet (มี search_score ติดมา) ที่ต่อ filter/pagination ได้
+    """
+    if queryset is None:
+        queryset = Product.objects.all()
+
+    ranked = rank_products(query)
+    if not ranked:
+        return queryset.none()
+
+    scores = Case(
+        *[When(id=product_id, then=Value(score)) for product_id, score in ranked],
+        output_field=IntegerField(),
+    )
+    return (
+        queryset.filter(id__in=[product_id for product_id, _ in ranked])
+        .annotate(search_score=scores)
+        .order_by('-search_score', '-id')
+    )
@@ -0,0 +1,95 @@
+import logging
+
+from django.db.models.signals import post_save, post_delete
+from django.contrib.auth.signals import user_logged_in
+from django.dispatch import receiver
+
+from config.caching import bump_storefront_version
+from .models import Product, Category, Order
+from .search import index_product
+from .images import build_derivatives, needs_derivatives
+from .downloads import grant_for_order, revoke_for_order
+from .orders import refresh_product_in_summaries
+from .cart_store import merge_anonymous_cart
+
+logger = logging.getLogger(__name__)
+
+
+# 🔎 อัปเดตดัชนีค้นหาทุกครั้งที่สินค้าถูกเพิ่ม/แก้ไข (ตอนลบ token จะหายไปเองเพราะ CASCADE)
+@receiver(post_save, sender=Product)
+def reindex_product(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    index_product(instance)
+
+
+# เปลี่ยนชื่อหมวดหมู่ -> สินค้าในหมวดนั้นต้องได้ token หมวดหมู่ใหม่
+@receiver(post_save, sender=Category)
+def reindex_category_products(sender, instance, created=False, raw=False, **kwargs):
+    if raw or created:
+        return
+    for product in instance.product_set.select_related('category'):
+        index_product(product)
+
+
+# 🧾 ชื่อสินค้า/ไฟล์สคริปต์เปลี่ยน -> แก้ summary ของ order ที่มีสินค้านี้ (หน้า my_orders อ่านจาก summary)
+@receiver(post_save, sender=Product)
+def refresh_order_summaries(sender, instance, created=False, raw=False, **kwargs):
+    if raw or created:
+        return
+    refresh_product_in_summaries(instance)
+
+
+# 🧹 สินค้า/หมวดหมู่เปลี่ยน -> cache หน้าร้าน (ทั้งหน้าและการ์ดสินค้า) ใช้ไม่ได้แล้ว
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_storefront_cache(sender, **kwargs):
+    bump_storefront_version()
+
+
+# 🖼️ อัปโหลดรูปใหม่ -> สร้างรูปย่อหลายขนาด (ใช้ .update() เลยไม่วน signal ซ้ำ)
+def _refresh_variants(instance, field_name):
+    field_file = getattr(instance, field_name)
+    variants_field = f'{field_name}_variants'
+    if not needs_derivatives(field_file, getattr(instance, variants_field)):
+        return
+    try:
+        info = build_derivatives(field_file.name, storage=field_file.storage)
+    except Exception:
+        # รูปเสีย/อ่านไม่ได้ ไม่ควรทำให้การบันทึกพัง ใช้รูปต้นฉบับไปก่อน
+        logger.exception("Could not build derivatives for %s", field_file.name)
+        return
+    type(instance).objects.filter(pk=instance.pk).update(**{variants_field: info})
+    setattr(instance, variants_field, info)
+
+
+@receiver(post_save, sender=Product)
+def build_product_image_variants(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _refresh_variants(instance, 'image')
+
+
+@receiver(post_save, sender=Order)
+def build_slip_image_variants(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _refresh_variants(instance, 'slip_image')
+
+
+# 🔑 ติ๊ก paid (เช่น list_editable ในหน้า Admin) -> ให้สิทธิ์ดาวน์โหลด / เอา paid ออก -> ถอนสิทธิ์
+@receiver(post_save, sender=Order)
+def sync_order_entitlements(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    if instance.paid:
+        grant_for_order(instance)
+    elif not created:
+        revoke_for_order(instance)
+
+
+# 🛒 login แล้วรวมของในตะกร้าตอนยังไม่ได้ login เข้าตะกร้าของบัญชี
+@receiver(user_logged_in)
+def merge_cart_on_login(sender, request, user, **kwargs):
+    if request is not None:
+        merge_anonymous_cart(request, user)
@@ -0,0 +1,24 @@
+// ตะกร้าสินค้า (cart_detail.html): ยืนยันก่อนสั่งซื้อด้วย SweetAlert2
+function confirmCheckout(btn) { // 👈 รับค่า btn (ปุ่ม) เข้ามา
+    Swal.fire({
+        title: 'ยืนยันการสั่งซื้อ?',
+        text: "คุณตรวจสอบรายการสินค้าเรียบร้อยแล้วใช่ไหม?",
+        icon: 'question',
+        showCancelButton: true,
+        confirmButtonColor: '#198754',
+        cancelButtonColor: '#d33',
+        confirmButtonText: 'ใช่, สั่งเลย!',
+        cancelButtonText: 'ยกเลิก',
+        background: '#fff'
+    }).then((result) => {
+        if (result.isConfirmed) {
+            // ✅ ให้ปุ่มมองหา "ฟอร์มพ่อ" ของมันเอง (ไม่ต้องง้อ ID แล้ว)
+            const form = btn.closest('form');
+            if (form) {
+                form.submit();
+            } else {
+                Swal.fire('Error', 'ไม่พบฟอร์มสำหรับการส่งข้อมูล', 'error');
+            }
+        }
+    })
+}
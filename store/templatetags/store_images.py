@@ -0,0 +1,51 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+register = template.Library()
+
+
+def _srcset(storage, variants, ext):
+    return ', '.join(
+        f"{storage.url(v['name'])} {v['width']}w"
+        for v in variants if v['format'] == ext
+    )
+
+
+@register.simple_tag
+def responsive_image(field_file, variants=None, sizes='100vw', **attrs):
+    """<picture> ที่มี srcset ของรูปย่อ WebP + JPEG (ถ้ายังไม่มีรูปย่อ ใช้รูปต้นฉบับ)
+
+    ตัวอย่าง: {% responsive_image product.image product.image_variants sizes="(min-width: 992px) 25vw, 100vw" class="product-img" alt=product.name %}
+    """
+    if not field_file:
+        return ''
+
+    attrs.setdefault('loading', 'lazy')
+    attrs.setdefault('decoding', 'async')
+    extra = format_html_join(' ', '{}="{}"', attrs.items())
+
+    items = (variants or {}).get('variants') or []
+    if not items:
+        return format_html('<img src="{}" {}>', field_file.url, extra)
+
+    storage = field_file.storage
+    jpg = [v for v in items if v['format'] == 'jpg']
+    # fallback สำหรับ browser ที่ไม่รู้จัก srcset: ใช้ JPEG ขนาดใหญ่สุด
+    fallback = storage.url(jpg[-1]['name']) if jpg else field_file.url
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" {}></picture>',
+        _srcset(storage, items, 'webp'), sizes,
+        fallback, _srcset(storage, items, 'jpg'), sizes, extra,
+    )
+
+
+@register.simple_tag
+def thumbnail_url(field_file, variants=None):
+    """URL ของรูปย่อขนาดเล็กสุด (JPEG) สำหรับรูปจิ๋ว เช่น ในตะกร้า/หน้า admin"""
+    if not field_file:
+        return ''
+    items = [v for v in (variants or {}).get('variants') or [] if v['format'] == 'jpg']
+    if not items:
+        return field_file.url
+    return field_file.storage.url(items[0]['name'])
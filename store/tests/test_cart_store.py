@@ -0,0 +1,71 @@
+import shutil
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from store.cart_store import SignedCookieCartStore, UserCartStore, anonymous_store_class
+from store.models import Product, SavedCart
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM)
+class AnonymousCartStoreTests(TestCase):
+    def test_default_is_signed_cookie(self):
+        self.assertIs(anonymous_store_class(), SignedCookieCartStore)
+
+    @override_settings(CART_STORE='store.cart_store.CacheCartStore')
+    def test_cache_store_refused_with_process_local_cache(self):
+        with self.assertRaises(ImproperlyConfigured):
+            anonymous_store_class()
+
+    def test_cart_survives_requests(self):
+        # ตะกร้าอยู่ใน cookie -> worker ไหนรับ request ก็เห็นเหมือนกัน
+        product = Product.objects.create(name='Auto Farm', description='-', price=10, image='')
+        self.client.get(reverse('store:add_to_cart', args=[product.id]))
+        self.client.get(reverse('store:add_to_cart', args=[product.id]))
+        cache.clear()
+        response = self.client.get(reverse('store:cart_detail'))
+        self.assertEqual(response.context['cart_count'], 2)
+        self.assertContains(response, 'Auto Farm')
+
+
+class UserCartStoreTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('buyer')
+
+    def setUp(self):
+        self.request = RequestFactory().get('/')
+        self.request.user = self.user
+
+    def other_worker_writes(self, items):
+        # worker อื่นเขียน SavedCart ไปแล้ว cache ของ process นี้ไม่รู้เรื่อง
+        SavedCart.objects.update_or_create(user=self.user, defaults={'items': items})
+
+    @override_settings(CACHES=LOCMEM)
+    def test_reads_saved_cart_every_time(self):
+        store = UserCartStore(self.request)
+        store.save({'1': 1})
+        self.assertEqual(store.count(), 1)
+        self.other_worker_writes({'1': 1, '2': 4})
+        self.assertEqual(store.load(), {'1': 1, '2': 4})
+        self.assertEqual(store.count(), 5)
+
+    def test_count_cache_invalidated_on_save(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+        shared = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': cache_dir}}
+        with override_settings(CACHES=shared):
+            store = UserCartStore(self.request)
+            store.save({'1': 2})
+            self.assertEqual(store.count(), 2)
+            # worker อื่น save ผ่าน store -> ลบ count ใน cache กลาง
+            UserCartStore(self.request).save({'1': 2, '3': 1})
+            self.assertEqual(store.count(), 3)
+            with self.assertNumQueries(0):
+                store.count()
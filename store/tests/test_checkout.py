@@ -0,0 +1,86 @@
+import threading
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client, TestCase, TransactionTestCase
+from django.urls import reverse
+
+from store.models import Order, Product
+
+
+class GuestCheckoutKeyTests(TestCase):
+    def setUp(self):
+        product = Product.objects.create(name='Auto Farm', description='-', price=10, image='')
+        self.client.get(reverse('store:add_to_cart', args=[product.id]))
+
+    def test_cart_page_starts_session(self):
+        self.assertNotIn('sessionid', self.client.cookies)
+        response = self.client.get(reverse('store:cart_detail'))
+        self.assertIn('sessionid', response.cookies)
+
+    def test_double_submit_gets_one_order(self):
+        key = self.client.get(reverse('store:cart_detail')).context['idempotency_key']
+        data = {'customer_name': 'guest', 'idempotency_key': key}
+        self.client.post(reverse('store:checkout'), data)
+        response = self.client.post(reverse('store:checkout'), data)
+        self.assertTemplateUsed(response, 'store/success.html')
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_same_key_from_another_guest_is_not_shared(self):
+        key = self.client.get(reverse('store:cart_detail')).context['idempotency_key']
+        self.client.post(reverse('store:checkout'), {'customer_name': 'guest', 'idempotency_key': key})
+
+        other = Client()
+        other.get(reverse('store:add_to_cart', args=[Product.objects.get().id]))
+        other.get(reverse('store:cart_detail'))
+        other.post(reverse('store:checkout'), {'customer_name': 'other', 'idempotency_key': key})
+        self.assertEqual(Order.objects.count(), 2)
+
+
+class ConcurrentCheckoutTests(TransactionTestCase):
+    """กดยืนยันสองครั้งพร้อมกัน (สอง thread) ด้วยฟอร์มเดียวกัน -> order เดียว"""
+
+    SUBMITS = 4
+
+    def submit_concurrently(self, client, data):
+        barrier = threading.Barrier(self.SUBMITS)
+        responses, errors = [], []
+
+        def submit():
+            # แต่ละ thread มี connection ของตัวเอง: ปิดทิ้งตอนจบ
+            try:
+                barrier.wait()
+                responses.append(client.post(reverse('store:checkout'), data))
+            except Exception as exc:
+                # ส่งกลับไป fail ใน thread หลัก
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=submit) for _ in range(self.SUBMITS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        return responses
+
+    def test_guest(self):
+        product = Product.objects.create(name='Auto Farm', description='-', price=10, image='')
+        client = Client()
+        client.get(reverse('store:add_to_cart', args=[product.id]))
+        key = client.get(reverse('store:cart_detail')).context['idempotency_key']
+
+        responses = self.submit_concurrently(client, {'customer_name': 'guest', 'idempotency_key': key})
+        self.assertEqual([response.status_code for response in responses], [200] * self.SUBMITS)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_logged_in(self):
+        product = Product.objects.create(name='Auto Farm', description='-', price=10, image='')
+        client = Client()
+        client.force_login(User.objects.create_user('buyer'))
+        client.get(reverse('store:add_to_cart', args=[product.id]))
+        key = client.get(reverse('store:cart_detail')).context['idempotency_key']
+
+        self.submit_concurrently(client, {'idempotency_key': key})
+        self.assertEqual(Order.objects.filter(user__username='buyer').count(), 1)
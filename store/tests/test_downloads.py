@@ -0,0 +1,149 @@
+import shutil
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from store.downloads import grant_for_order, parse_range, revoke_for_order
+from store.models import Entitlement, Order, OrderItem, Product
+
+
+class ParseRangeTests(SimpleTestCase):
+    def test_single_range(self):
+        self.assertEqual(parse_range('bytes=0-99', 1000), (0, 99))
+        self.assertEqual(parse_range('bytes=900-', 1000), (900, 999))
+        # ปลายเกินขนาดไฟล์ -> ตัดที่ไบต์สุดท้าย
+        self.assertEqual(parse_range('bytes=500-5000', 1000), (500, 999))
+
+    def test_suffix_range(self):
+        self.assertEqual(parse_range('bytes=-100', 1000), (900, 999))
+        self.assertEqual(parse_range('bytes=-5000', 1000), (0, 999))
+        self.assertIs(parse_range('bytes=-0', 1000), False)
+
+    def test_unsatisfiable(self):
+        self.assertIs(parse_range('bytes=1000-', 1000), False)
+        self.assertIs(parse_range('bytes=5-2', 1000), False)
+
+    def test_unsupported_sends_whole_file(self):
+        for header in (None, '', 'bytes=-', 'items=0-1', 'bytes=0-1,5-6'):
+            with self.subTest(header=header):
+                self.assertIsNone(parse_range(header, 1000))
+
+
+class ServeFileTests(TestCase):
+    CONTENT = bytes(range(256)) * 4
+
+    @classmethod
+    def setUpClass(cls):
+        # ก่อน super(): setUpTestData เขียนไฟล์ลง MEDIA_ROOT ชั่วคราว
+        cls.media_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.media_root, ignore_errors=True)
+        cls.enterClassContext(override_settings(MEDIA_ROOT=cls.media_root))
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.buyer = User.objects.create_user('buyer')
+        cls.product = Product.objects.create(name='Auto Farm', description='-', price=10, image='')
+        cls.product.script_file.save('farm.lua', ContentFile(cls.CONTENT))
+        Entitlement.objects.create(user=cls.buyer, product=cls.product)
+
+    def setUp(self):
+        self.client.force_login(self.buyer)
+        self.url = reverse('store:download_script', args=[self.product.id])
+
+    def download(self, **headers):
+        return self.client.get(self.url, headers=headers)
+
+    def test_whole_file(self):
+        response = self.download()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.CONTENT)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('attachment; filename="farm', response['Content-Disposition'])
+
+    def test_partial_content(self):
+        response = self.download(Range='bytes=100-199')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 100-199/1024')
+        self.assertEqual(response['Content-Length'], '100')
+        self.assertEqual(b''.join(response.streaming_content), self.CONTENT[100:200])
+
+        response = self.download(Range='bytes=-24')
+        self.assertEqual(b''.join(response.streaming_content), self.CONTENT[-24:])
+
+    def test_range_not_satisfiable(self):
+        response = self.download(Range='bytes=2000-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */1024')
+
+    def test_not_modified(self):
+        response = self.download()
+        etag = response['ETag']
+        b''.join(response.streaming_content)
+        response = self.download(If_None_Match=f'"other", {etag}')
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    @override_settings(DOWNLOAD_OFFLOAD='x-accel-redirect', DOWNLOAD_ACCEL_PREFIX='/protected/')
+    def test_offload_to_nginx(self):
+        response = self.download()
+        self.assertEqual(response['X-Accel-Redirect'], '/protected/' + self.product.script_file.name)
+        self.assertEqual(response.content, b'')
+
+    def test_missing_file_is_404(self):
+        # แถวใน DB ยังชี้ไปที่ไฟล์ที่ถูกลบไปแล้ว
+        Product.objects.filter(pk=self.product.pk).update(script_file='script_files/deleted.lua')
+        self.assertEqual(self.download().status_code, 404)
+
+    def test_requires_entitlement(self):
+        self.client.force_login(User.objects.create_user('window-shopper'))
+        self.assertEqual(self.download().status_code, 403)
+
+
+class EntitlementTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('buyer')
+        cls.farm = Product.objects.create(name='Auto Farm', description='-', price=10, image='')
+        cls.fly = Product.objects.create(name='Fly', description='-', price=20, image='')
+
+    def order(self, *products, user=None, paid=True):
+        order = Order.objects.create(customer_name='buyer', user=user or self.user, total_price=30)
+        for product in products:
+            OrderItem.objects.create(order=order, product=product, price=product.price)
+        if paid:
+            # ติ๊ก paid ทีหลังแบบหน้า Admin -> signal ให้สิทธิ์
+            order.paid = True
+            order.save()
+        return order
+
+    def entitlements(self):
+        return dict(Entitlement.objects.filter(user=self.user).values_list('product_id', 'order_id'))
+
+    def test_grant_is_idempotent(self):
+        order = self.order(self.farm, self.fly)
+        self.assertEqual(self.entitlements(), {self.farm.id: order.id, self.fly.id: order.id})
+        self.assertEqual(grant_for_order(order), 2)
+        self.assertEqual(Entitlement.objects.count(), 2)
+
+    def test_guest_order_grants_nothing(self):
+        order = Order.objects.create(customer_name='guest', total_price=10, paid=True)
+        OrderItem.objects.create(order=order, product=self.farm, price=10)
+        self.assertEqual(grant_for_order(order), 0)
+        self.assertFalse(Entitlement.objects.exists())
+
+    def test_revoke_regrants_from_other_paid_order(self):
+        first = self.order(self.farm, self.fly)
+        second = self.order(self.farm)
+        # สินค้าที่มีสิทธิ์อยู่แล้วยังผูกกับ order แรก
+        self.assertEqual(self.entitlements(), {self.farm.id: first.id, self.fly.id: first.id})
+
+        first.paid = False
+        first.save()
+        self.assertEqual(self.entitlements(), {self.farm.id: second.id})
+
+        revoke_for_order(second)
+        self.assertEqual(self.entitlements(), {})
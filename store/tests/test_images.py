@@ -0,0 +1,101 @@
+import io
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.test import TestCase, override_settings
+from PIL import Image, UnidentifiedImageError
+
+from store.images import build_derivatives, bytes_saved, derivative_name, needs_derivatives
+from store.models import Product
+
+
+def png_bytes(width, height, mode='RGBA', color=(200, 30, 30, 0)):
+    image = Image.new(mode, (width, height), color)
+    # ครึ่งซ้ายสีน้ำเงินทึบ ครึ่งขวาเป็นสีพื้น (RGBA = โปร่งใส)
+    image.paste((30, 30, 200, 255) if mode == 'RGBA' else (30, 30, 200), (0, 0, width // 2, height))
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+class TempMediaRoot:
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.storage = FileSystemStorage(location=self.media_root)
+
+
+class BuildDerivativesTests(TempMediaRoot, TestCase):
+    def open(self, name):
+        with self.storage.open(name, 'rb') as f:
+            image = Image.open(io.BytesIO(f.read()))
+            image.load()
+        return image
+
+    def test_sizes_and_formats(self):
+        source = self.storage.save('products/banner.png', ContentFile(png_bytes(800, 400)))
+        info = build_derivatives(source, storage=self.storage)
+
+        self.assertEqual((info['source'], info['original_width']), (source, 800))
+        # 1024 ใหญ่กว่าต้นฉบับ ไม่ทำ
+        self.assertEqual(
+            [(variant['width'], variant['format']) for variant in info['variants']],
+            [(320, 'webp'), (320, 'jpg'), (640, 'webp'), (640, 'jpg')],
+        )
+        for variant in info['variants']:
+            with self.subTest(variant=variant['name']):
+                self.assertEqual(variant['name'], derivative_name(source, variant['width'], variant['format']))
+                image = self.open(variant['name'])
+                self.assertEqual(image.format, {'webp': 'WEBP', 'jpg': 'JPEG'}[variant['format']])
+                self.assertEqual(image.size, (variant['width'], variant['width'] // 2))
+                self.assertEqual(variant['bytes'], self.storage.size(variant['name']))
+
+        # JPEG ไม่มี alpha: ส่วนโปร่งใสกลายเป็นพื้นขาว ไม่ใช่สีดำ
+        jpeg = self.open(derivative_name(source, 320, 'jpg'))
+        self.assertEqual(jpeg.mode, 'RGB')
+        self.assertTrue(all(channel > 240 for channel in jpeg.getpixel((310, 80))))
+        self.assertEqual(bytes_saved(info), info['original_bytes'] - info['variants'][2]['bytes'])
+
+    def test_small_image_keeps_its_width(self):
+        source = self.storage.save('products/icon.png', ContentFile(png_bytes(100, 50, mode='RGB')))
+        info = build_derivatives(source, storage=self.storage)
+        self.assertEqual({variant['width'] for variant in info['variants']}, {100})
+
+    def test_rebuild_replaces_files(self):
+        source = self.storage.save('products/banner.png', ContentFile(png_bytes(800, 400)))
+        first = build_derivatives(source, storage=self.storage, widths=(320,))
+        second = build_derivatives(source, storage=self.storage, widths=(320,))
+        # ชื่อเดิม ไม่ได้ไฟล์ใหม่ต่อท้ายด้วย suffix สุ่ม
+        self.assertEqual([v['name'] for v in first['variants']], [v['name'] for v in second['variants']])
+
+    def test_not_an_image(self):
+        source = self.storage.save('products/fake.png', ContentFile(b'<?php echo "hi"; ?>'))
+        with self.assertRaises(UnidentifiedImageError):
+            build_derivatives(source, storage=self.storage)
+
+
+class ProductUploadTests(TempMediaRoot, TestCase):
+    def test_upload_builds_variants(self):
+        product = Product(name='Farm', description='-', price=10)
+        product.image.save('farm.png', ContentFile(png_bytes(1200, 600)))
+        product.refresh_from_db()
+        self.assertEqual(len(product.image_variants['variants']), 6)
+        self.assertEqual(product.image_variants['source'], product.image.name)
+        # save อีกครั้งโดยไม่เปลี่ยนรูป ไม่ต้องสร้างใหม่
+        self.assertFalse(needs_derivatives(product.image, product.image_variants))
+
+    def test_non_image_upload_keeps_original(self):
+        product = Product(name='Broken', description='-', price=10)
+        with self.assertLogs('store.signals', 'ERROR') as logs:
+            product.image.save('broken.png', ContentFile(b'not really a png'))
+        self.assertIn('Could not build derivatives for products/broken', logs.output[0])
+        product.refresh_from_db()
+        # บันทึกสินค้าได้ตามปกติ หน้าร้านใช้รูปต้นฉบับไปก่อน
+        self.assertEqual(product.image_variants, {})
+        self.assertTrue(product.image.name.startswith('products/broken'))
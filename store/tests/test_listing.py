@@ -0,0 +1,60 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from store.listing import encode_cursor
+from store.models import Order, Product
+
+
+class TamperedCursorTests(TestCase):
+    """cursor ที่ถูกแก้ต้องได้ 400 ไม่ใช่ 500"""
+
+    BAD_CURSORS = [
+        'not-base64!!',
+        encode_cursor(['x']),
+        encode_cursor(['2024-01-01T00:00:00+00:00', 'abc']),
+        encode_cursor(['2024-01-01T00:00:00+00:00', 1e400]),
+        encode_cursor(['2024-01-01T00:00:00+00:00', 2 ** 70]),
+        encode_cursor(['2024-01-01T00:00:00+00:00', True]),
+        encode_cursor(['2024-13-45T00:00:00', 1]),
+        encode_cursor([12345, 1]),
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('buyer')
+        for i in range(3):
+            Product.objects.create(name=f'Script {i}', description='auto farm', price=10, image='')
+            Order.objects.create(customer_name='buyer', user=cls.user, total_price=10)
+
+    def assertRejected(self, url, cursors):
+        for cursor in cursors:
+            with self.subTest(cursor=cursor):
+                response = self.client.get(url, {'cursor': cursor})
+                self.assertEqual(response.status_code, 400)
+
+    def test_product_list(self):
+        self.assertRejected(reverse('store:product_list'), self.BAD_CURSORS)
+        self.assertRejected(reverse('store:product_list_api'), self.BAD_CURSORS)
+
+    def test_search_cursor(self):
+        # cursor ของผลค้นหาเก็บคะแนน (ตัวเลข) แทนวันที่
+        url = reverse('store:product_list_api')
+        for cursor in [encode_cursor(['abc', 1]), encode_cursor([[1], 1]), encode_cursor([1.5, 1]), encode_cursor([2 ** 64, 1])]:
+            with self.subTest(cursor=cursor):
+                self.assertEqual(self.client.get(url, {'search': 'farm', 'cursor': cursor}).status_code, 400)
+
+    def test_my_orders(self):
+        self.client.force_login(self.user)
+        self.assertRejected(reverse('store:my_orders'), self.BAD_CURSORS)
+
+    def test_valid_cursor_still_pages(self):
+        url = reverse('store:product_list_api')
+        first = self.client.get(url, {'page_size': 2}).json()
+        second = self.client.get(url, {'page_size': 2, 'cursor': first['next_cursor']}).json()
+        self.assertEqual(len(first['products']) + len(second['products']), 3)
+        self.assertIsNone(second['next_cursor'])
+
+        ranked = self.client.get(url, {'search': 'farm', 'page_size': 2}).json()
+        rest = self.client.get(url, {'search': 'farm', 'page_size': 2, 'cursor': ranked['next_cursor']}).json()
+        self.assertEqual(len(ranked['products']) + len(rest['products']), 3)
@@ -0,0 +1,32 @@
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+
+class BackfillOrderUserMigrationTests(TransactionTestCase):
+    """0017 เติม Order.user ให้ order เก่าจาก customer_name"""
+
+    before = [('store', '0016_search_token_pattern_ops')]
+    after = [('store', '0017_backfill_order_user')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_links_orders_by_username(self):
+        apps = self.migrate(self.before)
+        User = apps.get_model('auth', 'User')
+        Order = apps.get_model('store', 'Order')
+        buyer = User.objects.create(username='buyer')
+        linked = Order.objects.create(customer_name='buyer', total_price=10)
+        guest = Order.objects.create(customer_name='Guest#1234', total_price=10)
+
+        apps = self.migrate(self.after)
+        Order = apps.get_model('store', 'Order')
+        self.assertEqual(Order.objects.get(pk=linked.pk).user_id, buyer.pk)
+        self.assertIsNone(Order.objects.get(pk=guest.pk).user_id)
@@ -0,0 +1,143 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from store.models import Notification
+from store.notifications import (
+    BACKOFF_MAX, CLAIM_SECONDS, DISCORD_MAX_CONTENT, MAX_ATTEMPTS,
+    Dispatcher, _retry_after, backoff_delay, build_batches, enqueue,
+)
+
+WEBHOOK = 'https://discord.test/api/webhooks/1/abc'
+OTHER_WEBHOOK = 'https://discord.test/api/webhooks/2/def'
+
+
+class StubResponse:
+    def __init__(self, status_code=204, headers=None, body=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.body = body
+        self.text = '' if body is None else str(body)
+
+    def json(self):
+        if self.body is None:
+            raise ValueError('no JSON body')
+        return self.body
+
+
+class StubSession:
+    """session.post คืน response ตามลำดับที่เตรียมไว้ (หมดแล้วตอบ 204)"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.posts = []
+
+    def post(self, url, **kwargs):
+        self.posts.append((url, kwargs))
+        return self.responses.pop(0) if self.responses else StubResponse()
+
+
+class BuildBatchesTests(SimpleTestCase):
+    def notification(self, content, url=WEBHOOK, attachment=''):
+        return Notification(webhook_url=url, content=content, attachment=attachment)
+
+    def test_joins_text_up_to_discord_limit(self):
+        half = 'x' * (DISCORD_MAX_CONTENT // 2 - 1)
+        notifications = [self.notification(half), self.notification(half), self.notification('tail')]
+        batches = build_batches(notifications)[WEBHOOK]
+        # 2 ข้อความ + ตัวคั่น '\n\n' = 2000 พอดี ข้อความที่ 3 ต้องขึ้นก้อนใหม่
+        self.assertEqual([len(batch) for batch in batches], [2, 1])
+
+    def test_attachment_sent_alone(self):
+        notifications = [
+            self.notification('a'), self.notification('slip', attachment='payment_slips/1.png'),
+            self.notification('b'), self.notification('c'),
+        ]
+        batches = build_batches(notifications)[WEBHOOK]
+        self.assertEqual([[n.content for n in batch] for batch in batches], [['a'], ['slip'], ['b', 'c']])
+
+    def test_grouped_by_webhook(self):
+        batches = build_batches([self.notification('a'), self.notification('b', url=OTHER_WEBHOOK)])
+        self.assertEqual(set(batches), {WEBHOOK, OTHER_WEBHOOK})
+
+
+class RetryAfterTests(SimpleTestCase):
+    def test_rate_limited(self):
+        self.assertEqual(_retry_after(StubResponse(429, {'Retry-After': '2.5'})), 2.5)
+        self.assertEqual(_retry_after(StubResponse(429, body={'retry_after': 3})), 3.0)
+        self.assertEqual(_retry_after(StubResponse(429)), 1.0)
+        self.assertEqual(_retry_after(StubResponse(429, {'Retry-After': 'soon'})), 1.0)
+
+    def test_bucket_exhausted(self):
+        headers = {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset-After': '1.5'}
+        self.assertEqual(_retry_after(StubResponse(204, headers)), 1.5)
+        self.assertEqual(_retry_after(StubResponse(204, {'X-RateLimit-Remaining': '4'})), 0)
+
+    def test_backoff_delay(self):
+        self.assertEqual([backoff_delay(attempts) for attempts in (1, 2, 3)], [5, 10, 20])
+        self.assertEqual(backoff_delay(30), BACKOFF_MAX)
+
+
+class DispatcherTests(TestCase):
+    def dispatch(self, *responses):
+        self.sleeps = []
+        self.session = StubSession(*responses)
+        dispatcher = Dispatcher(session=self.session, sleep=self.sleeps.append)
+        return dispatcher.run_once()
+
+    def test_sent(self):
+        first, second = enqueue(WEBHOOK, 'a'), enqueue(WEBHOOK, 'b')
+        self.assertEqual(self.dispatch(), (2, 2))
+        self.assertEqual(self.session.posts[0][1]['json'], {'content': 'a\n\nb'})
+        self.assertEqual(Notification.objects.filter(pk__in=[first.pk, second.pk], status='SENT').count(), 2)
+
+    def test_rate_limit_reschedules_without_attempt(self):
+        notification = enqueue(WEBHOOK, 'a')
+        before = timezone.now()
+        self.assertEqual(self.dispatch(StubResponse(429, {'Retry-After': '30'})), (1, 0))
+        notification.refresh_from_db()
+        self.assertEqual((notification.status, notification.attempts), ('PENDING', 0))
+        self.assertGreaterEqual(notification.next_attempt_at, before + timedelta(seconds=30))
+
+    def test_rate_limit_delays_next_batch_to_same_webhook(self):
+        enqueue(WEBHOOK, 'x' * DISCORD_MAX_CONTENT)
+        enqueue(WEBHOOK, 'y')
+        self.dispatch(StubResponse(204, {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset-After': '2'}))
+        self.assertEqual(len(self.session.posts), 2)
+        self.assertEqual(len(self.sleeps), 1)
+        self.assertTrue(0 < self.sleeps[0] <= 2)
+
+    def test_server_error_backs_off(self):
+        notification = enqueue(WEBHOOK, 'a')
+        before = timezone.now()
+        self.dispatch(StubResponse(503, body='unavailable'))
+        notification.refresh_from_db()
+        self.assertEqual((notification.status, notification.attempts), ('PENDING', 1))
+        self.assertGreaterEqual(notification.next_attempt_at, before + timedelta(seconds=backoff_delay(1)))
+        self.assertEqual(notification.last_error, 'HTTP 503: unavailable')
+
+        # ครบ MAX_ATTEMPTS แล้วเลิก retry
+        Notification.objects.filter(pk=notification.pk).update(attempts=MAX_ATTEMPTS - 1, next_attempt_at=before)
+        self.dispatch(StubResponse(503))
+        notification.refresh_from_db()
+        self.assertEqual((notification.status, notification.attempts), ('FAILED', MAX_ATTEMPTS))
+
+    def test_client_error_fails_immediately(self):
+        notification = enqueue(WEBHOOK, 'a')
+        self.dispatch(StubResponse(404, body={'message': 'Unknown Webhook'}))
+        notification.refresh_from_db()
+        self.assertEqual((notification.status, notification.attempts), ('FAILED', 1))
+
+    def test_claim_expires(self):
+        notification = enqueue(WEBHOOK, 'a')
+        dispatcher = Dispatcher(session=StubSession())
+        self.assertEqual(dispatcher.claim(), [notification])
+        # worker อื่นไม่เห็นแถวที่ถูกจองอยู่
+        self.assertEqual(dispatcher.claim(), [])
+
+        # worker ที่จองตายกลางทาง: หมดเวลาจองแล้วแถวกลับมาให้ส่งใหม่
+        later = timezone.now() + timedelta(seconds=CLAIM_SECONDS + 1)
+        with mock.patch('django.utils.timezone.now', return_value=later):
+            self.assertEqual(dispatcher.claim(), [notification])
@@ -0,0 +1,85 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from store.models import Order, OrderItem, Product
+from store.orders import build_summary
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class MyOrdersQueryTests(TestCase):
+    """หน้าประวัติการสั่งซื้อ: จำนวน query ต้องไม่โตตามจำนวน order / สินค้าใน order"""
+
+    ORDERS = 300
+    # session + user + order 1 หน้า + จำนวนชิ้นในตะกร้า (badge อ่าน SavedCart เมื่อ cache เป็น LocMem)
+    QUERIES = 4
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('buyer')
+        cls.products = [
+            Product.objects.create(name=f'Script {i}', description='-', price=10, image='', script_file=f'scripts/{i}.lua')
+            for i in range(5)
+        ]
+        summary = build_summary([{'product': product, 'quantity': 1} for product in cls.products])
+        Order.objects.bulk_create([
+            Order(customer_name='buyer', user=cls.user, total_price=50, summary=summary)
+            for _ in range(cls.ORDERS)
+        ])
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.url = reverse('store:my_orders')
+
+    def test_query_count_is_constant(self):
+        with self.assertNumQueries(self.QUERIES):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Script 4')
+        self.assertIsNotNone(response.context['next_cursor'])
+
+        # หน้าถัดไปก็ต้องเท่าเดิม
+        with self.assertNumQueries(self.QUERIES):
+            self.client.get(self.url, {'cursor': response.context['next_cursor']})
+
+    def test_page_size_does_not_add_queries(self):
+        with self.assertNumQueries(self.QUERIES):
+            response = self.client.get(self.url, {'page_size': 100})
+        self.assertEqual(len(response.context['orders']), 100)
+
+    def test_orders_without_summary_cost_one_prefetch(self):
+        # order เก่าก่อนมี summary: prefetch items + product เพิ่ม 1 query ไม่ใช่ 1 query ต่อ order
+        legacy = Order.objects.bulk_create([
+            Order(customer_name='buyer', user=self.user, total_price=50) for _ in range(30)
+        ])
+        OrderItem.objects.bulk_create([
+            OrderItem(order=order, product=product, quantity=2, price=10)
+            for order in legacy
+            for product in self.products
+        ])
+        with self.assertNumQueries(self.QUERIES + 1):
+            response = self.client.get(self.url)
+        first = response.context['orders'][0]
+        self.assertEqual(first.summary['count'], 10)
+        self.assertTrue(all(item['downloadable'] for item in first.summary['items']))
+
+
+class UploadSlipTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('buyer')
+        cls.order = Order.objects.create(customer_name='buyer', user=cls.owner, total_price=10)
+
+    def test_anonymous_redirected_to_login(self):
+        url = reverse('store:upload_slip', args=[self.order.id])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(f'next={url}', response['Location'])
+
+    def test_other_users_order_is_404(self):
+        self.client.force_login(User.objects.create_user('someone'))
+        self.assertEqual(self.client.get(reverse('store:upload_slip', args=[self.order.id])).status_code, 404)
+
+    def test_owner_sees_form(self):
+        self.client.force_login(self.owner)
+        self.assertEqual(self.client.get(reverse('store:upload_slip', args=[self.order.id])).status_code, 200)
@@ -0,0 +1,61 @@
+from django.test import SimpleTestCase, TestCase
+
+from store.models import Category, Product
+from store.search import MAX_TOKEN_LENGTH, rank_products, search_products, tokenize
+
+
+class TokenizeTests(SimpleTestCase):
+    def test_english_words(self):
+        self.assertEqual(tokenize('Auto-Farm Script_v2, ROBLOX 2026'), ['auto', 'farm', 'script', 'v2', 'roblox', '2026'])
+        self.assertEqual(tokenize(''), [])
+        self.assertEqual(tokenize(None), [])
+        self.assertEqual(tokenize('x' * 100), ['x' * MAX_TOKEN_LENGTH])
+
+    def test_thai_trigrams(self):
+        self.assertEqual(tokenize('ไทย'), ['ไทย'])
+        self.assertEqual(tokenize('ภาษา'), ['ภาษ', 'าษา'])
+        # สระ/วรรณยุกต์เป็นตัวอักษรหนึ่งตัวใน trigram ด้วย
+        self.assertEqual(tokenize('สคริปต์'), ['สคร', 'คริ', 'ริป', 'ิปต', 'ปต์'])
+
+    def test_mixed_thai_english(self):
+        self.assertEqual(tokenize('สคริปต์Python ไทย'), ['สคร', 'คริ', 'ริป', 'ิปต', 'ปต์', 'python', 'ไทย'])
+
+
+class RankProductsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        tools = Category.objects.create(name='Tools')
+        cls.script = Product.objects.create(
+            name='Python Script', description='auto farm', price=10, image='', category=tools,
+        )
+        cls.bot = Product.objects.create(name='Farm Bot', description='python helper', price=10, image='')
+        cls.thai = Product.objects.create(name='สคริปต์ภาษาไทย', description='ใช้งานง่าย', price=10, image='')
+
+    def ids(self, query):
+        return [product_id for product_id, _ in rank_products(query)]
+
+    def test_prefix_match(self):
+        self.assertEqual(self.ids('pyt'), [self.script.id, self.bot.id])
+        self.assertEqual(self.ids('scri'), [self.script.id])
+        self.assertEqual(self.ids('สคริ'), [self.thai.id])
+        self.assertEqual(self.ids('ython'), [])
+
+    def test_ranked_by_field_weight(self):
+        # ชื่อ 3 > หมวดหมู่ 2 > รายละเอียด 1
+        self.assertEqual(rank_products('python'), [(self.script.id, 3), (self.bot.id, 1)])
+        self.assertEqual(rank_products('tools'), [(self.script.id, 2)])
+
+    def test_every_term_must_match(self):
+        self.assertEqual(self.ids('python auto'), [self.script.id])
+        self.assertEqual(self.ids('python missing'), [])
+        self.assertEqual(self.ids('ภาษา farm'), [])
+
+    def test_terms_matching_the_same_token(self):
+        # 'py' กับ 'python' ตรงกับ token 'python' ตัวเดียวกัน ต้องนับว่าเจอทั้งสองคำ
+        self.assertEqual(self.ids('py python'), [self.script.id, self.bot.id])
+        self.assertEqual(self.ids('scr script'), [self.script.id])
+
+    def test_search_products_queryset(self):
+        products = search_products('farm')
+        self.assertEqual([(p.id, p.search_score) for p in products], [(self.bot.id, 3), (self.script.id, 1)])
+        self.assertFalse(search_products('   ').exists())
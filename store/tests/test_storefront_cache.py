@@ -0,0 +1,50 @@
+import shutil
+import tempfile
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from config.caching import is_shared_cache, storefront_cache_timeout
+from store.models import Product
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class StorefrontCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.cache_dir = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.cache_dir, ignore_errors=True)
+
+    def setUp(self):
+        self.product = Product.objects.create(name='Auto Farm', description='-', price=10, image='')
+
+    def shared_cache(self):
+        # FileBasedCache = cache ที่ทุก worker เห็นร่วมกัน (แบบเดียวกับ CACHE_DIR)
+        return override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': self.cache_dir,
+        }})
+
+    @override_settings(CACHES=LOCMEM)
+    def test_disabled_with_process_local_cache(self):
+        self.assertFalse(is_shared_cache())
+        self.assertEqual(storefront_cache_timeout(), 0)
+        url = reverse('store:product_list')
+        self.assertNotIn('X-Cache', self.client.get(url))
+        self.assertNotIn('X-Cache', self.client.get(url))
+
+    def test_cached_with_shared_cache(self):
+        with self.shared_cache():
+            cache.clear()
+            url = reverse('store:product_list')
+            self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+            self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+            # แก้สินค้า -> version เพิ่มใน cache กลาง ทุก worker ได้หน้าใหม่
+            self.product.name = 'Auto Farm v2'
+            self.product.save()
+            response = self.client.get(url)
+            self.assertEqual(response['X-Cache'], 'MISS')
+            self.assertContains(response, 'Auto Farm v2')
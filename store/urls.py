@@ -13,6 +13,7 @@ urlpatterns = [
 
     # สินค้า
     path('shop/', views.product_list, name='product_list'),
+    path('api/products/', views.product_list_api, name='product_list_api'),
     path('product/<int:pk>/', views.product_detail, name='product_detail'),
     
     # ตะกร้าสินค้า
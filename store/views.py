@@ -1,28 +1,29 @@
 from django.shortcuts import render, redirect, get_object_or_404
-from .models import Product, Order, OrderItem
+from .models import Product, Order
 from django.contrib.auth.decorators import login_required
-import requests
 from .forms import ProductForm
+from .cart import Cart
+from . import notifications
+from .listing import product_page, InvalidCursor
+from .downloads import has_entitlement, serve_file
+from .orders import order_history
+from .checkout import idempotency_key, new_idempotency_key, place_order
 from django.contrib.auth import logout
-from django.http import FileResponse, Http404, HttpResponseForbidden
-import os
+from django.core.exceptions import BadRequest
+from django.http import Http404, HttpResponseForbidden, JsonResponse
+from django.urls import reverse
 from django.conf import settings
+from config.caching import cache_anonymous_page, storefront_cache_timeout, storefront_version
 
 @login_required
 def download_script(request, product_id):
-    # 1. หาสินค้า
-    product = get_object_or_404(Product, id=product_id)
+    # 1. หาสินค้า (ใช้แค่ไฟล์สคริปต์)
+    product = get_object_or_404(Product.objects.only('id', 'script_file'), id=product_id)
     
     # 2. 🛡️ เช็คว่า User เคยซื้อและจ่ายเงินหรือยัง? (Security Check)
-    # ค้นหา Order ของ User นี้ ที่มีสินค้านี้ และจ่ายเงินแล้ว (paid=True)
-    has_purchased = Order.objects.filter(
-        customer_name=request.user.username,
-        items__product=product, # เช็คว่าใน order มีสินค้านี้ไหม (ผ่านตาราง OrderItem)
-        paid=True
-    ).exists()
-
+    # ตาราง Entitlement ถูกเขียนตอน Order ถูกติ๊ก paid -> เช็คด้วย index (user, product) ครั้งเดียว
     # ถ้าไม่ใช่ Superuser และ ไม่เคยซื้อ -> ห้ามโหลด!
-    if not request.user.is_superuser and not has_purchased:
+    if not has_entitlement(request.user, product.id):
         return HttpResponseForbidden("⛔ คุณยังไม่ได้ซื้อสินค้านี้ หรือยังไม่ได้ชำระเงิน")
 
     # 3. เช็คว่ามีไฟล์จริงๆ ไหม
@@ -30,112 +31,119 @@ def download_script(request, product_id):
         raise Http404("ไม่พบไฟล์สคริปต์")
 
     # 4. 📤 ส่งไฟล์ให้โหลด (โดยไม่เปิดเผย Path จริง)
-    file_path = product.script_file.path
-    response = FileResponse(open(file_path, 'rb'))
-    response['Content-Disposition'] = f'attachment; filename="{os.path.basename(file_path)}"'
-    return response
+    # รองรับ Range (โหลดต่อ), ETag และส่งต่อให้ nginx/Apache ได้ (ดู store/downloads.py)
+    return serve_file(request, product.script_file)
 
 # 1. ฟังก์ชันเพิ่มของลงตะกร้า
 def add_to_cart(request, product_id):
-    product = get_object_or_404(Product, id=product_id)
-    cart = request.session.get('cart', {})
-    
-    # เก็บข้อมูลพื้นฐานลง Session
-    cart[str(product_id)] = cart.get(str(product_id), 0) + 1
-    
-    request.session['cart'] = cart
+    product = get_object_or_404(Product.objects.only('id'), id=product_id)
+
+    # เก็บลง cart store (cache/cookie หรือ SavedCart ถ้า login) ไม่ต้องเขียน Session
+    Cart.for_request(request).add(product.id)
     # ✅ แก้เป็น store:cart_detail
     return redirect('store:cart_detail')
 
 # 2. ฟังก์ชันดูของในตะกร้า
 def cart_detail(request):
-    cart = request.session.get('cart', {})
-    cart_items = []
-    total_price = 0
-    
-    for product_id, quantity in cart.items():
-        try:
-            product = Product.objects.get(id=product_id)
-            subtotal = product.price * quantity
-            total_price += subtotal
-            cart_items.append({'product': product, 'quantity': quantity, 'subtotal': subtotal})
-        except Product.DoesNotExist:
-            continue
-        
+    # คิดราคาทั้งตะกร้าด้วย query เดียว (ดู store/cart.py)
+    snapshot = Cart.for_request(request).price()
+
     return render(request, 'store/cart_detail.html', {
-        'cart_items': cart_items, 
-        'total_price': total_price
+        'cart_items': snapshot['items'], 
+        'total_price': snapshot['total_price'],
+        # ส่งกลับมาตอน checkout กันกดยืนยันซ้ำ (ดู store/checkout.py)
+        'idempotency_key': new_idempotency_key(request),
     })
 
 # 3. ฟังก์ชันเคลียร์ตะกร้า
 def clear_cart(request):
-    if 'cart' in request.session:
-        del request.session['cart']
+    Cart.for_request(request).clear()
     # ✅ แก้เป็น store:product_list
     return redirect('store:product_list')
 
 # 4. รายละเอียดสินค้า
+@cache_anonymous_page
 def product_detail(request, pk):
     product = get_object_or_404(Product, id=pk)
     return render(request, 'store/product_detail.html', {'product': product})
 
 # 5. หน้าร้านค้า
+def _product_page(request):
+    # ใช้ร่วมกันทั้งหน้า HTML และ JSON (infinite scroll)
+    category_id = request.GET.get('category')
+    if category_id and not category_id.isdigit():
+        category_id = None
+    try:
+        return product_page(
+            query=request.GET.get('search'),
+            category_id=category_id,
+            cursor=request.GET.get('cursor'),
+            page_size=request.GET.get('page_size'),
+        )
+    except InvalidCursor:
+        raise BadRequest("Invalid cursor")
+
+@cache_anonymous_page
 def product_list(request):
-    query = request.GET.get('search')
-    if query:
-        products = Product.objects.filter(name__icontains=query)
-    else:
-        products = Product.objects.all()
-    return render(request, 'store/product_list.html', {'products': products})
+    # 🔎 ค้นหา/กรองหมวดหมู่ + แบ่งหน้าแบบ cursor (ดู store/listing.py)
+    page = _product_page(request)
+    return render(request, 'store/product_list.html', {
+        'products': page['products'],
+        'facets': page['facets'],
+        'next_cursor': page['next_cursor'],
+        'search': request.GET.get('search', ''),
+        'current_category': request.GET.get('category', ''),
+        'storefront_version': storefront_version(),
+        'storefront_cache_timeout': storefront_cache_timeout(),
+    })
+
+def product_list_api(request):
+    page = _product_page(request)
+    return JsonResponse({
+        'products': [
+            {
+                'id': product.id,
+                'name': product.name,
+                'description': product.description,
+                'price': product.price,
+                'image': product.image.url if product.image else None,
+                'category': product.category.name if product.category else None,
+                'url': reverse('store:product_detail', args=[product.id]),
+            }
+            for product in page['products']
+        ],
+        'facets': page['facets'],
+        'next_cursor': page['next_cursor'],
+    })
 
 # 6. สั่งซื้อและแจ้งเตือน Discord
 def checkout(request):
     if request.method == 'POST':
-        cart = request.session.get('cart', {})
+        cart = Cart.for_request(request)
         
         if request.user.is_authenticated:
             customer_name = request.user.username
         else:
             customer_name = request.POST.get('customer_name')
 
+        key = idempotency_key(request)
+
         if not cart:
+            # กดซ้ำหลังสั่งสำเร็จไปแล้ว (ตะกร้าถูกล้างไปแล้ว) -> ตอบเหมือนครั้งแรก
+            if key and Order.objects.filter(idempotency_key=key).exists():
+                return render(request, 'store/success.html')
             return redirect('store:product_list')
 
-        total_price = 0
-        for product_id, quantity in cart.items():
-            product = Product.objects.get(id=product_id)
-            total_price += product.price * quantity
-
-        order = Order.objects.create(
-            customer_name=customer_name,
-            total_price=total_price,
-            paid=False
+        # โหลดสินค้าทั้งตะกร้าครั้งเดียว แล้วใช้ snapshot เดียวกันทั้งยอดรวมและ OrderItem
+        # สร้าง Order + OrderItem (bulk_create) + แจ้งเตือน ใน transaction เดียว กดซ้ำได้ order เดิม
+        place_order(
+            cart.price(),
+            customer_name,
+            user=request.user if request.user.is_authenticated else None,
+            key=key,
         )
 
-        discord_message = f"🔔 **ออเดอร์ใหม่มาแล้ว! (#{order.id})**\n"
-        discord_message += f"👤 ลูกค้า: **{customer_name}**\n"
-        discord_message += "---------------------------------\n"
-
-        for product_id, quantity in cart.items():
-            product = Product.objects.get(id=product_id)
-            OrderItem.objects.create(
-                order=order,
-                product=product,
-                quantity=quantity,
-                price=product.price
-            )
-            discord_message += f"📦 {product.name} x {quantity} = {product.price * quantity} บ.\n"
-
-        discord_message += "---------------------------------\n"
-        discord_message += f"💰 **ยอดรวม: {total_price} บาท**"
-
-        webhook_url = 'https://discord.com/api/webhooks/1458009167381139509/1gSu6Hhe-EQcwKE90Jd8Pko4yTm9S1kFjU2IDxB67arMUeBR2fTHUgyBjuMuwpQJcYsy'
-        try:
-            requests.post(webhook_url, json={'content': discord_message})
-        except:
-            print("ส่ง Discord ไม่ผ่าน แต่บันทึก DB แล้ว")
-
-        del request.session['cart']
+        cart.clear()
         return render(request, 'store/success.html')
         
     # ✅ แก้เป็น store:cart_detail
@@ -143,8 +151,19 @@ def checkout(request):
 
 @login_required
 def my_orders(request):
-    orders = Order.objects.filter(customer_name=request.user.username).order_by('-created_at')
-    return render(request, 'store/my_orders.html', {'orders': orders})
+    # 🧾 อ่านรายการสินค้าจาก Order.summary (ไม่ต้อง join) + แบ่งหน้าแบบ cursor (ดู store/orders.py)
+    try:
+        page = order_history(
+            request.user,
+            cursor=request.GET.get('cursor'),
+            page_size=request.GET.get('page_size'),
+        )
+    except InvalidCursor:
+        raise BadRequest("Invalid cursor")
+    return render(request, 'store/my_orders.html', {
+        'orders': page['orders'],
+        'next_cursor': page['next_cursor'],
+    })
 
 def add_product(request):
     if not request.user.is_superuser:
@@ -196,8 +215,9 @@ def delete_product(request, pk):
 
     return render(request, 'store/delete_confirm.html', {'product': product})
 
+@login_required
 def upload_slip(request, order_id):
-    order = get_object_or_404(Order, id=order_id, customer_name=request.user.username)
+    order = get_object_or_404(Order, id=order_id, user=request.user)
 
     if request.method == 'POST':
         slip = request.FILES.get('slip_image')
@@ -206,33 +226,19 @@ def upload_slip(request, order_id):
             order.slip_image = slip
             order.save()
 
-            # 2. เตรียมข้อมูลส่ง Discord 🚀
-            webhook_url = 'https://discord.com/api/webhooks/1460176250902544394/kanTURG_tRgy_vg2panKhr2RevWdJhYZ6RmtAQLPEqY2uzpkiuWr5BEXb9MGkNeemVwc'
-            
-            # ข้อความแจ้งเตือน
+            # 2. เตรียมข้อความแจ้งเตือน Discord 🚀
             message_content = f"💸 **มีการแจ้งชำระเงินเข้ามา!**\n"
             message_content += f"🧾 **Order:** #{order.id}\n"
             message_content += f"👤 **User:** {order.customer_name}\n"
             message_content += f"💰 **ยอดเงิน:** {order.total_price} บาท\n"
             message_content += f"---------------------------------"
 
-            try:
-                # สำคัญ! เทคนิคการส่งไฟล์รูปไป Discord
-                # เราต้อง rewind ไฟล์ให้กลับไปจุดเริ่มต้นก่อนส่ง (เพราะ Django เพิ่งอ่านไปบันทึก DB)
-                slip.seek(0) 
-
-                files = {
-                    'file': (slip.name, slip, slip.content_type)
-                }
-                data = {
-                    'content': message_content
-                }
-
-                # ส่ง POST Request แบบมีไฟล์แนบ (multipart/form-data)
-                requests.post(webhook_url, data=data, files=files)
-                
-            except Exception as e:
-                print(f"Discord Error: {e}")
+            # 3. ส่งเข้า outbox พร้อมแนบสลิป (worker จะเปิดไฟล์จาก storage แล้วส่งเป็น multipart ให้เอง)
+            notifications.enqueue(
+                settings.DISCORD_SLIP_WEBHOOK_URL,
+                message_content,
+                attachment=order.slip_image.name,
+            )
 
             return redirect('store:my_orders')
 
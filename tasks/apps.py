@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class TasksConfig(AppConfig):
     name = 'tasks'
+
+    def ready(self):
+        # ผูก signal ล้าง cache สิทธิ์ของทีม
+        from . import signals  # noqa: F401
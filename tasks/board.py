@@ -0,0 +1,158 @@
+from django.db import transaction
+from django.db.models import Case, When, Value, IntegerField, Q
+from django.http import Http404
+
+from .models import Task, Sprint
+from .permissions import TeamPermissions
+from .ranks import rank_between
+from .stats import task_state
+
+# คอลัมน์บนกระดาน (เรียงตามที่แสดงผล) + ค่าที่ template ใช้วาดหัวคอลัมน์
+BOARD_COLUMNS = [
+    {'status': 'TODO', 'key': 'todo', 'title': '📌 TO DO',
+     'title_class': 'text-secondary', 'badge_class': 'badge-soft', 'style': ''},
+    {'status': 'IN_PROGRESS', 'key': 'inprogress', 'title': '⚡ IN PROGRESS',
+     'title_class': 'text-primary', 'badge_class': 'bg-primary', 'style': 'background: rgba(225, 245, 254, 0.5);'},
+    {'status': 'DONE', 'key': 'done', 'title': '✅ DONE',
+     'title_class': 'text-success', 'badge_class': 'bg-success', 'style': 'background: rgba(232, 245, 233, 0.5);'},
+]
+
+PRIORITY_ORDER = Case(
+    When(priority='H', then=Value(3)),
+    When(priority='M', then=Value(2)),
+    When(priority='L', then=Value(1)),
+    default=Value(0),
+    output_field=IntegerField(),
+)
+
+
+def load_board(user, team_id=None, sprint_id=None, permissions=None):
+    """โหลดข้อมูลทั้งกระดาน Kanban ด้วยจำนวน query คงที่
+
+    - ทีม + role: จาก TeamPermissions (cache ข้าม request / ไม่ใช่สมาชิก -> 404)
+    - รายการ Sprint: 1 query (เลือก active sprint ใน Python)
+    - งานใน sprint + backlog: 1 query แล้วแบ่งคอลัมน์ใน Python
+    """
+    current_team = None
+
+    permissions = permissions or TeamPermissions(user)
+
+    if team_id:
+        current_team = permissions.team(team_id)
+        if current_team is None:
+            raise Http404("No Team matches the given query.")
+        role = permissions.role(team_id)
+        sprint_queryset = Sprint.objects.filter(team=current_team)
+        backlog_filter = Q(sprint__isnull=True, team=current_team)
+    else:
+        role = 'OWNER'
+        sprint_queryset = Sprint.objects.filter(created_by=user, team__isnull=True)
+        backlog_filter = Q(sprint__isnull=True, team__isnull=True, created_by=user)
+
+    all_sprints = list(sprint_queryset.order_by('-id'))
+
+    # --- Active Sprint ---
+    active_sprint = None
+    if sprint_id:
+        active_sprint = next((s for s in all_sprints if str(s.pk) == str(sprint_id)), None)
+    else:
+        active_sprint = next((s for s in all_sprints if s.is_active), None)
+
+    # --- Tasks (sprint + backlog ใน query เดียว) ---
+    task_filter = backlog_filter
+    if active_sprint:
+        task_filter |= Q(sprint=active_sprint)
+
+    tasks = (
+        Task.objects.filter(task_filter)
+        .select_related('assignee')
+        .annotate(priority_val=PRIORITY_ORDER)
+        # ลำดับที่ผู้ใช้ลากจัดไว้ (rank) ก่อน / rank ซ้ำกันค่อยใช้ priority + วันที่สร้างแบบเดิม
+        .order_by('rank', '-priority_val', '-created_at')
+    )
+
+    columns = [dict(column, tasks=[]) for column in BOARD_COLUMNS] if active_sprint else []
+    columns_by_status = {column['status']: column for column in columns}
+    backlog = []
+
+    for task in tasks:
+        if task.sprint_id is None:
+            backlog.append(task)
+        elif task.status in columns_by_status:
+            columns_by_status[task.status]['tasks'].append(task)
+
+    return {
+        'current_team': current_team,
+        'current_user_role': role,
+        'all_sprints': all_sprints,
+        'active_sprint': active_sprint,
+        'columns': columns,
+        'backlog_tasks': backlog,
+    }
+
+
+VALID_STATUSES = {column['status'] for column in BOARD_COLUMNS}
+
+
+def board_sprints(user, team_id=None):
+    """Sprint ของกระดานนี้ (ทีม team_id หรือกระดานส่วนตัวของ user)"""
+    if team_id:
+        return Sprint.objects.filter(team_id=team_id)
+    return Sprint.objects.filter(created_by=user, team__isnull=True)
+
+
+def apply_moves(user, moves, team_id=None, permissions=None):
+    """ย้ายการ์ดหลายใบใน transaction เดียว คืน (งานที่ย้าย, [(task_state ก่อน, หลัง), ...] ของ apply_task_changes)
+
+    move แต่ละตัว: {'task_id', 'status', 'sprint_id', 'after_id', 'before_id'}
+    after_id / before_id คือการ์ดที่อยู่บน / ล่างตำแหน่งใหม่ (ไม่มีก็ได้)
+    ทำตามลำดับที่ส่งมา (การ์ดที่ย้ายก่อนเป็นเพื่อนบ้านของตัวถัดไปได้) แล้วเขียนลง DB ด้วย bulk_update ครั้งเดียว
+
+    งานต้องอยู่บนกระดานเดียวกัน (ทีม team_id หรือกระดานส่วนตัว) ไม่ใช่สมาชิกทีม -> 404 แบบ load_board
+    ข้อมูลไม่ถูกต้อง -> ValueError
+    """
+    permissions = permissions or TeamPermissions(user)
+
+    if team_id:
+        if permissions.role(team_id) is None:
+            raise Http404("No Team matches the given query.")
+        board_filter = Q(team_id=team_id)
+    else:
+        board_filter = Q(created_by=user, team__isnull=True)
+    sprint_queryset = board_sprints(user, team_id)
+
+    ids = set()
+    sprint_ids = set()
+    for move in moves:
+        if move.get('status') not in VALID_STATUSES:
+            raise ValueError(f"invalid status: {move.get('status')!r}")
+        ids.update(move.get(key) for key in ('task_id', 'after_id', 'before_id'))
+        if move.get('sprint_id'):
+            sprint_ids.add(int(move['sprint_id']))
+    ids.discard(None)
+
+    tasks = {
+        task.id: task
+        for task in Task.objects.filter(board_filter, id__in=[int(pk) for pk in ids]).select_related('assignee')
+    }
+    if sprint_ids and len(sprint_queryset.filter(id__in=sprint_ids)) != len(sprint_ids):
+        raise ValueError("sprint not found on this board")
+
+    moved = {}
+    old_states = {}
+    for move in moves:
+        task = tasks.get(int(move['task_id']))
+        if task is None:
+            raise ValueError(f"task {move['task_id']} not found on this board")
+        after = tasks.get(int(move['after_id'])) if move.get('after_id') else None
+        before = tasks.get(int(move['before_id'])) if move.get('before_id') else None
+
+        old_states.setdefault(task.id, task_state(task))
+        task.status = move['status']
+        task.sprint_id = int(move['sprint_id']) if move.get('sprint_id') else None
+        task.rank = rank_between(after.rank if after else None, before.rank if before else None)
+        moved[task.id] = task
+
+    with transaction.atomic(savepoint=False):
+        Task.objects.bulk_update(list(moved.values()), ['status', 'sprint', 'rank'])
+    return list(moved.values()), [(old_states[task_id], task_state(task)) for task_id, task in moved.items()]
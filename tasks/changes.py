@@ -0,0 +1,144 @@
+"""
+Change log ของกระดานงาน สำหรับ client ที่หลุดแล้วต่อใหม่ (Delta Sync)
+
+- ทุกครั้งที่ Task/Sprint เปลี่ยนหรือถูกลบ จะเขียน BoardChange 1 แถวต่อ object พร้อม seq ของช่องนั้น
+  (team:<id> / user:<id>) seq เพิ่มทีละ 1 ต่อเนื่องกัน และเรียงตามลำดับ commit จริง
+  เพราะการจอง seq lock แถว BoardSequence ของช่องไว้จนจบ transaction
+- event SSE (tasks/events.py) ใช้ seq เดียวกันเป็น id -> client รู้ว่าพลาด event ไหนไปบ้าง
+- GET /tasks/api/changes/?since=N คืนเฉพาะ object ที่เปลี่ยนหลัง seq N (range query บน index (channel, seq))
+- compact() ลบแถวที่มีแถวใหม่กว่าของ object เดียวกัน และแถวที่เก่ากว่ากำหนด
+- reset() ใช้ตอนแก้ข้อมูลทีละมากๆ (import): client ที่ since เก่ากว่าได้ reset=True แล้วโหลดกระดานใหม่
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Max
+from django.utils import timezone
+
+from .models import BoardChange, BoardSequence
+
+# จำนวนแถวสูงสุดต่อครั้ง (เกินนี้ client เรียกต่อด้วย since ใหม่)
+MAX_CHANGES = 1000
+
+
+def _reserve(channel, count):
+    """จอง seq ต่อกัน count ตัว คืน seq ตัวสุดท้าย (ต้องเรียกใน transaction)"""
+    sequences = BoardSequence.objects.filter(channel=channel)
+    # UPDATE lock แถวไว้ -> อีก transaction ของช่องเดียวกันต้องรอจน commit
+    if not sequences.update(last_seq=F('last_seq') + count):
+        BoardSequence.objects.get_or_create(channel=channel)
+        sequences.update(last_seq=F('last_seq') + count)
+    return sequences.values_list('last_seq', flat=True).get()
+
+
+def record(channel, entries):
+    """บันทึก [(kind, object_id, data)] ลง change log คืน seq ตัวสุดท้าย (data=None คือถูกลบ)
+
+    เรียกใน transaction.atomic() เดียวกับที่แก้ข้อมูล: seq ถูกจองและ commit พร้อมกับการแก้ไข
+    (ซ้อนใน transaction อยู่แล้วไม่ต้องเปิด savepoint ผิดพลาดก็ rollback ทั้งก้อน)
+    """
+    if not entries:
+        return None
+    with transaction.atomic(savepoint=False):
+        last_seq = _reserve(channel, len(entries))
+        first_seq = last_seq - len(entries) + 1
+        BoardChange.objects.bulk_create([
+            BoardChange(channel=channel, seq=first_seq + i, kind=kind, object_id=object_id, data=data)
+            for i, (kind, object_id, data) in enumerate(entries)
+        ])
+    return last_seq
+
+
+def reset(channel):
+    """ให้ client ทุกคนของช่องนี้โหลดกระดานใหม่ทั้งหมด (ใช้แทนการลง log ทีละแถวตอนแก้ข้อมูลทีละมากๆ เช่น import)
+
+    จอง seq ใหม่ 1 ตัวแล้วเลื่อน compacted_seq มาเท่ากัน -> since ที่เก่ากว่านี้ได้ reset=True
+    """
+    with transaction.atomic(savepoint=False):
+        last_seq = _reserve(channel, 1)
+        BoardSequence.objects.filter(channel=channel).update(compacted_seq=last_seq)
+    return last_seq
+
+
+def current_seq(channel):
+    return BoardSequence.objects.filter(channel=channel).values_list('last_seq', flat=True).first() or 0
+
+
+def changes_since(channel, since, limit=MAX_CHANGES):
+    """สิ่งที่เปลี่ยนหลัง seq `since` (object ละ 1 รายการ เป็นสถานะล่าสุด)
+
+    reset=True แปลว่าตามต่อจาก since ไม่ได้ (log ช่วงนั้นถูก compact ไปแล้ว) ต้องโหลดกระดานใหม่ทั้งหมด
+    """
+    sequence = BoardSequence.objects.filter(channel=channel).values('last_seq', 'compacted_seq').first()
+    last_seq = sequence['last_seq'] if sequence else 0
+    compacted_seq = sequence['compacted_seq'] if sequence else 0
+    result = {
+        'seq': last_seq, 'reset': False, 'has_more': False,
+        'tasks': [], 'deleted_tasks': [], 'sprints': [], 'deleted_sprints': [],
+    }
+    if since < compacted_seq or since > last_seq:
+        result['reset'] = True
+        return result
+    if since == last_seq:
+        # ไม่มีอะไรเปลี่ยน (กรณีส่วนใหญ่) ไม่ต้องแตะตาราง BoardChange
+        return result
+
+    rows = list(
+        BoardChange.objects.filter(channel=channel, seq__gt=since)
+        .order_by('seq')
+        .values_list('seq', 'kind', 'object_id', 'data')[:limit]
+    )
+    latest = {}
+    for seq, kind, object_id, data in rows:
+        latest[(kind, object_id)] = data
+    for (kind, object_id), data in latest.items():
+        if data is None:
+            result[f'deleted_{kind}s'].append(object_id)
+        else:
+            result[f'{kind}s'].append(data)
+    if len(rows) == limit:
+        result['seq'] = rows[-1][0]
+        result['has_more'] = True
+    elif rows:
+        # อาจมีแถวที่ commit หลังอ่าน BoardSequence ติดมาด้วย
+        result['seq'] = max(last_seq, rows[-1][0])
+    return result
+
+
+def compact(older_than_days=None, batch_size=1000):
+    """ลบ change log ที่ไม่จำเป็นแล้ว คืน (จำนวนแถวที่ถูกแทนที่, จำนวนแถวที่หมดอายุ)
+
+    1) แถวที่มีแถวใหม่กว่าของ object เดียวกัน: ลบได้เลย client ทุกคนได้สถานะล่าสุดจากแถวใหม่อยู่แล้ว
+    2) แถวที่เก่ากว่า older_than_days: ลบแล้วเลื่อน compacted_seq ของช่องขึ้นไป
+    """
+    superseded = []
+    seen = set()
+    previous_channel = None
+    rows = BoardChange.objects.order_by('channel', '-seq').values_list('id', 'channel', 'kind', 'object_id')
+    for pk, channel, kind, object_id in rows.iterator(chunk_size=batch_size):
+        if channel != previous_channel:
+            seen.clear()
+            previous_channel = channel
+        if (kind, object_id) in seen:
+            superseded.append(pk)
+        else:
+            seen.add((kind, object_id))
+    for start in range(0, len(superseded), batch_size):
+        BoardChange.objects.filter(pk__in=superseded[start:start + batch_size]).delete()
+
+    expired = 0
+    if older_than_days is not None:
+        cutoff = timezone.now() - timedelta(days=older_than_days)
+        floors = list(
+            BoardChange.objects.filter(created_at__lt=cutoff)
+            .values('channel')
+            .annotate(max_seq=Max('seq'))
+            .values_list('channel', 'max_seq')
+        )
+        for channel, max_seq in floors:
+            with transaction.atomic():
+                # เลื่อน compacted_seq ก่อนลบ client จะไม่ได้ผลลัพธ์ที่ขาดแถวไปโดยไม่รู้ตัว
+                BoardSequence.objects.filter(channel=channel, compacted_seq__lt=max_seq).update(compacted_seq=max_seq)
+                deleted, _ = BoardChange.objects.filter(channel=channel, seq__lte=max_seq).delete()
+            expired += deleted
+    return len(superseded), expired
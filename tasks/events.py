@@ -0,0 +1,226 @@
+"""
+Event ของกระดานงานแบบ real-time (Server-Sent Events)
+
+- view ที่แก้ Task/Sprint เรียก publish_task_* / publish_sprint_changed หลัง commit
+- ผู้ที่เปิดกระดานอยู่ subscribe ช่อง team:<id> (หรือ user:<id> สำหรับกระดานส่วนตัว) ผ่าน /tasks/api/events/
+- event ทุกตัวถูกบันทึกลง change log ก่อน (tasks/changes.py) และใช้ seq ของ log เป็น id ของ event
+  client เห็น id กระโดดข้าม = พลาด event ไป ให้ดึง /tasks/api/changes/?since=<id ล่าสุด> มาเติม
+- broker เลือกได้จาก settings.TASK_EVENTS_BROKER
+    InProcessBroker: ส่งกันใน process เดียว (ASGI worker เดียว)
+    RedisBroker: ส่งข้ามหลาย worker ผ่าน Redis pub/sub แล้วกระจายต่อใน process
+"""
+import asyncio
+import json
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from . import changes
+
+QUEUE_SIZE = 100
+DESCRIPTION_PREVIEW = 200
+
+
+def task_payload(task):
+    """ข้อมูลการ์ดงานแบบย่อ (พอให้ client แก้การ์ดบนกระดานได้เอง)"""
+    return {
+        'id': task.id,
+        'title': task.title,
+        # การ์ดโชว์แค่บรรทัดเดียว ไม่ต้องส่ง description ยาวๆ ทั้งก้อน
+        'description': (task.description or '')[:DESCRIPTION_PREVIEW],
+        'status': task.status,
+        'priority': task.priority,
+        'points': task.story_points,
+        'sprint': task.sprint_id,
+        'rank': task.rank,
+        'assignee': task.assignee.username if task.assignee_id else None,
+    }
+
+
+def sprint_payload(sprint):
+    return {
+        'id': sprint.id,
+        'name': sprint.name,
+        'is_active': sprint.is_active,
+    }
+
+
+def channel_for(team_id=None, user_id=None):
+    return f'team:{team_id}' if team_id else f'user:{user_id}'
+
+
+def format_sse(message):
+    data = json.dumps(message['data'], separators=(',', ':'), ensure_ascii=False)
+    return f"id: {message['id']}\nevent: {message['event']}\ndata: {data}\n\n"
+
+
+class Subscription:
+    """คิวของผู้ฟัง 1 คน (ผูกกับ event loop ที่ subscribe)"""
+
+    def __init__(self, channel, loop):
+        self.channel = channel
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+
+    def deliver(self, message):
+        # เรียกจาก thread ไหนก็ได้ (view แบบ sync รันใน thread pool)
+        self.loop.call_soon_threadsafe(self._put, message)
+
+    def _put(self, message):
+        if self.queue.full():
+            # client ช้า: ทิ้ง event เก่าสุด ไม่ให้คิวโตไม่จำกัด
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+    async def get(self, timeout):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class InProcessBroker:
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    async def subscribe(self, channel):
+        subscription = Subscription(channel, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers[channel].add(subscription)
+        return subscription
+
+    async def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.channel]
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def _fanout(self, channel, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            subscription.deliver(message)
+
+    def publish(self, channel, message):
+        self._fanout(channel, message)
+
+
+class RedisBroker(InProcessBroker):
+    """ส่ง event ผ่าน Redis pub/sub: ทุก worker ฟัง pattern เดียวแล้วกระจายให้ผู้ฟังใน process ตัวเอง"""
+
+    PREFIX = 'tasks:events:'
+
+    def __init__(self, url=None):
+        super().__init__()
+        try:
+            import redis
+        except ImportError:
+            raise ImproperlyConfigured("RedisBroker ต้องติดตั้งแพ็กเกจ redis")
+        self.url = url or settings.REDIS_URL
+        self._redis = redis
+        self._client = redis.Redis.from_url(self.url)
+        self._listener = None
+
+    def publish(self, channel, message):
+        self._client.publish(self.PREFIX + channel, json.dumps(message))
+
+    async def subscribe(self, channel):
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+        return await super().subscribe(channel)
+
+    async def _listen(self):
+        client = self._redis.asyncio.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        await pubsub.psubscribe(self.PREFIX + '*')
+        try:
+            async for item in pubsub.listen():
+                if item['type'] != 'pmessage':
+                    continue
+                channel = item['channel'].decode()[len(self.PREFIX):]
+                self._fanout(channel, json.loads(item['data']))
+        finally:
+            await pubsub.aclose()
+            await client.aclose()
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                path = getattr(settings, 'TASK_EVENTS_BROKER', 'tasks.events.InProcessBroker')
+                _broker = import_string(path)()
+    return _broker
+
+
+def publish(channel, seq, event, data):
+    """ส่ง event หลัง transaction commit (rollback แล้วจะไม่มี event หลุดออกไป)"""
+    message = {'id': seq, 'event': event, 'data': data}
+    transaction.on_commit(lambda: get_broker().publish(channel, message))
+
+
+def publish_task_event(event, task):
+    channel = channel_for(task.team_id, task.created_by_id)
+    data = task_payload(task)
+    publish(channel, changes.record(channel, [('task', task.id, data)]), event, data)
+
+
+def publish_task_deleted(task):
+    channel = channel_for(task.team_id, task.created_by_id)
+    data = {'id': task.id}
+    publish(channel, changes.record(channel, [('task', task.id, None)]), 'task-deleted', data)
+
+
+def publish_tasks_moved(tasks):
+    """งานหลายใบที่ถูกย้ายพร้อมกัน (batch move) บันทึก log ครั้งเดียวต่อช่อง แล้วส่ง event ทีละใบตาม seq"""
+    by_channel = {}
+    for task in tasks:
+        by_channel.setdefault(channel_for(task.team_id, task.created_by_id), []).append(task)
+    for channel, channel_tasks in by_channel.items():
+        payloads = [task_payload(task) for task in channel_tasks]
+        last_seq = changes.record(channel, [('task', data['id'], data) for data in payloads])
+        first_seq = last_seq - len(payloads) + 1
+        for offset, data in enumerate(payloads):
+            publish(channel, first_seq + offset, 'task-moved', data)
+
+
+def record_tasks_changed(tasks):
+    """งานที่ถูกแก้ทีละหลายตัว (QuerySet.update) ลง change log อย่างเดียว ไม่ส่ง event ทีละตัว
+
+    client จะเห็น seq กระโดดจาก event ถัดไป แล้วดึงส่วนที่ขาดจาก /tasks/api/changes/ เอง
+    """
+    by_channel = {}
+    for task in tasks.select_related('assignee'):
+        channel = channel_for(task.team_id, task.created_by_id)
+        by_channel.setdefault(channel, []).append(('task', task.id, task_payload(task)))
+    for channel, entries in by_channel.items():
+        changes.record(channel, entries)
+
+
+def publish_board_reset(team_id=None, user_id=None):
+    """ข้อมูลเปลี่ยนทีละมากๆ (import) ไม่ลง log ทีละแถว ให้ client โหลดกระดานใหม่ทั้งหมดแทน"""
+    channel = channel_for(team_id, user_id)
+    publish(channel, changes.reset(channel), 'board-reset', {})
+
+
+def publish_sprint_changed(sprint, deleted=False):
+    channel = channel_for(sprint.team_id, sprint.created_by_id)
+    data = sprint_payload(sprint)
+    seq = changes.record(channel, [('sprint', sprint.id, None if deleted else data)])
+    publish(channel, seq, 'sprint-changed', data)
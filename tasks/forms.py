@@ -1,4 +1,5 @@
 from django import forms
+from django.contrib.auth.models import User
 from .models import Task, Sprint, Team
 
 # ==========================================
@@ -24,15 +25,9 @@ class TaskForm(forms.ModelForm):
 
         # 🔥 Logic กรองคนรับงาน (Assignee)
         if team_id:
-            # กรณีอยู่ในทีม: ให้เลือกได้เฉพาะสมาชิกในทีมนั้น
-            try:
-                team = Team.objects.get(id=team_id)
-                # ดึงเฉพาะ User ที่อยู่ในทีมนี้
-                self.fields['assignee'].queryset = team.members.all()
-                self.fields['assignee'].empty_label = "--- Unassigned (ยังไม่ระบุคน) ---"
-            except Team.DoesNotExist:
-                # กันเหนียวเผื่อหาทีมไม่เจอ
-                self.fields['assignee'].queryset = team.members.none()
+            # กรณีอยู่ในทีม: ให้เลือกได้เฉพาะสมาชิกในทีมนั้น (กรองผ่าน TeamMember ตรงๆ ไม่ต้องโหลด Team ก่อน)
+            self.fields['assignee'].queryset = User.objects.filter(team_memberships__team_id=team_id)
+            self.fields['assignee'].empty_label = "--- Unassigned (ยังไม่ระบุคน) ---"
         else:
             # กรณีส่วนตัว: ซ่อนช่อง Assignee ไปเลย (เพราะคืองานของตัวเอง)
             self.fields['assignee'].widget = forms.HiddenInput()
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Sum, Q
+from django.utils import timezone
+
+from tasks.models import Sprint, Task, SprintSnapshot
+
+
+class Command(BaseCommand):
+    help = "สร้าง SprintSnapshot ให้ Sprint ที่ยังไม่มีประวัติ (ใช้สถานะงานปัจจุบันเป็นจุดเริ่มต้น)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        batch_size = options['batch_size']
+
+        sprints = Sprint.objects.filter(snapshots__isnull=True).order_by('id')
+        created = 0
+
+        # ทำทีละ batch: สถิติของทั้ง batch ได้จาก grouped aggregate query เดียว
+        while True:
+            batch = list(sprints.only('id', 'start_date', 'end_date')[:batch_size])
+            if not batch:
+                break
+
+            done = Q(status='DONE')
+            rows = Task.objects.filter(sprint__in=batch).values('sprint_id').annotate(
+                total_tasks=Count('id'),
+                done_tasks=Count('id', filter=done),
+                total_points=Sum('story_points'),
+                done_points=Sum('story_points', filter=done),
+            )
+            stats = {row['sprint_id']: row for row in rows}
+
+            snapshots = []
+            for sprint in batch:
+                row = stats.get(sprint.id, {})
+                # Sprint ที่จบไปแล้วบันทึกไว้ที่วันสุดท้ายของ Sprint
+                snapshots.append(SprintSnapshot(
+                    sprint=sprint,
+                    date=min(sprint.end_date, today),
+                    total_tasks=row.get('total_tasks') or 0,
+                    done_tasks=row.get('done_tasks') or 0,
+                    total_points=row.get('total_points') or 0,
+                    done_points=row.get('done_points') or 0,
+                ))
+            SprintSnapshot.objects.bulk_create(snapshots, ignore_conflicts=True)
+            created += len(snapshots)
+            self.stdout.write(f"{created} sprint(s) backfilled...")
+
+        self.stdout.write(self.style.SUCCESS(f"Done. {created} snapshot(s) created."))
@@ -0,0 +1,102 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.models import Sprint, Task, Team, TeamMember
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "seed กระดานทีมขนาดต่างๆ (ค่าเริ่มต้น 10 กับ 5000 งาน) แล้ววัดจำนวน query / เวลาของ task_board "
+        "จำนวน query ต้องเท่ากันทุกขนาด ไม่งั้นจบด้วย error (rollback ทุกอย่างตอนจบ)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10,5000', help='จำนวนงานบนกระดาน คั่นด้วย ,')
+        parser.add_argument('--members', type=int, default=8)
+        parser.add_argument('--repeat', type=int, default=10)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        try:
+            sizes = sorted({int(size) for size in options['sizes'].split(',')})
+        except ValueError:
+            raise CommandError("--sizes ต้องเป็นตัวเลขคั่นด้วย , เช่น 10,5000")
+        counts = []
+        self.stdout.write(self.style.MIGRATE_HEADING(f"task_board, {options['repeat']} requests per size"))
+        self.stdout.write(f"{'tasks':>6} {'queries':>8} {'p50 ms':>8} {'min ms':>8} {'KB':>7}")
+        try:
+            # กระดาน 5000 งานช้ากว่า SLOW_REQUEST_MS อยู่แล้ว ไม่ต้อง log ทุก request
+            with override_settings(SLOW_REQUEST_MS=10 ** 6), transaction.atomic():
+                for size in sizes:
+                    counts.append(self.run(size, options))
+                raise Rollback
+        except Rollback:
+            self.stdout.write("(rolled back seeded data)")
+        if len(set(counts)) > 1:
+            raise CommandError(f"query count grows with board size: {counts}")
+
+    def seed(self, size, options):
+        """ทีม 1 ทีม + Sprint ที่ Active: 80% ของงานอยู่ใน Sprint ที่เหลืออยู่ใน Backlog"""
+        rng = random.Random(options['seed'])
+        today = timezone.localdate()
+        users = User.objects.bulk_create([
+            User(username=f'bench_board_{size}_{i}', password='!') for i in range(options['members'])
+        ])
+        team = Team.objects.create(name=f'Bench Board {size}')
+        TeamMember.objects.bulk_create([
+            TeamMember(user=user, team=team, role='OWNER' if i == 0 else 'MEMBER') for i, user in enumerate(users)
+        ])
+        sprint = Sprint.objects.create(
+            name='Bench Sprint', team=team, created_by=users[0],
+            start_date=today, end_date=today + timedelta(days=14), is_active=True,
+        )
+        Task.objects.bulk_create([
+            Task(
+                title=f'Task {i}', description='รายละเอียด ' * 5,
+                status=rng.choice(['TODO', 'IN_PROGRESS', 'DONE']),
+                priority=rng.choice('HML'), story_points=rng.choice([1, 2, 3, 5, 8]),
+                rank=f'{i:08d}', team=team, created_by=users[0], assignee=rng.choice(users),
+                sprint=sprint if rng.random() < 0.8 else None,
+            )
+            for i in range(size)
+        ], batch_size=1000)
+        return users[0], team
+
+    def run(self, size, options):
+        user, team = self.seed(size, options)
+        client = Client()
+        client.force_login(user)
+        url = f"{reverse('tasks:board')}?team_id={team.id}"
+        client.get(url, HTTP_HOST='localhost')  # warm-up (template / cache ของสิทธิ์)
+
+        # request_started ล้าง queries_log: เริ่มนับจาก log ว่าง
+        reset_queries()
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, HTTP_HOST='localhost')
+        if response.status_code != 200:
+            raise CommandError(f"task_board returned {response.status_code}")
+
+        timings = []
+        for _ in range(options['repeat']):
+            started = time.perf_counter()
+            client.get(url, HTTP_HOST='localhost')
+            timings.append((time.perf_counter() - started) * 1000)
+        self.stdout.write(
+            f"{size:>6} {len(queries.captured_queries):>8} {statistics.median(timings):>8.1f} "
+            f"{min(timings):>8.1f} {len(response.content) / 1024:>7.0f}"
+        )
+        return len(queries.captured_queries)
@@ -0,0 +1,115 @@
+import json
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.http import JsonResponse
+from django.template.loader import render_to_string
+from django.test import Client, RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.events import task_payload
+from tasks.models import Sprint, Task, Team, TeamMember
+from tasks.views import card_response
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "เทียบเวลาฝั่ง server ต่อการย้ายการ์ด 1 ใบ: render partials/task_card.html (แบบเดิม) "
+        "กับข้อมูลการ์ดแบบย่อ + ETag (rollback ทุกอย่างตอนจบ)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--moves', type=int, default=500)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            self.stdout.write("(rolled back seeded data)")
+
+    def seed(self):
+        today = timezone.localdate()
+        user = User.objects.create_user(username='bench_cards_user')
+        team = Team.objects.create(name='Bench Cards Team')
+        TeamMember.objects.create(user=user, team=team, role='OWNER')
+        sprint = Sprint.objects.create(
+            name='Bench Sprint', team=team, created_by=user,
+            start_date=today, end_date=today + timedelta(days=14), is_active=True,
+        )
+        task = Task.objects.create(
+            title='Benchmark card', description='รายละเอียดงาน ' * 10, priority='H', story_points=5,
+            team=team, created_by=user, assignee=user, sprint=sprint, rank='i',
+        )
+        return user, team, sprint, task
+
+    def best_of(self, repeat, moves, build):
+        """เวลาเฉลี่ยต่อครั้ง (µs) จากรอบที่เร็วที่สุด กับขนาด body"""
+        rounds = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(moves):
+                body = build()
+            rounds.append((time.perf_counter() - started) / moves * 1e6)
+        return min(rounds), len(body)
+
+    def run(self, options):
+        user, team, sprint, task = self.seed()
+        task = Task.objects.select_related('assignee').get(pk=task.pk)
+        request = RequestFactory().post(reverse('tasks:move_task_api'), HTTP_REFERER=f'/tasks/?team_id={team.id}')
+        request.user = user
+        moves, repeat = options['moves'], options['repeat']
+
+        def html_card():
+            html = render_to_string('tasks/partials/task_card.html', {
+                'task': task, 'current_user_role': 'OWNER', 'redirect_url': request.META['HTTP_REFERER'],
+            }, request=request)
+            return JsonResponse({'success': True, 'message': 'Moved successfully!', 'html': html}).content
+
+        def json_card():
+            return card_response(request, {
+                'success': True, 'message': 'Moved successfully!', 'task': task_payload(task),
+            }).content
+
+        render_to_string('tasks/partials/task_card.html', {'task': task}, request=request)  # warm-up template cache
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\nresponse building only, {moves} moves x {repeat} rounds"))
+        for label, build in (('render task_card.html (old)', html_card), ('task_payload + ETag', json_card)):
+            micros, size = self.best_of(repeat, moves, build)
+            self.stdout.write(f"{label:<30} {micros:8.1f} µs/move  {size:6d} bytes")
+
+        client = Client()
+        client.force_login(user)
+        url = reverse('tasks:move_task_api')
+        statuses = ['TODO', 'IN_PROGRESS', 'DONE']
+        timings = []
+        for i in range(min(moves, 200)):
+            body = json.dumps({'task_id': task.id, 'status': statuses[i % 3], 'sprint_id': sprint.id})
+            started = time.perf_counter()
+            response = client.post(url, body, content_type='application/json', HTTP_HOST='localhost')
+            timings.append((time.perf_counter() - started) * 1000)
+            assert response.status_code == 200, response.content
+        self.stdout.write(self.style.MIGRATE_HEADING("\nfull move_task_api request (save + stats + event + response)"))
+        self.stdout.write(
+            f"p50 {statistics.median(timings):.2f} ms  "
+            f"p95 {statistics.quantiles(timings, n=20)[-1]:.2f} ms  "
+            f"{len(response.content)} bytes  ETag {response['ETag']}"
+        )
+
+        api_url = reverse('tasks:task_api', args=[task.id])
+        first = client.get(api_url, HTTP_HOST='localhost')
+        again = client.get(api_url, HTTP_HOST='localhost', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.stdout.write(
+            f"\nGET {api_url}: {first.status_code} ({len(first.content)} bytes), "
+            f"with If-None-Match: {again.status_code} ({len(again.content)} bytes)"
+        )
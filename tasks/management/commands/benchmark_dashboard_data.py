@@ -0,0 +1,116 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.models import Sprint, SprintSnapshot, Task, Team, TeamMember
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "วัดจำนวน query / เวลาของ dashboard_data (burndown + velocity) ตามจำนวนงานในทีม "
+        "ต้องคงที่ทุกขนาดเพราะอ่านจาก SprintSnapshot อย่างเดียว (rollback ทุกอย่างตอนจบ)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='100,20000', help='จำนวนงานในทีม คั่นด้วย ,')
+        parser.add_argument('--sprints', type=int, default=12, help='จำนวน Sprint ย้อนหลัง (velocity)')
+        parser.add_argument('--repeat', type=int, default=50)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        try:
+            sizes = sorted({int(size) for size in options['sizes'].split(',')})
+        except ValueError:
+            raise CommandError("--sizes ต้องเป็นตัวเลขคั่นด้วย , เช่น 100,20000")
+        counts = []
+        self.stdout.write(self.style.MIGRATE_HEADING(f"dashboard_data, {options['repeat']} requests per size"))
+        self.stdout.write(f"{'tasks':>6} {'queries':>8} {'p50 ms':>8} {'min ms':>8}")
+        try:
+            with transaction.atomic():
+                for size in sizes:
+                    counts.append(self.run(size, options))
+                raise Rollback
+        except Rollback:
+            self.stdout.write("(rolled back seeded data)")
+        if len(set(counts)) > 1:
+            raise CommandError(f"query count grows with task count: {counts}")
+
+    def seed(self, size, options):
+        """ทีมที่มี Sprint ละ 14 วัน ย้อนหลัง --sprints รอบ (รอบสุดท้าย Active) งานกระจายทุก Sprint + snapshot รายวัน"""
+        rng = random.Random(options['seed'])
+        today = timezone.localdate()
+        user = User.objects.create_user(username=f'bench_dashboard_{size}')
+        team = Team.objects.create(name=f'Bench Dashboard {size}')
+        TeamMember.objects.create(user=user, team=team, role='OWNER')
+
+        count = options['sprints']
+        # Sprint ที่ Active เริ่มมาแล้ว 7 วัน รอบก่อนหน้าถอยไปรอบละ 14 วัน
+        starts = [today - timedelta(days=7 + 14 * (count - 1 - n)) for n in range(count)]
+        sprints = Sprint.objects.bulk_create([
+            Sprint(
+                name=f'Sprint {n}', team=team, created_by=user,
+                start_date=start, end_date=start + timedelta(days=13), is_active=(n == count - 1),
+            )
+            for n, start in enumerate(starts)
+        ])
+
+        Task.objects.bulk_create([
+            Task(
+                title=f'Task {i}', status=rng.choice(['TODO', 'IN_PROGRESS', 'DONE']),
+                story_points=rng.choice([1, 2, 3, 5, 8]), rank=f'{i:08d}',
+                team=team, created_by=user, sprint=sprints[i % count],
+            )
+            for i in range(size)
+        ], batch_size=1000)
+
+        per_sprint = size // count
+        snapshots = []
+        for sprint in sprints:
+            for day in range(14):
+                date = sprint.start_date + timedelta(days=day)
+                if date > today:
+                    break
+                done = per_sprint * day // 13
+                snapshots.append(SprintSnapshot(
+                    sprint=sprint, date=date, total_tasks=per_sprint, done_tasks=done,
+                    total_points=per_sprint * 3, done_points=done * 3,
+                ))
+        SprintSnapshot.objects.bulk_create(snapshots)
+        return user, team
+
+    def run(self, size, options):
+        user, team = self.seed(size, options)
+        client = Client()
+        client.force_login(user)
+        url = f"{reverse('tasks:dashboard_data')}?team_id={team.id}"
+        client.get(url, HTTP_HOST='localhost')  # warm-up (cache ของสิทธิ์)
+
+        # request_started ล้าง queries_log: เริ่มนับจาก log ว่าง
+        reset_queries()
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, HTTP_HOST='localhost')
+        if response.status_code != 200 or not response.json()['burndown']:
+            raise CommandError(f"dashboard_data returned {response.status_code}: {response.content[:200]!r}")
+
+        timings = []
+        for _ in range(options['repeat']):
+            started = time.perf_counter()
+            client.get(url, HTTP_HOST='localhost')
+            timings.append((time.perf_counter() - started) * 1000)
+        self.stdout.write(
+            f"{size:>6} {len(queries.captured_queries):>8} {statistics.median(timings):>8.2f} {min(timings):>8.2f}"
+        )
+        return len(queries.captured_queries)
@@ -0,0 +1,110 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.changes import current_seq
+from tasks.events import channel_for, publish_task_event, record_tasks_changed
+from tasks.models import BoardChange, Sprint, Task, Team, TeamMember
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "seed กระดานทีมขนาดใหญ่ใน transaction แล้วเทียบการโหลดกระดานใหม่ทั้งหน้า "
+        "กับการดึงเฉพาะส่วนที่เปลี่ยน (/tasks/api/changes/) (rollback ทุกอย่างตอนจบ)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=10000)
+        parser.add_argument('--changes', type=int, default=20, help='จำนวนงานที่ถูกแก้ระหว่างที่ client หลุด')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            self.stdout.write("(rolled back seeded data)")
+
+    def measure(self, client, url, repeat):
+        client.get(url, HTTP_HOST='localhost')  # warm-up
+        # request_started ล้าง queries_log ต้องเริ่มจาก log ว่าง ไม่งั้นนับผิด
+        reset_queries()
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, HTTP_HOST='localhost')
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            client.get(url, HTTP_HOST='localhost')
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings), len(response.content), len(queries.captured_queries)
+
+    def run(self, options):
+        rng = random.Random(options['seed'])
+        today = timezone.localdate()
+
+        self.stdout.write("Seeding...")
+        user = User.objects.create_user(username='bench_delta_user')
+        team = Team.objects.create(name='Bench Delta Team')
+        TeamMember.objects.create(user=user, team=team, role='OWNER')
+        sprint = Sprint.objects.create(
+            name='Bench Sprint', team=team, created_by=user,
+            start_date=today, end_date=today + timedelta(days=14), is_active=True,
+        )
+        statuses = ['TODO', 'IN_PROGRESS', 'DONE']
+        Task.objects.bulk_create([
+            Task(
+                title=f'Task {i}', status=rng.choice(statuses), priority=rng.choice('HML'),
+                story_points=rng.randint(1, 8), team=team, created_by=user,
+                sprint=sprint if rng.random() < 0.4 else None,
+            )
+            for i in range(options['tasks'])
+        ], batch_size=2000)
+        # ประวัติของทุกงานใน log (ขนาดตารางใกล้ของจริง)
+        record_tasks_changed(Task.objects.filter(team=team))
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+        channel = channel_for(team.id)
+        since = current_seq(channel)
+        changed = list(Task.objects.filter(team=team).select_related('assignee').order_by('?')[:options['changes']])
+        for task in changed:
+            task.status = rng.choice(statuses)
+            task.save()
+            publish_task_event('task-moved', task)
+
+        client = Client()
+        client.force_login(user)
+        board_url = f"{reverse('tasks:board')}?team_id={team.id}"
+        changes_url = f"{reverse('tasks:task_changes')}?team_id={team.id}"
+        rows = [
+            ('full board reload', board_url),
+            (f'delta sync ({len(changed)} changed)', f'{changes_url}&since={since}'),
+            ('delta sync (up to date)', f'{changes_url}&since={current_seq(channel)}'),
+        ]
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"\n{options['tasks']} tasks, {BoardChange.objects.filter(channel=channel).count()} change log rows"
+        ))
+        for label, url in rows:
+            ms, size, query_count = self.measure(client, url, options['repeat'])
+            self.stdout.write(f"{label:<28} {ms:9.2f} ms  {size / 1024:9.1f} KiB  {query_count} queries")
+
+        plan = BoardChange.objects.filter(channel=channel, seq__gt=since).order_by('seq').explain()
+        self.stdout.write("\ndelta query plan:")
+        for line in plan.splitlines():
+            self.stdout.write(f"  {line}")
@@ -0,0 +1,179 @@
+import csv
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.models import Sprint, Task, Team, TeamMember
+from tasks.transfer import TASK_FIELDS, TaskImporter, encode, export_rows, read_rows
+
+
+class Rollback(Exception):
+    pass
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        "สร้างไฟล์ CSV งาน N แถว แล้ววัดการนำเข้า (TaskImporter) เทียบกับ add_task ทีละฟอร์ม "
+        "และการ export แบบ streaming เทียบกับสร้างทั้งไฟล์ใน memory (rollback ทุกอย่างตอนจบ)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=100000)
+        parser.add_argument('--form-posts', type=int, default=200, help='จำนวน add_task ที่ใช้วัดแบบเดิม (คูณเป็นเวลาต่อ N แถว)')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            self.stdout.write("(rolled back seeded data)")
+
+    def seed(self):
+        today = timezone.localdate()
+        owner = User.objects.create_user(username='bench_import_owner')
+        team = Team.objects.create(name='Bench Import Team')
+        TeamMember.objects.create(user=owner, team=team, role='OWNER')
+        usernames = [owner.username]
+        for i in range(5):
+            member = User.objects.create_user(username=f'bench_import_member_{i}')
+            TeamMember.objects.create(user=member, team=team, role='MEMBER')
+            usernames.append(member.username)
+        sprint_names = []
+        for i in range(3):
+            sprint = Sprint.objects.create(
+                name=f'Bench Sprint {i}', team=team, created_by=owner,
+                start_date=today + timedelta(days=14 * i), end_date=today + timedelta(days=14 * (i + 1)),
+            )
+            sprint_names.append(sprint.name)
+        return owner, team, usernames, sprint_names
+
+    def write_file(self, path, count, usernames, sprint_names, rng):
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['title', 'description', 'status', 'priority', 'story_points', 'assignee', 'sprint'])
+            for i in range(count):
+                writer.writerow([
+                    f'Imported task {i}', f'รายละเอียดของงาน {i}' if i % 3 == 0 else '',
+                    rng.choice(['To Do', 'In Progress', 'Done']), rng.choice('HML'), rng.randint(1, 8),
+                    rng.choice(usernames + ['']), rng.choice(sprint_names + ['', '']),
+                ])
+
+    def measure_import(self, path, owner, team, trace):
+        counter = QueryCounter()
+        if trace:
+            tracemalloc.start()
+        started = time.perf_counter()
+        # DEBUG=True เก็บ SQL ล่าสุด 9000 ตัวไว้ใน connection.queries_log (INSERT ก้อนใหญ่) จะกลบหน่วยความจำของ importer
+        with override_settings(DEBUG=False), connection.execute_wrapper(counter), \
+                open(path, encoding='utf-8-sig', newline='') as f:
+            for result in TaskImporter(owner, team.id).run(read_rows(f, 'csv')):
+                pass
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] if trace else None
+        if trace:
+            tracemalloc.stop()
+        return result, elapsed, counter.count, peak
+
+    def run(self, options):
+        rng = random.Random(options['seed'])
+        owner, team, usernames, sprint_names = self.seed()
+        count = options['tasks']
+
+        fd, path = tempfile.mkstemp(suffix='.csv')
+        os.close(fd)
+        try:
+            self.write_file(path, count, usernames, sprint_names, rng)
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"\nimport {count} tasks ({os.path.getsize(path) / 1024 / 1024:.1f} MiB CSV)"
+            ))
+
+            savepoint = transaction.savepoint()
+            result, elapsed, queries, _ = self.measure_import(path, owner, team, trace=False)
+            self.stdout.write(
+                f"TaskImporter          {elapsed:8.1f} s  {count / elapsed:8,.0f} rows/s  {queries} queries  "
+                f"{result.created} created  {result.error_count} errors"
+            )
+            transaction.savepoint_rollback(savepoint)
+
+            savepoint = transaction.savepoint()
+            _, _, _, peak = self.measure_import(path, owner, team, trace=True)
+            self.stdout.write(f"  peak Python memory while importing (tracemalloc): {peak / 1024 / 1024:.1f} MiB")
+            transaction.savepoint_rollback(savepoint)
+        finally:
+            os.remove(path)
+
+        client = Client()
+        client.force_login(owner)
+        posts = options['form_posts']
+        savepoint = transaction.savepoint()
+        started = time.perf_counter()
+        for i in range(posts):
+            client.post(reverse('tasks:add_task'), {
+                'team_id': team.id, 'title': f'Form task {i}', 'status': 'TODO', 'priority': 'M', 'story_points': 1,
+            }, HTTP_HOST='localhost')
+        per_task = (time.perf_counter() - started) / posts
+        transaction.savepoint_rollback(savepoint)
+        self.stdout.write(
+            f"add_task form posts   {per_task * 1000:8.2f} ms/task  -> {per_task * count:,.0f} s for {count} tasks "
+            f"(measured over {posts} posts)"
+        )
+
+        # ข้อมูลสำหรับ export: นำเข้าไว้จริง 1 รอบ
+        Task.objects.bulk_create([
+            Task(
+                title=f'Export task {i}', description='รายละเอียด' if i % 3 == 0 else None,
+                priority=rng.choice('HML'), story_points=rng.randint(1, 8), rank=f'{i:06d}i',
+                team=team, created_by=owner,
+            )
+            for i in range(count)
+        ], batch_size=2000)
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\nexport {count} tasks"))
+        url = f"{reverse('tasks:export_tasks')}?team_id={team.id}"
+
+        def streamed():
+            response = client.get(url, HTTP_HOST='localhost')
+            size = chunks = 0
+            for chunk in response.streaming_content:
+                size += len(chunk)
+                chunks += 1
+            return size, chunks
+
+        def buffered():
+            # แบบที่ไม่ใช้ streaming: โหลดทุกแถวแล้วสร้างทั้งไฟล์ก่อนส่ง
+            body = ''.join(encode(list(export_rows('tasks', owner, team.id)), TASK_FIELDS, 'csv'))
+            return len(body.encode()), 1
+
+        for label, export in (('streaming (export_tasks view)', streamed), ('whole file in memory', buffered)):
+            started = time.perf_counter()
+            size, chunks = export()
+            elapsed = time.perf_counter() - started
+            tracemalloc.start()
+            export()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            self.stdout.write(
+                f"{label:<30} {elapsed:6.2f} s  {size / 1024 / 1024:6.1f} MiB in {chunks} chunk(s)  "
+                f"peak memory {peak / 1024 / 1024:6.1f} MiB"
+            )
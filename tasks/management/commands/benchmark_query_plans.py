@@ -0,0 +1,158 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from store.models import Order
+from tasks.models import Sprint, Task, Team
+
+# index ที่เพิ่มมาสำหรับ query ของ view (ตัดทิ้งชั่วคราวเพื่อดู plan แบบ "ก่อน")
+NEW_INDEXES = [
+    'order_user_created_idx',
+    'sprint_team_active_idx',
+    'sprint_personal_idx',
+    'task_sprint_status_idx',
+    'task_team_backlog_idx',
+    'task_personal_idx',
+]
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "seed ข้อมูลจำนวนมากใน transaction แล้วเทียบ query plan / เวลา ของ query หลักใน view "
+        "ตอนไม่มีกับมี composite/partial index (rollback ทุกอย่างตอนจบ)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=500)
+        parser.add_argument('--teams', type=int, default=100)
+        parser.add_argument('--tasks', type=int, default=100000)
+        parser.add_argument('--orders', type=int, default=50000)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            self.stdout.write("(rolled back seeded data)")
+
+    def seed(self, options):
+        rng = random.Random(options['seed'])
+        today = timezone.localdate()
+
+        users = User.objects.bulk_create([
+            User(username=f'bench_user_{i}', password='!') for i in range(options['users'])
+        ])
+        teams = Team.objects.bulk_create([Team(name=f'Bench Team {i}') for i in range(options['teams'])])
+
+        sprints = []
+        for team in teams:
+            for n in range(10):
+                sprints.append(Sprint(
+                    name=f'{team.name} S{n}', team=team, created_by=users[0],
+                    start_date=today, end_date=today + timedelta(days=14), is_active=(n == 9),
+                ))
+        for user in users:
+            for n in range(3):
+                sprints.append(Sprint(
+                    name=f'{user.username} S{n}', created_by=user,
+                    start_date=today, end_date=today + timedelta(days=14), is_active=(n == 2),
+                ))
+        sprints = Sprint.objects.bulk_create(sprints)
+        team_sprints = [s for s in sprints if s.team_id]
+        personal_sprints = {}
+        for s in sprints:
+            if not s.team_id:
+                personal_sprints.setdefault(s.created_by_id, []).append(s)
+
+        tasks = []
+        statuses = ['TODO', 'IN_PROGRESS', 'DONE']
+        for i in range(options['tasks']):
+            user = rng.choice(users)
+            if rng.random() < 0.7:
+                sprint = rng.choice(team_sprints) if rng.random() < 0.8 else None
+                team_id = sprint.team_id if sprint else rng.choice(teams).id
+            else:
+                sprint = rng.choice(personal_sprints[user.id]) if rng.random() < 0.8 else None
+                team_id = None
+            tasks.append(Task(
+                title=f'Task {i}', status=rng.choice(statuses), team_id=team_id,
+                sprint=sprint, created_by=user,
+            ))
+        Task.objects.bulk_create(tasks, batch_size=2000)
+
+        orders = []
+        for i in range(options['orders']):
+            user = rng.choice(users)
+            orders.append(Order(customer_name=user.username, user=user, total_price=10))
+        Order.objects.bulk_create(orders, batch_size=2000)
+
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        return users[len(users) // 2], teams[len(teams) // 2], team_sprints[len(team_sprints) // 2]
+
+    def run(self, options):
+        self.stdout.write("Seeding...")
+        user, team, sprint = self.seed(options)
+
+        queries = [
+            ('my_orders (customer_name, legacy)',
+             lambda: Order.objects.filter(customer_name=user.username).order_by('-created_at', '-id')[:25]),
+            ('my_orders (user FK)',
+             lambda: Order.objects.filter(user=user).order_by('-created_at', '-id')[:25]),
+            ('sprint tasks by status',
+             lambda: Task.objects.filter(sprint=sprint, status='IN_PROGRESS')),
+            ('team backlog',
+             lambda: Task.objects.filter(team=team, sprint__isnull=True)),
+            ('board (team backlog + sprint)',
+             lambda: Task.objects.filter(Q(team=team, sprint__isnull=True) | Q(sprint=sprint))),
+            ('personal backlog',
+             lambda: Task.objects.filter(created_by=user, team__isnull=True, sprint__isnull=True)),
+            ('team active sprint',
+             lambda: Sprint.objects.filter(team=team, is_active=True)),
+            ('personal active sprint',
+             lambda: Sprint.objects.filter(created_by=user, team__isnull=True, is_active=True)),
+        ]
+
+        def measure():
+            results = {}
+            for label, build in queries:
+                plan = build().explain()
+                timings = []
+                for _ in range(options['repeat']):
+                    started = time.perf_counter()
+                    list(build())
+                    timings.append((time.perf_counter() - started) * 1000)
+                results[label] = (plan, statistics.median(timings))
+            return results
+
+        after = measure()
+        with connection.cursor() as cursor:
+            for name in NEW_INDEXES:
+                cursor.execute(f'DROP INDEX {connection.ops.quote_name(name)}')
+            cursor.execute('ANALYZE')
+        before = measure()
+
+        for label, _ in queries:
+            plan_before, ms_before = before[label]
+            plan_after, ms_after = after[label]
+            self.stdout.write(self.style.MIGRATE_HEADING(f"\n{label}: {ms_before:.2f} ms -> {ms_after:.2f} ms"))
+            self.stdout.write("  before:")
+            for line in plan_before.splitlines():
+                self.stdout.write(f"    {line}")
+            self.stdout.write("  after:")
+            for line in plan_after.splitlines():
+                self.stdout.write(f"    {line}")
@@ -0,0 +1,164 @@
+import json
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.board import BOARD_COLUMNS
+from tasks.models import Sprint, Task, Team, TeamMember
+from tasks.ranks import spread
+
+
+class Rollback(Exception):
+    pass
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        "จำลองการลากจัดการ์ด N ครั้งบนกระดานทีม เทียบแบบเดิม (1 request ต่อการ์ด + render HTML) "
+        "กับ batch move API (rollback ทุกอย่างตอนจบ)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cards', type=int, default=50)
+        parser.add_argument('--moves', type=int, default=50)
+        parser.add_argument('--batch-size', type=int, default=5, help='จำนวนการลากต่อ request ตอน JS รวบส่ง (debounce)')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            self.stdout.write("(rolled back seeded data)")
+
+    def seed(self, options):
+        today = timezone.localdate()
+        user = User.objects.create_user(username='bench_moves_user')
+        team = Team.objects.create(name='Bench Moves Team')
+        TeamMember.objects.create(user=user, team=team, role='OWNER')
+        sprint = Sprint.objects.create(
+            name='Bench Sprint', team=team, created_by=user,
+            start_date=today, end_date=today + timedelta(days=14), is_active=True,
+        )
+        statuses = [column['status'] for column in BOARD_COLUMNS]
+        per_column = options['cards'] // len(statuses)
+        tasks = []
+        for status in statuses:
+            for i, rank in enumerate(spread(per_column)):
+                tasks.append(Task(
+                    title=f'{status} {i}', status=status, rank=rank,
+                    team=team, created_by=user, sprint=sprint,
+                ))
+        Task.objects.bulk_create(tasks)
+        return user, team, sprint
+
+    def plan_moves(self, options, sprint):
+        """ลำดับการลาก (การ์ดไหน ไปคอลัมน์ไหน ตำแหน่งไหน) จำลองบนรายการในหน่วยความจำ"""
+        rng = random.Random(options['seed'])
+        columns = {}
+        for task in Task.objects.filter(sprint=sprint).order_by('rank'):
+            columns.setdefault(task.status, []).append(task.id)
+        statuses = list(columns)
+
+        moves = []
+        renumbered = 0
+        for _ in range(options['moves']):
+            source = rng.choice([status for status in statuses if columns[status]])
+            task_id = rng.choice(columns[source])
+            old_index = columns[source].index(task_id)
+            columns[source].remove(task_id)
+            target = rng.choice(statuses)
+            index = rng.randint(0, len(columns[target]))
+            columns[target].insert(index, task_id)
+            # ถ้าเก็บตำแหน่งเป็นเลขจำนวนเต็ม: การ์ดที่ต้องเลื่อนเลขในคอลัมน์ต้นทาง + ปลายทาง
+            renumbered += (len(columns[source]) - old_index) + (len(columns[target]) - index)
+            moves.append({
+                'task_id': task_id,
+                'status': target,
+                'sprint_id': sprint.id,
+                'after_id': columns[target][index - 1] if index > 0 else None,
+                'before_id': columns[target][index + 1] if index + 1 < len(columns[target]) else None,
+            })
+        return moves, columns, renumbered
+
+    def timed(self, label, send):
+        counter = QueryCounter()
+        started = time.perf_counter()
+        with connection.execute_wrapper(counter):
+            requests, size = send()
+        elapsed = (time.perf_counter() - started) * 1000
+        self.stdout.write(
+            f"{label:<34} {elapsed:8.1f} ms  {requests:3d} requests  {counter.count:4d} queries  {size / 1024:7.1f} KiB"
+        )
+
+    def run(self, options):
+        user, team, sprint = self.seed(options)
+        moves, expected, renumbered = self.plan_moves(options, sprint)
+        client = Client()
+        client.force_login(user)
+        single_url = reverse('tasks:move_task_api')
+        batch_url = reverse('tasks:move_tasks_api')
+
+        def one_per_card():
+            size = 0
+            for move in moves:
+                response = client.post(
+                    single_url, json.dumps({key: move[key] for key in ('task_id', 'status', 'sprint_id')}),
+                    content_type='application/json', HTTP_HOST='localhost',
+                )
+                size += len(response.content)
+            return len(moves), size
+
+        def batched(batch_size):
+            def send():
+                size = requests = 0
+                for start in range(0, len(moves), batch_size):
+                    response = client.post(
+                        batch_url, json.dumps({'team_id': team.id, 'moves': moves[start:start + batch_size]}),
+                        content_type='application/json', HTTP_HOST='localhost',
+                    )
+                    assert response.status_code == 200, response.content
+                    size += len(response.content)
+                    requests += 1
+                return requests, size
+            return send
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"\n{len(moves)} drags across {options['cards']} cards"
+        ))
+        flows = [
+            ('one request per card (old)', one_per_card),
+            (f'batch, {options["batch_size"]} moves per request', batched(options['batch_size'])),
+            (f'batch, {len(moves)} moves in one request', batched(len(moves))),
+        ]
+        for label, send in flows:
+            savepoint = transaction.savepoint()
+            client.get(reverse('tasks:board'), {'team_id': team.id}, HTTP_HOST='localhost')  # warm-up
+            self.timed(label, send)
+            if send is not one_per_card:
+                actual = {}
+                for task in Task.objects.filter(sprint=sprint).order_by('rank', 'id'):
+                    actual.setdefault(task.status, []).append(task.id)
+                self.stdout.write(f"  final order matches client: {actual == expected}")
+            transaction.savepoint_rollback(savepoint)
+
+        self.stdout.write(
+            f"\nrows written per drag: rank 1, integer positions {renumbered / len(moves):.1f} (renumber shifted cards)"
+        )
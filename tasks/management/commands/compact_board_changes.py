@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tasks.changes import compact
+
+
+class Command(BaseCommand):
+    help = "compact change log ของกระดาน (ลบแถวที่ถูกแทนที่แล้ว + แถวที่เก่ากว่า TASK_CHANGES_RETENTION_DAYS) รันจาก cron วันละครั้ง"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None, help='อายุสูงสุดของ log (ค่าเริ่มต้นจาก settings)')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        days = options['days']
+        if days is None:
+            days = getattr(settings, 'TASK_CHANGES_RETENTION_DAYS', 30)
+        superseded, expired = compact(older_than_days=days, batch_size=options['batch_size'])
+        self.stdout.write(f"removed {superseded} superseded and {expired} expired change(s)")
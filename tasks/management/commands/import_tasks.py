@@ -0,0 +1,44 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.permissions import TeamPermissions
+from tasks.transfer import FORMATS, IMPORT_BATCH_SIZE, IMPORTERS, read_rows
+
+
+class Command(BaseCommand):
+    help = "นำเข้างาน / Sprint จากไฟล์ CSV หรือ JSON lines (รูปแบบเดียวกับที่ export) ทีละ batch พร้อมรายงานความคืบหน้า"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--user', required=True, help='username ของผู้นำเข้า (เป็น created_by ของงานใหม่)')
+        parser.add_argument('--team', type=int, default=None, help='id ของทีม (ไม่ใส่ = กระดานส่วนตัวของ --user)')
+        parser.add_argument('--kind', choices=list(IMPORTERS), default='tasks')
+        parser.add_argument('--format', choices=list(FORMATS), default=None, help='ค่าเริ่มต้นเดาจากนามสกุลไฟล์')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"user {options['user']} does not exist")
+        team_id = options['team']
+        if team_id and not TeamPermissions(user).has_role(team_id, 'ADMIN'):
+            raise CommandError(f"{user.username} must be an Admin/Owner of team {team_id}")
+        fmt = options['format'] or ('jsonl' if options['path'].endswith(('.jsonl', '.ndjson')) else 'csv')
+
+        importer = IMPORTERS[options['kind']](user, team_id)
+        started = time.perf_counter()
+        with open(options['path'], encoding='utf-8-sig', newline='') as f:
+            for result in importer.run(read_rows(f, fmt), batch_size=options['batch_size']):
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"{result.processed:>9} rows  {result.created} created  {result.updated} updated  "
+                    f"{result.error_count} errors  ({result.processed / elapsed if elapsed else 0:,.0f} rows/s)"
+                )
+
+        for error in result.errors:
+            self.stderr.write(f"line {error['line']}: {error['error']}")
+        if result.error_count > len(result.errors):
+            self.stderr.write(f"... and {result.error_count - len(result.errors)} more")
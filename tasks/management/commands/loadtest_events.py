@@ -0,0 +1,114 @@
+import asyncio
+import time
+import tracemalloc
+
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.models import User
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+
+from tasks.events import channel_for, get_broker
+from tasks.models import Team, TeamMember
+
+
+class Command(BaseCommand):
+    help = "เปิด SSE subscriber ค้างไว้หลายร้อยตัวใน process เดียว (ผ่าน ASGI app จริง) แล้ววัด memory และเวลากระจาย event"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--subscribers', type=int, default=500)
+        parser.add_argument('--events', type=int, default=20)
+
+    def handle(self, *args, **options):
+        user = User.objects.create_user(username='loadtest_events_user')
+        team = Team.objects.create(name='loadtest events')
+        TeamMember.objects.create(user=user, team=team, role='OWNER')
+        session = SessionStore()
+        session[SESSION_KEY] = str(user.pk)
+        session[BACKEND_SESSION_KEY] = 'django.contrib.auth.backends.ModelBackend'
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.create()
+        try:
+            asyncio.run(self.run(options, team, session.session_key))
+        finally:
+            session.delete()
+            team.delete()
+            user.delete()
+
+    async def run(self, options, team, session_key):
+        app = ASGIHandler()
+        broker = get_broker()
+        count = options['subscribers']
+        path = reverse('tasks:task_events')
+        disconnect = asyncio.Event()
+        received = {}
+        delivered = asyncio.Condition()
+        statuses = []
+
+        async def subscriber(i):
+            scope = {
+                'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+                'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+                'query_string': f'team_id={team.id}'.encode(), 'root_path': '',
+                'headers': [(b'host', b'localhost'), (b'cookie', f'sessionid={session_key}'.encode())],
+                'client': ('127.0.0.1', 10000 + i), 'server': ('localhost', 80),
+            }
+            sent_body = False
+
+            async def receive():
+                nonlocal sent_body
+                if not sent_body:
+                    sent_body = True
+                    return {'type': 'http.request', 'body': b'', 'more_body': False}
+                await disconnect.wait()
+                return {'type': 'http.disconnect'}
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    statuses.append(message['status'])
+                elif message['type'] == 'http.response.body' and b'event: ' in message.get('body', b''):
+                    async with delivered:
+                        received[i] = received.get(i, 0) + message['body'].count(b'event: ')
+                        delivered.notify_all()
+
+            await app(scope, receive, send)
+
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        tasks = [asyncio.create_task(subscriber(i)) for i in range(count)]
+        while broker.subscriber_count() < count:
+            await asyncio.sleep(0.05)
+        connected = time.perf_counter() - started
+        per_subscriber = (tracemalloc.get_traced_memory()[0] - baseline) / count
+        self.stdout.write(
+            f"{count} subscribers connected in {connected:.2f}s "
+            f"(~{per_subscriber / 1024:.1f} KiB Python heap each)"
+        )
+
+        channel = channel_for(team.id)
+        latencies = []
+        for n in range(1, options['events'] + 1):
+            message = {'id': n, 'event': 'task-updated', 'data': {'id': n, 'title': f'Task {n}'}}
+            sent = time.perf_counter()
+            # publish จาก thread อื่นเหมือน view แบบ sync
+            await asyncio.to_thread(broker.publish, channel, message)
+            async with delivered:
+                await delivered.wait_for(
+                    lambda: len(received) == count and all(value >= n for value in received.values())
+                )
+            latencies.append((time.perf_counter() - sent) * 1000)
+        tracemalloc.stop()
+
+        latencies.sort()
+        self.stdout.write(
+            f"fan-out to all {count}: p50 {latencies[len(latencies) // 2]:.1f} ms, "
+            f"max {latencies[-1]:.1f} ms over {len(latencies)} events"
+        )
+
+        disconnect.set()
+        await asyncio.gather(*tasks)
+        self.stdout.write(
+            f"statuses: {sorted(set(statuses))}, subscribers left after disconnect: {broker.subscriber_count()}"
+        )
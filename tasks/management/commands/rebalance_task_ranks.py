@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tasks.events import record_tasks_changed
+from tasks.models import Task
+from tasks.ranks import columns_needing_rebalance, rebalance_column
+
+
+class Command(BaseCommand):
+    help = "กระจาย rank ของคอลัมน์ที่ rank ยาวเกินไปใหม่ (fractional rank ดู tasks/ranks.py) แบบ background"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='จัดคอลัมน์ที่ค้างอยู่ให้หมดแล้วจบ')
+        parser.add_argument('--interval', type=float, default=60.0, help='เวลารอระหว่างรอบ (วินาที)')
+
+    def handle(self, *args, **options):
+        while True:
+            columns = columns_needing_rebalance()
+            for task in columns:
+                changed = rebalance_column(task)
+                # ให้ client ที่ delta sync ได้ rank ใหม่ไปด้วย
+                record_tasks_changed(Task.objects.filter(id__in=[changed_task.id for changed_task in changed]))
+            if columns:
+                self.stdout.write(f"rebalanced {len(columns)} column(s)")
+                continue
+            if options['once']:
+                break
+            time.sleep(options['interval'])
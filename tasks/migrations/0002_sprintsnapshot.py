@@ -0,0 +1,30 @@
+# Generated by Django 6.0 on 2026-10-18 19:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SprintSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('total_tasks', models.IntegerField(default=0)),
+                ('done_tasks', models.IntegerField(default=0)),
+                ('total_points', models.IntegerField(default=0)),
+                ('done_points', models.IntegerField(default=0)),
+                ('sprint', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='tasks.sprint')),
+            ],
+            options={
+                'ordering': ['date'],
+                'unique_together': {('sprint', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 6.0 on 2026-10-18 20:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_sprintsnapshot'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='sprint',
+            index=models.Index(fields=['team', 'is_active'], name='sprint_team_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sprint',
+            index=models.Index(condition=models.Q(('team__isnull', True)), fields=['created_by', 'is_active'], name='sprint_personal_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['sprint', 'status'], name='task_sprint_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('sprint__isnull', True)), fields=['team', 'sprint'], name='task_team_backlog_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('team__isnull', True)), fields=['created_by', 'sprint'], name='task_personal_idx'),
+        ),
+    ]
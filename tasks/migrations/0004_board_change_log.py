@@ -0,0 +1,38 @@
+# Generated by Django 6.0 on 2026-10-18 20:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('channel', models.CharField(max_length=50, unique=True)),
+                ('last_seq', models.BigIntegerField(default=0)),
+                ('compacted_seq', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='BoardChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('channel', models.CharField(max_length=50)),
+                ('seq', models.BigIntegerField()),
+                ('kind', models.CharField(choices=[('task', 'Task'), ('sprint', 'Sprint')], max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('data', models.JSONField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['created_at'], name='board_change_created_idx')],
+                'unique_together': {('channel', 'seq')},
+            },
+        ),
+    ]
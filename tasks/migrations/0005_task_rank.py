@@ -0,0 +1,63 @@
+# Generated by Django 6.0 on 2026-10-18 20:36
+
+from django.db import migrations, models
+
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+PRIORITY = {'H': 3, 'M': 2, 'L': 1}
+
+
+def spread(count):
+    # สำเนาของ tasks.ranks.spread (migration ไม่ควรผูกกับโค้ดที่อาจเปลี่ยนภายหลัง)
+    width = 1
+    while len(DIGITS) ** width <= count:
+        width += 1
+    width += 1
+    space = len(DIGITS) ** width
+    ranks = []
+    for i in range(count):
+        value = (i + 1) * space // (count + 1)
+        digits = []
+        for _ in range(width):
+            value, digit = divmod(value, len(DIGITS))
+            digits.append(DIGITS[digit])
+        ranks.append(''.join(reversed(digits)).rstrip('0'))
+    return ranks
+
+
+def rank_existing_tasks(apps, schema_editor):
+    # ให้ rank ตามลำดับที่กระดานเคยแสดง (priority สูงก่อน แล้วงานใหม่ก่อน) ของแต่ละคอลัมน์
+    Task = apps.get_model('tasks', 'Task')
+
+    columns = {}
+    rows = Task.objects.values_list('id', 'team_id', 'created_by_id', 'sprint_id', 'status', 'priority', 'created_at')
+    for pk, team_id, created_by_id, sprint_id, status, priority, created_at in rows.iterator():
+        if sprint_id:
+            key = ('sprint', sprint_id, status)
+        elif team_id:
+            key = ('team', team_id)
+        else:
+            key = ('user', created_by_id)
+        columns.setdefault(key, []).append((-PRIORITY.get(priority, 0), -created_at.timestamp(), pk))
+
+    tasks = []
+    for column in columns.values():
+        column.sort()
+        for (_, _, pk), rank in zip(column, spread(len(column))):
+            tasks.append(Task(id=pk, rank=rank))
+    Task.objects.bulk_update(tasks, ['rank'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_board_change_log'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='rank',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.RunPython(rank_existing_tasks, migrations.RunPython.noop),
+    ]
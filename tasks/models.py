@@ -46,6 +46,14 @@ class Sprint(models.Model):
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, null=True, related_name='created_sprints')
     team = models.ForeignKey(Team, on_delete=models.CASCADE, null=True, blank=True, related_name='sprints')
 
+    class Meta:
+        indexes = [
+            # Active Sprint ของทีม
+            models.Index(fields=['team', 'is_active'], name='sprint_team_active_idx'),
+            # Sprint ส่วนตัว (ไม่มีทีม)
+            models.Index(fields=['created_by', 'is_active'], condition=models.Q(team__isnull=True), name='sprint_personal_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -70,6 +78,8 @@ class Task(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='TODO')
     priority = models.CharField(max_length=1, choices=PRIORITY_CHOICES, default='M')
     story_points = models.IntegerField(default=1)
+    # ลำดับในคอลัมน์ (fractional rank ดู tasks/ranks.py)
+    rank = models.CharField(max_length=100, blank=True, default='')
     
     # 🔥 เพิ่ม Assignee (คนรับผิดชอบงาน)
     assignee = models.ForeignKey(
@@ -88,5 +98,73 @@ class Task(models.Model):
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, null=True, related_name='tasks')
     team = models.ForeignKey(Team, on_delete=models.CASCADE, null=True, blank=True, related_name='tasks')
 
+    class Meta:
+        indexes = [
+            # งานใน Sprint แยกตามสถานะ (board, สถิติ Sprint, ย้ายงานที่ยังไม่เสร็จ)
+            models.Index(fields=['sprint', 'status'], name='task_sprint_status_idx'),
+            # Backlog ของทีม (เก็บเฉพาะงานที่ยังไม่อยู่ใน Sprint; ใส่ sprint ใน fields ด้วย SQLite ถึงจะเลือกใช้)
+            models.Index(fields=['team', 'sprint'], condition=models.Q(sprint__isnull=True), name='task_team_backlog_idx'),
+            # Backlog ส่วนตัว (ไม่มีทีม)
+            models.Index(fields=['created_by', 'sprint'], condition=models.Q(team__isnull=True), name='task_personal_idx'),
+        ]
+
+    def __str__(self):
+        return self.title
+
+# ==========================================
+# 4. Sprint Snapshot (ประวัติรายวันสำหรับ Burndown / Velocity)
+# ==========================================
+class SprintSnapshot(models.Model):
+    # 1 แถวต่อ Sprint ต่อวัน อัปเดตทุกครั้งที่งานใน Sprint เปลี่ยน (ดู tasks/stats.py)
+    sprint = models.ForeignKey(Sprint, on_delete=models.CASCADE, related_name='snapshots')
+    date = models.DateField()
+    total_tasks = models.IntegerField(default=0)
+    done_tasks = models.IntegerField(default=0)
+    total_points = models.IntegerField(default=0)
+    done_points = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('sprint', 'date') # ดึงช่วงวันที่ของ Sprint ได้จาก index นี้ตรงๆ
+        ordering = ['date']
+
+    def __str__(self):
+        return f"{self.sprint.name} @ {self.date}"
+
+
+# ==========================================
+# 5. Change Log (Delta Sync ของกระดาน)
+# ==========================================
+class BoardSequence(models.Model):
+    # ตัวนับ seq ของแต่ละช่อง (team:<id> / user:<id> ชื่อเดียวกับช่องของ tasks/events.py)
+    channel = models.CharField(max_length=50, unique=True)
+    last_seq = models.BigIntegerField(default=0)
+    # แถวที่ seq <= ค่านี้ถูก compact ทิ้งไปแล้ว (client ที่ตามหลังกว่านี้ต้องโหลดกระดานใหม่)
+    compacted_seq = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.channel} @ {self.last_seq}"
+
+
+class BoardChange(models.Model):
+    KIND_CHOICES = [
+        ('task', 'Task'),
+        ('sprint', 'Sprint'),
+    ]
+
+    channel = models.CharField(max_length=50)
+    seq = models.BigIntegerField()
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    # ข้อมูลล่าสุดของ object ตอนเปลี่ยน (None = ถูกลบ / tombstone)
+    data = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('channel', 'seq') # ดึงช่วง seq > N ของช่องเดียวจาก index นี้ตรงๆ
+        indexes = [
+            # compact แถวเก่าตามอายุ
+            models.Index(fields=['created_at'], name='board_change_created_idx'),
+        ]
+
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return f"{self.channel} #{self.seq} {self.kind}:{self.object_id}"
@@ -0,0 +1,149 @@
+"""
+สิทธิ์ของผู้ใช้ในแต่ละทีม (Owner / Admin / Member)
+
+- TeamPermissions โหลด membership ทั้งหมดของผู้ใช้ครั้งเดียว (ชื่อทีม + role) แล้วจำไว้ทั้ง request
+- ข้าม request เก็บใน cache ล้างเมื่อ TeamMember ถูกบันทึก/ลบ หรือทีมเปลี่ยนชื่อ (ดู tasks/signals.py)
+  เฉพาะ cache ที่ทุก worker เห็นร่วมกัน (Redis / ไฟล์): LocMem ล้างได้แค่ใน worker ที่รับ request ที่แก้สมาชิก
+  worker อื่นจะยังให้สิทธิ์เดิม (เช่นคนที่ถูกเตะออกแล้ว) -> LocMem อ่านจาก DB ใหม่ทุก request
+- @team_role_required('ADMIN') ใช้แทนการ query TeamMember เช็ค role เองในแต่ละ view
+"""
+from functools import wraps
+
+from django.contrib import messages
+from django.core.cache import cache
+from django.db import router
+from django.db.models import QuerySet
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404, redirect
+from django.urls import reverse
+
+from config.caching import is_shared_cache
+
+from .models import Team, TeamMember
+
+ROLE_LEVELS = {'MEMBER': 1, 'ADMIN': 2, 'OWNER': 3}
+# สั้นไว้เผื่อแก้ role ด้วย queryset.update() ที่ไม่ยิง signal (ปกติถูกล้างทันทีตอนบันทึก)
+MEMBERSHIP_CACHE_TIMEOUT = 60 * 5
+
+
+def _cache_key(user_id):
+    return f'tasks:memberships:{user_id}'
+
+
+def invalidate_memberships(*user_ids):
+    keys = [_cache_key(user_id) for user_id in user_ids if user_id]
+    if keys:
+        cache.delete_many(keys)
+
+
+def _to_id(team_id):
+    try:
+        return int(team_id)
+    except (TypeError, ValueError):
+        return None
+
+
+class TeamPermissions:
+    """role ของผู้ใช้คนหนึ่งในทุกทีม (โหลดครั้งแรกที่ถูกถาม)"""
+
+    def __init__(self, user):
+        self.user = user
+        self._teams = None
+
+    @property
+    def teams(self):
+        """{team_id: (ชื่อทีม, role)}"""
+        if self._teams is None:
+            key = _cache_key(self.user.pk)
+            shared = is_shared_cache()
+            teams = cache.get(key) if shared else None
+            if teams is None:
+                rows = (
+                    TeamMember.objects.filter(user_id=self.user.pk)
+                    .order_by('team_id')
+                    .values_list('team_id', 'team__name', 'role')
+                )
+                teams = {team_id: (name, role) for team_id, name, role in rows}
+                if shared:
+                    cache.set(key, teams, MEMBERSHIP_CACHE_TIMEOUT)
+            self._teams = teams
+        return self._teams
+
+    def role(self, team_id):
+        """role ในทีมนี้ (ไม่ใช่สมาชิก / team_id ไม่ถูกต้อง -> None)"""
+        entry = self.teams.get(_to_id(team_id))
+        return entry[1] if entry else None
+
+    def has_role(self, team_id, role):
+        current = self.role(team_id)
+        return current is not None and ROLE_LEVELS[current] >= ROLE_LEVELS[role]
+
+    def team(self, team_id):
+        """Team (เฉพาะ id + name จาก cache ไม่ query) หรือ None ถ้าไม่ใช่สมาชิก"""
+        team_id = _to_id(team_id)
+        entry = self.teams.get(team_id)
+        if entry is None:
+            return None
+        return Team.from_db(router.db_for_read(Team), ['id', 'name'], [team_id, entry[0]])
+
+    def team_list(self):
+        return [self.team(team_id) for team_id in self.teams]
+
+
+def get_permissions(request):
+    """TeamPermissions ของ request นี้ (สร้างครั้งเดียวต่อ request)"""
+    permissions = getattr(request, '_team_permissions', None)
+    if permissions is None or permissions.user.pk != request.user.pk:
+        permissions = TeamPermissions(request.user)
+        request._team_permissions = permissions
+    return permissions
+
+
+def get_board_object_or_404(request, model, pk):
+    """Task / Sprint ที่ผู้ใช้เห็นได้: ของส่วนตัวของคนอื่น หรือของทีมที่ไม่ได้เป็นสมาชิก -> 404"""
+    obj = get_object_or_404(model, pk=pk)
+    if obj.team_id is None:
+        if obj.created_by_id != request.user.pk:
+            raise Http404("No object matches the given query.")
+    elif get_permissions(request).role(obj.team_id) is None:
+        raise Http404("No Team matches the given query.")
+    return obj
+
+
+def team_role_required(role, model=None, url_kwarg=None, message="❌ Access Denied: Admin/Owner only.",
+                       denied_url=None):
+    """ต้องมี role อย่างน้อยเท่านี้ในทีม (ใช้ต่อจาก @login_required)
+
+    - ไม่มี model: ทีมมาจาก URL kwarg team_id หรือ team_id ใน POST/GET (ไม่มีทีม = กระดานส่วนตัว ผ่าน)
+    - model=Sprint / Task (หรือ QuerySet): โหลด object จาก url_kwarg แล้วส่งให้ view แทน id
+      เช่น url_kwarg='sprint_id' -> view รับ sprint=<Sprint> / object ส่วนตัวของคนอื่น -> 404
+    ไม่ใช่สมาชิกทีม -> 404 / role ไม่ถึง -> messages.error แล้ว redirect ไปกระดาน (หรือ denied_url)
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            obj = None
+            if model is not None:
+                obj = get_board_object_or_404(request, model, kwargs.pop(url_kwarg))
+                team_id = obj.team_id
+            else:
+                team_id = kwargs.get('team_id') or request.POST.get('team_id') or request.GET.get('team_id')
+
+            if team_id:
+                permissions = get_permissions(request)
+                if permissions.role(team_id) is None:
+                    raise Http404("No Team matches the given query.")
+                if not permissions.has_role(team_id, role):
+                    if request.accepts('text/html'):
+                        messages.error(request, message)
+                        if denied_url:
+                            return redirect(denied_url, team_id=team_id)
+                        return redirect(f"{reverse('tasks:board')}?team_id={team_id}")
+                    return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
+
+            if obj is not None:
+                name = (model.model if isinstance(model, QuerySet) else model)._meta.model_name
+                kwargs[name] = obj
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
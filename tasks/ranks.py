@@ -0,0 +1,152 @@
+"""
+ลำดับการ์ดในคอลัมน์แบบ fractional rank (สตริงเรียงตามตัวอักษร)
+
+- rank เป็นเลขฐาน 36 หลังจุดทศนิยม เช่น 'i' = 0.i (ครึ่งทาง) การย้ายการ์ดไปไว้ระหว่าง 2 ใบ
+  แค่หาค่ากึ่งกลางของ rank เพื่อนบ้าน -> เขียนแถวเดียว ไม่ต้องเรียงเลขใหม่ทั้งคอลัมน์
+- ใช้แค่ 0-9a-z (ไม่ผสมตัวพิมพ์ใหญ่) collation ของ database แบบไหนก็เรียงเหมือนกัน
+- rank ไม่ลงท้ายด้วย '0' (ค่าเท่ากับตัวที่ตัด 0 ออก) ทำให้เทียบสตริงได้ตรงกับเทียบค่า
+- แทรกที่เดิมซ้ำๆ rank จะยาวขึ้นเรื่อยๆ rebalance_column() กระจาย rank ของคอลัมน์ใหม่
+  (รันเป็น background ผ่าน manage.py rebalance_task_ranks)
+- import งานทีละมากๆ ใช้ ranks_after() ต่อท้ายคอลัมน์ ความยาวคงที่ ไม่ยาวขึ้นตามจำนวนแถว
+"""
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Length
+
+from .models import Task
+
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+# rank ยาวเกินนี้ -> ถึงเวลา rebalance คอลัมน์ (field ยาวได้ 100)
+MAX_RANK_LENGTH = 16
+
+
+def rank_between(before, after):
+    """rank ที่อยู่ระหว่าง before กับ after (None = ไม่มีขอบด้านนั้น)"""
+    before = before or ''
+    if after is not None and after <= before:
+        # เพื่อนบ้านเรียงผิด (client ถือข้อมูลเก่า) วางต่อจาก before ไปก่อน rebalance จะจัดให้ทีหลัง
+        after = None
+    return _midpoint(before, after)
+
+
+def _midpoint(a, b):
+    if b is not None:
+        # ตัดส่วนหน้าที่เหมือนกันออกก่อน
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else '0') == b[n]:
+            n += 1
+        if n > 0:
+            return b[:n] + _midpoint(a[n:], b[n:])
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0]) if b is not None else BASE
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b + 1) // 2]
+    if b is not None and len(b) > 1:
+        # หลักติดกัน แต่ b ยาวกว่า 1 หลัก -> ใช้หลักแรกของ b ก็น้อยกว่า b แล้ว
+        return b[0]
+    return DIGITS[digit_a] + _midpoint(a[1:], None)
+
+
+def spread(count):
+    """rank ความยาวเท่าๆ กัน count ตัว กระจายห่างเท่ากันทั้งช่วง (ใช้ตอน rebalance / backfill)"""
+    width = 1
+    while BASE ** width <= count:
+        width += 1
+    width += 1  # เผื่อช่องว่างระหว่างการ์ดให้แทรกได้อีกหลายครั้งก่อน rank จะยาวขึ้น
+    space = BASE ** width
+    ranks = []
+    for i in range(count):
+        value = (i + 1) * space // (count + 1)
+        digits = []
+        for _ in range(width):
+            value, digit = divmod(value, BASE)
+            digits.append(DIGITS[digit])
+        ranks.append(''.join(reversed(digits)).rstrip('0'))
+    return ranks
+
+
+def ranks_after(bottom, width=5):
+    """rank เรียงต่อกันไปเรื่อยๆ หลัง bottom (rank ล่างสุดของคอลัมน์) ยาวเท่ากันทุกตัว รองรับ BASE ** width แถว"""
+    for index in range(1, BASE ** width):
+        digits = []
+        for _ in range(width):
+            index, digit = divmod(index, BASE)
+            digits.append(DIGITS[digit])
+        # ลงท้ายด้วย 'i' กัน rank ลงท้าย '0'
+        yield bottom + ''.join(reversed(digits)) + 'i'
+
+
+def column_key(task):
+    """key ของคอลัมน์ (ตรงกับ column_filter) ไว้จัดกลุ่มการ์ดใน Python"""
+    if task.sprint_id:
+        return ('sprint', task.sprint_id, task.status)
+    if task.team_id:
+        return ('team', task.team_id)
+    return ('user', task.created_by_id)
+
+
+def column_filter(task):
+    """Q ของคอลัมน์ที่การ์ดใบนี้อยู่ (Sprint: แยกตามสถานะ / Backlog: ทุกสถานะรวมกัน)"""
+    if task.sprint_id:
+        return Q(sprint_id=task.sprint_id, status=task.status)
+    if task.team_id:
+        return Q(team_id=task.team_id, sprint__isnull=True)
+    return Q(created_by_id=task.created_by_id, team__isnull=True, sprint__isnull=True)
+
+
+def top_rank(task):
+    """rank ที่ทำให้การ์ดอยู่บนสุดของคอลัมน์ (งานใหม่ขึ้นบนสุดเหมือนเดิม)"""
+    first = (
+        Task.objects.filter(column_filter(task))
+        .exclude(pk=task.pk)
+        .order_by('rank')
+        .values_list('rank', flat=True)
+        .first()
+    )
+    return rank_between(None, first or None)
+
+
+def bottom_rank(task):
+    """rank ล่างสุดของคอลัมน์ที่การ์ดใบนี้อยู่ ('' ถ้าคอลัมน์ว่าง)"""
+    return (
+        Task.objects.filter(column_filter(task))
+        .order_by('-rank')
+        .values_list('rank', flat=True)
+        .first()
+    ) or ''
+
+
+def rebalance_column(task):
+    """กระจาย rank ของทั้งคอลัมน์ใหม่ (เรียงตามลำดับที่เห็นอยู่บนกระดาน) คืนรายการงานที่ถูกแก้"""
+    from .board import PRIORITY_ORDER
+
+    with transaction.atomic():
+        tasks = list(
+            Task.objects.select_for_update()
+            .filter(column_filter(task))
+            .annotate(priority_val=PRIORITY_ORDER)
+            .order_by('rank', '-priority_val', '-created_at')
+        )
+        changed = []
+        for column_task, rank in zip(tasks, spread(len(tasks))):
+            if column_task.rank != rank:
+                column_task.rank = rank
+                changed.append(column_task)
+        Task.objects.bulk_update(changed, ['rank'], batch_size=500)
+    return changed
+
+
+def columns_needing_rebalance(limit=100):
+    """การ์ดตัวแทน 1 ใบต่อคอลัมน์ที่มี rank ยาวเกิน MAX_RANK_LENGTH"""
+    long_ranks = (
+        Task.objects.annotate(rank_length=Length('rank'))
+        .filter(rank_length__gt=MAX_RANK_LENGTH)
+        .only('id', 'team_id', 'created_by_id', 'sprint_id', 'status')
+    )
+    columns = {}
+    for task in long_ranks.iterator():
+        columns.setdefault(column_key(task), task)
+        if len(columns) >= limit:
+            break
+    return list(columns.values())
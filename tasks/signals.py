@@ -0,0 +1,20 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Team, TeamMember
+from .permissions import invalidate_memberships
+
+
+@receiver(post_save, sender=TeamMember)
+@receiver(post_delete, sender=TeamMember)
+def invalidate_member_permissions(sender, instance, **kwargs):
+    # role ของผู้ใช้คนนี้เปลี่ยน -> ให้ request ถัดไปโหลด membership ใหม่
+    invalidate_memberships(instance.user_id)
+
+
+@receiver(post_save, sender=Team)
+def invalidate_team_permissions(sender, instance, created=False, raw=False, **kwargs):
+    # ชื่อทีมถูกเก็บใน cache ด้วย (ทีมใหม่ยังไม่มีสมาชิก ไม่ต้องทำอะไร)
+    if raw or created:
+        return
+    invalidate_memberships(*instance.memberships.values_list('user_id', flat=True))
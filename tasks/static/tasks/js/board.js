@@ -0,0 +1,323 @@
+// Sprint board (list.html): ลากการ์ดด้วย Sortable, บันทึกการย้ายเป็นชุด, อัปเดตสดจากเพื่อนร่วมทีม
+// ค่าจาก template (URL, ทีม, sprint, seq) อยู่ใน data-* ของแท็ก <script> ที่โหลดไฟล์นี้
+const config = document.currentScript.dataset;
+
+function getCookie(name) {
+    let cookieValue = null;
+    if (document.cookie && document.cookie !== '') {
+        const cookies = document.cookie.split(';');
+        for (let i = 0; i < cookies.length; i++) {
+            const cookie = cookies[i].trim();
+            if (cookie.substring(0, name.length + 1) === (name + '=')) {
+                cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+                break;
+            }
+        }
+    }
+    return cookieValue;
+}
+const csrftoken = getCookie('csrftoken');
+
+document.addEventListener('DOMContentLoaded', function () {
+    const columns = [
+        document.getElementById('todo-list'),
+        document.getElementById('inprogress-list'),
+        document.getElementById('done-list'),
+        document.getElementById('backlog-list')
+    ];
+
+    function updateBadgeCounts() {
+        if (document.getElementById('todo-count')) {
+            document.getElementById('todo-count').textContent = document.querySelectorAll('#todo-list .task-card').length;
+            document.getElementById('inprogress-count').textContent = document.querySelectorAll('#inprogress-list .task-card').length;
+            document.getElementById('done-count').textContent = document.querySelectorAll('#done-list .task-card').length;
+        }
+    }
+
+    function checkEmptyBacklog() {
+        const backlogList = document.getElementById('backlog-list');
+        const emptyMsg = document.getElementById('backlog-empty-msg');
+        const tasks = backlogList.querySelectorAll('.task-card');
+
+        if (emptyMsg) {
+            if (tasks.length > 0) {
+                emptyMsg.style.display = 'none';
+            } else {
+                emptyMsg.style.display = 'block';
+            }
+        }
+    }
+
+    columns.forEach(column => {
+        if (!column) return;
+        new Sortable(column, {
+            group: 'shared',
+            animation: 150,
+            ghostClass: 'sortable-ghost',
+            delay: 100,
+            delayOnTouchOnly: true,
+            filter: '#backlog-empty-msg',
+
+            onEnd: function (evt) {
+                const itemEl = evt.item;
+                const newList = evt.to;
+                const prev = itemEl.previousElementSibling;
+                const next = itemEl.nextElementSibling;
+
+                // 📦 เก็บการลากไว้ก่อน แล้วส่งเป็นชุดเดียว (ลากหลายใบติดกัน = request เดียว)
+                queueMove({
+                    task_id: itemEl.getAttribute('data-task-id'),
+                    status: newList.getAttribute('data-status'),
+                    sprint_id: newList.getAttribute('data-sprint-id') || null,
+                    after_id: prev && prev.classList.contains('task-card') ? prev.getAttribute('data-task-id') : null,
+                    before_id: next && next.classList.contains('task-card') ? next.getAttribute('data-task-id') : null,
+                });
+
+                // อัปเดต UI ชั่วคราวไปก่อน (เผื่อเน็ตช้า)
+                updateBadgeCounts();
+                checkEmptyBacklog();
+            }
+        });
+    });
+
+    let pendingMoves = [];
+    let flushTimer = null;
+
+    function queueMove(move) {
+        pendingMoves.push(move);
+        clearTimeout(flushTimer);
+        flushTimer = setTimeout(flushMoves, 400);
+    }
+
+    function flushMoves() {
+        if (!pendingMoves.length) return;
+        const moves = pendingMoves;
+        pendingMoves = [];
+        fetch(config.moveUrl, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json', 'X-CSRFToken': csrftoken },
+            // keepalive: ส่งให้เสร็จแม้ผู้ใช้ปิด/เปลี่ยนหน้าไปแล้ว
+            keepalive: true,
+            body: JSON.stringify({
+                team_id: config.teamId || null,
+                moves: moves
+            })
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                // ✨ รับข้อมูลการ์ดแบบย่อกลับมาวาดการ์ดใหม่เอง (server ไม่ต้อง render HTML)
+                data.tasks.forEach(task => {
+                    const card = findCard(task.id);
+                    if (card) card.replaceWith(renderCard(task));
+                });
+                updateBadgeCounts();
+                checkEmptyBacklog();
+            } else {
+                alert('Failed: ' + data.error);
+            }
+        })
+        .catch(error => console.error('Error:', error));
+    }
+    window.addEventListener('pagehide', flushMoves);
+
+    // 📡 Live update: เพื่อนร่วมทีมย้าย/แก้งาน -> แก้การ์ดบนกระดานทันที ไม่ต้อง reload ทั้งหน้า
+    // event (SSE) ใช้ได้เฉพาะตอนรันใต้ ASGI / ส่วนที่พลาดไป (เน็ตหลุด, seq กระโดด) ดึงจาก change log มาเติม
+    const activeSprintId = config.sprintId;
+    const teamQuery = config.teamId ? 'team_id=' + config.teamId : '';
+    let lastSeq = Number(config.boardSeq) || 0;
+
+    const PRIORITY = {
+        H: { label: 'High', color: '#dc3545', cls: 'text-danger' },
+        M: { label: 'Medium', color: '#ffc107', cls: 'text-warning' },
+        L: { label: 'Low', color: '#0dcaf0', cls: 'text-info' },
+    };
+    const STATUS_ICON = {
+        DONE: 'bi bi-check-circle-fill text-success',
+        IN_PROGRESS: 'bi bi-play-circle-fill text-warning',
+        TODO: 'bi bi-circle text-muted',
+    };
+
+    function findCard(id) {
+        return document.querySelector('.task-card[data-task-id="' + id + '"]');
+    }
+
+    function targetList(task) {
+        if (!task.sprint) return document.getElementById('backlog-list');
+        if (String(task.sprint) !== activeSprintId) return null;
+        return document.querySelector('.drop-zone[data-sprint-id="' + activeSprintId + '"][data-status="' + task.status + '"]');
+    }
+
+    // 🧩 วาดการ์ดจากข้อมูลแบบย่อ (markup เดียวกับ partials/task_card.html ที่ใช้ตอน render หน้าเต็ม)
+    const EDIT_URL = config.editUrl;
+    const DELETE_URL = config.deleteUrl;
+    const canDelete = config.role !== 'MEMBER';
+    const STATUS_TITLE = { DONE: 'Done', IN_PROGRESS: 'In Progress', TODO: 'To Do' };
+
+    function escapeHtml(value) {
+        return String(value == null ? '' : value)
+            .replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;')
+            .replace(/"/g, '&quot;').replace(/'/g, '&#x27;');
+    }
+
+    function taskUrl(template, id) {
+        return template.replace('/0/', '/' + id + '/');
+    }
+
+    function renderCard(task) {
+        const priority = PRIORITY[task.priority] || { label: '', color: '#6c757d', cls: '' };
+        const status = STATUS_ICON[task.status] ? task.status : 'TODO';
+        const next = encodeURIComponent(location.pathname + location.search);
+        const assignee = task.assignee
+            ? `<div class="rounded-circle bg-primary text-white d-flex align-items-center justify-content-center shadow-sm"
+                    style="width: 28px; height: 28px; font-size: 12px; cursor: help;"
+                    title="Assignee: ${escapeHtml(task.assignee)}">${escapeHtml(task.assignee.charAt(0).toUpperCase())}</div>`
+            : `<div class="rounded-circle bg-light text-muted border d-flex align-items-center justify-content-center"
+                    style="width: 28px; height: 28px;" title="Unassigned"><i class="bi bi-person"></i></div>`;
+        const remove = canDelete
+            ? `<li><hr class="dropdown-divider"></li>
+               <li><a class="dropdown-item small text-danger" href="${taskUrl(DELETE_URL, task.id)}"
+                      onclick="return confirm('ลบจริงนะ?');">🗑️ ลบ</a></li>`
+            : '';
+        const description = task.description
+            ? `<p class="text-muted small mb-3 text-truncate" style="max-height: 40px;">${escapeHtml(task.description)}</p>`
+            : '';
+
+        const wrapper = document.createElement('div');
+        wrapper.innerHTML = `
+            <div class="card mb-3 shadow-sm task-card border-0" data-task-id="${task.id}" data-rank="${escapeHtml(task.rank)}"
+                 style="cursor: grab; border-left: 5px solid ${priority.color} !important;">
+                <div class="card-body p-3 bg-white rounded-end">
+                    <div class="d-flex justify-content-between align-items-start mb-2">
+                        <h6 class="card-title fw-bold text-dark mb-0 text-break">${escapeHtml(task.title)}</h6>
+                        <div class="dropdown ms-2">
+                            <button class="btn btn-link text-muted p-0 text-decoration-none" type="button" data-bs-toggle="dropdown">⋮</button>
+                            <ul class="dropdown-menu dropdown-menu-end shadow-sm">
+                                <a class="dropdown-item small" href="${taskUrl(EDIT_URL, task.id)}?next=${next}">✏️ แก้ไข</a>
+                                ${remove}
+                            </ul>
+                        </div>
+                    </div>
+                    ${description}
+                    <div class="d-flex justify-content-between align-items-center mt-2 pt-2 border-top">
+                        <div>
+                            <i class="${STATUS_ICON[status]}" title="${STATUS_TITLE[status]}"></i>
+                            <small class="ms-1 fw-bold ${priority.cls}">${priority.label}</small>
+                        </div>
+                        <div class="d-flex align-items-center gap-2">
+                            ${assignee}
+                            <span class="badge bg-light text-dark border rounded-pill" title="Story Points">${escapeHtml(task.points)} pts</span>
+                        </div>
+                    </div>
+                </div>
+            </div>`;
+        return wrapper.firstElementChild;
+    }
+
+    function showReloadBanner() {
+        if (document.getElementById('live-reload-banner')) return;
+        const banner = document.createElement('div');
+        banner.id = 'live-reload-banner';
+        banner.className = 'alert alert-info shadow position-fixed bottom-0 end-0 m-4';
+        banner.style.zIndex = 1080;
+        banner.innerHTML = 'กระดานมีการเปลี่ยนแปลง <a href="" class="alert-link ms-2">รีโหลด</a>';
+        document.body.appendChild(banner);
+    }
+
+    function applyTask(task) {
+        const card = findCard(task.id);
+        const list = targetList(task);
+        if (!list) {
+            // ย้ายออกไปนอกกระดานที่เปิดอยู่ (Sprint อื่น)
+            if (card) card.remove();
+            return;
+        }
+        // การ์ดใหม่ (เพื่อนเพิ่งสร้าง) ก็วาดได้เลย ไม่ต้องรีโหลดหน้า
+        const fresh = renderCard(task);
+        if (card) card.replaceWith(fresh);
+        placeCard(list, fresh, task.rank);
+    }
+
+    // วางการ์ดตาม rank (เทียบสตริงตรงๆ เหมือนฝั่ง database)
+    function placeCard(list, card, rank) {
+        card.setAttribute('data-rank', rank || '');
+        const next = Array.from(list.querySelectorAll('.task-card'))
+            .find(other => other !== card && (other.getAttribute('data-rank') || '') > (rank || ''));
+        if (next) {
+            if (card.nextElementSibling !== next) list.insertBefore(card, next);
+        } else if (card.parentElement !== list || card.nextElementSibling) {
+            list.appendChild(card);
+        }
+    }
+
+    function removeTask(id) {
+        const card = findCard(id);
+        if (card) card.remove();
+    }
+
+    function refreshCounts() {
+        updateBadgeCounts();
+        checkEmptyBacklog();
+    }
+
+    // 🔄 Delta sync: ดึงเฉพาะสิ่งที่เปลี่ยนหลัง lastSeq (ไม่มีอะไรเปลี่ยน = JSON เล็กๆ ก้อนเดียว)
+    function fetchChanges() {
+        return fetch(config.changesUrl + '?since=' + lastSeq + (teamQuery ? '&' + teamQuery : ''))
+            .then(response => response.json())
+            .then(data => {
+                if (data.reset) {
+                    // log ช่วงที่พลาดถูก compact ไปแล้ว ต้องโหลดทั้งกระดาน
+                    showReloadBanner();
+                    return;
+                }
+                data.tasks.forEach(applyTask);
+                data.deleted_tasks.forEach(removeTask);
+                if (data.sprints.length || data.deleted_sprints.length) showReloadBanner();
+                refreshCounts();
+                lastSeq = data.seq;
+                if (data.has_more) return fetchChanges();
+            });
+    }
+
+    let syncing = null;
+    function resync() {
+        if (!syncing) {
+            syncing = fetchChanges()
+                .catch(error => console.error('Sync error:', error))
+                .finally(() => { syncing = null; });
+        }
+        return syncing;
+    }
+
+    // event ต้องมาต่อจาก lastSeq พอดี ถ้ากระโดด (พลาดไประหว่างทาง) ให้ดึง delta มาแทน
+    function onLiveEvent(apply) {
+        return function (event) {
+            const seq = Number(event.lastEventId);
+            if (seq <= lastSeq) return;
+            if (seq !== lastSeq + 1) {
+                resync();
+                return;
+            }
+            apply(JSON.parse(event.data));
+            lastSeq = seq;
+            refreshCounts();
+        };
+    }
+
+    if (window.EventSource) {
+        const source = new EventSource(config.eventsUrl + (teamQuery ? '?' + teamQuery : ''));
+        source.addEventListener('task-moved', onLiveEvent(applyTask));
+        source.addEventListener('task-updated', onLiveEvent(applyTask));
+        source.addEventListener('task-deleted', onLiveEvent(task => removeTask(task.id)));
+        // Sprint เริ่ม/จบ/ถูกแก้ กระทบทั้งกระดาน ให้ผู้ใช้กดรีโหลดเอง
+        source.addEventListener('sprint-changed', onLiveEvent(showReloadBanner));
+        // import งานทีละมากๆ ไม่มีรายละเอียดทีละใบ ต้องโหลดใหม่ทั้งกระดาน
+        source.addEventListener('board-reset', onLiveEvent(showReloadBanner));
+        // ต่อใหม่หลังหลุด -> เติมส่วนที่พลาดไประหว่างหลุด
+        source.addEventListener('open', resync);
+    }
+    window.addEventListener('online', resync);
+    document.addEventListener('visibilitychange', function () {
+        if (document.visibilityState === 'visible') resync();
+    });
+});
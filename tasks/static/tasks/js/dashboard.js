@@ -0,0 +1,102 @@
+// Dashboard ของ sprint (dashboard.html) ค่าจาก template อยู่ใน data-* ของแท็ก <script> ที่โหลดไฟล์นี้
+const config = document.currentScript.dataset;
+const numbers = value => value.split(',').map(Number);
+
+// 1. Config Doughnut Chart (Status)
+const ctxStatus = document.getElementById('statusChart');
+new Chart(ctxStatus, {
+    type: 'doughnut',
+    data: {
+        labels: ['To Do', 'In Progress', 'Done'],
+        datasets: [{
+            data: numbers(config.status),
+            backgroundColor: [
+                '#e9ecef', // Grey for Todo
+                '#0d6efd', // Blue for In Progress
+                '#198754'  // Green for Done
+            ],
+            borderWidth: 0,
+            hoverOffset: 4
+        }]
+    },
+    options: {
+        responsive: true,
+        maintainAspectRatio: false,
+        plugins: {
+            legend: { position: 'bottom' }
+        }
+    }
+});
+
+// 2. Config Bar Chart (Points/Tasks)
+const ctxPoints = document.getElementById('pointsChart');
+new Chart(ctxPoints, {
+    type: 'bar',
+    data: {
+        labels: ['Tasks Count', 'Story Points'],
+        datasets: [
+            {
+                label: 'Total',
+                data: numbers(config.total),
+                backgroundColor: '#6c757d',
+                borderRadius: 5
+            },
+            {
+                label: 'Completed',
+                data: numbers(config.done),
+                backgroundColor: '#198754',
+                borderRadius: 5
+            }
+        ]
+    },
+    options: {
+        responsive: true,
+        maintainAspectRatio: false,
+        scales: {
+            y: { beginAtZero: true }
+        }
+    }
+});
+
+// 3. Burndown + Velocity (ดึงจาก API ที่อ่าน SprintSnapshot)
+fetch(config.url)
+    .then(response => response.json())
+    .then(data => {
+        const burndown = data.burndown;
+        const start = burndown.length ? burndown[0].total_points : 0;
+        new Chart(document.getElementById('burndownChart'), {
+            type: 'line',
+            data: {
+                labels: burndown.map(point => point.date),
+                datasets: [
+                    {
+                        label: 'Remaining',
+                        data: burndown.map(point => point.remaining_points),
+                        borderColor: '#0d6efd',
+                        tension: 0.2
+                    },
+                    {
+                        label: 'Ideal',
+                        data: burndown.map((point, i) => burndown.length > 1 ? Math.round(start - start * i / (burndown.length - 1)) : start),
+                        borderColor: '#adb5bd',
+                        borderDash: [5, 5],
+                        pointRadius: 0
+                    }
+                ]
+            },
+            options: { responsive: true, maintainAspectRatio: false, scales: { y: { beginAtZero: true } } }
+        });
+
+        new Chart(document.getElementById('velocityChart'), {
+            type: 'bar',
+            data: {
+                labels: data.velocity.map(row => row.sprint),
+                datasets: [
+                    { label: 'Committed', data: data.velocity.map(row => row.committed), backgroundColor: '#6c757d', borderRadius: 5 },
+                    { label: 'Completed', data: data.velocity.map(row => row.completed), backgroundColor: '#198754', borderRadius: 5 }
+                ]
+            },
+            options: { responsive: true, maintainAspectRatio: false, scales: { y: { beginAtZero: true } } }
+        });
+    })
+    .catch(error => console.error('Error:', error));
@@ -0,0 +1,43 @@
+// นำเข้างานจาก CSV (import.html)
+// อ่านผลทีละบรรทัด (1 บรรทัดต่อ batch) ระหว่างที่ server ยังนำเข้าอยู่
+document.getElementById('import-form').addEventListener('submit', async event => {
+    event.preventDefault();
+    const form = event.target;
+    const panel = document.getElementById('import-progress');
+    const status = document.getElementById('import-status');
+    const errors = document.getElementById('import-errors');
+    form.querySelector('button[type="submit"]').disabled = true;
+    panel.classList.remove('d-none');
+    status.textContent = 'กำลังอัปโหลด...';
+    errors.innerHTML = '';
+
+    const show = result => {
+        status.textContent = `อ่านแล้ว ${result.processed} แถว / สร้าง ${result.created} / แก้ ${result.updated} / ผิด ${result.error_count}`;
+        errors.innerHTML = '';
+        result.errors.forEach(item => {
+            const li = document.createElement('li');
+            li.textContent = `บรรทัด ${item.line}: ${item.error}`;
+            errors.appendChild(li);
+        });
+    };
+
+    const response = await fetch(form.action, { method: 'POST', body: new FormData(form) });
+    if (!response.ok) {
+        status.textContent = 'นำเข้าไม่สำเร็จ (' + response.status + ')';
+        form.querySelector('button[type="submit"]').disabled = false;
+        return;
+    }
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        lines.filter(Boolean).forEach(line => show(JSON.parse(line)));
+    }
+    status.textContent = '✅ ' + status.textContent;
+    form.querySelector('button[type="submit"]').disabled = false;
+});
@@ -0,0 +1,202 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Count, Sum, Max, Q, F, OuterRef, Subquery
+from django.utils import timezone
+
+from config.caching import is_shared_cache
+
+from .models import Task, SprintSnapshot
+
+# เก็บสถิติของแต่ละ Sprint ไว้ใน cache เฉพาะตอนทุก worker เห็น cache ชุดเดียวกัน (Redis / ไฟล์)
+# LocMem: worker ที่ไม่ได้แก้งานจะไม่รู้ว่าต้องล้าง -> คำนวณใหม่ทุกครั้ง (aggregate query เดียว)
+SPRINT_STATS_TIMEOUT = 60 * 5
+
+
+def empty_stats():
+    return {
+        'total_tasks': 0,
+        'done_tasks': 0,
+        'todo_tasks': 0,
+        'progress_tasks': 0,
+        'completion_rate': 0,
+        'total_points': 0,
+        'done_points': 0,
+    }
+
+
+def _cache_key(sprint_id):
+    return f'tasks:sprint_stats:{sprint_id}'
+
+
+def compute_sprint_stats(sprint_id):
+    """คำนวณสถิติทั้งหมดของ Sprint ด้วย aggregate query เดียว"""
+    done = Q(status='DONE')
+    result = Task.objects.filter(sprint_id=sprint_id).aggregate(
+        total_tasks=Count('id'),
+        done_tasks=Count('id', filter=done),
+        todo_tasks=Count('id', filter=Q(status='TODO')),
+        progress_tasks=Count('id', filter=Q(status='IN_PROGRESS')),
+        total_points=Sum('story_points'),
+        done_points=Sum('story_points', filter=done),
+    )
+
+    stats = empty_stats()
+    stats.update({key: value or 0 for key, value in result.items()})
+    if stats['total_tasks'] > 0:
+        stats['completion_rate'] = int((stats['done_tasks'] / stats['total_tasks']) * 100)
+    return stats
+
+
+def get_sprint_stats(sprint):
+    """อ่านสถิติจาก cache ถ้าไม่มีค่อยคำนวณแล้วเก็บไว้"""
+    if not is_shared_cache():
+        return compute_sprint_stats(sprint.pk)
+    key = _cache_key(sprint.pk)
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_sprint_stats(sprint.pk)
+        cache.set(key, stats, SPRINT_STATS_TIMEOUT)
+    return stats
+
+
+def invalidate_sprint_stats(*sprint_ids):
+    """ล้าง cache สถิติของ Sprint ที่มีงานเปลี่ยน (ส่ง None มาได้ จะถูกข้ามไป)"""
+    keys = [_cache_key(sprint_id) for sprint_id in sprint_ids if sprint_id]
+    if keys and is_shared_cache():
+        cache.delete_many(keys)
+
+
+def refresh_sprint_stats(*sprint_ids):
+    """เรียกหลังงานใน Sprint เปลี่ยนทีละมากๆ (import, ปิด/เริ่ม Sprint): คำนวณใหม่ทั้ง Sprint แล้วเขียน snapshot ของวันนี้
+
+    snapshot เป็นแถวเดียวต่อ Sprint ต่อวัน (update_or_create) เลยไม่ต้องคำนวณย้อนหลังจาก Task ตอนเปิดกราฟ
+    แก้งานทีละใบใช้ apply_task_changes แทน (บวก/ลบตัวนับ ไม่ต้อง aggregate ใหม่)
+    """
+    today = timezone.localdate()
+    for sprint_id in {sprint_id for sprint_id in sprint_ids if sprint_id}:
+        stats = compute_sprint_stats(sprint_id)
+        if is_shared_cache():
+            cache.set(_cache_key(sprint_id), stats, SPRINT_STATS_TIMEOUT)
+        SprintSnapshot.objects.update_or_create(
+            sprint_id=sprint_id,
+            date=today,
+            defaults={
+                'total_tasks': stats['total_tasks'],
+                'done_tasks': stats['done_tasks'],
+                'total_points': stats['total_points'],
+                'done_points': stats['done_points'],
+            },
+        )
+
+
+def task_state(task):
+    """ส่วนของงานที่มีผลกับสถิติ Sprint (เก็บไว้ก่อนแก้งาน แล้วส่งคู่ก่อน/หลังให้ apply_task_changes)"""
+    return (task.sprint_id, task.status, task.story_points or 0)
+
+
+def _add_state(deltas, state, sign):
+    sprint_id, status, points = state
+    if sprint_id is None:
+        return
+    done = status == 'DONE'
+    delta = deltas.setdefault(sprint_id, {'total_tasks': 0, 'done_tasks': 0, 'total_points': 0, 'done_points': 0})
+    delta['total_tasks'] += sign
+    delta['done_tasks'] += sign * done
+    delta['total_points'] += sign * points
+    delta['done_points'] += sign * points * done
+
+
+def apply_task_changes(changes):
+    """เรียกหลังแก้งาน (ใน transaction เดียวกัน): บวก/ลบตัวนับใน snapshot วันนี้ของ Sprint เดิมและ Sprint ใหม่ด้วย F()
+
+    changes: [(task_state ก่อนแก้, task_state หลังแก้), ...] งานใหม่ใช้ None เป็นค่าก่อน งานที่ถูกลบใช้ None เป็นค่าหลัง
+    Sprint ที่ยังไม่มี snapshot ของวันนี้ (แก้ครั้งแรกของวัน) คำนวณเต็มครั้งเดียวด้วย refresh_sprint_stats
+    """
+    deltas = {}
+    changed = set()
+    for before, after in changes:
+        if before == after:
+            # เรียงลำดับในคอลัมน์เดิม: สถิติไม่เปลี่ยน
+            continue
+        for state, sign in ((before, -1), (after, 1)):
+            if state is not None:
+                _add_state(deltas, state, sign)
+                changed.add(state[0])
+
+    today = timezone.localdate()
+    missing = []
+    for sprint_id, delta in deltas.items():
+        if not any(delta.values()):
+            continue
+        updated = SprintSnapshot.objects.filter(sprint_id=sprint_id, date=today).update(
+            **{field: F(field) + value for field, value in delta.items() if value}
+        )
+        if not updated:
+            missing.append(sprint_id)
+    refresh_sprint_stats(*missing)
+    # จำนวน To Do / In Progress ไม่ได้อยู่ใน snapshot: ล้าง cache ให้คำนวณใหม่ตอนมีคนเปิดดู
+    invalidate_sprint_stats(*(changed - set(missing)))
+
+
+def burndown_series(sprint):
+    """แต้มที่เหลือรายวันของ Sprint (อ่านจาก snapshot ด้วย range query เดียว)
+
+    วันไหนไม่มี snapshot (ไม่มีงานเปลี่ยน) ใช้ค่าของวันก่อนหน้า
+    """
+    end_date = min(sprint.end_date, timezone.localdate())
+    snapshots = SprintSnapshot.objects.filter(
+        sprint=sprint, date__lte=end_date,
+    ).values_list('date', 'total_points', 'done_points', 'total_tasks', 'done_tasks')
+
+    series = []
+    last = None
+    by_date = {}
+    for date, total_points, done_points, total_tasks, done_tasks in snapshots:
+        if date < sprint.start_date:
+            # ค่าก่อนเริ่ม Sprint ใช้เป็นจุดตั้งต้นของวันแรก
+            last = (total_points, done_points, total_tasks, done_tasks)
+        else:
+            by_date[date] = (total_points, done_points, total_tasks, done_tasks)
+
+    day = sprint.start_date
+    while day <= end_date:
+        last = by_date.get(day, last)
+        if last is not None:
+            total_points, done_points, total_tasks, done_tasks = last
+            series.append({
+                'date': day.isoformat(),
+                'remaining_points': total_points - done_points,
+                'remaining_tasks': total_tasks - done_tasks,
+                'total_points': total_points,
+            })
+        day += timedelta(days=1)
+    return series
+
+
+def velocity_series(sprints, limit=10):
+    """แต้มที่วางแผน (committed) และทำเสร็จ (completed) ของ Sprint ล่าสุด `limit` รอบ
+
+    committed = total_points สูงสุดที่เคยมี, completed = done_points ของ snapshot ล่าสุด
+    """
+    latest = SprintSnapshot.objects.filter(sprint=OuterRef('pk')).order_by('-date')
+    committed = (
+        SprintSnapshot.objects.filter(sprint=OuterRef('pk'))
+        .values('sprint')
+        .annotate(max_points=Max('total_points'))
+        .values('max_points')
+    )
+    sprints = sprints.annotate(
+        completed=Subquery(latest.values('done_points')[:1]),
+        committed=Subquery(committed),
+    ).order_by('-start_date', '-id')[:limit]
+
+    return [
+        {
+            'sprint_id': sprint.id,
+            'sprint': sprint.name,
+            'committed': sprint.committed or 0,
+            'completed': sprint.completed or 0,
+        }
+        for sprint in reversed(list(sprints))
+    ]
@@ -0,0 +1,70 @@
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from tasks.events import DESCRIPTION_PREVIEW
+from tasks.models import Task
+
+from .test_permissions import LOCMEM, BoardFixture
+
+
+@override_settings(CACHES=LOCMEM)
+class CardPayloadTests(BoardFixture, TestCase):
+    def setUp(self):
+        self.client.force_login(self.member)
+        self.task = self.tasks[0]
+        self.task.description = 'x' * 5000
+        self.task.assignee = self.member
+        self.task.save()
+        self.url = reverse('tasks:task_api', args=[self.task.id])
+
+    def test_compact_payload(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], 'private, no-cache')
+        card = response.json()
+        self.assertEqual(set(card), {
+            'id', 'title', 'description', 'status', 'priority', 'points', 'sprint', 'rank', 'assignee',
+        })
+        self.assertEqual(len(card['description']), DESCRIPTION_PREVIEW)
+        self.assertEqual((card['assignee'], card['sprint']), ('member', self.sprint.id))
+
+    def test_not_modified(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, headers={'If-None-Match': f'"other", {etag}'})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+
+        # การ์ดเปลี่ยน -> ETag ใหม่ ได้ข้อมูลเต็ม
+        Task.objects.filter(pk=self.task.pk).update(title='Renamed')
+        response = self.client.get(self.url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()['title'], 'Renamed')
+
+    def test_post_never_304(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.post(
+            reverse('tasks:move_task_api'),
+            json.dumps({'task_id': self.task.id, 'status': 'TODO', 'sprint_id': self.sprint.id}),
+            content_type='application/json', headers={'If-None-Match': etag},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['task']['status'], 'TODO')
+
+    def test_non_member_404(self):
+        self.client.force_login(User.objects.create_user('outsider'))
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_update_status_ajax_returns_payload(self):
+        url = reverse('tasks:update_status', args=[self.task.id, 'IN_PROGRESS'])
+        response = self.client.get(url, headers={'X-Requested-With': 'XMLHttpRequest'})
+        self.assertEqual(response.json()['task']['status'], 'IN_PROGRESS')
+        self.assertNotIn('html', response.json())
+
+        # ลิงก์ธรรมดาจากหน้ากระดาน -> กลับไปหน้ากระดานเหมือนเดิม
+        response = self.client.get(url, headers={'Accept': 'text/html'})
+        self.assertRedirects(response, f'/tasks/?team_id={self.team.id}', fetch_redirect_response=False)
@@ -0,0 +1,141 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks import changes
+from tasks.events import channel_for
+from tasks.models import BoardChange, Task
+
+from .test_permissions import LOCMEM, BoardFixture
+
+
+@override_settings(CACHES=LOCMEM)
+class TaskChangesViewTests(BoardFixture, TestCase):
+    def setUp(self):
+        self.client.force_login(self.member)
+        self.url = reverse('tasks:task_changes')
+
+    def changes(self, since, **params):
+        response = self.client.get(self.url, {'team_id': self.team.id, 'since': since, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_catch_up_after_missed_events(self):
+        owner = self.client_class()
+        owner.force_login(self.owner)
+        owner.get(reverse('tasks:update_status', args=[self.tasks[0].id, 'IN_PROGRESS']))
+        owner.get(reverse('tasks:update_status', args=[self.tasks[0].id, 'DONE']))
+        owner.post(reverse('tasks:delete_task', args=[self.tasks[1].id]))
+
+        result = self.changes(0)
+        self.assertEqual(result['seq'], 3)
+        # งานเดียวกันเปลี่ยนสองครั้ง -> ได้สถานะล่าสุดรายการเดียว
+        self.assertEqual([(task['id'], task['status']) for task in result['tasks']], [(self.tasks[0].id, 'DONE')])
+        self.assertEqual(result['deleted_tasks'], [self.tasks[1].id])
+        self.assertFalse(result['reset'])
+
+        self.assertEqual(self.changes(2)['tasks'], [])
+
+    def test_move_and_log_commit_together(self):
+        task = self.tasks[0]
+        url = reverse('tasks:move_task_api')
+        body = {'task_id': task.id, 'status': 'DONE', 'sprint_id': self.sprint.id}
+        # จอง seq ไม่ได้ -> การ์ดต้องไม่ถูกย้ายทั้งที่ save() ไปแล้ว (ไม่งั้น client ที่ตาม log จะไม่มีวันเห็น)
+        with mock.patch('tasks.changes._reserve', side_effect=DatabaseError('locked')):
+            with self.assertRaises(DatabaseError):
+                self.client.post(url, body, content_type='application/json')
+        task.refresh_from_db()
+        self.assertEqual(task.status, 'TODO')
+
+        self.client.post(url, body, content_type='application/json')
+        result = self.changes(0)
+        self.assertEqual((result['seq'], result['tasks'][0]['status']), (1, 'DONE'))
+
+    def test_up_to_date_skips_change_table(self):
+        changes.record(channel_for(self.team.id), [('task', self.tasks[0].id, {'id': self.tasks[0].id})])
+        # session + user + membership + BoardSequence
+        with self.assertNumQueries(4):
+            result = self.changes(1)
+        self.assertEqual((result['seq'], result['tasks']), (1, []))
+
+    def test_complete_sprint_logs_moved_tasks(self):
+        owner = self.client_class()
+        owner.force_login(self.owner)
+        Task.objects.filter(pk=self.tasks[2].pk).update(status='DONE')
+        owner.post(reverse('tasks:complete_sprint', args=[self.sprint.id]))
+
+        result = self.changes(0)
+        self.assertEqual(len(result['tasks']), len(self.tasks) - 1)
+        self.assertTrue(all(task['sprint'] is None for task in result['tasks']))
+        self.assertEqual([sprint['is_active'] for sprint in result['sprints']], [False])
+
+    def test_personal_board(self):
+        changes.record(channel_for(None, self.member.id), [('task', 1, {'id': 1})])
+        response = self.client.get(self.url, {'since': 0})
+        self.assertEqual(response.json()['tasks'], [{'id': 1}])
+
+    def test_invalid_since(self):
+        self.assertEqual(self.client.get(self.url, {'team_id': self.team.id, 'since': 'x'}).status_code, 400)
+
+    def test_non_member_forbidden(self):
+        self.client.force_login(User.objects.create_user('outsider'))
+        self.assertEqual(self.client.get(self.url, {'team_id': self.team.id}).status_code, 403)
+
+
+class ChangeLogTests(TestCase):
+    channel = 'team:1'
+
+    def record(self, object_id, data=True):
+        return changes.record(self.channel, [('task', object_id, {'id': object_id} if data else None)])
+
+    def test_seq_is_contiguous(self):
+        self.assertEqual(self.record(1), 1)
+        self.assertEqual(changes.record(self.channel, [('task', 2, {}), ('task', 3, {})]), 3)
+        self.assertEqual(changes.record('team:2', [('task', 4, {})]), 1)
+        self.assertEqual(list(BoardChange.objects.filter(channel=self.channel).values_list('seq', flat=True)), [1, 2, 3])
+        self.assertIsNone(changes.record(self.channel, []))
+
+    def test_since_ahead_of_log_resets(self):
+        self.record(1)
+        self.assertTrue(changes.changes_since(self.channel, 5)['reset'])
+
+    def test_has_more(self):
+        for object_id in range(5):
+            self.record(object_id)
+        result = changes.changes_since(self.channel, 0, limit=3)
+        self.assertEqual((result['seq'], result['has_more'], len(result['tasks'])), (3, True, 3))
+        result = changes.changes_since(self.channel, result['seq'], limit=3)
+        self.assertEqual((result['seq'], result['has_more'], len(result['tasks'])), (5, False, 2))
+
+    def test_compact_keeps_latest_row(self):
+        self.record(1)
+        self.record(1, data=False)
+        self.record(2)
+        self.assertEqual(changes.compact(), (1, 0))
+        result = changes.changes_since(self.channel, 0)
+        self.assertEqual((result['deleted_tasks'], result['tasks']), ([1], [{'id': 2}]))
+
+    def test_expired_rows_force_reset(self):
+        self.record(1)
+        self.record(2)
+        BoardChange.objects.filter(seq=1).update(created_at=timezone.now() - timedelta(days=40))
+        out = StringIO()
+        call_command('compact_board_changes', days=30, stdout=out)
+        self.assertIn('removed 0 superseded and 1 expired', out.getvalue())
+
+        self.assertTrue(changes.changes_since(self.channel, 0)['reset'])
+        self.assertEqual(changes.changes_since(self.channel, 1)['tasks'], [{'id': 2}])
+
+    def test_reset(self):
+        self.record(1)
+        seq = changes.reset(self.channel)
+        self.assertEqual(seq, 2)
+        self.assertTrue(changes.changes_since(self.channel, 1)['reset'])
+        self.assertFalse(changes.changes_since(self.channel, 2)['reset'])
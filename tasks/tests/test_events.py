@@ -0,0 +1,127 @@
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from tasks.events import InProcessBroker, Subscription, get_broker, publish
+
+from .test_permissions import LOCMEM, BoardFixture
+
+
+def parse_sse(chunk):
+    fields = dict(line.split(': ', 1) for line in chunk.decode().strip().split('\n'))
+    return fields['event'], int(fields['id']), json.loads(fields['data'])
+
+
+async def disconnect(stream):
+    # client หลุด: ASGI handler cancel task ที่ค้างรอ event อยู่ -> stream() ถอน subscription ใน finally
+    pending = asyncio.ensure_future(anext(stream))
+    await asyncio.sleep(0)
+    pending.cancel()
+    try:
+        await pending
+    except asyncio.CancelledError:
+        pass
+
+
+@override_settings(CACHES=LOCMEM)
+class TaskEventsTests(BoardFixture, TestCase):
+    def setUp(self):
+        self.url = reverse('tasks:task_events')
+
+    def test_wsgi_is_not_supported(self):
+        self.client.force_login(self.member)
+        self.assertEqual(self.client.get(self.url, {'team_id': self.team.id}).status_code, 501)
+
+    async def test_non_member_is_forbidden(self):
+        outsider = await User.objects.acreate(username='outsider')
+        await self.async_client.aforce_login(outsider)
+        response = await self.async_client.get(self.url, {'team_id': self.team.id})
+        self.assertEqual(response.status_code, 403)
+
+    def move(self, task, status):
+        # on_commit ไม่ทำงานใน TestCase เอง: จับ callback แล้วสั่งรัน (publish ไปที่ broker)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('tasks:move_task_api'),
+                json.dumps({'task_id': task.id, 'status': status, 'sprint_id': self.sprint.id}),
+                content_type='application/json',
+            )
+        self.assertEqual(response.status_code, 200)
+
+    async def test_subscriber_receives_move(self):
+        broker = get_broker()
+        before = broker.subscriber_count()
+        await self.async_client.aforce_login(self.member)
+        await sync_to_async(self.client.force_login)(self.owner)
+
+        response = await self.async_client.get(self.url, {'team_id': self.team.id})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b'retry: 5000\n\n')
+        self.assertEqual(broker.subscriber_count(), before + 1)
+
+        await sync_to_async(self.move)(self.tasks[4], 'DONE')
+        event, seq, data = parse_sse(await asyncio.wait_for(anext(stream), 5))
+        self.assertEqual(event, 'task-moved')
+        self.assertEqual(seq, 1)
+        self.assertEqual((data['id'], data['status']), (self.tasks[4].id, 'DONE'))
+
+        await sync_to_async(self.move)(self.tasks[5], 'IN_PROGRESS')
+        self.assertEqual(parse_sse(await asyncio.wait_for(anext(stream), 5))[1], 2)
+
+        await disconnect(stream)
+        self.assertEqual(broker.subscriber_count(), before)
+
+    @override_settings(TASK_EVENTS_HEARTBEAT=0.01)
+    async def test_heartbeat_when_idle(self):
+        await self.async_client.aforce_login(self.member)
+        response = await self.async_client.get(self.url, {'team_id': self.team.id})
+        stream = aiter(response.streaming_content)
+        await anext(stream)
+        self.assertEqual(await asyncio.wait_for(anext(stream), 5), b': ping\n\n')
+        await disconnect(stream)
+
+    async def test_other_channel_gets_nothing(self):
+        await self.async_client.aforce_login(self.member)
+        await sync_to_async(self.client.force_login)(self.owner)
+        # กระดานส่วนตัวของ member ไม่ได้ยิน event ของทีม
+        response = await self.async_client.get(self.url)
+        stream = aiter(response.streaming_content)
+        await anext(stream)
+        await sync_to_async(self.move)(self.tasks[6], 'DONE')
+        with self.assertRaises(asyncio.TimeoutError):
+            # wait_for cancel การรอเอง = client หลุดไปแล้ว
+            await asyncio.wait_for(anext(stream), 0.2)
+
+
+class BrokerTests(TestCase):
+    async def test_slow_subscriber_keeps_newest_events(self):
+        broker = InProcessBroker()
+        subscription = await broker.subscribe('team:1')
+        for seq in range(1, 151):
+            broker.publish('team:1', {'id': seq, 'event': 'task-updated', 'data': {}})
+        await asyncio.sleep(0)
+        self.assertEqual(subscription.queue.qsize(), subscription.queue.maxsize)
+        self.assertEqual((await subscription.get(1))['id'], 51)
+
+        await broker.unsubscribe(subscription)
+        self.assertEqual(broker.subscriber_count(), 0)
+
+    async def test_get_times_out(self):
+        subscription = Subscription('team:1', asyncio.get_running_loop())
+        self.assertIsNone(await subscription.get(0.01))
+
+    def test_nothing_published_on_rollback(self):
+        # publish รอ on_commit: transaction ที่ rollback ไม่มี event หลุดออกไป
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(RuntimeError):
+                with transaction.atomic():
+                    publish('team:1', 1, 'task-updated', {})
+                    raise RuntimeError
+        self.assertEqual(callbacks, [])
@@ -0,0 +1,145 @@
+import json
+import random
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from tasks.models import Sprint, Task
+from tasks.ranks import MAX_RANK_LENGTH, rank_between, ranks_after, spread
+from tasks.views import MAX_BATCH_MOVES
+
+from .test_permissions import LOCMEM, BoardFixture
+
+
+class RankTests(SimpleTestCase):
+    def assertValidRank(self, rank):
+        self.assertRegex(rank, r'^[0-9a-z]*[1-9a-z]$')
+
+    def test_between_neighbours(self):
+        self.assertEqual(rank_between(None, None), 'i')
+        for before, after in [(None, 'i'), ('i', None), ('a', 'b'), ('a', 'a1'), ('az', 'b'), ('0001', '0002')]:
+            rank = rank_between(before, after)
+            self.assertValidRank(rank)
+            self.assertLess(before or '', rank)
+            self.assertLess(rank, after or '~')
+
+    def test_random_inserts_keep_order(self):
+        ranks = []
+        generator = random.Random(7)
+        for _ in range(500):
+            position = generator.randint(0, len(ranks))
+            before = ranks[position - 1] if position else None
+            after = ranks[position] if position < len(ranks) else None
+            ranks.insert(position, rank_between(before, after))
+        self.assertEqual(ranks, sorted(set(ranks)))
+
+    def test_out_of_order_neighbours(self):
+        # client ถือข้อมูลเก่า: เพื่อนบ้านสลับกัน -> วางต่อจาก before
+        self.assertGreater(rank_between('m', 'c'), 'm')
+
+    def test_spread_and_ranks_after(self):
+        for count in (1, 35, 36, 1000):
+            ranks = spread(count)
+            self.assertEqual(ranks, sorted(set(ranks)))
+            for rank in ranks:
+                self.assertValidRank(rank)
+        ranks = [rank for rank, _ in zip(ranks_after('z'), range(100))]
+        self.assertEqual(ranks, sorted(ranks))
+        self.assertEqual({len(rank) for rank in ranks}, {7})
+
+
+@override_settings(CACHES=LOCMEM)
+class MoveTasksApiTests(BoardFixture, TestCase):
+    def setUp(self):
+        self.client.force_login(self.member)
+
+    def post(self, moves, team_id=None):
+        return self.client.post(
+            reverse('tasks:move_tasks_api'),
+            json.dumps({'team_id': team_id or self.team.id, 'moves': moves}),
+            content_type='application/json',
+        )
+
+    def column(self, status):
+        return list(
+            Task.objects.filter(sprint=self.next_sprint, status=status).order_by('rank').values_list('id', flat=True)
+        )
+
+    def test_batch_moves_in_order(self):
+        a, b, c = self.tasks[:3]
+        moves = [
+            {'task_id': a.id, 'status': 'IN_PROGRESS', 'sprint_id': self.next_sprint.id},
+            # ใบถัดไปอ้างอิงตำแหน่งใหม่ของใบก่อนหน้าใน batch เดียวกัน
+            {'task_id': b.id, 'status': 'IN_PROGRESS', 'sprint_id': self.next_sprint.id, 'after_id': a.id},
+            {'task_id': c.id, 'status': 'IN_PROGRESS', 'sprint_id': self.next_sprint.id, 'before_id': a.id},
+        ]
+        response = self.post(moves)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([task['id'] for task in response.json()['tasks']], [a.id, b.id, c.id])
+        self.assertEqual(self.column('IN_PROGRESS'), [c.id, a.id, b.id])
+
+        # เรียงใหม่ในคอลัมน์เดิม: เขียนแค่การ์ดที่ย้าย
+        self.post([{
+            'task_id': c.id, 'status': 'IN_PROGRESS', 'sprint_id': self.next_sprint.id, 'after_id': b.id,
+        }])
+        self.assertEqual(self.column('IN_PROGRESS'), [a.id, b.id, c.id])
+
+    def test_query_count_does_not_grow_with_batch(self):
+        def moves(tasks):
+            return [{'task_id': task.id, 'status': 'DONE', 'sprint_id': self.sprint.id} for task in tasks]
+
+        # request แรกสร้างแถว BoardSequence ของช่อง + snapshot ของวัน (ครั้งเดียว)
+        self.post(moves(self.tasks[:1]))
+        with CaptureQueriesContext(connection) as few:
+            self.post(moves(self.tasks[1:3]))
+        with CaptureQueriesContext(connection) as many:
+            self.post(moves(self.tasks[3:]))
+        self.assertEqual(len(few.captured_queries), len(many.captured_queries))
+
+    def test_invalid_requests(self):
+        task = self.tasks[0]
+        other_sprint = Sprint.objects.create(
+            name='Elsewhere', created_by=self.member, start_date='2026-10-01', end_date='2026-10-14',
+        )
+        personal = Task.objects.create(title='Mine', created_by=self.member)
+        cases = [
+            [{'task_id': task.id, 'status': 'ARCHIVED'}],
+            [{'task_id': task.id, 'status': 'DONE', 'sprint_id': other_sprint.id}],
+            [{'task_id': personal.id, 'status': 'DONE'}],
+            [{'task_id': 'x', 'status': 'DONE'}],
+            [{'status': 'DONE'}],
+            [{'task_id': task.id, 'status': 'DONE'}] * (MAX_BATCH_MOVES + 1),
+            {'task_id': task.id},
+        ]
+        for moves in cases:
+            with self.subTest(moves=str(moves)[:60]):
+                self.assertEqual(self.post(moves).status_code, 400)
+        task.refresh_from_db()
+        self.assertEqual(task.status, 'TODO')
+
+    def test_method_and_membership(self):
+        self.assertEqual(self.client.get(reverse('tasks:move_tasks_api')).status_code, 405)
+        self.client.force_login(User.objects.create_user('outsider'))
+        self.assertEqual(self.post([{'task_id': self.tasks[0].id, 'status': 'DONE'}]).status_code, 404)
+
+
+class RebalanceTests(BoardFixture, TestCase):
+    def test_long_ranks_are_rebalanced(self):
+        column = self.tasks[:5]
+        rank = ''
+        for task in column:
+            rank = rank_between(rank, None) + 'z' * MAX_RANK_LENGTH
+            task.rank = rank
+        Task.objects.bulk_update(column, ['rank'])
+        out = StringIO()
+        call_command('rebalance_task_ranks', once=True, stdout=out)
+        self.assertIn('rebalanced 1 column(s)', out.getvalue())
+
+        ranks = list(Task.objects.filter(sprint=self.sprint, status='TODO').order_by('rank').values_list('id', 'rank'))
+        self.assertEqual([pk for pk, _ in ranks][-5:], [task.id for task in column])
+        self.assertTrue(all(len(rank) <= MAX_RANK_LENGTH for _, rank in ranks))
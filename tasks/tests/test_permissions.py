@@ -0,0 +1,171 @@
+import json
+import shutil
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from tasks.models import Sprint, Task, Team, TeamMember
+from tasks.permissions import _cache_key
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def membership_loads(queries):
+    """query ที่ TeamPermissions ใช้โหลด membership ทั้งหมดของผู้ใช้ (TeamMember join Team)"""
+    return [
+        query for query in queries.captured_queries
+        if 'FROM "tasks_teammember" INNER JOIN "tasks_team"' in query['sql']
+    ]
+
+
+class BoardFixture:
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner')
+        cls.member = User.objects.create_user('member')
+        cls.team = Team.objects.create(name='Dev')
+        TeamMember.objects.create(user=cls.owner, team=cls.team, role='OWNER')
+        TeamMember.objects.create(user=cls.member, team=cls.team, role='MEMBER')
+        cls.sprint = Sprint.objects.create(
+            name='Sprint 1', team=cls.team, created_by=cls.owner,
+            start_date='2026-10-01', end_date='2026-10-14', is_active=True,
+        )
+        cls.next_sprint = Sprint.objects.create(
+            name='Sprint 2', team=cls.team, created_by=cls.owner, start_date='2026-10-15', end_date='2026-10-28',
+        )
+        cls.tasks = [
+            Task.objects.create(title=f'Task {i}', team=cls.team, created_by=cls.owner, sprint=cls.sprint, rank=f'{i:03d}i')
+            for i in range(20)
+        ]
+
+
+@override_settings(CACHES=LOCMEM)
+class PermissionQueryTests(BoardFixture, TestCase):
+    """view ที่เคย query TeamMember เองทีละจุด: โหลด membership ครั้งเดียวต่อ request และจำนวน query คงที่"""
+
+    def setUp(self):
+        self.client.force_login(self.owner)
+
+    def cases(self):
+        team, sprint, next_sprint, tasks = self.team, self.sprint, self.next_sprint, self.tasks
+        move = json.dumps({'task_id': tasks[2].id, 'status': 'DONE', 'sprint_id': sprint.id})
+        # (ชื่อ, จำนวน query ทั้งหมด, ยิง request)
+        return [
+            ('board', 7, lambda: self.client.get(reverse('tasks:board'), {'team_id': team.id})),
+            ('add_sprint', 4, lambda: self.client.get(reverse('tasks:add_sprint'), {'team_id': team.id})),
+            ('add_task', 5, lambda: self.client.get(reverse('tasks:add_task'), {'team_id': team.id})),
+            ('edit_task', 6, lambda: self.client.get(reverse('tasks:edit_task', args=[tasks[3].id]))),
+            ('update_status', 23, lambda: self.client.get(reverse('tasks:update_status', args=[tasks[1].id, 'DONE']))),
+            ('move_task_api', 12, lambda: self.client.post(
+                reverse('tasks:move_task_api'), move, content_type='application/json')),
+            ('manage_team', 4, lambda: self.client.get(reverse('tasks:manage_team', args=[team.id]))),
+            ('edit_sprint', 5, lambda: self.client.get(reverse('tasks:edit_sprint', args=[sprint.id]))),
+            ('start_sprint', 5, lambda: self.client.post(reverse('tasks:start_sprint', args=[next_sprint.id]))),
+            ('complete_sprint', 19, lambda: self.client.post(reverse('tasks:complete_sprint', args=[next_sprint.id]))),
+            ('delete_sprint', 14, lambda: self.client.post(reverse('tasks:delete_sprint', args=[next_sprint.id]))),
+            ('delete_task', 11, lambda: self.client.post(reverse('tasks:delete_task', args=[tasks[0].id]))),
+            ('remove_team_member', 6, lambda: self.client.post(
+                reverse('tasks:remove_team_member', args=[team.id, self.member.id]))),
+        ]
+
+    def test_views(self):
+        for name, budget, request in self.cases():
+            with self.subTest(view=name):
+                with CaptureQueriesContext(connection) as queries:
+                    response = request()
+                self.assertLess(response.status_code, 400)
+                self.assertEqual(len(membership_loads(queries)), 1)
+                self.assertEqual(len(queries.captured_queries), budget)
+
+
+class RevocationTests(BoardFixture, TestCase):
+    """ถูกเอาออกจากทีม / ลด role -> request ถัดไปต้องเห็นทันที"""
+
+    def board(self):
+        return self.client.get(reverse('tasks:board'), {'team_id': self.team.id})
+
+    @override_settings(CACHES=LOCMEM)
+    def test_process_local_cache_is_not_trusted(self):
+        self.client.force_login(self.member)
+        self.assertEqual(self.board().status_code, 200)
+        # worker อื่นลบสมาชิกไปแล้ว แต่ LocMem ของ process นี้ยังมีสิทธิ์เดิมค้างอยู่
+        cache.set(_cache_key(self.member.pk), {self.team.id: ('Dev', 'MEMBER')})
+        TeamMember.objects.filter(user=self.member).update(team=Team.objects.create(name='Other'))
+        self.assertEqual(self.board().status_code, 404)
+
+    def test_removed_member_with_shared_cache(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+        shared = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': cache_dir}}
+        with override_settings(CACHES=shared):
+            self.client.force_login(self.member)
+            self.assertEqual(self.board().status_code, 200)
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.board().status_code, 200)
+            self.assertEqual(membership_loads(queries), [])
+
+            owner = self.client_class()
+            owner.force_login(self.owner)
+            owner.post(reverse('tasks:remove_team_member', args=[self.team.id, self.member.id]))
+            self.assertEqual(self.board().status_code, 404)
+
+    @override_settings(CACHES=LOCMEM)
+    def test_demoted_admin_loses_admin_views(self):
+        TeamMember.objects.filter(user=self.member).update(role='ADMIN')
+        self.client.force_login(self.member)
+        url = reverse('tasks:manage_team', args=[self.team.id])
+        self.assertEqual(self.client.get(url).status_code, 200)
+        TeamMember.objects.filter(user=self.member).update(role='MEMBER')
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+
+@override_settings(CACHES=LOCMEM)
+class MoveTaskApiTests(BoardFixture, TestCase):
+    def move(self, **data):
+        return self.client.post(reverse('tasks:move_task_api'), json.dumps(data), content_type='application/json')
+
+    def test_moves_task(self):
+        self.client.force_login(self.member)
+        task = self.tasks[0]
+        response = self.move(task_id=task.id, status='IN_PROGRESS', sprint_id=self.next_sprint.id)
+        self.assertEqual(response.status_code, 200)
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.sprint_id), ('IN_PROGRESS', self.next_sprint.id))
+
+    def test_other_users_personal_task_is_404(self):
+        personal = Task.objects.create(title='Mine', created_by=self.owner)
+        self.client.force_login(self.member)
+        self.assertEqual(self.move(task_id=personal.id, status='DONE').status_code, 404)
+        personal.refresh_from_db()
+        self.assertEqual(personal.status, 'TODO')
+
+    def test_non_member_is_404(self):
+        self.client.force_login(User.objects.create_user('outsider'))
+        self.assertEqual(self.move(task_id=self.tasks[0].id, status='DONE').status_code, 404)
+
+    def test_rejects_sprint_from_another_board(self):
+        other = Sprint.objects.create(
+            name='Elsewhere', created_by=self.member, start_date='2026-10-01', end_date='2026-10-14',
+        )
+        self.client.force_login(self.member)
+        self.assertEqual(self.move(task_id=self.tasks[0].id, status='DONE', sprint_id=other.id).status_code, 400)
+        self.assertEqual(self.move(task_id=self.tasks[0].id, status='DONE', sprint_id='x').status_code, 400)
+
+    def test_rejects_unknown_status(self):
+        self.client.force_login(self.member)
+        self.assertEqual(self.move(task_id=self.tasks[0].id, status='ARCHIVED').status_code, 400)
+        self.assertEqual(self.move(task_id=self.tasks[0].id).status_code, 400)
+
+    def test_requires_csrf_token(self):
+        client = self.client_class(enforce_csrf_checks=True)
+        client.force_login(self.member)
+        response = client.post(
+            reverse('tasks:move_task_api'), json.dumps({'task_id': self.tasks[0].id, 'status': 'DONE'}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,204 @@
+import json
+import shutil
+import tempfile
+from datetime import date
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from tasks.models import Sprint, SprintSnapshot, Task
+from tasks.stats import (
+    _cache_key, apply_task_changes, burndown_series, compute_sprint_stats, get_sprint_stats, refresh_sprint_stats,
+    task_state, velocity_series,
+)
+
+from .test_permissions import LOCMEM, BoardFixture
+
+COUNTERS = ('total_tasks', 'done_tasks', 'total_points', 'done_points')
+
+
+@override_settings(CACHES=LOCMEM)
+class SnapshotCounterTests(BoardFixture, TestCase):
+    """ตัวนับใน snapshot วันนี้ถูกบวก/ลบตามงานที่เปลี่ยน ต้องตรงกับการนับใหม่ทั้ง Sprint เสมอ"""
+
+    def setUp(self):
+        self.client.force_login(self.owner)
+        refresh_sprint_stats(self.sprint.id, self.next_sprint.id)
+
+    def assertCountersMatch(self, *sprints):
+        for sprint in sprints:
+            snapshot = SprintSnapshot.objects.get(sprint=sprint, date=timezone.localdate())
+            stats = compute_sprint_stats(sprint.id)
+            self.assertEqual(
+                {field: getattr(snapshot, field) for field in COUNTERS}, {field: stats[field] for field in COUNTERS},
+            )
+
+    def move(self, task, status, sprint):
+        return self.client.post(
+            reverse('tasks:move_task_api'),
+            json.dumps({'task_id': task.id, 'status': status, 'sprint_id': sprint.id if sprint else None}),
+            content_type='application/json',
+        )
+
+    def test_move_between_sprints(self):
+        task = self.tasks[0]
+        Task.objects.filter(pk=task.pk).update(story_points=5)
+        refresh_sprint_stats(self.sprint.id)
+        with CaptureQueriesContext(connection) as queries:
+            self.move(task, 'DONE', self.next_sprint)
+        # บวก/ลบด้วย UPDATE ... SET x = x + n ไม่ aggregate งานทั้ง Sprint ใหม่
+        self.assertFalse([query for query in queries.captured_queries if 'COUNT(' in query['sql']])
+        self.assertCountersMatch(self.sprint, self.next_sprint)
+        snapshot = SprintSnapshot.objects.get(sprint=self.next_sprint, date=timezone.localdate())
+        self.assertEqual((snapshot.total_tasks, snapshot.done_points), (1, 5))
+
+        self.move(task, 'TODO', None)
+        self.assertCountersMatch(self.sprint, self.next_sprint)
+
+    def test_views_keep_counters_in_sync(self):
+        self.client.get(reverse('tasks:update_status', args=[self.tasks[1].id, 'DONE']))
+        self.client.post(reverse('tasks:edit_task', args=[self.tasks[1].id]), {
+            'title': 'Bigger', 'status': 'DONE', 'priority': 'M', 'story_points': 8,
+        })
+        self.client.post(reverse('tasks:delete_task', args=[self.tasks[2].id]))
+        self.client.post(reverse('tasks:move_tasks_api'), json.dumps({'team_id': self.team.id, 'moves': [
+            {'task_id': self.tasks[3].id, 'status': 'DONE', 'sprint_id': self.next_sprint.id},
+            # ย้ายใบเดิมซ้ำใน batch เดียว: นับจากสถานะก่อน batch ครั้งเดียว
+            {'task_id': self.tasks[3].id, 'status': 'IN_PROGRESS', 'sprint_id': self.next_sprint.id},
+        ]}), content_type='application/json')
+        self.assertEqual(Task.objects.get(pk=self.tasks[1].pk).story_points, 8)
+        self.assertCountersMatch(self.sprint, self.next_sprint)
+
+    def test_reorder_writes_no_snapshot(self):
+        state = task_state(self.tasks[0])
+        with CaptureQueriesContext(connection) as queries:
+            apply_task_changes([(state, state)])
+        self.assertEqual(queries.captured_queries, [])
+
+    def test_first_change_of_the_day_creates_snapshot(self):
+        SprintSnapshot.objects.all().delete()
+        task = self.tasks[0]
+        old_state = task_state(task)
+        task.status = 'DONE'
+        task.save()
+        apply_task_changes([(old_state, task_state(task))])
+        self.assertCountersMatch(self.sprint)
+        self.assertFalse(SprintSnapshot.objects.filter(sprint=self.next_sprint).exists())
+
+
+class StatsCacheTests(BoardFixture, TestCase):
+    @override_settings(CACHES=LOCMEM)
+    def test_process_local_cache_not_used(self):
+        get_sprint_stats(self.sprint)
+        self.assertIsNone(cache.get(_cache_key(self.sprint.id)))
+
+    def test_shared_cache_invalidated_on_change(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+        shared = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': cache_dir}}
+        with override_settings(CACHES=shared):
+            self.assertEqual(get_sprint_stats(self.sprint)['progress_tasks'], 0)
+            with CaptureQueriesContext(connection) as queries:
+                get_sprint_stats(self.sprint)
+            self.assertEqual(queries.captured_queries, [])
+
+            task = self.tasks[0]
+            old_state = task_state(task)
+            task.status = 'IN_PROGRESS'
+            task.save()
+            apply_task_changes([(old_state, task_state(task))])
+            self.assertEqual(get_sprint_stats(self.sprint)['progress_tasks'], 1)
+
+
+def on_day(day):
+    """ให้ "วันนี้" ของ snapshot / กราฟเป็นวันที่กำหนด"""
+    return mock.patch('django.utils.timezone.localdate', return_value=day)
+
+
+class SeriesTests(BoardFixture, TestCase):
+    """กราฟอ่านจาก snapshot รายวันที่เขียนตอนงานเปลี่ยนสถานะ"""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.short = Sprint.objects.create(
+            name='Short', team=cls.team, created_by=cls.owner, start_date=date(2026, 11, 2), end_date=date(2026, 11, 6),
+        )
+        cls.cards = [
+            Task.objects.create(title=f'Card {i}', team=cls.team, created_by=cls.owner, sprint=cls.short, story_points=2)
+            for i in range(4)
+        ]
+
+    def change(self, task, **fields):
+        old_state = task_state(task)
+        for field, value in fields.items():
+            setattr(task, field, value)
+        task.save()
+        apply_task_changes([(old_state, task_state(task))])
+
+    def play_sprint(self):
+        a, b, c, _ = self.cards
+        # วางแผนก่อนเริ่ม Sprint: เป็นจุดตั้งต้นของวันแรก
+        with on_day(date(2026, 10, 30)):
+            refresh_sprint_stats(self.short.id)
+        with on_day(date(2026, 11, 3)):
+            self.change(a, status='DONE')
+        with on_day(date(2026, 11, 4)):
+            extra = Task.objects.create(title='Scope creep', team=self.team, created_by=self.owner, story_points=4)
+            self.change(extra, sprint=self.short)
+        with on_day(date(2026, 11, 5)):
+            self.change(extra, sprint=None)
+            self.change(b, status='DONE')
+            self.change(c, status='IN_PROGRESS')
+            self.change(c, status='DONE')
+
+    def test_burndown(self):
+        self.play_sprint()
+        with on_day(date(2026, 11, 20)):
+            series = burndown_series(self.short)
+        self.assertEqual([point['date'] for point in series], [f'2026-11-0{day}' for day in range(2, 7)])
+        self.assertEqual([point['remaining_points'] for point in series], [8, 6, 10, 2, 2])
+        self.assertEqual([point['remaining_tasks'] for point in series], [4, 3, 4, 1, 1])
+        self.assertEqual([point['total_points'] for point in series], [8, 8, 12, 8, 8])
+
+    def test_burndown_stops_today(self):
+        self.play_sprint()
+        with on_day(date(2026, 11, 3)):
+            series = burndown_series(self.short)
+        self.assertEqual([(point['date'], point['remaining_points']) for point in series], [
+            ('2026-11-02', 8), ('2026-11-03', 6),
+        ])
+
+    def test_velocity(self):
+        self.play_sprint()
+        # Sprint ที่ไม่มี snapshot เลยได้ 0 / เรียงจาก Sprint เก่าไปใหม่
+        self.assertEqual(velocity_series(Sprint.objects.filter(team=self.team)), [
+            {'sprint_id': self.sprint.id, 'sprint': 'Sprint 1', 'committed': 0, 'completed': 0},
+            {'sprint_id': self.next_sprint.id, 'sprint': 'Sprint 2', 'committed': 0, 'completed': 0},
+            # committed = แต้มสูงสุดที่เคยมี (รวมงานที่ถูกเพิ่มกลางทาง), completed = done ของวันสุดท้าย
+            {'sprint_id': self.short.id, 'sprint': 'Short', 'committed': 12, 'completed': 6},
+        ])
+        self.assertEqual(len(velocity_series(Sprint.objects.filter(team=self.team), limit=2)), 2)
+
+    def test_backfill_is_idempotent(self):
+        out = StringIO()
+        with on_day(date(2026, 10, 20)):
+            call_command('backfill_sprint_snapshots', stdout=out)
+            call_command('backfill_sprint_snapshots', stdout=out)
+        self.assertIn('Done. 3 snapshot(s) created.', out.getvalue())
+        self.assertIn('Done. 0 snapshot(s) created.', out.getvalue())
+
+        # Sprint ที่จบแล้วบันทึกที่วันสุดท้าย, Sprint ที่ยังไม่ถึงบันทึกที่วันนี้
+        snapshots = {
+            snapshot.sprint_id: snapshot for snapshot in SprintSnapshot.objects.all()
+        }
+        self.assertEqual(len(snapshots), 3)
+        self.assertEqual((snapshots[self.sprint.id].date, snapshots[self.sprint.id].total_tasks), (date(2026, 10, 14), 20))
+        self.assertEqual((snapshots[self.short.id].date, snapshots[self.short.id].total_points), (date(2026, 10, 20), 8))
@@ -0,0 +1,161 @@
+import csv
+import io
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from tasks import changes
+from tasks.events import channel_for
+from tasks.models import Sprint, Task
+from tasks.transfer import TaskImporter, read_rows
+
+from .test_permissions import LOCMEM, BoardFixture
+
+
+@override_settings(CACHES=LOCMEM)
+class TransferTests(BoardFixture, TestCase):
+    def setUp(self):
+        self.client.force_login(self.owner)
+
+    def export(self, kind='tasks', fmt='csv'):
+        response = self.client.get(reverse('tasks:export_tasks'), {'team_id': self.team.id, 'kind': kind, 'format': fmt})
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def upload(self, content, name='tasks.csv', kind='tasks', client=None):
+        client = client or self.client
+        response = client.post(reverse('tasks:import_tasks'), {
+            'team_id': self.team.id, 'kind': kind,
+            'file': SimpleUploadedFile(name, content.encode('utf-8')),
+        })
+        self.assertEqual(response.status_code, 200)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        return [json.loads(line) for line in lines]
+
+    def test_export_csv(self):
+        Task.objects.filter(pk=self.tasks[0].pk).update(assignee=self.member, title='ทดสอบ, "quoted"')
+        content = self.export()
+        self.assertTrue(content.startswith('﻿id,title,'))
+        rows = list(csv.DictReader(io.StringIO(content.lstrip('﻿'))))
+        self.assertEqual(len(rows), len(self.tasks))
+        self.assertEqual(
+            (rows[0]['title'], rows[0]['assignee'], rows[0]['sprint']), ('ทดสอบ, "quoted"', 'member', 'Sprint 1'),
+        )
+
+    def test_export_jsonl_sprints(self):
+        rows = [json.loads(line) for line in self.export('sprints', 'jsonl').splitlines()]
+        self.assertEqual([row['name'] for row in rows], ['Sprint 1', 'Sprint 2'])
+        self.assertEqual(rows[0]['start_date'], '2026-10-01')
+
+    def test_export_rejects_unknown_kind(self):
+        response = self.client.get(reverse('tasks:export_tasks'), {'team_id': self.team.id, 'kind': 'users'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_csv_round_trip(self):
+        content = self.export().replace('Task 3', 'Task 3 (renamed)')
+        # แถวใหม่ไม่มี id -> สร้างงานใหม่ต่อท้าย Backlog
+        content += ',Imported,,In Progress,high,3,,member,,jira,\r\n'
+        result = self.upload(content)[-1]
+        self.assertEqual((result['created'], result['updated'], result['error_count']), (1, len(self.tasks), 0))
+
+        self.assertEqual(Task.objects.get(pk=self.tasks[3].pk).title, 'Task 3 (renamed)')
+        imported = Task.objects.get(title='Imported')
+        self.assertEqual(
+            (imported.status, imported.priority, imported.assignee, imported.sprint, imported.team),
+            ('IN_PROGRESS', 'H', self.member, None, self.team),
+        )
+        self.assertTrue(imported.rank)
+
+    def test_jsonl_round_trip(self):
+        new = {'name': 'Sprint 3', 'start_date': '2026-11-01', 'end_date': '2026-11-14'}
+        content = self.export('sprints', 'jsonl') + json.dumps(new)
+        result = self.upload(content, name='sprints.jsonl', kind='sprints')[-1]
+        self.assertEqual((result['created'], result['updated'], result['error_count']), (1, 2, 0))
+        self.assertFalse(Sprint.objects.get(name='Sprint 3').is_active)
+
+    def test_row_errors_do_not_stop_import(self):
+        other = Task.objects.create(title='Elsewhere', created_by=self.member)
+        content = '\n'.join([
+            json.dumps({'title': 'ok'}),
+            json.dumps({'id': other.id, 'title': 'not on this board'}),
+            json.dumps({'title': 'bad status', 'status': 'ARCHIVED'}),
+            json.dumps({'title': 'bad assignee', 'assignee': 'nobody'}),
+            json.dumps({'title': 'bad sprint', 'sprint': 'Sprint 99'}),
+            json.dumps({'title': 'bad rank', 'rank': 'A0'}),
+            '[1, 2]',
+            json.dumps({'title': 'ok too'}),
+        ])
+        result = self.upload(content, name='tasks.jsonl')[-1]
+        self.assertEqual((result['processed'], result['created'], result['error_count']), (8, 2, 6))
+        self.assertEqual(sorted(error['line'] for error in result['errors']), [2, 3, 4, 5, 6, 7])
+        self.assertEqual(Task.objects.get(pk=other.pk).title, 'Elsewhere')
+
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=0, FILE_UPLOAD_TEMP_DIR=tempfile.gettempdir())
+    def test_large_upload_read_from_temp_file(self):
+        content = 'title,status\r\n' + ''.join(f'Bulk {i},Done\r\n' for i in range(50))
+        result = self.upload(content)[-1]
+        self.assertEqual(result['created'], 50)
+        self.assertEqual(Task.objects.filter(title__startswith='Bulk ', status='DONE').count(), 50)
+
+    def test_import_requires_admin(self):
+        member = self.client_class()
+        member.force_login(self.member)
+        url = reverse('tasks:import_tasks')
+        upload = SimpleUploadedFile('tasks.csv', b'title\r\nSneaky\r\n')
+        response = member.post(url, {'team_id': self.team.id, 'file': upload})
+        self.assertEqual(response.status_code, 302)
+        response = member.post(url, {'team_id': self.team.id}, headers={'Accept': 'application/json'})
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Task.objects.filter(title='Sneaky').exists())
+
+    def test_import_resets_delta_sync(self):
+        channel = channel_for(self.team.id)
+        changes.record(channel, [('task', self.tasks[0].id, {'id': self.tasks[0].id})])
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.upload('title\r\nNew\r\n')
+        self.assertEqual(len(callbacks), 1)
+        # client ที่ตามอยู่ต้องโหลดกระดานใหม่ทั้งหมด ไม่ใช่รับ log ทีละแถว
+        self.assertTrue(changes.changes_since(channel, 1)['reset'])
+        self.assertFalse(changes.changes_since(channel, changes.current_seq(channel))['reset'])
+
+
+class ImporterTests(BoardFixture, TestCase):
+    def rows(self, count):
+        return read_rows(io.StringIO('title,assignee,sprint\r\n' + 'x,member,Sprint 1\r\n' * count), 'csv')
+
+    def test_progress_per_batch(self):
+        importer = TaskImporter(self.owner, self.team.id)
+        processed = [result.processed for result in importer.run(self.rows(25), batch_size=10)]
+        self.assertEqual(processed, [10, 20, 25])
+
+    def test_lookups_once_per_batch(self):
+        def queries(count):
+            importer = TaskImporter(self.owner, self.team.id)
+            batch = list(self.rows(count))
+            with CaptureQueriesContext(connection) as context:
+                importer._flush(batch)
+            return len(context.captured_queries)
+
+        # 50 แถวยังอยู่ใน INSERT เดียวบน SQLite (จำกัดจำนวน parameter ต่อ query)
+        self.assertEqual(queries(5), queries(50))
+
+    def test_command_checks_role(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'tasks.csv')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('title\nFrom cron\n')
+        with self.assertRaisesMessage(CommandError, 'must be an Admin/Owner'):
+            call_command('import_tasks', path, user='member', team=self.team.id)
+
+        out = StringIO()
+        call_command('import_tasks', path, user='owner', team=self.team.id, stdout=out)
+        self.assertIn('1 created', out.getvalue())
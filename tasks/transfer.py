@@ -0,0 +1,366 @@
+"""
+Export / Import งานและ Sprint ของกระดานทีละมากๆ (ย้ายมาจาก tracker อื่น)
+
+- export_rows(): อ่านจาก database ทีละ chunk (iterator) แล้ว encode() เป็น CSV / JSON lines
+  ส่งออกผ่าน StreamingHttpResponse ทีละก้อน หน่วยความจำคงที่ไม่ว่าจะกี่แถว
+- read_rows(): อ่านไฟล์ทีละบรรทัด / TaskImporter, SprintImporter ตรวจและเขียนทีละ batch
+  (1 transaction ต่อ batch, bulk_create / bulk_update) แล้ว yield ผลสะสมออกมาให้รายงานความคืบหน้า
+- แถวที่มี id ของกระดานนี้ = แก้ไข / ไม่มี id = สร้างใหม่ / แถวที่ผิดถูกข้ามพร้อมเลขบรรทัด
+- assignee (username) และ sprint (ชื่อ) ค้นครั้งเดียวต่อ batch ไม่ query ทีละแถว
+- ไม่ลง change log ทีละแถว จบแล้วส่ง board-reset ครั้งเดียว (client ที่เปิดกระดานอยู่โหลดใหม่ทั้งหมด)
+- created_at / is_active ส่งออกอย่างเดียว ตอนนำเข้าไม่ใช้ (Sprint ใหม่ยังไม่ active ต้องกด Start เอง)
+"""
+import csv
+import json
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from .events import publish_board_reset
+from .models import Sprint, Task
+from .ranks import DIGITS, bottom_rank, column_key, ranks_after
+from .stats import refresh_sprint_stats
+
+TASK_FIELDS = [
+    'id', 'title', 'description', 'status', 'priority', 'story_points',
+    'rank', 'assignee', 'sprint', 'source', 'created_at',
+]
+SPRINT_FIELDS = ['id', 'name', 'goal', 'start_date', 'end_date', 'is_active']
+FORMATS = {'csv': 'text/csv', 'jsonl': 'application/x-ndjson'}
+
+EXPORT_CHUNK_SIZE = 2000
+# รวมหลายแถวเป็นก้อนละประมาณนี้ก่อนส่ง (ไม่ส่งทีละบรรทัด)
+EXPORT_BUFFER_SIZE = 64 * 1024
+IMPORT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+
+
+def board_tasks(user, team_id=None):
+    if team_id:
+        return Task.objects.filter(team_id=team_id)
+    return Task.objects.filter(created_by=user, team__isnull=True)
+
+
+def board_sprints(user, team_id=None):
+    if team_id:
+        return Sprint.objects.filter(team_id=team_id)
+    return Sprint.objects.filter(created_by=user, team__isnull=True)
+
+
+# ==========================================
+# 1. Export
+# ==========================================
+def export_rows(kind, user, team_id=None):
+    """แถว (dict) ของงาน / Sprint ทั้งกระดาน เรียงตาม id อ่านทีละ EXPORT_CHUNK_SIZE"""
+    if kind == 'tasks':
+        fields = TASK_FIELDS
+        rows = board_tasks(user, team_id).values_list(
+            'id', 'title', 'description', 'status', 'priority', 'story_points',
+            'rank', 'assignee__username', 'sprint__name', 'source', 'created_at',
+        )
+    else:
+        fields = SPRINT_FIELDS
+        rows = board_sprints(user, team_id).values_list(*SPRINT_FIELDS)
+    for values in rows.order_by('id').iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield {
+            field: value.isoformat() if hasattr(value, 'isoformat') else value
+            for field, value in zip(fields, values)
+        }
+
+
+class _Echo:
+    """ไฟล์ปลอมให้ csv.writer เขียนใส่ แล้วคืนบรรทัดนั้นกลับมาตรงๆ"""
+
+    def write(self, value):
+        return value
+
+
+def encode(rows, fields, fmt):
+    """แปลงแถวเป็นข้อความ CSV / JSON lines ทีละก้อน (ใช้กับ StreamingHttpResponse)"""
+    if fmt == 'csv':
+        writer = csv.writer(_Echo())
+        # BOM ให้ Excel อ่านภาษาไทยถูก (read_rows อ่านด้วย utf-8-sig)
+        lines = ['\ufeff' + writer.writerow(fields)]
+        line = lambda row: writer.writerow([row[field] for field in fields])
+    else:
+        lines = []
+        line = lambda row: json.dumps(row, ensure_ascii=False) + '\n'
+
+    size = 0
+    for row in rows:
+        text = line(row)
+        lines.append(text)
+        size += len(text)
+        if size >= EXPORT_BUFFER_SIZE:
+            yield ''.join(lines)
+            lines, size = [], 0
+    yield ''.join(lines)
+
+
+# ==========================================
+# 2. Import
+# ==========================================
+def read_rows(stream, fmt):
+    """(เลขบรรทัด, dict) ทีละแถวจากไฟล์ text ที่เปิดไว้ บรรทัด JSON ที่อ่านไม่ได้ได้ None"""
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_no, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield line_no, row if isinstance(row, dict) else None
+
+
+def _text(value):
+    return str(value).strip() if value is not None else ''
+
+
+def _to_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _choice_lookup(choices):
+    """รับได้ทั้งรหัสและชื่อที่แสดง ไม่สนตัวพิมพ์ เช่น 'H' / 'high' / 'In Progress'"""
+    lookup = {}
+    for code, label in choices:
+        lookup[code.lower()] = code
+        lookup[label.lower()] = code
+    return lookup
+
+
+STATUS_LOOKUP = _choice_lookup(Task.STATUS_CHOICES)
+PRIORITY_LOOKUP = _choice_lookup(Task.PRIORITY_CHOICES)
+
+
+def _error_message(error):
+    if hasattr(error, 'message_dict'):
+        return '; '.join(f"{field}: {' '.join(messages)}" for field, messages in error.message_dict.items())
+    return ' '.join(error.messages)
+
+
+class ImportResult:
+    def __init__(self):
+        self.processed = 0
+        self.created = 0
+        self.updated = 0
+        self.error_count = 0
+        self.errors = []
+
+    def error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'error': message})
+
+    def as_dict(self):
+        return {
+            'processed': self.processed,
+            'created': self.created,
+            'updated': self.updated,
+            'error_count': self.error_count,
+            'errors': self.errors,
+        }
+
+
+class BaseImporter:
+    """นำเข้าแถวเข้ากระดานหนึ่ง (ทีม หรือกระดานส่วนตัวของ user) ทีละ batch"""
+
+    def __init__(self, user, team_id=None):
+        self.user = user
+        self.team_id = int(team_id) if team_id else None
+        self.result = ImportResult()
+
+    def run(self, rows, batch_size=IMPORT_BATCH_SIZE):
+        """yield ImportResult (ผลสะสม) หลังจบแต่ละ batch / อ่านไฟล์พังกลางทาง -> เก็บส่วนที่อ่านได้แล้วหยุด"""
+        batch = []
+        line = 0
+        try:
+            for line, row in rows:
+                batch.append((line, row))
+                if len(batch) >= batch_size:
+                    self._flush(batch)
+                    batch = []
+                    yield self.result
+        except (csv.Error, UnicodeDecodeError) as e:
+            self.result.error(line + 1, f'อ่านไฟล์ไม่ได้: {e}')
+        self._flush(batch)
+        self.finish()
+        if batch or not self.result.processed:
+            yield self.result
+
+    def _flush(self, batch):
+        if not batch:
+            return
+        self.result.processed += len(batch)
+        rows = []
+        for line, row in batch:
+            if row is None:
+                self.result.error(line, 'บรรทัดนี้ไม่ใช่ JSON object')
+            else:
+                rows.append((line, row))
+        with transaction.atomic():
+            self.import_batch(rows)
+
+    def clean(self, obj, line, exclude):
+        try:
+            obj.clean_fields(exclude=exclude)
+        except ValidationError as e:
+            self.result.error(line, _error_message(e))
+            return False
+        return True
+
+    def import_batch(self, rows):
+        raise NotImplementedError
+
+    def finish(self):
+        if self.result.created or self.result.updated:
+            publish_board_reset(self.team_id, self.user.pk)
+
+
+class TaskImporter(BaseImporter):
+    # ช่องว่าง = ใช้ค่าเดิม/ค่าเริ่มต้น ยกเว้น description, source ที่ช่องว่างแปลว่าล้างค่า
+    FIELDS = ['title', 'description', 'status', 'priority', 'story_points', 'source']
+    CLEARABLE = {'description', 'source'}
+    UPDATE_FIELDS = FIELDS + ['rank', 'assignee', 'sprint']
+
+    def __init__(self, user, team_id=None):
+        super().__init__(user, team_id)
+        self.columns = {}
+        self.sprint_ids = set()
+
+    def members(self, usernames):
+        """{username: user_id} ที่ assign ได้ (ทีม: สมาชิก / กระดานส่วนตัว: ตัวเอง)"""
+        users = User.objects.filter(username__in=usernames)
+        if self.team_id:
+            users = users.filter(team_memberships__team_id=self.team_id)
+        else:
+            users = users.filter(pk=self.user.pk)
+        return dict(users.values_list('username', 'id'))
+
+    def next_rank(self, task):
+        """ต่อท้ายคอลัมน์ตามลำดับในไฟล์ (อ่าน rank ล่างสุดครั้งเดียวต่อคอลัมน์ต่อการ import)"""
+        key = column_key(task)
+        if key not in self.columns:
+            self.columns[key] = ranks_after(bottom_rank(task))
+        return next(self.columns[key])
+
+    def import_batch(self, rows):
+        usernames = {_text(row.get('assignee')) for _, row in rows} - {''}
+        sprint_names = {_text(row.get('sprint')) for _, row in rows} - {''}
+        ids = {_to_id(row.get('id')) for _, row in rows} - {None}
+
+        # 3 query ต่อ batch ไม่ว่าจะกี่แถว
+        members = self.members(usernames) if usernames else {}
+        sprints = (
+            dict(board_sprints(self.user, self.team_id).filter(name__in=sprint_names).order_by('id').values_list('name', 'id'))
+            if sprint_names else {}
+        )
+        existing = board_tasks(self.user, self.team_id).in_bulk(ids) if ids else {}
+
+        created, updated = [], []
+        for line, row in rows:
+            row_id = _text(row.get('id'))
+            task = existing.get(_to_id(row_id)) if row_id else None
+            if row_id and task is None:
+                self.result.error(line, f'ไม่พบงาน id {row_id} ในกระดานนี้')
+                continue
+            if task is None:
+                task = Task(created_by=self.user, team_id=self.team_id)
+            old_column = column_key(task) if task.pk else None
+            old_sprint_id = task.sprint_id
+
+            for field in self.FIELDS:
+                if field not in row:
+                    continue
+                value = _text(row[field])
+                if not value and field not in self.CLEARABLE:
+                    continue
+                if field == 'status':
+                    value = STATUS_LOOKUP.get(value.lower(), value)
+                elif field == 'priority':
+                    value = PRIORITY_LOOKUP.get(value.lower(), value)
+                setattr(task, field, value)
+
+            if 'assignee' in row:
+                username = _text(row['assignee'])
+                if username and username not in members:
+                    self.result.error(line, f'assignee: ไม่พบผู้ใช้ {username} ในทีมนี้')
+                    continue
+                task.assignee_id = members.get(username)
+            if 'sprint' in row:
+                name = _text(row['sprint'])
+                if name and name not in sprints:
+                    self.result.error(line, f'sprint: ไม่พบ Sprint ชื่อ {name}')
+                    continue
+                task.sprint_id = sprints.get(name)
+
+            rank = _text(row.get('rank'))
+            if rank and (rank.endswith('0') or not set(rank) <= set(DIGITS)):
+                self.result.error(line, f'rank: ค่า {rank} ไม่ถูกต้อง (ใช้ได้แค่ 0-9a-z และไม่ลงท้ายด้วย 0)')
+                continue
+            if not self.clean(task, line, exclude=['created_by', 'team', 'sprint', 'assignee', 'rank']):
+                continue
+
+            if rank:
+                task.rank = rank
+            elif column_key(task) != old_column:
+                task.rank = self.next_rank(task)
+
+            self.sprint_ids.update({old_sprint_id, task.sprint_id})
+            (updated if task.pk else created).append(task)
+
+        Task.objects.bulk_create(created, batch_size=500)
+        Task.objects.bulk_update(updated, self.UPDATE_FIELDS, batch_size=500)
+        self.result.created += len(created)
+        self.result.updated += len(updated)
+
+    def finish(self):
+        refresh_sprint_stats(*self.sprint_ids)
+        super().finish()
+
+
+class SprintImporter(BaseImporter):
+    FIELDS = ['name', 'goal', 'start_date', 'end_date']
+    CLEARABLE = {'goal'}
+
+    def import_batch(self, rows):
+        ids = {_to_id(row.get('id')) for _, row in rows} - {None}
+        existing = board_sprints(self.user, self.team_id).in_bulk(ids) if ids else {}
+
+        created, updated = [], []
+        for line, row in rows:
+            row_id = _text(row.get('id'))
+            sprint = existing.get(_to_id(row_id)) if row_id else None
+            if row_id and sprint is None:
+                self.result.error(line, f'ไม่พบ Sprint id {row_id} ในกระดานนี้')
+                continue
+            if sprint is None:
+                sprint = Sprint(created_by=self.user, team_id=self.team_id)
+            for field in self.FIELDS:
+                value = _text(row.get(field))
+                if field in row and (value or field in self.CLEARABLE):
+                    setattr(sprint, field, value)
+            if not self.clean(sprint, line, exclude=['created_by', 'team']):
+                continue
+            if sprint.end_date < sprint.start_date:
+                self.result.error(line, 'end_date: ต้องไม่ก่อน start_date')
+                continue
+            (updated if sprint.pk else created).append(sprint)
+
+        Sprint.objects.bulk_create(created, batch_size=500)
+        Sprint.objects.bulk_update(updated, self.FIELDS, batch_size=500)
+        self.result.created += len(created)
+        self.result.updated += len(updated)
+
+
+IMPORTERS = {'tasks': TaskImporter, 'sprints': SprintImporter}
+EXPORT_FIELDS = {'tasks': TASK_FIELDS, 'sprints': SPRINT_FIELDS}
@@ -11,6 +11,8 @@ urlpatterns = [
     path('add-sprint/', views.add_sprint, name='add_sprint'),
     path('edit/<int:task_id>/', views.edit_task, name='edit_task'),
     path('api/move-task/', views.move_task_api, name='move_task_api'),
+    path('api/move-tasks/', views.move_tasks_api, name='move_tasks_api'),
+    path('api/tasks/<int:task_id>/', views.task_api, name='task_api'),
     path('delete/<int:task_id>/', views.delete_task, name='delete_task'),
     path('create-team/', views.create_team, name='create_team'),
     path('team/<int:team_id>/manage/', views.manage_team, name='manage_team'),
@@ -20,5 +22,10 @@ urlpatterns = [
     path('edit-sprint/<int:sprint_id>/', views.edit_sprint, name='edit_sprint'),
     path('delete-sprint/<int:sprint_id>/', views.delete_sprint, name='delete_sprint'),
     path('dashboard/', views.dashboard, name='dashboard'),
+    path('api/dashboard/', views.dashboard_data, name='dashboard_data'),
+    path('api/events/', views.task_events, name='task_events'),
+    path('api/changes/', views.task_changes, name='task_changes'),
+    path('export/', views.export_tasks, name='export_tasks'),
+    path('import/', views.import_tasks, name='import_tasks'),
 
 ]
\ No newline at end of file
@@ -1,93 +1,63 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.db.models import Q
-from django.http import JsonResponse, HttpResponseForbidden
-from django.views.decorators.csrf import csrf_exempt
+from django.http import (
+    Http404, JsonResponse, HttpResponse, HttpResponseForbidden, HttpResponseNotModified, StreamingHttpResponse,
+)
+from django.core.handlers.asgi import ASGIRequest
+from django.conf import settings
+from django.db import transaction
+from django.utils.http import content_disposition_header
+import hashlib
+import io
 import json
 from django.contrib import messages
 from django.contrib.auth.models import User
-from django.template.loader import render_to_string
-from django.db.models import Case, When, Value, IntegerField
 
-from .models import Task, Sprint, Team, TeamMember
+from .models import Task, Sprint, TeamMember
 from .forms import TaskForm, SprintForm, TeamForm
+from .board import load_board, apply_moves, board_sprints
+from .ranks import top_rank
+from .permissions import get_board_object_or_404, get_permissions, team_role_required
+from .events import (
+    channel_for, get_broker, format_sse,
+    task_payload, publish_task_event, publish_task_deleted, publish_sprint_changed,
+    publish_tasks_moved, record_tasks_changed,
+)
+from .changes import current_seq, changes_since
+from .transfer import EXPORT_FIELDS, FORMATS, IMPORTERS, encode, export_rows, read_rows
+from .stats import (
+    get_sprint_stats, invalidate_sprint_stats, refresh_sprint_stats, empty_stats,
+    task_state, apply_task_changes,
+    burndown_series, velocity_series,
+)
 
 # ==========================================
 # 1. Main Board (หน้ากระดานงาน)
 # ==========================================
 @login_required
 def task_board(request):
-    my_teams = getattr(request.user, 'teams', None)
-    if my_teams:
-        my_teams = my_teams.all()
-    else:
-        my_teams = []
+    # ทีมของผู้ใช้ + role มาจาก cache ของสิทธิ์ (ไม่ query TeamMember/Team ซ้ำ)
+    permissions = get_permissions(request)
+    my_teams = permissions.team_list()
 
-    current_team_id = request.GET.get('team_id')
-    current_team = None
-    sprint_queryset = Sprint.objects.none()
-    
-    current_user_role = None 
-
-    if current_team_id:
-        current_team = get_object_or_404(Team, id=current_team_id, members=request.user)
-        sprint_queryset = Sprint.objects.filter(team=current_team)
-        
-        membership = TeamMember.objects.filter(user=request.user, team=current_team).first()
-        if membership:
-            current_user_role = membership.role
-    else:
-        sprint_queryset = Sprint.objects.filter(created_by=request.user, team__isnull=True)
-        current_user_role = 'OWNER'
-
-    all_sprints = sprint_queryset.order_by('-id')
-
-    # --- Active Sprint ---
-    sprint_id = request.GET.get('sprint')
-    active_sprint = None
-
-    if sprint_id:
-        active_sprint = all_sprints.filter(pk=sprint_id).first()
-    else:
-        active_sprint = all_sprints.filter(is_active=True).first()
-
-    # --- Tasks List ---
-    tasks_todo = []
-    tasks_in_progress = []
-    tasks_done = []
-
-    if active_sprint:
-        
-        tasks = active_sprint.tasks.select_related('assignee').annotate(
-            priority_val=Case(
-                When(priority='H', then=Value(3)),  
-                When(priority='M', then=Value(2)),  
-                When(priority='L', then=Value(1)),  
-                default=Value(0),
-                output_field=IntegerField(),
-            )
-        ).order_by('-priority_val', '-created_at') 
-        
-      
-        tasks_todo = tasks.filter(status='TODO')
-        tasks_in_progress = tasks.filter(status='IN_PROGRESS')
-        tasks_done = tasks.filter(status='DONE')
+    # seq ของ change log ก่อนโหลดกระดาน (JS ใช้ดึงเฉพาะส่วนที่เปลี่ยนหลังจากนี้)
+    # อ่านก่อน load_board: อะไรที่เปลี่ยนระหว่างนั้นจะถูกดึงซ้ำ ดีกว่าหลุดหาย
+    team_id = request.GET.get('team_id')
+    board_seq = current_seq(channel_for(team_id, request.user.id))
 
-    if current_team:
-        backlog_tasks = Task.objects.filter(sprint__isnull=True, team=current_team).select_related('assignee')
-    else:
-        backlog_tasks = Task.objects.filter(sprint__isnull=True, team__isnull=True, created_by=request.user).select_related('assignee')
+    # 🔥 โหลดทั้งกระดานด้วย query จำนวนคงที่ (ดู tasks/board.py)
+    board = load_board(
+        request.user,
+        team_id=team_id,
+        sprint_id=request.GET.get('sprint'),
+        permissions=permissions,
+    )
 
     context = {
         'my_teams': my_teams,
-        'current_team': current_team,
-        'active_sprint': active_sprint,
-        'all_sprints': all_sprints,
-        'tasks_todo': tasks_todo,
-        'tasks_in_progress': tasks_in_progress,
-        'tasks_done': tasks_done,
-        'backlog_tasks': backlog_tasks,
-        'current_user_role': current_user_role,
+        'board_seq': board_seq,
+        **board,
     }
     return render(request, 'tasks/list.html', context)
 
@@ -96,6 +66,7 @@ def task_board(request):
 # 2. Add Functions
 # ==========================================
 @login_required
+@team_role_required('MEMBER')
 def add_task(request):
     team_id = request.POST.get('team_id') or request.GET.get('team_id')
     
@@ -108,12 +79,15 @@ def add_task(request):
             task = form.save(commit=False)
             task.created_by = request.user 
             
-            if team_id:
-                task.team = get_object_or_404(Team, id=team_id)
-            else:
-                task.team = None
+            # สิทธิ์ในทีมถูกเช็คแล้วที่ decorator ไม่ต้องโหลด Team
+            task.team_id = int(team_id) if team_id else None
             
-            task.save()
+            task.rank = top_rank(task)
+            # งาน + สถิติ + change log (จอง seq) commit พร้อมกัน: ไม่มี seq ที่ชี้ไปหาข้อมูลที่ไม่ได้ถูกบันทึก
+            with transaction.atomic():
+                task.save()
+                apply_task_changes([(None, task_state(task))])
+                publish_task_event('task-updated', task)
             
             # ถ้ามี Next URL ให้กลับไปที่นั่นเลย
             if next_url:
@@ -135,46 +109,42 @@ def add_task(request):
     })
 
 @login_required
+@team_role_required('ADMIN', message="❌ สมาชิกทั่วไปไม่สามารถเริ่ม Sprint ได้ (ต้องเป็น Admin/Owner)")
 def add_sprint(request):
     team_id = request.POST.get('team_id') or request.GET.get('team_id')
 
-    # เช็คสิทธิ์: MEMBER ห้ามสร้าง Sprint
-    if team_id:
-        membership = TeamMember.objects.filter(user=request.user, team_id=team_id).first()
-        if membership and membership.role == 'MEMBER':
-            messages.error(request, "❌ สมาชิกทั่วไปไม่สามารถเริ่ม Sprint ได้ (ต้องเป็น Admin/Owner)")
-            return redirect(f'/tasks/?team_id={team_id}')
-
     if request.method == 'POST':
         form = SprintForm(request.POST)
         if form.is_valid():
             new_sprint = form.save(commit=False)
             new_sprint.created_by = request.user
             
-            if team_id:
-                target_team = get_object_or_404(Team, id=team_id)
-                new_sprint.team = target_team
-            else:
-                new_sprint.team = None
-
-            if new_sprint.is_active:
-                old_sprint_query = Sprint.objects.filter(is_active=True)
-                if team_id:
-                    old_sprint = old_sprint_query.filter(team_id=team_id).first()
+            new_sprint.team_id = int(team_id) if team_id else None
+
+            with transaction.atomic():
+                if new_sprint.is_active:
+                    old_sprint_query = Sprint.objects.filter(is_active=True)
+                    if team_id:
+                        old_sprint = old_sprint_query.filter(team_id=team_id).first()
+                    else:
+                        old_sprint = old_sprint_query.filter(created_by=request.user, team__isnull=True).first()
+
+                    if old_sprint:
+                        old_sprint.is_active = False
+                        old_sprint.save()
+                        publish_sprint_changed(old_sprint)
+
+                    new_sprint.save()
+
+                    if old_sprint:
+                        unfinished_tasks = old_sprint.tasks.exclude(status='DONE')
+                        moved_ids = list(unfinished_tasks.values_list('id', flat=True))
+                        unfinished_tasks.update(sprint=new_sprint, source=old_sprint.name)
+                        record_tasks_changed(Task.objects.filter(id__in=moved_ids))
+                        refresh_sprint_stats(old_sprint.id, new_sprint.id)
                 else:
-                    old_sprint = old_sprint_query.filter(created_by=request.user, team__isnull=True).first()
-                
-                if old_sprint:
-                    old_sprint.is_active = False
-                    old_sprint.save()
-                
-                new_sprint.save()
-                
-                if old_sprint:
-                    unfinished_tasks = old_sprint.tasks.exclude(status='DONE')
-                    unfinished_tasks.update(sprint=new_sprint, source=old_sprint.name)
-            else:
-                new_sprint.save()
+                    new_sprint.save()
+                publish_sprint_changed(new_sprint)
                 
             if team_id:
                 return redirect(f'/tasks/?team_id={team_id}&sprint={new_sprint.id}')
@@ -209,16 +179,21 @@ def create_team(request):
 # 3. Edit / Delete Functions
 # ==========================================
 @login_required
-def edit_task(request, task_id):
-    task = get_object_or_404(Task, pk=task_id)
-    team_id = task.team.id if task.team else None
+@team_role_required('MEMBER', model=Task, url_kwarg='task_id')
+def edit_task(request, task):
+    team_id = task.team_id
     
     next_url = request.GET.get('next') or request.POST.get('next')
 
     if request.method == 'POST':
+        # form.is_valid() เขียนค่าใหม่ลง task เลย ต้องเก็บค่าเดิมไว้ก่อน
+        old_state = task_state(task)
         form = TaskForm(request.POST, instance=task, team_id=team_id)
         if form.is_valid():
-            form.save()
+            with transaction.atomic():
+                form.save()
+                apply_task_changes([(old_state, task_state(task))])
+                publish_task_event('task-updated', task)
             
             if next_url:
                 return redirect(next_url)
@@ -237,17 +212,15 @@ def edit_task(request, task_id):
     })
 
 @login_required
-def delete_task(request, task_id):
-    task = get_object_or_404(Task, pk=task_id)
-    team_id = task.team.id if task.team else None
-    
-    if team_id:
-        membership = TeamMember.objects.filter(user=request.user, team_id=team_id).first()
-        if membership and membership.role == 'MEMBER':
-            messages.error(request, "❌ คุณไม่มีสิทธิ์ลบงานนี้ (Member Role)")
-            return redirect(f'/tasks/?team_id={team_id}')
-
-    task.delete()
+@team_role_required('ADMIN', model=Task, url_kwarg='task_id', message="❌ คุณไม่มีสิทธิ์ลบงานนี้ (Member Role)")
+def delete_task(request, task):
+    team_id = task.team_id
+
+    # event ถูกส่งหลังลบสำเร็จ (on_commit) แต่ต้องเก็บ id ไว้ก่อนลบ
+    with transaction.atomic():
+        publish_task_deleted(task)
+        task.delete()
+        apply_task_changes([(task_state(task), None)])
     
     if team_id:
         return redirect(f'/tasks/?team_id={team_id}')
@@ -257,98 +230,122 @@ def delete_task(request, task_id):
 # ==========================================
 # 4. Utility / API Functions
 # ==========================================
+def card_response(request, data):
+    """JSON ของข้อมูลการ์ด + ETag (hash ของ body) / GET ที่ If-None-Match ตรงกัน -> 304 ไม่ส่ง body ซ้ำ"""
+    response = JsonResponse(data)
+    etag = '"%s"' % hashlib.md5(response.content).hexdigest()
+    if request.method in ('GET', 'HEAD') and etag in [
+        tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')
+    ]:
+        response = HttpResponseNotModified()
+    response['ETag'] = etag
+    return response
+
+
 @login_required
-def update_task_status(request, task_id, new_status):
-    task = get_object_or_404(Task, pk=task_id)
-    
+@team_role_required('MEMBER', model=Task.objects.select_related('assignee'), url_kwarg='task_id')
+def update_task_status(request, task, new_status):
     valid_statuses = ['TODO', 'IN_PROGRESS', 'DONE']
     if new_status in valid_statuses:
+        old_state = task_state(task)
         task.status = new_status
-        task.save()
+        with transaction.atomic():
+            task.save()
+            apply_task_changes([(old_state, task_state(task))])
+            publish_task_event('task-moved', task)
     
     if request.headers.get('x-requested-with') == 'XMLHttpRequest' or request.accepts('application/json'):
-        current_user_role = 'MEMBER' # Default safe
-        if task.team:
-            mem = TeamMember.objects.filter(user=request.user, team=task.team).first()
-            if mem: current_user_role = mem.role
-        else:
-            current_user_role = 'OWNER'
-
-        # 🔥 Fix: ดึง URL หน้าปัจจุบันส่งไปให้ Partial View
-        referer_url = request.META.get('HTTP_REFERER', '/tasks/')
-
-        new_card_html = render_to_string('tasks/partials/task_card.html', {
-            'task': task, 
-            'current_user_role': current_user_role,
-            'redirect_url': referer_url # 👈 ส่งตัวแปรนี้ไป!
-        }, request=request)
-        
-        return JsonResponse({'success': True, 'html': new_card_html})
+        # ✨ ส่งข้อมูลการ์ดแบบย่อ ให้ JS วาดการ์ดเอง (task_card.html ใช้ตอน render หน้าเต็มเท่านั้น)
+        return card_response(request, {'success': True, 'task': task_payload(task)})
 
-    team_id = task.team.id if task.team else None
-    if team_id:
-        return redirect(f'/tasks/?team_id={team_id}')
+    if task.team_id:
+        return redirect(f'/tasks/?team_id={task.team_id}')
     return redirect('tasks:board')
 
 
-@csrf_exempt
 @login_required
 def move_task_api(request):
-    if request.method == 'POST':
+    """ย้ายการ์ดใบเดียว body: {"task_id", "status", "sprint_id"} (สิทธิ์แบบเดียวกับ @team_role_required('MEMBER'))"""
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'error': 'Invalid method'}, status=400)
+
+    try:
+        data = json.loads(request.body)
+        task_id = int(data['task_id'])
+        sprint_id = int(data['sprint_id']) if data.get('sprint_id') else None
+    except (ValueError, KeyError, TypeError) as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    new_status = data.get('status')
+    if new_status not in dict(Task.STATUS_CHOICES):
+        return JsonResponse({'success': False, 'error': f'invalid status: {new_status!r}'}, status=400)
+
+    # งานส่วนตัวของคนอื่น / ทีมที่ไม่ได้เป็นสมาชิก -> 404
+    task = get_board_object_or_404(request, Task.objects.select_related('assignee'), task_id)
+    if sprint_id and not board_sprints(request.user, task.team_id).filter(pk=sprint_id).exists():
+        return JsonResponse({'success': False, 'error': 'sprint not found on this board'}, status=400)
+
+    old_state = task_state(task)
+    task.status = new_status
+    task.sprint_id = sprint_id
+    # การ์ด + สถิติ + แถวใน change log (จอง seq) อยู่ใน transaction เดียว: ล้มก็ล้มด้วยกัน
+    with transaction.atomic():
+        task.save()
+        apply_task_changes([(old_state, task_state(task))])
+        publish_task_event('task-moved', task)
+
+    return card_response(request, {
+        'success': True,
+        'message': 'Moved successfully!',
+        'task': task_payload(task),
+    })
+
+
+# การลาก 1 ชุดที่รับได้ต่อ request
+MAX_BATCH_MOVES = 200
+
+@login_required
+def move_tasks_api(request):
+    """ย้าย/เรียงการ์ดหลายใบใน request เดียว (JS รวบการลากไว้แล้วส่งเป็นชุด) ดู apply_moves ใน tasks/board.py
+
+    body: {"team_id": ..., "moves": [{"task_id", "status", "sprint_id", "after_id", "before_id"}, ...]}
+    ตอบกลับเป็นข้อมูลการ์ดแบบย่อ ไม่ render task_card.html ใหม่ (JS แก้การ์ดบนหน้าเอง)
+    """
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'error': 'Invalid method'}, status=405)
+
+    with transaction.atomic():
         try:
             data = json.loads(request.body)
-            task_id = data.get('task_id')
-            new_status = data.get('status')
-            sprint_id = data.get('sprint_id') 
+            moves = data['moves']
+            if not isinstance(moves, list) or len(moves) > MAX_BATCH_MOVES:
+                raise ValueError(f"moves must be a list of at most {MAX_BATCH_MOVES} items")
+            tasks, state_changes = apply_moves(
+                request.user, moves, team_id=data.get('team_id'), permissions=get_permissions(request),
+            )
+        except (ValueError, KeyError, TypeError) as e:
+            # apply_moves ตรวจทุกใบก่อนเขียน: ข้อมูลผิดไม่มีอะไรถูกบันทึก
+            return JsonResponse({'success': False, 'error': str(e)}, status=400)
+        apply_task_changes(state_changes)
+        publish_tasks_moved(tasks)
 
-            task = get_object_or_404(Task, id=task_id)
-            task.status = new_status
+    return card_response(request, {'success': True, 'tasks': [task_payload(task) for task in tasks]})
 
-            if sprint_id:
-                task.sprint_id = sprint_id 
-            else:
-                task.sprint = None  
 
-            task.save()
-            
-            current_user_role = 'MEMBER'
-            if task.team:
-                mem = TeamMember.objects.filter(user=request.user, team=task.team).first()
-                if mem: current_user_role = mem.role
-            else:
-                current_user_role = 'OWNER'
-
-            # 🔥 Fix: ดึง URL หน้าปัจจุบันส่งไปให้ Partial View เช่นกัน
-            referer_url = request.META.get('HTTP_REFERER', '/tasks/')
-
-            new_card_html = render_to_string('tasks/partials/task_card.html', {
-                'task': task,
-                'current_user_role': current_user_role,
-                'redirect_url': referer_url # 👈 ส่งตัวแปรนี้ไป!
-            }, request=request)
-
-            return JsonResponse({
-                'success': True, 
-                'message': 'Moved successfully!',
-                'html': new_card_html 
-            })
-            
-        except Exception as e:
-            return JsonResponse({'success': False, 'error': str(e)}, status=400)
-    
-    return JsonResponse({'success': False, 'error': 'Invalid method'}, status=400)
+@login_required
+@team_role_required('MEMBER', model=Task.objects.select_related('assignee'), url_kwarg='task_id')
+def task_api(request, task):
+    """ข้อมูลการ์ดแบบย่อของงานเดียว (ส่ง If-None-Match มา ถ้าการ์ดไม่เปลี่ยนได้ 304 กลับไป)"""
+    response = card_response(request, task_payload(task))
+    response['Cache-Control'] = 'private, no-cache'
+    return response
 
 # ==========================================
 # 5. Team Management
 # ==========================================
 @login_required
+@team_role_required('ADMIN', message="❌ Access Denied: Admin or Owner only.")
 def manage_team(request, team_id):
-    team = get_object_or_404(Team, id=team_id, members=request.user)
-
-    membership = TeamMember.objects.filter(user=request.user, team=team).first()
-    if not membership or membership.role == 'MEMBER':
-        messages.error(request, "❌ Access Denied: Admin or Owner only.")
-        return redirect(f'/tasks/?team_id={team_id}')
+    team = get_permissions(request).team(team_id)
 
     if request.method == 'POST':
         username = request.POST.get('username')
@@ -357,10 +354,10 @@ def manage_team(request, team_id):
             try:
                 user_to_add = User.objects.get(username=username)
                 
-                if TeamMember.objects.filter(user=user_to_add, team=team).exists():
+                if TeamMember.objects.filter(user=user_to_add, team_id=team_id).exists():
                     messages.warning(request, f'User "{username}" is already in the team!')
                 else:
-                    TeamMember.objects.create(user=user_to_add, team=team, role='MEMBER')
+                    TeamMember.objects.create(user=user_to_add, team_id=team_id, role='MEMBER')
                     messages.success(request, f'Welcome! "{username}" has been added to the team.')
                     
             except User.DoesNotExist:
@@ -368,7 +365,7 @@ def manage_team(request, team_id):
         
         return redirect('tasks:manage_team', team_id=team_id)
 
-    memberships = TeamMember.objects.filter(team=team).select_related('user')
+    memberships = TeamMember.objects.filter(team_id=team_id).select_related('user')
     
     return render(request, 'tasks/manage_team.html', {
         'team': team,
@@ -376,37 +373,26 @@ def manage_team(request, team_id):
     })
 
 @login_required
+@team_role_required('ADMIN', message="❌ Access Denied.", denied_url='tasks:manage_team')
 def remove_team_member(request, team_id, user_id):
-    team = get_object_or_404(Team, id=team_id, members=request.user)
-    
-    current_membership = TeamMember.objects.filter(user=request.user, team=team).first()
-    if not current_membership or current_membership.role == 'MEMBER':
-        messages.error(request, "❌ Access Denied.")
-        return redirect('tasks:manage_team', team_id=team_id)
 
     user_to_remove = get_object_or_404(User, id=user_id)
     if user_to_remove == request.user:
          pass 
          
-    TeamMember.objects.filter(team=team, user=user_to_remove).delete()
+    TeamMember.objects.filter(team_id=team_id, user=user_to_remove).delete()
     
     messages.success(request, f'{user_to_remove.username} was removed from the team.')
     return redirect('tasks:manage_team', team_id=team_id)
 
 @login_required
-def start_sprint(request, sprint_id):
-    sprint = get_object_or_404(Sprint, pk=sprint_id)
-    team_id = sprint.team.id if sprint.team else None
-
-    if team_id:
-        membership = TeamMember.objects.filter(user=request.user, team=sprint.team).first()
-        if not membership or membership.role == 'MEMBER':
-            messages.error(request, "❌ Access Denied.")
-            return redirect(f'/tasks/?team_id={team_id}')
+@team_role_required('ADMIN', model=Sprint, url_kwarg='sprint_id', message="❌ Access Denied.")
+def start_sprint(request, sprint):
+    team_id = sprint.team_id
 
     active_sprint_query = Sprint.objects.filter(is_active=True)
     if team_id:
-        active_sprint = active_sprint_query.filter(team=sprint.team).exists()
+        active_sprint = active_sprint_query.filter(team_id=team_id).exists()
     else:
         active_sprint = active_sprint_query.filter(created_by=request.user, team__isnull=True).exists()
 
@@ -416,7 +402,9 @@ def start_sprint(request, sprint_id):
         return redirect('tasks:board')
 
     sprint.is_active = True
-    sprint.save()
+    with transaction.atomic():
+        sprint.save()
+        publish_sprint_changed(sprint)
     messages.success(request, f"🚀 Sprint '{sprint.name}' Started!")
 
     if team_id:
@@ -425,22 +413,21 @@ def start_sprint(request, sprint_id):
 
 
 @login_required
-def complete_sprint(request, sprint_id):
-    sprint = get_object_or_404(Sprint, pk=sprint_id)
-    team_id = sprint.team.id if sprint.team else None
-
-    if team_id:
-        membership = TeamMember.objects.filter(user=request.user, team=sprint.team).first()
-        if not membership or membership.role == 'MEMBER':
-            messages.error(request, "❌ Access Denied.")
-            return redirect(f'/tasks/?team_id={team_id}')
-
-    incomplete_tasks = sprint.tasks.exclude(status='DONE')
-    count = incomplete_tasks.count()
-    incomplete_tasks.update(sprint=None)
-
-    sprint.is_active = False
-    sprint.save()
+@team_role_required('ADMIN', model=Sprint, url_kwarg='sprint_id', message="❌ Access Denied.")
+def complete_sprint(request, sprint):
+    team_id = sprint.team_id
+
+    with transaction.atomic():
+        incomplete_tasks = sprint.tasks.exclude(status='DONE')
+        moved_ids = list(incomplete_tasks.values_list('id', flat=True))
+        count = len(moved_ids)
+        incomplete_tasks.update(sprint=None)
+        record_tasks_changed(Task.objects.filter(id__in=moved_ids))
+
+        sprint.is_active = False
+        sprint.save()
+        refresh_sprint_stats(sprint.id)
+        publish_sprint_changed(sprint)
     
     msg = f"🏁 Sprint Completed! "
     if count > 0:
@@ -452,20 +439,16 @@ def complete_sprint(request, sprint_id):
     return redirect('tasks:board')
 
 @login_required
-def edit_sprint(request, sprint_id):
-    sprint = get_object_or_404(Sprint, pk=sprint_id)
-    team_id = sprint.team.id if sprint.team else None
-
-    if team_id:
-        membership = TeamMember.objects.filter(user=request.user, team=sprint.team).first()
-        if not membership or membership.role == 'MEMBER':
-            messages.error(request, "❌ Access Denied: Admin/Owner only.")
-            return redirect(f'/tasks/?team_id={team_id}')
+@team_role_required('ADMIN', model=Sprint, url_kwarg='sprint_id', message="❌ Access Denied: Admin/Owner only.")
+def edit_sprint(request, sprint):
+    team_id = sprint.team_id
 
     if request.method == 'POST':
         form = SprintForm(request.POST, instance=sprint)
         if form.is_valid():
-            form.save()
+            with transaction.atomic():
+                form.save()
+                publish_sprint_changed(sprint)
             messages.success(request, f"Sprint '{sprint.name}' updated!")
             if team_id:
                 return redirect(f'/tasks/?team_id={team_id}&sprint={sprint.id}')
@@ -481,19 +464,18 @@ def edit_sprint(request, sprint_id):
     })
 
 @login_required
-def delete_sprint(request, sprint_id):
-    sprint = get_object_or_404(Sprint, pk=sprint_id)
-    team_id = sprint.team.id if sprint.team else None
-
-    if team_id:
-        membership = TeamMember.objects.filter(user=request.user, team=sprint.team).first()
-        if not membership or membership.role == 'MEMBER':
-            messages.error(request, "❌ Access Denied: Admin/Owner only.")
-            return redirect(f'/tasks/?team_id={team_id}')
-
-    sprint.tasks.update(sprint=None)
-
-    sprint.delete()
+@team_role_required('ADMIN', model=Sprint, url_kwarg='sprint_id', message="❌ Access Denied: Admin/Owner only.")
+def delete_sprint(request, sprint):
+    team_id = sprint.team_id
+
+    with transaction.atomic():
+        moved_ids = list(sprint.tasks.values_list('id', flat=True))
+        sprint.tasks.update(sprint=None)
+        record_tasks_changed(Task.objects.filter(id__in=moved_ids))
+
+        invalidate_sprint_stats(sprint.id)
+        publish_sprint_changed(sprint, deleted=True)
+        sprint.delete()
     messages.success(request, "Sprint deleted. Tasks moved to backlog.")
 
     if team_id:
@@ -511,40 +493,175 @@ def dashboard(request):
 
     if team_id:
         # 🏢 กรณีมี Team ID: ให้หาเฉพาะ Sprint ของทีมนั้น
-        current_team = get_object_or_404(Team, id=team_id, members=request.user)
+        current_team = get_permissions(request).team(team_id)
+        if current_team is None:
+            raise Http404("No Team matches the given query.")
         active_sprint = Sprint.objects.filter(team=current_team, is_active=True).first()
     else:
         # 👤 กรณีไม่มี Team ID (Personal): ให้หาเฉพาะ Sprint ส่วนตัว (ที่ team เป็น NULL)
         active_sprint = Sprint.objects.filter(created_by=request.user, team__isnull=True, is_active=True).first()
 
-    # 2. เตรียมตัวแปรเก็บสถิติ (เหมือนเดิม)
-    stats = {
-        'total_tasks': 0,
-        'done_tasks': 0,
-        'todo_tasks': 0,
-        'progress_tasks': 0,
-        'completion_rate': 0,
-        'total_points': 0,
-        'done_points': 0,
-    }
-
-    # 3. คำนวณ (เหมือนเดิมเป๊ะ)
+    # 2. สถิติของ Sprint: aggregate query เดียว + cache (ล้างเมื่องานใน Sprint เปลี่ยน)
     if active_sprint:
-        tasks = active_sprint.tasks.all()
-        stats['total_tasks'] = tasks.count()
-        stats['done_tasks'] = tasks.filter(status='DONE').count()
-        stats['todo_tasks'] = tasks.filter(status='TODO').count()
-        stats['progress_tasks'] = tasks.filter(status='IN_PROGRESS').count()
-        
-        from django.db.models import Sum
-        stats['total_points'] = tasks.aggregate(Sum('story_points'))['story_points__sum'] or 0
-        stats['done_points'] = tasks.filter(status='DONE').aggregate(Sum('story_points'))['story_points__sum'] or 0
-
-        if stats['total_tasks'] > 0:
-            stats['completion_rate'] = int((stats['done_tasks'] / stats['total_tasks']) * 100)
+        stats = get_sprint_stats(active_sprint)
+    else:
+        stats = empty_stats()
 
     return render(request, 'tasks/dashboard.html', {
         'active_sprint': active_sprint,
         'stats': stats,
         'current_team': current_team,
-    })
\ No newline at end of file
+    })
+
+
+@login_required
+def dashboard_data(request):
+    """JSON ของกราฟ Burndown (Sprint ที่เลือก/Active) และ Velocity (Sprint ย้อนหลัง)
+
+    อ่านจาก SprintSnapshot อย่างเดียว ไม่แตะตาราง Task
+    """
+    team_id = request.GET.get('team_id')
+
+    if team_id:
+        if get_permissions(request).role(team_id) is None:
+            raise Http404("No Team matches the given query.")
+        sprints = Sprint.objects.filter(team_id=team_id)
+    else:
+        sprints = Sprint.objects.filter(created_by=request.user, team__isnull=True)
+
+    sprint_id = request.GET.get('sprint')
+    if sprint_id:
+        if not sprint_id.isdigit():
+            return JsonResponse({'error': 'sprint must be an integer'}, status=400)
+        sprint = get_object_or_404(sprints, pk=sprint_id)
+    else:
+        sprint = sprints.filter(is_active=True).first()
+
+    return JsonResponse({
+        'sprint': {
+            'id': sprint.id,
+            'name': sprint.name,
+            'start_date': sprint.start_date.isoformat(),
+            'end_date': sprint.end_date.isoformat(),
+        } if sprint else None,
+        'burndown': burndown_series(sprint) if sprint else [],
+        'velocity': velocity_series(sprints),
+    })
+
+
+# ==========================================
+# 6. Live Board (Server-Sent Events + Delta Sync)
+# ==========================================
+@login_required
+async def task_events(request):
+    """ส่ง event ของกระดาน (task-moved / task-updated / task-deleted / sprint-changed) แบบ SSE
+
+    ต้องรันใต้ ASGI (connection ค้างไว้นานโดยไม่กิน worker thread) ดู tasks/events.py
+    """
+    if not isinstance(request, ASGIRequest):
+        # ใต้ WSGI แต่ละ connection จะกิน worker 1 ตัวตลอดเวลา -> ไม่เปิดให้ใช้
+        return HttpResponse("Live updates require the ASGI server.", status=501)
+
+    user = await request.auser()
+    team_id = request.GET.get('team_id')
+    if team_id:
+        if not team_id.isdigit() or not await TeamMember.objects.filter(user=user, team_id=team_id).aexists():
+            return HttpResponseForbidden()
+    channel = channel_for(team_id, user.id)
+    broker = get_broker()
+    heartbeat = getattr(settings, 'TASK_EVENTS_HEARTBEAT', 15)
+
+    async def stream():
+        subscription = await broker.subscribe(channel)
+        try:
+            # browser ต่อใหม่เองหลังหลุด 5 วินาที
+            yield 'retry: 5000\n\n'
+            while True:
+                message = await subscription.get(timeout=heartbeat)
+                if message is None:
+                    # comment กัน proxy ตัด connection ที่เงียบนาน
+                    yield ': ping\n\n'
+                    continue
+                yield format_sse(message)
+        finally:
+            await broker.unsubscribe(subscription)
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@login_required
+def task_changes(request):
+    """สิ่งที่เปลี่ยนบนกระดานหลัง seq ที่ client มีอยู่ (?since=N) ใช้ตามต่อหลังเน็ตหลุด ไม่ต้องโหลดทั้งกระดาน
+
+    ดูรูปแบบผลลัพธ์ที่ tasks/changes.py (changes_since)
+    """
+    team_id = request.GET.get('team_id')
+    if team_id and get_permissions(request).role(team_id) is None:
+        return HttpResponseForbidden()
+    try:
+        since = int(request.GET.get('since', 0))
+    except ValueError:
+        return JsonResponse({'error': 'since must be an integer'}, status=400)
+
+    result = changes_since(channel_for(team_id, request.user.id), since)
+    response = JsonResponse(result)
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
+# ==========================================
+# 7. Import / Export (ย้ายงานจาก tracker อื่น ดู tasks/transfer.py)
+# ==========================================
+@login_required
+@team_role_required('MEMBER')
+def export_tasks(request):
+    """ดาวน์โหลดงาน / Sprint ทั้งกระดาน (?kind=tasks|sprints&format=csv|jsonl) ส่งทีละก้อน ไม่โหลดทั้งหมดเข้า memory"""
+    team_id = request.GET.get('team_id')
+    kind = request.GET.get('kind', 'tasks')
+    fmt = request.GET.get('format', 'csv')
+    if kind not in EXPORT_FIELDS or fmt not in FORMATS:
+        return JsonResponse({'success': False, 'error': 'kind must be tasks|sprints, format must be csv|jsonl'}, status=400)
+
+    rows = export_rows(kind, request.user, team_id)
+    response = StreamingHttpResponse(encode(rows, EXPORT_FIELDS[kind], fmt), content_type=f'{FORMATS[fmt]}; charset=utf-8')
+    filename = f"{kind}-team-{team_id}.{fmt}" if team_id else f"{kind}-personal.{fmt}"
+    response['Content-Disposition'] = content_disposition_header(True, filename)
+    return response
+
+
+@login_required
+@team_role_required('ADMIN', message="❌ นำเข้างานได้เฉพาะ Admin/Owner")
+def import_tasks(request):
+    """อัปโหลดไฟล์ CSV / JSON lines แล้วนำเข้าทีละ batch
+
+    ตอบกลับเป็น JSON lines: 1 บรรทัดต่อ batch (ความคืบหน้าสะสม) บรรทัดสุดท้ายคือผลรวม
+    """
+    team_id = request.POST.get('team_id') or request.GET.get('team_id')
+    if request.method != 'POST':
+        return render(request, 'tasks/import.html', {
+            'team_id': team_id,
+            'current_team': get_permissions(request).team(team_id) if team_id else None,
+        })
+
+    upload = request.FILES.get('file')
+    kind = request.POST.get('kind', 'tasks')
+    if upload is None or kind not in IMPORTERS:
+        return JsonResponse({'success': False, 'error': 'file and kind (tasks|sprints) are required'}, status=400)
+    fmt = request.POST.get('format') or ('jsonl' if upload.name.endswith(('.jsonl', '.ndjson')) else 'csv')
+    if fmt not in FORMATS:
+        return JsonResponse({'success': False, 'error': 'format must be csv|jsonl'}, status=400)
+
+    # อ่านไฟล์ที่ Django เก็บไว้ (memory / temp file) ทีละบรรทัด
+    stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+    importer = IMPORTERS[kind](request.user, team_id)
+
+    def progress():
+        for result in importer.run(read_rows(stream, fmt)):
+            yield json.dumps(result.as_dict(), ensure_ascii=False) + '\n'
+
+    response = StreamingHttpResponse(progress(), content_type='application/x-ndjson; charset=utf-8')
+    response['Cache-Control'] = 'no-store'
+    return response